@@ -36,13 +36,20 @@ python3 tools/validate_behaviors.py
 # 2.46 Validate asset modules
 python3 tools/validate_assets.py
 
+# 2.5/2.6 fan out over a process pool and reuse cells cached in out/build_cache/
+# (keyed on project + target pack + exporter source). Set MODULO_GATE_NO_CACHE=1 to force a full run.
+GATE_CACHE_ARGS=()
+if [[ "${MODULO_GATE_NO_CACHE:-0}" == "1" ]]; then
+  GATE_CACHE_ARGS=(--no-cache)
+fi
+
 echo
 echo "2.5) Export parity sweep"
-python3 tools/parity_sweep.py --json-summary
+python3 tools/parity_sweep.py --json-summary ${GATE_CACHE_ARGS[@]+"${GATE_CACHE_ARGS[@]}"}
 
 echo
 echo "2.6) Golden exports"
-python3 tools/golden_exports.py
+python3 tools/golden_exports.py ${GATE_CACHE_ARGS[@]+"${GATE_CACHE_ARGS[@]}"}
 
 
 echo
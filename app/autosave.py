@@ -1,9 +1,13 @@
 from __future__ import annotations
 import time, json
+import marshal
+import os
+import threading
 from pathlib import Path
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 
 from app.json_sanitize import sanitize_for_json
+from app.project_history import ListItems, MISSING, diff_values, set_path
 
 ROOT = Path(__file__).resolve().parents[1]
 OUT = ROOT / "out"
@@ -26,29 +30,45 @@ BACKUP = OUT / "autosave_project.prev.json"
 # ------------------------------------------------------------
 AUTOSAVE_ENABLED = False
 
+def _atomic_write_text(path: Path, text: str, *, fsync: bool = True) -> None:
+    """Write via a temp file in the same directory + os.replace (never a torn file)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}_{threading.get_ident()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
 def write_autosave(project: dict) -> None:
     if not AUTOSAVE_ENABLED:
         return
     try:
         if AUTOSAVE.exists():
             try:
-                BACKUP.write_text(AUTOSAVE.read_text(encoding="utf-8", errors="ignore"), encoding="utf-8")
+                os.replace(AUTOSAVE, BACKUP)
             except Exception:
                 pass
         clean, _issues = sanitize_for_json(project)
-        AUTOSAVE.write_text(json.dumps(clean, indent=2), encoding="utf-8")
+        _atomic_write_text(AUTOSAVE, json.dumps(clean, separators=(",", ":")))
     except Exception:
         pass
 
 def read_autosave() -> dict | None:
     if not AUTOSAVE_ENABLED:
         return None
-    if not AUTOSAVE.exists():
-        return None
-    try:
-        return json.loads(AUTOSAVE.read_text(encoding="utf-8"))
-    except Exception:
-        return None
+    rec = recover_autosave()
+    if rec is not None:
+        return rec["project"]
+    # Legacy single-file autosave (BACKUP covers a crash between rotate and write).
+    for p in (AUTOSAVE, BACKUP):
+        try:
+            if p.exists():
+                return json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            continue
+    return None
 
 def clear_autosave() -> None:
     if not AUTOSAVE_ENABLED:
@@ -59,6 +79,245 @@ def clear_autosave() -> None:
     except Exception:
         pass
 
+# ------------------------------------------------------------
+# Incremental autosave: checkpoint + change journal, written off the UI thread.
+#
+#   out/autosave/checkpoint.json  {"version", "gen", "rev", "project"}   (atomic replace)
+#   out/autosave/journal.jsonl    {"gen", "seq", "rev", "ops"} per line  (append + fsync)
+#
+# Journal ops are diff_values() path ops against the previously written snapshot:
+# ["s", path, value] sets, ["d", path] deletes. Only lines whose gen matches the
+# checkpoint are replayed, and a torn last line is ignored, so a crash at any point
+# recovers the last fully written state.
+# ------------------------------------------------------------
+AUTOSAVE_DIR = OUT / "autosave"
+CHECKPOINT_NAME = "checkpoint.json"
+JOURNAL_NAME = "journal.jsonl"
+
+
+def _encode_ops(ops) -> list:
+    out = []
+    for path, _old, new in ops:
+        if new is MISSING:
+            out.append(["d", list(path)])
+        else:
+            out.append(["s", list(path), list(new) if isinstance(new, ListItems) else new])
+    return out
+
+
+def apply_journal_ops(project: dict, ops: list) -> None:
+    for op in ops:
+        if op and op[0] == "d":
+            set_path(project, tuple(op[1]), MISSING)
+        elif op and op[0] == "s":
+            set_path(project, tuple(op[1]), op[2])
+
+
+def recover_autosave(directory: Path | None = None) -> dict | None:
+    """Checkpoint + matching journal replayed: {"project", "rev", "journal_entries"} or None."""
+    d = Path(directory) if directory is not None else AUTOSAVE_DIR
+    try:
+        ck = json.loads((d / CHECKPOINT_NAME).read_text(encoding="utf-8"))
+        project = ck["project"]
+        gen = ck["gen"]
+    except Exception:
+        return None
+    rev = ck.get("rev")
+    n = 0
+    try:
+        lines = (d / JOURNAL_NAME).read_text(encoding="utf-8").splitlines()
+    except Exception:
+        lines = []
+    for ln in lines:
+        try:
+            rec = json.loads(ln)
+        except Exception:
+            break  # torn tail write
+        if rec.get("gen") != gen or rec.get("seq") != n + 1:
+            continue
+        apply_journal_ops(project, rec.get("ops") or [])
+        rev = rec.get("rev", rev)
+        n += 1
+    return {"project": project, "rev": rev, "journal_entries": n}
+
+
+class AutosaveEngine:
+    """Revision-tracked autosave: the UI thread only snapshots; a worker diffs and writes.
+
+    tick() is cheap when the revision is unchanged. On change it freezes each top-level
+    section into an immutable marshal blob (C speed, no Python-level deep copy) and
+    reuses the previous blob object for sections whose bytes did not change, so the
+    snapshot shares every unchanged section with the last one. The worker decodes and
+    sanitizes only the changed sections; unchanged ones keep their previous decoded
+    object, so diff_values() skips them by identity (as for copy-on-write edits, see
+    app.project_history). It then appends the diff against the last written snapshot
+    to the journal, or writes a full checkpoint when none exists yet, after
+    `checkpoint_every` journal entries, or when the diff is larger than half the last
+    checkpoint. Pending snapshots coalesce: the worker always writes the newest one.
+    """
+
+    def __init__(self, get_project: Callable[[], dict], get_revision: Optional[Callable[[], Any]] = None, *,
+                 directory: Path | None = None, checkpoint_every: int = 50, enabled: bool | None = None):
+        self.get_project = get_project
+        self.get_revision = get_revision
+        self.directory = Path(directory) if directory is not None else AUTOSAVE_DIR
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self.enabled = AUTOSAVE_ENABLED if enabled is None else bool(enabled)
+        self.stats = {"ticks": 0, "skipped": 0, "checkpoints": 0, "journal": 0, "unchanged": 0, "errors": 0}
+        self.last_error = ""
+        self._last_rev = object()
+        self._saved = None
+        self._gen = None
+        self._seq = 0
+        self._ckpt_bytes = 0
+        self._blobs: dict | None = None  # UI thread: section -> marshal blob of the last snapshot
+        self._decoded: dict = {}  # worker: section -> (blob, sanitized value)
+        self._cv = threading.Condition()
+        self._pending = None
+        self._busy = False
+        self._stop = False
+        self._thread = None
+
+    # --- UI thread ---
+    def tick(self) -> bool:
+        """Queue a save if the project changed. Returns True if a snapshot was queued."""
+        if not self.enabled:
+            return False
+        self.stats["ticks"] += 1
+        try:
+            rev = self.get_revision() if self.get_revision is not None else None
+        except Exception:
+            rev = None
+        if rev is not None and rev == self._last_rev:
+            self.stats["skipped"] += 1
+            return False
+        try:
+            snap = self._share_snapshot(self.get_project())
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.last_error = f"snapshot: {e}"
+            return False
+        self._last_rev = rev
+        if snap is None:
+            self.stats["unchanged"] += 1
+            return False
+        with self._cv:
+            self._pending = (rev, snap)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop = False
+                self._thread = threading.Thread(target=self._run, name="modulo-autosave", daemon=True)
+                self._thread.start()
+            self._cv.notify_all()
+        return True
+
+    def _share_snapshot(self, project) -> dict | None:
+        """Section blobs of `project` (previous blob objects reused), or None if nothing changed."""
+        prev = self._blobs
+        blobs = {}
+        changed = prev is None
+        for k, v in (project.items() if isinstance(project, dict) else ()):
+            try:
+                b = marshal.dumps(v, 2)
+            except Exception:  # non-JSON objects or cycles: sanitize just this section
+                b = marshal.dumps(sanitize_for_json(v)[0], 2)
+            old = prev.get(k) if prev is not None else None
+            if old is not None and old == b:
+                b = old
+            else:
+                changed = True
+            blobs[k] = b
+        if prev is not None and len(prev) != len(blobs):
+            changed = True
+        self._blobs = blobs
+        return blobs if changed else None
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued snapshot is on disk."""
+        deadline = time.monotonic() + float(timeout)
+        with self._cv:
+            while self._pending is not None or self._busy:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cv.wait(left)
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        self.flush(timeout)
+        with self._cv:
+            self._stop = True
+            self._cv.notify_all()
+
+    # --- worker ---
+    def _run(self):
+        while True:
+            with self._cv:
+                while self._pending is None and not self._stop:
+                    self._cv.wait()
+                if self._pending is None:
+                    return
+                rev, blobs = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                self._write(rev, self._decode(blobs))
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.last_error = f"write: {e}"
+                self._saved = None  # next save starts a fresh checkpoint
+            finally:
+                with self._cv:
+                    self._busy = False
+                    self._cv.notify_all()
+
+    def _decode(self, blobs: dict) -> dict:
+        """JSON-safe project from section blobs; sections with an unchanged blob keep their object."""
+        prev = self._decoded
+        snap, decoded = {}, {}
+        for k, b in blobs.items():
+            hit = prev.get(k)
+            if hit is not None and hit[0] is b:
+                v = hit[1]
+            else:
+                v, _issues = sanitize_for_json(marshal.loads(b))
+            key = k if isinstance(k, str) else str(k)
+            snap[key] = v
+            decoded[k] = (b, v)
+        self._decoded = decoded
+        return snap
+
+    def _write(self, rev, snap):
+        if self._saved is None or self._gen is None or self._seq >= self.checkpoint_every:
+            self._checkpoint(rev, snap)
+            return
+        ops = diff_values(self._saved, snap)
+        if not ops:
+            self.stats["unchanged"] += 1
+            return
+        line = json.dumps({"gen": self._gen, "seq": self._seq + 1, "rev": rev, "ops": _encode_ops(ops)},
+                          separators=(",", ":"))
+        if len(line) * 2 > self._ckpt_bytes:
+            self._checkpoint(rev, snap)
+            return
+        with open(self.directory / JOURNAL_NAME, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._seq += 1
+        self._saved = snap
+        self.stats["journal"] += 1
+
+    def _checkpoint(self, rev, snap):
+        gen = time.time_ns()
+        text = json.dumps({"version": 1, "gen": gen, "rev": rev, "project": snap}, separators=(",", ":"))
+        _atomic_write_text(self.directory / CHECKPOINT_NAME, text)
+        # Old-generation journal lines are ignored on recovery; truncate to keep it small.
+        _atomic_write_text(self.directory / JOURNAL_NAME, "", fsync=False)
+        self._gen, self._seq, self._ckpt_bytes = gen, 0, len(text)
+        self._saved = snap
+        self.stats["checkpoints"] += 1
+
+
 class AutoSaver:
     def __init__(self, tk_root, get_project: Callable[[], dict], *, interval_ms: int = 15000):
         self.root = tk_root
@@ -66,6 +325,8 @@ class AutoSaver:
         self.interval_ms = max(3000, int(interval_ms))
         self._after = None
         self._last_hash = None
+        # No revision source here: every tick snapshots, the worker skips unchanged saves.
+        self.engine = AutosaveEngine(get_project)
 
     def start(self):
         if not AUTOSAVE_ENABLED:
@@ -78,15 +339,12 @@ class AutoSaver:
             try: self.root.after_cancel(self._after)
             except Exception: pass
             self._after = None
+        try: self.engine.close()
+        except Exception: pass
 
     def _tick(self):
         try:
-            proj = self.get_project()
-            clean, _issues = sanitize_for_json(proj)
-            h = hash(json.dumps(clean, sort_keys=True))
-            if h != self._last_hash:
-                write_autosave(clean)
-                self._last_hash = h
+            self.engine.tick()
         except Exception:
             pass
         self._after = self.root.after(self.interval_ms, self._tick)
@@ -21,6 +21,10 @@ def _layer_behavior(layer: Dict[str, Any]) -> str:
         return ""
 
 
+# Top-level project sections read by validate_project_against_era (app.validation_engine).
+ERA_READS = ("ui", "layers", "rules_v6", "signals", "layout")
+
+
 def validate_project_against_era(project: Dict[str, Any]) -> List[str]:
     errors: List[str] = []
     if not isinstance(project, dict):
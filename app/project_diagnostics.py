@@ -44,8 +44,15 @@ def _collect_mask_refs(node: Any, out: Set[str]) -> None:
         return
 
 
-def diagnose_project(project: Dict[str, Any]) -> Dict[str, List[str]]:
-    """Return {'invalid': [...], 'dangling': [...], 'empty': [...]}."""
+# Top-level sections read by diagnose_project (including its validate_project pass).
+DIAGNOSTICS_READS = ("layout", "zones", "groups", "masks", "ui", "layers", "target_mask")
+
+
+def diagnose_project(project: Dict[str, Any], *, validation: Optional[Dict[str, Any]] = None) -> Dict[str, List[str]]:
+    """Return {'invalid': [...], 'dangling': [...], 'empty': [...]}.
+
+    `validation` may carry an already computed validate_project() snapshot for `project`.
+    """
     p = project if isinstance(project, dict) else {}
     n = _layout_count(p)
 
@@ -54,7 +61,7 @@ def diagnose_project(project: Dict[str, Any]) -> Dict[str, List[str]]:
     empty: List[str] = []
 
     # ---- invalid (validator is authoritative) ----
-    snap = validate_project(p)
+    snap = validation if isinstance(validation, dict) else validate_project(p)
     for e in (snap.get("errors") or []):
         invalid.append(str(e))
     for w in (snap.get("warnings") or []):
@@ -200,9 +207,9 @@ def diagnose_project(project: Dict[str, Any]) -> Dict[str, List[str]]:
     return {"invalid": invalid, "dangling": dangling, "empty": empty}
 
 
-def diagnostics_text(project: Dict[str, Any]) -> str:
-    """Human-readable multiline diagnostics."""
-    d = diagnose_project(project)
+def diagnostics_text(project: Dict[str, Any], *, diagnosis: Optional[Dict[str, List[str]]] = None) -> str:
+    """Human-readable multiline diagnostics (`diagnosis`: a precomputed diagnose_project result)."""
+    d = diagnosis if isinstance(diagnosis, dict) else diagnose_project(project)
     lines: List[str] = []
 
     def emit(section: str, items: List[str]) -> None:
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+"""Undo/redo journal for project edits (structural diffs, no whole-project copies).
+
+Each history entry is a list of path ops `(path, old, new)` where path is a tuple of
+dict keys / list indices from the project root and MISSING marks an absent key.
+Ops are produced by diff_values(), which skips subtrees that are the same object
+(`old is new`) and recurses into dict keys and into list elements carrying the same
+uid/id (other list elements are swapped as references; a list whose length changed
+is restored in place by slice assignment). UI edits copy only the containers they touch (`p2 = dict(p)`), so a
+diff costs O(size of the change) and the entry holds references to the replaced
+subtrees rather than copies: old and new projects share everything else.
+
+Undo applies `old` values in reverse order, redo applies `new` values in order, both
+in place on the live project. Because undo is strictly LIFO, live objects referenced
+by an entry are back in the state the entry saw by the time it is reverted.
+
+Coalescing: an entry merges into the previous one when both touch exactly the same
+paths, every value is a number, and they arrive within `coalesce_window_s` - a
+slider drag becomes one entry holding the pre-drag and final values. An explicit
+`coalesce` key (same key within the window) merges any edit the same way;
+break_coalescing() ends a drag early (e.g. on slider release).
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
+
+class ListItems(tuple):
+    """Element references of a list at one point in time; applied by slice assignment."""
+    __slots__ = ()
+
+Path = Tuple[Any, ...]
+Op = Tuple[Path, Any, Any]
+
+
+def diff_values(old: Any, new: Any, path: Path = (), out: Optional[List[Op]] = None) -> List[Op]:
+    """Append the path ops turning `old` into `new` to `out` (identity-shared subtrees skipped)."""
+    if out is None:
+        out = []
+    if old is new:
+        return out
+    if isinstance(old, dict) and isinstance(new, dict):
+        for k, v in old.items():
+            if k not in new:
+                out.append((path + (k,), v, MISSING))
+        for k, v in new.items():
+            if k in old:
+                diff_values(old[k], v, path + (k,), out)
+            else:
+                out.append((path + (k,), MISSING, v))
+        return out
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for i, (a, b) in enumerate(zip(old, new)):
+            if a is b:
+                continue
+            if isinstance(a, (dict, list)) and not _same_entity(a, b):
+                # Reordered/replaced element: swap references, never rewrite one object's
+                # fields into another that may still be live elsewhere in the project.
+                out.append((path + (i,), a, b))
+            else:
+                diff_values(a, b, path + (i,), out)
+        return out
+    if isinstance(old, list) and isinstance(new, list):
+        # Insert/remove: restore the element references in place so the live list keeps
+        # its identity (later entries refer to it by path, earlier ones by object).
+        out.append((path, ListItems(old), ListItems(new)))
+        return out
+    try:
+        if type(old) is type(new) and not isinstance(old, (dict, list)) and old == new:
+            return out
+    except Exception:
+        pass
+    out.append((path, old, new))
+    return out
+
+
+_ENTITY_KEYS = ("uid", "id")
+
+
+def _same_entity(a: Any, b: Any) -> bool:
+    """List elements diffed field-by-field: dicts carrying the same uid/id (e.g. a layer
+    and its copy-on-write edit)."""
+    if not (isinstance(a, dict) and isinstance(b, dict)):
+        return False
+    for k in _ENTITY_KEYS:
+        if k in a or k in b:
+            return a.get(k) == b.get(k)
+    return False
+
+
+def get_path(root: Any, path: Path) -> Any:
+    cur = root
+    for k in path:
+        if isinstance(cur, dict):
+            if k not in cur:
+                return MISSING
+            cur = cur[k]
+        elif isinstance(cur, list) and isinstance(k, int) and -len(cur) <= k < len(cur):
+            cur = cur[k]
+        else:
+            return MISSING
+    return cur
+
+
+def set_path(root: Any, path: Path, value: Any) -> bool:
+    """Set (or delete, for MISSING) the value at `path`. Returns False if the parent is gone."""
+    if not path:
+        return False
+    parent = get_path(root, path[:-1])
+    k = path[-1]
+    try:
+        if isinstance(value, ListItems):
+            cur = get_path(root, path)
+            if isinstance(cur, list):
+                cur[:] = value
+                return True
+            value = list(value)
+        if isinstance(parent, dict):
+            if value is MISSING:
+                parent.pop(k, None)
+            else:
+                parent[k] = value
+            return True
+        if isinstance(parent, list) and isinstance(k, int) and value is not MISSING:
+            parent[k] = value
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+@dataclass
+class HistoryEntry:
+    label: str
+    ops: List[Op]
+    t: float
+    coalesce: Optional[str] = None
+    merged: int = 1  # edits folded into this entry
+
+    def paths(self) -> Tuple[Path, ...]:
+        return tuple(p for p, _o, _n in self.ops)
+
+    def numeric(self) -> bool:
+        return all((_is_number(o) and _is_number(n)) for _p, o, n in self.ops)
+
+
+@dataclass
+class ProjectHistory:
+    max_entries: int = 200
+    coalesce_window_s: float = 0.75
+    clock: Callable[[], float] = time.monotonic
+    undo_stack: List[HistoryEntry] = field(default_factory=list)
+    redo_stack: List[HistoryEntry] = field(default_factory=list)
+    _open_coalesce: bool = True
+    _suspended: int = 0
+
+    @contextmanager
+    def suspend(self):
+        """Edits inside the block are not journaled (e.g. re-syncing views after undo)."""
+        self._suspended += 1
+        try:
+            yield self
+        finally:
+            self._suspended -= 1
+
+    def clear(self) -> None:
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._open_coalesce = True
+
+    def break_coalescing(self) -> None:
+        """The next edit starts a new entry even if it would otherwise merge."""
+        self._open_coalesce = False
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    def record(self, label: str, ops: List[Op], *, coalesce: Optional[str] = None) -> Optional[HistoryEntry]:
+        """Push an edit (no-op edits are dropped). Clears the redo stack."""
+        if not ops or self._suspended:
+            return None
+        now = self.clock()
+        self.redo_stack.clear()
+        prev = self.undo_stack[-1] if self.undo_stack else None
+        entry = HistoryEntry(str(label), list(ops), now, coalesce)
+        if prev is not None and self._open_coalesce and (now - prev.t) <= self.coalesce_window_s:
+            same_key = coalesce is not None and coalesce == prev.coalesce
+            drag = coalesce is None and prev.coalesce is None and entry.paths() == prev.paths() \
+                and entry.numeric() and prev.numeric()
+            if same_key or drag:
+                self._merge(prev, entry)
+                return prev
+        self._open_coalesce = True
+        self.undo_stack.append(entry)
+        if len(self.undo_stack) > self.max_entries:
+            del self.undo_stack[:len(self.undo_stack) - self.max_entries]
+        return entry
+
+    @staticmethod
+    def _merge(prev: HistoryEntry, entry: HistoryEntry) -> None:
+        # Keep the first old value per path and the latest new value.
+        index = {p: i for i, (p, _o, _n) in enumerate(prev.ops)}
+        for p, o, n in entry.ops:
+            i = index.get(p)
+            if i is None:
+                index[p] = len(prev.ops)
+                prev.ops.append((p, o, n))
+            else:
+                prev.ops[i] = (p, prev.ops[i][1], n)
+        prev.t = entry.t
+        prev.merged += 1
+
+    def undo(self, project: Any) -> Optional[HistoryEntry]:
+        if not self.undo_stack:
+            return None
+        entry = self.undo_stack.pop()
+        for path, old, _new in reversed(entry.ops):
+            set_path(project, path, old)
+        self.redo_stack.append(entry)
+        self._open_coalesce = False
+        return entry
+
+    def redo(self, project: Any) -> Optional[HistoryEntry]:
+        if not self.redo_stack:
+            return None
+        entry = self.redo_stack.pop()
+        for path, _old, new in entry.ops:
+            set_path(project, path, new)
+        self.undo_stack.append(entry)
+        self._open_coalesce = False
+        return entry
+
+    def summary(self) -> dict:
+        return {
+            "undo": len(self.undo_stack),
+            "redo": len(self.redo_stack),
+            "ops": sum(len(e.ops) for e in self.undo_stack) + sum(len(e.ops) for e in self.redo_stack),
+            "next_undo": self.undo_stack[-1].label if self.undo_stack else None,
+            "next_redo": self.redo_stack[-1].label if self.redo_stack else None,
+        }
@@ -7,6 +7,8 @@ import uuid
 import os
 
 from app.json_sanitize import sanitize_for_json
+from app.project_normalize import NormalizePipeline, NormalizeStep
+from app.project_history import ProjectHistory, diff_values, get_path, MISSING
 
 ROOT = Path(__file__).resolve().parents[1]
 OUT = ROOT / "out"
@@ -596,25 +598,16 @@ def _ensure_layer_effect_behavior_operator_defaults(p: dict) -> None:
     return
 
 
-def migrate_project_dict(p: dict) -> dict:
+def migrate_project_dict(p: dict, fingerprints: dict | None = None) -> dict:
   """Best-effort migration for loaded project dicts.
 
   Conservative: never deletes data; only normalizes missing structural defaults.
+  Steps re-run only for sections changed since the last migrated output; pass the
+  caller's section fingerprints of `p` (if it has them) to avoid hashing twice.
   """
   if not isinstance(p, dict):
     return json.loads(json.dumps(DEFAULT_PROJECT))
-  p2 = _normalize_layout_keys(p)
-  _ensure_ui_defaults(p2)
-  _ensure_masks_dict(p2)
-  _ensure_zones_groups_dict(p2)
-  _sync_zones_groups_into_masks(p2)
-  _ensure_referenced_targets_exist(p2)
-  _ensure_demo_gain_targets(p2)
-
-  _ensure_layer_effect_behavior_operator_defaults(p2)
-  _ensure_layer_uids(p2)
-  _ensure_layer_modulotors_normalized(p2)
-  return p2
+  return _MIGRATE_PIPELINE.run(p, fingerprints)
 
 
 def _ensure_demo_gain_targets(p: dict) -> None:
@@ -669,6 +662,22 @@ def _ensure_demo_gain_targets(p: dict) -> None:
   op2["target_kind"] = "zone"
   op2["target_key"] = "zone_top"
 
+
+_MIGRATE_PIPELINE = NormalizePipeline([
+  NormalizeStep("layout_keys", ("layout",), _normalize_layout_keys),
+  NormalizeStep("ui_defaults", ("ui",), _ensure_ui_defaults),
+  NormalizeStep("masks_dict", ("masks",), _ensure_masks_dict),
+  NormalizeStep("zones_groups_dict", ("zones", "groups"), _ensure_zones_groups_dict),
+  NormalizeStep("mask_namespace", ("masks", "groups"), _sync_zones_groups_into_masks),
+  NormalizeStep("referenced_targets", ("layers", "layout", "groups", "zones", "masks"),
+                _ensure_referenced_targets_exist),
+  NormalizeStep("demo_gain_targets", ("name", "layers"), _ensure_demo_gain_targets),
+  NormalizeStep("operator_defaults", ("layers",), _ensure_layer_effect_behavior_operator_defaults),
+  NormalizeStep("layer_uids", ("layers",), _ensure_layer_uids),
+  NormalizeStep("layer_modulotors", ("layers",), _ensure_layer_modulotors_normalized),
+])
+
+
 class ProjectManager:
     def __init__(self):
         # Start from defaults. (Autosave/restore is hard-disabled for release stability.)
@@ -690,6 +699,8 @@ class ProjectManager:
         self.dirty: bool = False
         self._listeners = []  # callables(pm)
         self.root_dir = str(ROOT)
+        # Undo/redo journal (structural diffs; see app/project_history.py)
+        self.history = ProjectHistory()
 
     def add_listener(self, fn):
         try:
@@ -707,11 +718,37 @@ class ProjectManager:
     def get(self) -> dict:
         return self.project
 
-    def set(self, p: dict):
-        self.project = migrate_project_dict(p)
+    def set(self, p: dict, *, label: str = "edit", coalesce: str | None = None,
+            fingerprints: dict | None = None):
+        old = self.project
+        self.project = migrate_project_dict(p, fingerprints)
+        # A new dict (UI copy-on-write) is diffed against the previous one; an in-place
+        # edit of the same dict cannot be diffed and is not journaled.
+        if self.project is not old:
+            try:
+                self.history.record(label, diff_values(old, self.project), coalesce=coalesce)
+            except Exception:
+                pass
         self.dirty = True
         self._notify()
 
+    def undo(self) -> bool:
+        """Revert the last journaled edit in place. Returns True if anything was undone."""
+        entry = self.history.undo(self.project)
+        if entry is None:
+            return False
+        self.dirty = True
+        self._notify()
+        return True
+
+    def redo(self) -> bool:
+        entry = self.history.redo(self.project)
+        if entry is None:
+            return False
+        self.dirty = True
+        self._notify()
+        return True
+
     def mark_clean(self):
         self.dirty = False
         self._notify()
@@ -747,12 +784,14 @@ class ProjectManager:
 
     def new(self):
         self._apply_export_defaults_from_target()
+        self.history.clear()
         self.path = None
         self.dirty = True
         self._notify()
 
     def load(self, path: Path):
         self.project = migrate_project_dict(json.loads(path.read_text(encoding="utf-8")))
+        self.history.clear()
         self.path = path
         self.dirty = False
         self._notify()
@@ -775,6 +814,7 @@ class ProjectManager:
         if not isinstance(d, dict):
             return
         self.project = migrate_project_dict(d)
+        self.history.clear()
         self.dirty = True
         self._notify()
 
@@ -785,6 +825,7 @@ class ProjectManager:
             path = ROOT / "fixtures" / "projects" / filename
             proj = load_project(path)
             self.project = proj.to_dict()
+            self.history.clear()
             self.dirty = True
             self._notify()
         except Exception:
@@ -799,14 +840,45 @@ class ProjectManager:
             routes = data.get("audio_routes") or []
             if not isinstance(self.project, dict):
                 return
+            snaps = _journal_begin(self, ())
             self.project["audio_routes"] = routes
             self.project["audio_preset_name"] = data.get("name", preset_filename)
+            _journal_commit(self, "audio_preset", snaps)
             self.dirty = True
             self._notify()
         except Exception:
             return
 
 
+# ---- undo journal for in-place mutators ----
+def _journal_begin(self, *paths):
+    """Shallow copies of the containers a mutator edits in place (O(container), not O(project))."""
+    snaps = []
+    for path in paths:
+        cur = get_path(self.project, tuple(path))
+        if isinstance(cur, dict):
+            snaps.append((tuple(path), dict(cur)))
+        elif isinstance(cur, list):
+            snaps.append((tuple(path), list(cur)))
+        else:
+            snaps.append((tuple(path), cur))
+    return snaps
+
+def _journal_commit(self, label: str, snaps, *, coalesce: str | None = None) -> None:
+    """Record the diff between the snapshots and the live containers as one history entry."""
+    try:
+        ops = []
+        for path, old in snaps:
+            new = get_path(self.project, path)
+            if path and (old is MISSING or new is MISSING):
+                ops.append((path, old, new))
+            else:
+                diff_values(old, new, path, ops)
+        self.history.record(label, ops, coalesce=coalesce)
+    except Exception:
+        pass
+
+
 # ---- guarded layer helpers (single source of truth) ----
 def is_layer_locked(self, idx: int) -> bool:
     try:
@@ -817,8 +889,12 @@ def is_layer_locked(self, idx: int) -> bool:
         pass
     return False
 
-def guarded_update_layer(self, idx: int, updater, *, reason: str = "modify"):
-    """Apply updater(layer_dict) if layer is not locked. Returns True if applied."""
+def guarded_update_layer(self, idx: int, updater, *, reason: str = "modify", coalesce: str | None = None):
+    """Apply updater(layer_dict) if layer is not locked. Returns True if applied.
+
+    The change is journaled for undo; edits with the same `coalesce` key in quick
+    succession merge into one history entry.
+    """
     try:
         if self.is_layer_locked(idx):
             return False
@@ -826,9 +902,12 @@ def guarded_update_layer(self, idx: int, updater, *, reason: str = "modify"):
         if not (0 <= idx < len(layers)):
             return False
         layer = layers[idx] or {}
+        # Updaters replace top-level layer keys (params etc.); the layer is snapshotted shallowly.
+        snaps = _journal_begin(self, ("layers",), ("layers", idx))
         updater(layer)
         layers[idx] = layer
         self.project["layers"] = layers
+        _journal_commit(self, reason, snaps, coalesce=coalesce)
         self.dirty = True
         self._notify()
         return True
@@ -840,7 +919,8 @@ def guarded_set_layer_param(self, idx: int, name: str, value) -> bool:
         params = dict(layer.get("params") or {})
         params[name] = value
         layer["params"] = params
-    return self.guarded_update_layer(idx, _u, reason="set_param")
+    # Repeated edits of one param in quick succession (slider drags) share one undo entry.
+    return self.guarded_update_layer(idx, _u, reason="set_param", coalesce=f"param:{idx}:{name}")
 
 def guarded_set_layer_effect(self, idx: int, effect_key: str, params: dict | None = None) -> bool:
     def _u(layer):
@@ -865,6 +945,7 @@ def guarded_remove_layer(self, idx: int) -> bool:
         layers = (self.project.get("layers") or [])
         if not (0 <= idx < len(layers)):
             return False
+        snaps = _journal_begin(self, ("layers",), ("ui",))
         layers.pop(idx)
         self.project["layers"] = layers
         # clear selection if it pointed past end
@@ -874,6 +955,7 @@ def guarded_remove_layer(self, idx: int) -> bool:
                 self.project.setdefault("ui", {})["selected_layer"] = max(0, len(layers)-1) if layers else None
         except Exception:
             pass
+        _journal_commit(self, "remove_layer", snaps)
         self.dirty = True
         self._notify()
         return True
@@ -888,8 +970,10 @@ def guarded_move_layer(self, idx: int, delta: int) -> bool:
         j = idx + int(delta)
         if not (0 <= idx < len(layers)) or not (0 <= j < len(layers)):
             return False
+        snaps = _journal_begin(self, ("layers",))
         layers[idx], layers[j] = layers[j], layers[idx]
         self.project["layers"] = layers
+        _journal_commit(self, "move_layer", snaps)
         self.dirty = True
         self._notify()
         return True
@@ -900,6 +984,7 @@ def guarded_add_layer(self, layer_dict: dict, *, idx: int | None = None) -> bool
     """Insert new layer. If idx is provided, insertion happens at idx; if that slot is locked, returns False."""
     try:
         layers = (self.project.get("layers") or [])
+        snaps = _journal_begin(self, ("layers",))
         if idx is None:
             layers.append(dict(layer_dict))
         else:
@@ -911,6 +996,7 @@ def guarded_add_layer(self, layer_dict: dict, *, idx: int | None = None) -> bool
                 idx = len(layers)
             layers.insert(idx, dict(layer_dict))
         self.project["layers"] = layers
+        _journal_commit(self, "add_layer", snaps)
         self.dirty = True
         self._notify()
         return True
@@ -3,13 +3,25 @@
 # This file intentionally contains no UI code.
 
 from __future__ import annotations
-from typing import Any, Dict, List, Set, Tuple, Optional
+import hashlib
+import marshal
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Set, Tuple, Optional
+
+from app.validation_engine import _ABSENT, section_fingerprint
+from models.schema import CURRENT_SCHEMA_VERSION
 
 def _as_int_list(xs) -> List[int]:
     out: List[int] = []
     if xs is None:
         return out
     if isinstance(xs, (list, tuple, set)):
+        try:
+            return list(map(int, xs))  # common case: every entry converts
+        except Exception:
+            pass
         for v in xs:
             try:
                 out.append(int(v))
@@ -18,10 +30,50 @@ def _as_int_list(xs) -> List[int]:
     return out
 
 def _clamp_indices(idx: List[int], n: Optional[int]) -> List[int]:
+    s = set(idx)
+    if not s:
+        return []
+    lo, hi = min(s), max(s)
     if n is None or n <= 0:
         # still dedupe/sort
-        return sorted(set(i for i in idx if i >= 0))
-    return sorted(set(i for i in idx if 0 <= i < n))
+        return sorted(s if lo >= 0 else (i for i in s if i >= 0))
+    return sorted(s if (lo >= 0 and hi < n) else (i for i in s if 0 <= i < n))
+
+
+# Zone/group index lists dominate normalization cost on large layouts and rarely change
+# between edits, but the UI often edits project sections in place, so object identity
+# cannot tell that they are unchanged. Memoize the normalized list by a content
+# fingerprint instead (marshal format 2 is deterministic; 3+ depends on refcounts).
+# Entries are stored marshalled, so every hit returns a fresh list.
+_INDEX_MEMO: "OrderedDict[Tuple[bytes, Optional[int]], bytes]" = OrderedDict()
+_INDEX_MEMO_MAX = 256
+_INDEX_MEMO_MIN_LEN = 64  # shorter lists are cheaper to normalize than to fingerprint
+
+
+def _indices_fingerprint(raw) -> Optional[bytes]:
+    if not isinstance(raw, list) or len(raw) < _INDEX_MEMO_MIN_LEN:
+        return None
+    try:
+        return hashlib.sha256(marshal.dumps(raw, 2)).digest()
+    except Exception:
+        return None
+
+
+def _normalized_indices(raw, n: Optional[int]) -> List[int]:
+    """_clamp_indices(_as_int_list(raw), n), memoized for long lists."""
+    fp = _indices_fingerprint(raw)
+    key = (fp, n)
+    if fp is not None:
+        blob = _INDEX_MEMO.get(key)
+        if blob is not None:
+            _INDEX_MEMO.move_to_end(key)
+            return marshal.loads(blob)
+    idx = _clamp_indices(_as_int_list(raw), n)
+    if fp is not None:
+        _INDEX_MEMO[key] = marshal.dumps(idx, 2)
+        if len(_INDEX_MEMO) > _INDEX_MEMO_MAX:
+            _INDEX_MEMO.popitem(last=False)
+    return idx
 
 def _layout_count(project: Dict[str, Any]) -> Optional[int]:
     layout = project.get("layout") or {}
@@ -37,7 +89,14 @@ def normalize_project_zones_masks_groups(project: Dict[str, Any]) -> Tuple[Dict[
     """Return (new_project, changes) with deterministic Zones/Groups/Masks and safe target_mask."""
     if not isinstance(project, dict):
         return {}, ["project was not a dict; reset to {}"]
+    p, changes = _normalize_zones_groups_masks(project)
+    return _normalize_layer_targets_and_operators(p, changes), changes
+
 
+def _normalize_zones_groups_masks(project: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Zones/groups index lists, masks synced from them, canonical ui.target_mask.
+
+    Reads and writes layout, zones, groups, masks, ui and target_mask only."""
     changes: List[str] = []
     p = dict(project)
     n = _layout_count(p)
@@ -59,7 +118,7 @@ def normalize_project_zones_masks_groups(project: Dict[str, Any]) -> Tuple[Dict[
             changes.append("dropped zone with invalid name")
             continue
         node = node if isinstance(node, dict) else {}
-        idx = _clamp_indices(_as_int_list(node.get("indices")), n)
+        idx = _normalized_indices(node.get("indices"), n)
         node2 = dict(node)
         node2["indices"] = idx
         zones2[name] = node2
@@ -74,7 +133,7 @@ def normalize_project_zones_masks_groups(project: Dict[str, Any]) -> Tuple[Dict[
             changes.append("dropped group with invalid name")
             continue
         node = node if isinstance(node, dict) else {}
-        idx = _clamp_indices(_as_int_list(node.get("indices")), n)
+        idx = _normalized_indices(node.get("indices"), n)
         node2 = dict(node)
         node2["indices"] = idx
         groups2[name] = node2
@@ -88,52 +147,6 @@ def normalize_project_zones_masks_groups(project: Dict[str, Any]) -> Tuple[Dict[
         masks = {}
         changes.append("masks reset (was not dict)")
 
-    # Sync zones/groups into masks for beta-lock (idempotent)
-    # Normalize layer target references against current zones/groups
-    layers = p.get('layers')
-    if isinstance(layers, list):
-        zlen = len(zones2) if isinstance(zones2, list) else 0
-        glen = len(groups2) if isinstance(groups2, list) else 0
-        new_layers = []
-        changed_any = False
-        for L in layers:
-            if not isinstance(L, dict):
-                new_layers.append(L)
-                continue
-            tk = str(L.get('target_kind', 'all') or 'all').lower().strip()
-            tr = L.get('target_ref', 0)
-            try:
-                tr_i = int(tr)
-            except Exception:
-                tr_i = 0
-            ok = True
-            if tk == 'zone':
-                ok = (0 <= tr_i < zlen)
-            elif tk == 'group':
-                ok = (0 <= tr_i < glen)
-            elif tk == 'all':
-                ok = True
-            else:
-                # unknown target kind -> coerce to all
-                ok = False
-            if not ok:
-                L2 = dict(L)
-                L2['target_kind'] = 'all'
-                L2['target_ref'] = 0
-                new_layers.append(L2)
-                changed_any = True
-            else:
-                if tr_i != tr:
-                    L2 = dict(L)
-                    L2['target_ref'] = tr_i
-                    new_layers.append(L2)
-                    changed_any = True
-                else:
-                    new_layers.append(L)
-        if changed_any:
-            p['layers'] = new_layers
-            changes.append('normalized layer target_kind/target_ref refs')
-    
     masks2 = dict(masks)
     for zname, znode in zones2.items():
         key = f"zone:{zname}"
@@ -206,6 +219,60 @@ def normalize_project_zones_masks_groups(project: Dict[str, Any]) -> Tuple[Dict[
         pass
 
 
+    return p, changes
+
+
+def _normalize_layer_targets_and_operators(p: Dict[str, Any], changes: List[str]) -> Dict[str, Any]:
+    """Layer target_kind/target_ref against the zones/groups in `p`, and the operators stack.
+
+    Reads zones, groups and layers; writes layers only. Mutates `p` (a caller-owned copy)."""
+    zones2 = p.get("zones")
+    groups2 = p.get("groups")
+    # Normalize layer target references against current zones/groups
+    layers = p.get('layers')
+    if isinstance(layers, list):
+        zlen = len(zones2) if isinstance(zones2, list) else 0
+        glen = len(groups2) if isinstance(groups2, list) else 0
+        new_layers = []
+        changed_any = False
+        for L in layers:
+            if not isinstance(L, dict):
+                new_layers.append(L)
+                continue
+            tk = str(L.get('target_kind', 'all') or 'all').lower().strip()
+            tr = L.get('target_ref', 0)
+            try:
+                tr_i = int(tr)
+            except Exception:
+                tr_i = 0
+            ok = True
+            if tk == 'zone':
+                ok = (0 <= tr_i < zlen)
+            elif tk == 'group':
+                ok = (0 <= tr_i < glen)
+            elif tk == 'all':
+                ok = True
+            else:
+                # unknown target kind -> coerce to all
+                ok = False
+            if not ok:
+                L2 = dict(L)
+                L2['target_kind'] = 'all'
+                L2['target_ref'] = 0
+                new_layers.append(L2)
+                changed_any = True
+            else:
+                if tr_i != tr:
+                    L2 = dict(L)
+                    L2['target_ref'] = tr_i
+                    new_layers.append(L2)
+                    changed_any = True
+                else:
+                    new_layers.append(L)
+        if changed_any:
+            p['layers'] = new_layers
+            changes.append('normalized layer target_kind/target_ref refs')
+    
     # : operators stack normalization (Phase 1 Structure)
     # Contract: layer['operators'] is a list of {'type': str, 'params': dict}
     # Policy: operators[0].type mirrors layer['behavior'] (or 'effect') for compatibility.
@@ -271,4 +338,94 @@ def normalize_project_zones_masks_groups(project: Dict[str, Any]) -> Tuple[Dict[
     except Exception:
         pass
 
-    return p, changes
+    return p
+
+
+# ---------------------------------------------------------------------------
+# Incremental normalization
+#
+# Every project write (UI edit, undo, load) used to re-run the whole normalizer chain even
+# though a typical edit touches one section. A NormalizePipeline remembers the per-section
+# fingerprints of its last *output* and re-runs only the steps that read a section whose
+# content differs from it; an already-normalized project skips every step. Steps must be
+# idempotent and may only read/write the sections they declare. Bump NORMALIZE_VERSION
+# whenever a step's behavior changes so stamped fingerprints from older code are ignored.
+
+NORMALIZE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class NormalizeStep:
+    name: str
+    reads: Tuple[str, ...]  # top-level sections read *and* written
+    fn: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]  # None = mutated in place
+
+
+def _zones_groups_masks_step(p: Dict[str, Any]) -> Dict[str, Any]:
+    return _normalize_zones_groups_masks(p)[0]
+
+
+def _layer_targets_step(p: Dict[str, Any]) -> Dict[str, Any]:
+    return _normalize_layer_targets_and_operators(p, [])
+
+
+# normalize_project_zones_masks_groups() as pipeline steps.
+ZONES_MASKS_GROUPS_STEPS: Tuple[NormalizeStep, ...] = (
+    NormalizeStep("zones_groups_masks", ("layout", "zones", "groups", "masks", "ui", "target_mask"),
+                  _zones_groups_masks_step),
+    NormalizeStep("layer_targets", ("layers", "zones", "groups"), _layer_targets_step),
+)
+
+
+def project_fingerprints(project: Mapping[str, Any]) -> Dict[str, str]:
+    """section_fingerprint() of every top-level section of `project`."""
+    return {str(k): section_fingerprint(v) for k, v in project.items()}
+
+
+class NormalizePipeline:
+    """Run normalizer steps only for sections changed since the last normalized output."""
+
+    def __init__(self, steps: Iterable[NormalizeStep]):
+        self.steps: Tuple[NormalizeStep, ...] = tuple(steps)
+        self.stamp: Tuple[int, int] = (CURRENT_SCHEMA_VERSION, NORMALIZE_VERSION)
+        self.fingerprints: Dict[str, str] = {}  # sections of the last output
+        self.stats: Dict[str, int] = {"runs": 0, "skipped": 0, "steps_run": 0, "steps_skipped": 0}
+        self._stamped: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def run(self, project: Dict[str, Any], fingerprints: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+        """Normalize `project` (steps may mutate it in place, as the eager chain did).
+
+        `fingerprints` are the caller's section_fingerprint()s of `project`, if it already
+        has them. Returns the normalized project; self.fingerprints then describes it."""
+        fps = dict(fingerprints) if fingerprints is not None else project_fingerprints(project)
+        with self._lock:
+            self.stats["runs"] += 1
+            if self._stamped != self.stamp:
+                dirty: Set[str] = set(fps) | set(self.fingerprints) | {s for st in self.steps for s in st.reads}
+            else:
+                dirty = {k for k in set(fps) | set(self.fingerprints)
+                         if fps.get(k, _ABSENT) != self.fingerprints.get(k, _ABSENT)}
+            if not dirty:
+                self.stats["skipped"] += 1
+                self.stats["steps_skipped"] += len(self.steps)
+                return project
+            p = project
+            for st in self.steps:
+                if dirty.isdisjoint(st.reads):
+                    self.stats["steps_skipped"] += 1
+                    continue
+                out = st.fn(p)
+                if isinstance(out, dict):
+                    p = out
+                dirty.update(st.reads)
+                self.stats["steps_run"] += 1
+            out_fps = {k: v for k, v in fps.items() if k not in dirty and k in p}
+            for k in p:
+                key = str(k)
+                if key not in out_fps:
+                    out_fps[key] = section_fingerprint(p[k])
+            self.fingerprints = out_fps
+            self._stamped = self.stamp
+            return p
+
@@ -14,7 +14,7 @@ Beta contract:
 - If validation fails, project is structurally unsafe.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from app.masks_resolver import resolve_mask_to_indices
 
@@ -48,41 +48,44 @@ def _validate_index_list(name: str, idx: Any, *, n: Optional[int]) -> Optional[s
     return None
 
 
-def validate_project(project: Dict[str, Any]) -> Dict[str, Any]:
-    """Return validation snapshot: {'ok': bool, 'errors': [...], 'warnings': [...]}"""
-    p = project if isinstance(project, dict) else {}
+Issues = Tuple[List[str], List[str]]
+
+
+def _as_dict_section(p: Dict[str, Any], key: str) -> Dict[str, Any]:
+    v = p.get(key) or {}
+    return v if isinstance(v, dict) else {}
+
+
+def _check_index_section(p: Dict[str, Any], key: str, label: str) -> Issues:
     errors: List[str] = []
-    warnings: List[str] = []
     n = _layout_count(p)
-
-    zones = p.get("zones") or {}
-    if zones and not isinstance(zones, dict):
-        errors.append("zones: must be a dict of name -> {indices:[...]}")
-        zones = {}
-    if isinstance(zones, dict):
-        for zn in sorted(zones.keys(), key=lambda s: str(s).lower()):
-            node = zones.get(zn) or {}
+    node_map = p.get(key) or {}
+    if node_map and not isinstance(node_map, dict):
+        errors.append(f"{key}: must be a dict of name -> {{indices:[...]}}")
+        node_map = {}
+    if isinstance(node_map, dict):
+        for name in sorted(node_map.keys(), key=lambda s: str(s).lower()):
+            node = node_map.get(name) or {}
             if not isinstance(node, dict):
-                errors.append(f"zone '{zn}': must be a dict")
+                errors.append(f"{label} '{name}': must be a dict")
                 continue
-            err = _validate_index_list(f"zone '{zn}'", node.get("indices"), n=n)
+            err = _validate_index_list(f"{label} '{name}'", node.get("indices"), n=n)
             if err:
                 errors.append(err)
+    return errors, []
+
+
+def check_zones(p: Dict[str, Any]) -> Issues:
+    return _check_index_section(p, "zones", "zone")
+
+
+def check_groups(p: Dict[str, Any]) -> Issues:
+    return _check_index_section(p, "groups", "group")
 
-    groups = p.get("groups") or {}
-    if groups and not isinstance(groups, dict):
-        errors.append("groups: must be a dict of name -> {indices:[...]}")
-        groups = {}
-    if isinstance(groups, dict):
-        for gn in sorted(groups.keys(), key=lambda s: str(s).lower()):
-            node = groups.get(gn) or {}
-            if not isinstance(node, dict):
-                errors.append(f"group '{gn}': must be a dict")
-                continue
-            err = _validate_index_list(f"group '{gn}'", node.get("indices"), n=n)
-            if err:
-                errors.append(err)
 
+def check_masks(p: Dict[str, Any]) -> Issues:
+    errors: List[str] = []
+    n = _layout_count(p)
     masks = p.get("masks") or {}
     if masks and not isinstance(masks, dict):
         errors.append("masks: must be a dict of name -> mask node")
@@ -97,9 +100,7 @@ def validate_project(project: Dict[str, Any]) -> Dict[str, Any]:
         # Mask key namespace sanity:
         # Mask *definitions* must not use other namespaces like 'group:' or 'zone:'.
         # Those prefixes are for *references* (e.g. group:foo) and are resolved by the resolver.
-        groups2 = p.get('groups') or {}
-        if not isinstance(groups2, dict):
-            groups2 = {}
+        groups2 = _as_dict_section(p, 'groups')
         for mk in list(masks.keys()):
             if not isinstance(mk, str):
                 continue
@@ -109,34 +110,42 @@ def validate_project(project: Dict[str, Any]) -> Dict[str, Any]:
                     gn = mk.split(':',1)[1]
                     if gn in groups2:
                         errors.append(f"mask '{mk}': shadows group '{gn}' (remove this mask alias; groups are referenced as group:{gn})")
+    return errors, []
 
-    # Canonical target mask: project['ui']['target_mask']
-    ui = p.get("ui") or {}
-    if not isinstance(ui, dict):
-        ui = {}
+
+def check_target_mask(p: Dict[str, Any]) -> Issues:
+    """Canonical target mask: project['ui']['target_mask']."""
+    errors: List[str] = []
+    masks = _as_dict_section(p, "masks")
+    ui = _as_dict_section(p, "ui")
     tm = ui.get("target_mask")
     if tm is not None and str(tm).strip():
         tm = str(tm)
-        if not isinstance(masks, dict) or tm not in masks:
+        if tm not in masks:
             errors.append(f"ui.target_mask '{tm}' does not exist in masks")
         else:
             try:
-                resolve_mask_to_indices(p, tm, n=n)
+                resolve_mask_to_indices(p, tm, n=_layout_count(p))
             except Exception as e:
                 errors.append(f"ui.target_mask '{tm}' failed to resolve: {e}")
+    return errors, []
 
+
+def check_deprecated_target_mask(p: Dict[str, Any]) -> Issues:
     # Deprecated: top-level target_mask (should be migrated/removed by normalizer)
-    if isinstance(p, dict) and "target_mask" in p:
-        warnings.append("Deprecated: top-level target_mask present; normalizer should migrate/remove it")
+    if "target_mask" in p:
+        return [], ["Deprecated: top-level target_mask present; normalizer should migrate/remove it"]
+    return [], []
 
 
-    # Layer target refs (zone/group) sanity (warnings; normalizer coerces to 'all' if invalid)
-    layers = p.get("layers") if isinstance(p, dict) else None
+def check_layers(p: Dict[str, Any]) -> Issues:
+    """Operators schema (errors) and layer target refs (warnings; normalizer coerces to 'all')."""
+    errors: List[str] = []
+    warnings: List[str] = []
+    layers = p.get("layers")
     if isinstance(layers, list):
-        zkeys = list(zones.keys()) if isinstance(zones, dict) else []
-        gkeys = list(groups.keys()) if isinstance(groups, dict) else []
-        zlen = len(zkeys)
-        glen = len(gkeys)
+        zlen = len(_as_dict_section(p, "zones"))
+        glen = len(_as_dict_section(p, "groups"))
         for idx, L in enumerate(layers):
             if not isinstance(L, dict):
                 continue
@@ -167,7 +176,31 @@ def validate_project(project: Dict[str, Any]) -> Dict[str, Any]:
                 warnings.append(f"Layer[{idx}] target_ref out of range for group; will be normalized")
             if tk not in ("all", "zone", "group"):
                 warnings.append(f"Layer[{idx}] unknown target_kind '{tk}'; will be normalized")
+    return errors, warnings
+
 
+# (name, top-level sections read, check). validate_project() concatenates the results in
+# this order; app.validation_engine re-runs a check only when one of its sections changed.
+VALIDATION_CHECKS: Tuple[Tuple[str, Tuple[str, ...], Callable[[Dict[str, Any]], Issues]], ...] = (
+    ("zones", ("layout", "zones"), check_zones),
+    ("groups", ("layout", "groups"), check_groups),
+    ("masks", ("layout", "masks", "groups"), check_masks),
+    ("target_mask", ("layout", "masks", "ui"), check_target_mask),
+    ("deprecated_target_mask", ("target_mask",), check_deprecated_target_mask),
+    ("layers", ("layers", "zones", "groups"), check_layers),
+)
 
-    ok = (len(errors) == 0)
-    return {"ok": ok, "errors": errors, "warnings": warnings}
+
+def merge_issues(parts: List[Issues]) -> Dict[str, Any]:
+    errors: List[str] = []
+    warnings: List[str] = []
+    for errs, warns in parts:
+        errors.extend(errs)
+        warnings.extend(warns)
+    return {"ok": len(errors) == 0, "errors": errors, "warnings": warnings}
+
+
+def validate_project(project: Dict[str, Any]) -> Dict[str, Any]:
+    """Return validation snapshot: {'ok': bool, 'errors': [...], 'warnings': [...]}"""
+    p = project if isinstance(project, dict) else {}
+    return merge_issues([fn(p) for _name, _reads, fn in VALIDATION_CHECKS])
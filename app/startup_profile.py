@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+"""Startup tracer: phase spans + per-import timing from launch to the first frame.
+
+modulo_designer.main() starts the tracer (and its import hook), wraps each startup phase in a span
+(CoreBridge init, mod loading, target discovery, main window) and the preview widget
+calls first_frame() on its first render. That finishes the trace: the hook is removed
+(so runtime imports pay nothing) and the report is written to
+out/startup_profile_latest.json.
+
+Import timing follows `python -X importtime`: a builtins.__import__ wrapper records each
+import statement that actually loaded modules, with cumulative and self time (cumulative
+minus nested imports). Imports done via importlib.import_module are not seen.
+
+Reports are plain JSON dicts; diff_reports() compares two of them (e.g. the latest
+profile against one exported from a previous build) for cold-start regressions.
+"""
+
+import builtins
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+REPORT_VERSION = 1
+
+
+@dataclass
+class Span:
+    name: str
+    start_ms: float
+    dur_ms: float = -1.0  # < 0 while open
+    depth: int = 0
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    cum_ms: float
+    self_ms: float
+    depth: int
+    start_ms: float
+
+
+class StartupTracer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.spans: List[Span] = []
+        self.imports: List[ImportRecord] = []
+        self.marks: Dict[str, float] = {}
+        self.active = False
+        self.finished = False
+        self.total_ms: Optional[float] = None
+        self._open: List[Span] = []
+        self._orig_import = None
+        self._tls = threading.local()
+        self._lock = threading.Lock()
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000.0
+
+    def start(self, *, import_hook: bool = True) -> None:
+        """Begin tracing. Until then spans/marks are no-ops (tests, tools, embedded use)."""
+        if self.finished:
+            return
+        self.active = True
+        if import_hook:
+            self.install_import_hook()
+
+    # --- phase spans ---
+
+    def begin(self, name: str) -> Optional[Span]:
+        """Open a phase span (ignored unless tracing). Close with end()."""
+        if not self.active or self.finished:
+            return None
+        sp = Span(str(name), self._now_ms(), depth=len(self._open))
+        with self._lock:
+            self.spans.append(sp)
+            self._open.append(sp)
+        return sp
+
+    def end(self, sp: Optional[Span]) -> None:
+        if sp is None or sp.dur_ms >= 0:
+            return
+        sp.dur_ms = self._now_ms() - sp.start_ms
+        with self._lock:
+            if sp in self._open:
+                self._open.remove(sp)
+
+    @contextmanager
+    def span(self, name: str):
+        sp = self.begin(name)
+        try:
+            yield sp
+        finally:
+            self.end(sp)
+
+    def mark(self, name: str) -> None:
+        if self.active and not self.finished:
+            self.marks.setdefault(str(name), self._now_ms())
+
+    def first_frame(self) -> None:
+        """Called on every preview render; the first call finishes the trace."""
+        if not self.active or self.finished:
+            return
+        self.mark("first_frame")
+        self.finish()
+
+    # --- import hook ---
+
+    def install_import_hook(self) -> None:
+        if self._orig_import is not None or self.finished:
+            return
+        self._orig_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall_import_hook(self) -> None:
+        orig = self._orig_import
+        if orig is None:
+            return
+        if builtins.__import__ == self._timed_import:
+            builtins.__import__ = orig
+        self._orig_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        orig = self._orig_import or _BUILTIN_IMPORT
+        if level == 0 and not fromlist and name in sys.modules:
+            return orig(name, globals, locals, fromlist, level)
+        stack = getattr(self._tls, "stack", None)
+        if stack is None:
+            stack = self._tls.stack = []
+        n0 = len(sys.modules)
+        frame = [0.0]  # time spent in nested recorded imports
+        stack.append(frame)
+        t0 = time.perf_counter()
+        try:
+            return orig(name, globals, locals, fromlist, level)
+        finally:
+            dt = (time.perf_counter() - t0) * 1000.0
+            stack.pop()
+            if len(sys.modules) > n0:
+                full = name
+                if level and isinstance(globals, dict):
+                    pkg = globals.get("__package__") or ""
+                    base = pkg.rsplit(".", level - 1)[0] if level > 1 else pkg
+                    full = f"{base}.{name}" if name else base
+                if fromlist and len(fromlist) == 1 and f"{full}.{fromlist[0]}" in sys.modules:
+                    full = f"{full}.{fromlist[0]}"  # `from pkg import submodule`
+                rec = ImportRecord(str(full), dt, max(0.0, dt - frame[0]), len(stack),
+                                   (t0 - self.t0) * 1000.0)
+                with self._lock:
+                    self.imports.append(rec)
+                if stack:
+                    stack[-1][0] += dt
+
+    # --- report ---
+
+    def finish(self, *, write: bool = True) -> Dict[str, Any]:
+        if not self.finished:
+            self.total_ms = self._now_ms()
+            self.uninstall_import_hook()
+            for sp in list(self._open):
+                self.end(sp)
+            self.finished = True
+            if write:
+                try:
+                    export_report(self.report(), out_dir() / "startup_profile_latest.json")
+                except Exception:
+                    pass
+        return self.report()
+
+    def report(self, *, top: int = 40) -> Dict[str, Any]:
+        try:
+            from app.build_id import get_build_id
+            build = get_build_id(ROOT)
+        except Exception:
+            build = "unknown"
+        imports = sorted(self.imports, key=lambda r: -r.cum_ms)
+        return {
+            "version": REPORT_VERSION,
+            "build_id": build,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "finished": bool(self.finished),
+            "total_ms": round(self.total_ms if self.total_ms is not None else self._now_ms(), 3),
+            "marks": {k: round(v, 3) for k, v in self.marks.items()},
+            "phases": [_rounded(asdict(s)) for s in self.spans],
+            "imports_total_ms": round(sum(r.cum_ms for r in self.imports if r.depth == 0), 3),
+            "imports_count": len(self.imports),
+            "imports_top": [_rounded(asdict(r)) for r in imports[:max(0, int(top))]],
+        }
+
+
+def _rounded(d: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: (round(v, 3) if isinstance(v, float) else v) for k, v in d.items()}
+
+
+_BUILTIN_IMPORT = builtins.__import__
+
+# Process-wide tracer, created when this module is first imported (early in main()).
+STARTUP = StartupTracer()
+
+
+def out_dir() -> Path:
+    return ROOT / "out"
+
+
+def export_report(report: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    """Write a report as JSON (default: out/startup_profile_<utc timestamp>.json)."""
+    if path is None:
+        ts = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+        path = out_dir() / f"startup_profile_{ts}.json"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+    tmp.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def load_report(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        d = json.loads(Path(path).read_text(encoding="utf-8"))
+        return d if isinstance(d, dict) else None
+    except Exception:
+        return None
+
+
+def report_text(report: Dict[str, Any], *, top: int = 20) -> str:
+    lines = [
+        f"Startup profile — build {report.get('build_id', '?')}",
+        f"total: {report.get('total_ms', 0):.1f} ms" + ("" if report.get("finished") else " (still running)"),
+    ]
+    for k, v in (report.get("marks") or {}).items():
+        lines.append(f"mark {k}: {v:.1f} ms")
+    lines.append("")
+    lines.append("Phases (start / duration ms):")
+    for sp in report.get("phases") or []:
+        dur = sp.get("dur_ms", -1)
+        dtxt = f"{dur:9.1f}" if dur >= 0 else "     open"
+        lines.append(f"  {sp.get('start_ms', 0):9.1f} {dtxt}  {'  ' * int(sp.get('depth', 0))}{sp.get('name')}")
+    lines.append("")
+    lines.append(f"Imports: {report.get('imports_count', 0)} statements, "
+                 f"{report.get('imports_total_ms', 0):.1f} ms at top level")
+    lines.append("    cum ms   self ms  module")
+    for r in (report.get("imports_top") or [])[:top]:
+        lines.append(f"  {r.get('cum_ms', 0):8.1f}  {r.get('self_ms', 0):8.1f}  {'  ' * int(r.get('depth', 0))}{r.get('name')}")
+    return "\n".join(lines)
+
+
+def diff_reports(old: Dict[str, Any], new: Dict[str, Any], *, threshold_ms: float = 5.0) -> List[str]:
+    """Lines describing total/phase/import changes larger than threshold_ms (new - old)."""
+    out: List[str] = []
+    thr = float(threshold_ms)
+
+    def _cmp(label, a, b):
+        if a is None or b is None:
+            return
+        d = float(b) - float(a)
+        if abs(d) >= thr:
+            out.append(f"{label}: {a:.1f} -> {b:.1f} ms ({d:+.1f})")
+
+    _cmp("total", old.get("total_ms"), new.get("total_ms"))
+    _cmp("imports", old.get("imports_total_ms"), new.get("imports_total_ms"))
+
+    def _phase_map(rep):
+        m: Dict[str, float] = {}
+        for sp in rep.get("phases") or []:
+            if sp.get("dur_ms", -1) >= 0:
+                m[sp["name"]] = m.get(sp["name"], 0.0) + float(sp["dur_ms"])
+        return m
+
+    po, pn = _phase_map(old), _phase_map(new)
+    for name in list(pn) + [k for k in po if k not in pn]:
+        _cmp(f"phase {name}", po.get(name), pn.get(name))
+    io = {r["name"]: r["cum_ms"] for r in old.get("imports_top") or [] if r.get("depth") == 0}
+    inn = {r["name"]: r["cum_ms"] for r in new.get("imports_top") or [] if r.get("depth") == 0}
+    for name in inn:
+        _cmp(f"import {name}", io.get(name, 0.0), inn[name])
+    return out
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+"""Incremental project validation keyed by section revisions.
+
+The UI used to re-run validate_project() / diagnose_project() on every project set
+and poll the result from timers. Each check in app.project_validation declares the
+top-level project sections it reads (VALIDATION_CHECKS); the engine fingerprints
+every top-level section, bumps a per-section revision when its content changes, and
+re-runs only the checks whose read sections moved. The merged snapshot is identical
+to validate_project() (same errors/warnings, same order).
+
+Content fingerprints (marshal format 2 + sha256), not object identity: the Qt code
+often mutates a section in place and assigns the same dict back, so identity would
+miss edits. Values marshal cannot encode fall back to a sorted JSON dump.
+
+Listeners registered with subscribe() are called with the snapshot only when its
+content changes, so panels no longer need polling timers. After a hard failure
+(set_failed) the next clean update() publishes again even if it matches the last
+check results.
+
+cached() memoizes heavier read-only passes (diagnostics, era gates, export parity)
+under the same revisions.
+"""
+
+import hashlib
+import json
+import marshal
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.project_validation import VALIDATION_CHECKS, Issues, merge_issues
+
+# Pseudo-section read by checks that look at every section (e.g. export parity).
+ALL_SECTIONS = "*"
+
+_ABSENT = "<absent>"
+
+
+def section_fingerprint(value: Any) -> str:
+    try:
+        blob = marshal.dumps(value, 2)
+    except Exception:
+        try:
+            blob = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+        except Exception:
+            blob = repr(value).encode("utf-8", "replace")
+    return hashlib.sha256(blob).hexdigest()
+
+
+@dataclass
+class SectionRevisions:
+    """Per-section revision counters driven by content fingerprints."""
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    revisions: Dict[str, int] = field(default_factory=dict)
+    generation: int = 0  # bumped whenever any section changes
+
+    def update(self, project: Dict[str, Any], fingerprints: Optional[Dict[str, str]] = None) -> List[str]:
+        """Fingerprint `project`; return the sections whose content changed.
+
+        `fingerprints` may carry section_fingerprint()s the caller already computed for `project`."""
+        p = project if isinstance(project, dict) else {}
+        known = fingerprints or {}
+        changed: List[str] = []
+        seen = set()
+        for k, v in p.items():
+            key = str(k)
+            seen.add(key)
+            fp = known.get(key) or section_fingerprint(v)
+            if self.fingerprints.get(key) != fp:
+                self.fingerprints[key] = fp
+                self.revisions[key] = self.revisions.get(key, 0) + 1
+                changed.append(key)
+        for key in [k for k in self.fingerprints if k not in seen]:
+            if self.fingerprints[key] != _ABSENT:
+                self.fingerprints[key] = _ABSENT
+                self.revisions[key] = self.revisions.get(key, 0) + 1
+                changed.append(key)
+        if changed:
+            self.generation += 1
+        return changed
+
+    def key(self, reads: Tuple[str, ...]) -> Tuple[int, ...]:
+        if ALL_SECTIONS in reads:
+            return (self.generation,)
+        return tuple(self.revisions.get(s, 0) for s in reads)
+
+
+@dataclass
+class Check:
+    name: str
+    reads: Tuple[str, ...]
+    fn: Callable[[Dict[str, Any]], Issues]
+
+
+def default_checks() -> List[Check]:
+    return [Check(name, tuple(reads), fn) for name, reads, fn in VALIDATION_CHECKS]
+
+
+class ValidationEngine:
+    def __init__(self, checks: Optional[List[Check]] = None, *, max_cached: int = 32):
+        self.checks: List[Check] = list(checks) if checks is not None else default_checks()
+        self.sections = SectionRevisions()
+        self.max_cached = int(max_cached)
+        self._results: Dict[str, Tuple[Tuple[int, ...], Issues]] = {}
+        self._memo: Dict[Hashable, Tuple[Tuple[int, ...], Any]] = {}
+        self._snapshot: Dict[str, Any] = {"ok": True, "errors": [], "warnings": []}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._pending = False
+        self.stats: Dict[str, int] = {"updates": 0, "checks_run": 0, "checks_reused": 0,
+                                      "memo_hits": 0, "memo_misses": 0, "events": 0}
+
+    @property
+    def snapshot(self) -> Dict[str, Any]:
+        return self._snapshot
+
+    def update(self, project: Dict[str, Any], *, refresh: bool = True, notify: bool = True) -> Dict[str, Any]:
+        """Validate `project`, re-running only checks whose sections changed.
+
+        notify=False holds a change event back until publish() (e.g. until the caller
+        has stored the project listeners will read).
+        """
+        p = project if isinstance(project, dict) else {}
+        self.stats["updates"] += 1
+        if refresh:
+            self.sections.update(p)
+        parts: List[Issues] = []
+        for c in self.checks:
+            key = self.sections.key(c.reads)
+            hit = self._results.get(c.name)
+            if hit is not None and hit[0] == key:
+                self.stats["checks_reused"] += 1
+                parts.append(hit[1])
+                continue
+            try:
+                res = c.fn(p)
+            except Exception as e:
+                res = ([f"{c.name}: check failed: {e}"], [])
+            self.stats["checks_run"] += 1
+            self._results[c.name] = (key, res)
+            parts.append(res)
+        snap = merge_issues(parts)
+        if snap != self._snapshot:
+            self._snapshot = snap
+            self._pending = True
+        if notify:
+            self.publish()
+        return snap
+
+    def publish(self) -> None:
+        """Deliver a held-back change event, if any."""
+        if self._pending:
+            self._pending = False
+            self._emit(self._snapshot)
+
+    def set_failed(self, errors: List[str]) -> Dict[str, Any]:
+        """Publish a hard failure (e.g. an era violation) that bypassed the checks."""
+        snap = {"ok": False, "errors": [str(e) for e in errors], "warnings": []}
+        if snap != self._snapshot:
+            self._snapshot = snap
+            self._pending = True
+        self.publish()
+        return snap
+
+    def cached(self, name: Hashable, reads: Tuple[str, ...], project: Dict[str, Any],
+               fn: Callable[[Dict[str, Any]], Any], *, refresh: bool = True) -> Any:
+        """Return fn(project), reused while the sections in `reads` are unchanged.
+
+        refresh=False skips re-fingerprinting when the caller knows update() already
+        saw this exact project (e.g. right after the setter ran).
+        """
+        if refresh:
+            self.sections.update(project)
+        key = self.sections.key(tuple(reads))
+        hit = self._memo.get(name)
+        if hit is not None and hit[0] == key:
+            self.stats["memo_hits"] += 1
+            return hit[1]
+        self.stats["memo_misses"] += 1
+        val = fn(project)
+        if name not in self._memo and len(self._memo) >= self.max_cached:
+            self._memo.pop(next(iter(self._memo)))
+        self._memo[name] = (key, val)
+        return val
+
+    def era_errors(self, project: Dict[str, Any], *, refresh: bool = True) -> List[str]:
+        """validate_project_against_era(project), cached on the sections it reads."""
+        from app.eras.era_enforce import ERA_READS, validate_project_against_era
+        return list(self.cached("era", ERA_READS, project, validate_project_against_era, refresh=refresh) or [])
+
+    def diagnose(self, project: Dict[str, Any]) -> Dict[str, List[str]]:
+        """diagnose_project(project), reusing the validation snapshot and cached per revision."""
+        from app.project_diagnostics import DIAGNOSTICS_READS, diagnose_project
+        snap = self.update(project)
+        return self.cached("diagnostics", DIAGNOSTICS_READS, project,
+                           lambda p: diagnose_project(p, validation=snap), refresh=False)
+
+    def subscribe(self, fn: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """Call fn(snapshot) whenever the validation snapshot changes. Returns an unsubscribe."""
+        if fn not in self._listeners:
+            self._listeners.append(fn)
+
+        def _unsubscribe() -> None:
+            self.unsubscribe(fn)
+        return _unsubscribe
+
+    def unsubscribe(self, fn: Callable[[Dict[str, Any]], None]) -> None:
+        try:
+            self._listeners.remove(fn)
+        except ValueError:
+            pass
+
+    def _emit(self, snap: Dict[str, Any]) -> None:
+        self.stats["events"] += 1
+        for fn in list(self._listeners):
+            try:
+                fn(snap)
+            except Exception:
+                pass
@@ -0,0 +1,623 @@
+from __future__ import annotations
+
+"""Offline audio feature extraction from WAV files.
+
+Decodes a WAV with the stdlib ``wave`` module, runs a short-time FFT and reduces
+each analysis frame to MSGEQ7-compatible features:
+
+  - 7-band envelopes for mono, left and right (63/160/400/1k/2.5k/6.25k/16k Hz)
+  - energy (mean of the mono bands, same definition as AudioInput)
+  - kick / snare / beat onset pulses (spectral flux peak picking)
+  - a global BPM estimate (+ confidence) from the onset envelope
+
+The result is a compact binary *feature track* cached under ``out/audio_features``
+and keyed by the WAV content hash, so rendering a long show only reads the cache
+and never re-runs the FFT.
+
+numpy is optional: when available the PCM is decoded with one frombuffer view and
+the STFT is vectorized over blocks of frames (bounded memory on long files),
+otherwise a pure-Python radix-2 FFT is used (slower, same features).
+
+Feature track format (little-endian):
+  header  <4sHHfIIff   magic b"MLAF", version, n_cols, frame_rate, n_frames,
+                       sample_rate, bpm, bpm_conf
+  names   <H + ascii   comma-separated column names
+  data    uint8        n_frames * n_cols, row-major (value / 255 -> 0..1)
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import cmath
+import hashlib
+import math
+import os
+import struct
+import wave
+
+try:  # optional acceleration
+    import numpy as _np  # type: ignore
+except Exception:  # pragma: no cover - depends on environment
+    _np = None
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = ROOT / "out" / "audio_features"
+
+# Bump when the analysis changes so stale cache entries are ignored.
+ANALYZER_VERSION = 1
+
+MAGIC = b"MLAF"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHfIIff")
+_NAMES_LEN = struct.Struct("<H")
+
+# MSGEQ7 band centre frequencies (Hz).
+MSGEQ7_CENTERS_HZ = (63.0, 160.0, 400.0, 1000.0, 2500.0, 6250.0, 16000.0)
+
+DEFAULT_FRAME_RATE = 100.0   # feature frames per second
+DYN_RANGE_DB = 60.0          # level 0..1 spans the top 60 dB of the track
+RELEASE_S = 0.12             # envelope release time constant (MSGEQ7-like peak hold)
+ONSET_MIN_GAP_S = 0.10       # minimum spacing between onsets of the same kind
+BPM_RANGE = (60.0, 200.0)
+BPM_WINDOW_S = 120.0         # onset envelope window used for the BPM estimate
+
+COLUMNS: Tuple[str, ...] = (
+    ("energy",)
+    + tuple(f"mono{i}" for i in range(7))
+    + tuple(f"l{i}" for i in range(7))
+    + tuple(f"r{i}" for i in range(7))
+    + ("kick", "snare", "beat")
+)
+EVENT_COLUMNS = ("kick", "snare", "beat")
+
+
+class FeatureTrackError(ValueError):
+    """Raised for unreadable WAV input or malformed feature track files."""
+
+
+@dataclass
+class WavData:
+    sample_rate: int
+    left: Sequence[float]  # float64 arrays when numpy is available, lists otherwise
+    right: Sequence[float]
+    stereo: bool
+
+    @property
+    def duration(self) -> float:
+        return len(self.left) / float(self.sample_rate) if self.sample_rate > 0 else 0.0
+
+
+@dataclass
+class FeatureTrack:
+    """Quantized per-frame audio features (0..1) at a fixed frame rate."""
+
+    frame_rate: float
+    n_frames: int
+    sample_rate: int
+    bpm: float
+    bpm_conf: float
+    columns: Tuple[str, ...]
+    data: bytes
+    _col_index: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._col_index = {c: i for i, c in enumerate(self.columns)}
+        if len(self.data) != self.n_frames * len(self.columns):
+            raise FeatureTrackError("feature data size does not match header")
+
+    @property
+    def duration(self) -> float:
+        return self.n_frames / float(self.frame_rate) if self.frame_rate > 0 else 0.0
+
+    def value(self, frame: int, column: str) -> float:
+        ci = self._col_index.get(column)
+        if ci is None or frame < 0 or frame >= self.n_frames:
+            return 0.0
+        return self.data[frame * len(self.columns) + ci] / 255.0
+
+    def column(self, column: str) -> List[float]:
+        ci = self._col_index.get(column)
+        if ci is None:
+            return []
+        stride = len(self.columns)
+        return [b / 255.0 for b in self.data[ci::stride]]
+
+    def to_bytes(self) -> bytes:
+        names = ",".join(self.columns).encode("ascii")
+        head = _HEADER.pack(MAGIC, FORMAT_VERSION, len(self.columns), float(self.frame_rate),
+                            int(self.n_frames), int(self.sample_rate), float(self.bpm), float(self.bpm_conf))
+        return head + _NAMES_LEN.pack(len(names)) + names + bytes(self.data)
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "FeatureTrack":
+        if len(raw) < _HEADER.size + _NAMES_LEN.size:
+            raise FeatureTrackError("feature track too short")
+        magic, ver, n_cols, fr, n_frames, sr, bpm, conf = _HEADER.unpack_from(raw, 0)
+        if magic != MAGIC:
+            raise FeatureTrackError("not a feature track (bad magic)")
+        if ver != FORMAT_VERSION:
+            raise FeatureTrackError(f"unsupported feature track version {ver}")
+        off = _HEADER.size
+        (nlen,) = _NAMES_LEN.unpack_from(raw, off)
+        off += _NAMES_LEN.size
+        cols = tuple(raw[off:off + nlen].decode("ascii").split(","))
+        off += nlen
+        if len(cols) != n_cols:
+            raise FeatureTrackError("column count mismatch")
+        return cls(frame_rate=float(fr), n_frames=int(n_frames), sample_rate=int(sr), bpm=float(bpm),
+                   bpm_conf=float(conf), columns=cols, data=bytes(raw[off:]))
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(self.to_bytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "FeatureTrack":
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+# ---------------------------------------------------------------------------
+# WAV decoding
+# ---------------------------------------------------------------------------
+
+def decode_wav(path: Path) -> WavData:
+    """Decode a PCM WAV into float channels in -1..1 (first two channels only)."""
+    try:
+        with wave.open(str(path), "rb") as wf:
+            n_ch = int(wf.getnchannels())
+            width = int(wf.getsampwidth())
+            sr = int(wf.getframerate())
+            raw = wf.readframes(wf.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise FeatureTrackError(f"unsupported WAV: {e}") from e
+    if n_ch < 1 or sr <= 0:
+        raise FeatureTrackError("WAV has no channels or sample rate")
+
+    if _np is not None:
+        frames = _pcm_to_array(raw, width, n_ch)
+        left = frames[:, 0]
+        right = frames[:, 1] if n_ch >= 2 else left
+        return WavData(sample_rate=sr, left=left, right=right, stereo=n_ch >= 2)
+    samples = _pcm_to_floats(raw, width)
+    left = samples[0::n_ch]
+    right = samples[1::n_ch] if n_ch >= 2 else left
+    n = min(len(left), len(right))
+    return WavData(sample_rate=sr, left=list(left[:n]), right=list(right[:n]), stereo=n_ch >= 2)
+
+
+_PCM_DTYPES = {1: ("u1", 128.0, 1.0 / 128.0), 2: ("<i2", 0.0, 1.0 / 32768.0), 4: ("<i4", 0.0, 1.0 / 2147483648.0)}
+
+
+def _pcm_to_array(raw: bytes, width: int, n_ch: int):
+    """PCM bytes -> float64 array of shape (frames, n_ch) in -1..1 (numpy only)."""
+    np = _np
+    n = len(raw) // (width * n_ch)
+    if width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8, count=n * n_ch * 3).reshape(-1, 3).astype(np.int32)
+        v = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        v = np.where(v & 0x800000, v - 0x1000000, v)
+        return (v * (1.0 / 8388608.0)).reshape(-1, n_ch)
+    spec = _PCM_DTYPES.get(width)
+    if spec is None:
+        raise FeatureTrackError(f"unsupported sample width: {width} bytes")
+    dtype, offset, scale = spec
+    v = np.frombuffer(raw, dtype=dtype, count=n * n_ch).reshape(-1, n_ch)
+    return (v.astype(np.float64) - offset) * scale if offset else v * scale
+
+
+def _pcm_to_floats(raw: bytes, width: int) -> List[float]:
+    if width == 1:
+        return [(b - 128) / 128.0 for b in raw]
+    if width == 2:
+        scale = 1.0 / 32768.0
+        n = len(raw) // 2
+        return [v * scale for v in struct.unpack(f"<{n}h", raw[:n * 2])]
+    if width == 3:
+        scale = 1.0 / 8388608.0
+        out = []
+        for i in range(0, len(raw) - 2, 3):
+            v = raw[i] | (raw[i + 1] << 8) | (raw[i + 2] << 16)
+            if v & 0x800000:
+                v -= 0x1000000
+            out.append(v * scale)
+        return out
+    if width == 4:
+        scale = 1.0 / 2147483648.0
+        n = len(raw) // 4
+        return [v * scale for v in struct.unpack(f"<{n}i", raw[:n * 4])]
+    raise FeatureTrackError(f"unsupported sample width: {width} bytes")
+
+
+# ---------------------------------------------------------------------------
+# Spectral analysis
+# ---------------------------------------------------------------------------
+
+def _fft_size_for_hop(hop: int) -> int:
+    n = 256
+    while n < 2 * hop:
+        n *= 2
+    return n
+
+
+def _band_bins(n_fft: int, sample_rate: int) -> List[List[int]]:
+    """FFT bin indices for each MSGEQ7 band (never empty)."""
+    nyq = sample_rate / 2.0
+    c = MSGEQ7_CENTERS_HZ
+    edges = [20.0] + [math.sqrt(c[i - 1] * c[i]) for i in range(1, 7)] + [max(nyq, c[-1])]
+    bin_hz = sample_rate / float(n_fft)
+    n_bins = n_fft // 2 + 1
+    bands: List[List[int]] = []
+    for b in range(7):
+        lo, hi = edges[b], edges[b + 1]
+        idx = [k for k in range(1, n_bins) if lo <= k * bin_hz < hi]
+        if not idx:
+            idx = [min(n_bins - 1, max(1, int(round(min(c[b], nyq) / bin_hz))))]
+        bands.append(idx)
+    return bands
+
+
+def _fft_radix2(x: List[complex]) -> List[complex]:
+    n = len(x)
+    a = list(x)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            a[i], a[j] = a[j], a[i]
+    size = 2
+    while size <= n:
+        half = size // 2
+        w_step = cmath.exp(-2j * math.pi / size)
+        for start in range(0, n, size):
+            w = 1.0 + 0j
+            for k in range(start, start + half):
+                u = a[k]
+                v = a[k + half] * w
+                a[k] = u + v
+                a[k + half] = u - v
+                w *= w_step
+        size *= 2
+    return a
+
+
+def _band_powers_python(left: Sequence[float], right: Sequence[float], stereo: bool, *, hop: int,
+                        n_fft: int, bands: List[List[int]]) -> Tuple[List[List[float]], ...]:
+    half = n_fft // 2
+    win = [0.5 - 0.5 * math.cos(2.0 * math.pi * i / n_fft) for i in range(n_fft)]
+    n = len(left)
+    n_frames = max(1, -(-n // hop))
+    out_l: List[List[float]] = []
+    out_r: List[List[float]] = []
+    out_m: List[List[float]] = []
+    n_bins = half + 1
+
+    def frame(src: Sequence[float], start: int) -> List[complex]:
+        buf = []
+        for i in range(n_fft):
+            k = start + i
+            buf.append(complex(src[k] * win[i]) if 0 <= k < n else 0j)
+        return _fft_radix2(buf)[:n_bins]
+
+    def reduce(spec: List[complex]) -> List[float]:
+        return [sum(abs(spec[k]) ** 2 for k in idx) / len(idx) for idx in bands]
+
+    for fi in range(n_frames):
+        start = fi * hop - half
+        sl = frame(left, start)
+        if stereo:
+            sr_ = frame(right, start)
+            sm = [(a + b) * 0.5 for a, b in zip(sl, sr_)]
+            out_l.append(reduce(sl))
+            out_r.append(reduce(sr_))
+            out_m.append(reduce(sm))
+        else:
+            p = reduce(sl)
+            out_l.append(p)
+            out_r.append(p)
+            out_m.append(p)
+    return out_l, out_r, out_m
+
+
+_STFT_BLOCK_FRAMES = 1024
+
+
+def _band_powers_numpy(left: Sequence[float], right: Sequence[float], stereo: bool, *, hop: int,
+                       n_fft: int, bands: List[List[int]]) -> Tuple[List[List[float]], ...]:
+    np = _np
+    half = n_fft // 2
+    n = len(left)
+    n_frames = max(1, -(-n // hop))
+    win = 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n_fft) / n_fft)
+    n_bins = half + 1
+    weights = np.zeros((n_bins, 7), dtype=np.float64)
+    for b, idx in enumerate(bands):
+        weights[idx, b] = 1.0 / len(idx)
+
+    pad_l = np.zeros(n_frames * hop + n_fft, dtype=np.float64)
+    pad_l[half:half + n] = np.asarray(left, dtype=np.float64)
+    if stereo:
+        pad_r = np.zeros_like(pad_l)
+        pad_r[half:half + n] = np.asarray(right, dtype=np.float64)
+    pl = np.empty((n_frames, 7), dtype=np.float64)
+    pr = np.empty_like(pl) if stereo else pl
+    pm = np.empty_like(pl) if stereo else pl
+
+    # Windowed frames and spectra exist for one block at a time, not for the whole file.
+    for f0 in range(0, n_frames, _STFT_BLOCK_FRAMES):
+        f1 = min(n_frames, f0 + _STFT_BLOCK_FRAMES)
+        seg = slice(f0 * hop, (f1 - 1) * hop + n_fft)
+        spec_l = np.fft.rfft(np.lib.stride_tricks.sliding_window_view(pad_l[seg], n_fft)[::hop] * win, axis=1)
+        pl[f0:f1] = (np.abs(spec_l) ** 2) @ weights
+        if stereo:
+            spec_r = np.fft.rfft(np.lib.stride_tricks.sliding_window_view(pad_r[seg], n_fft)[::hop] * win, axis=1)
+            pr[f0:f1] = (np.abs(spec_r) ** 2) @ weights
+            pm[f0:f1] = (np.abs((spec_l + spec_r) * 0.5) ** 2) @ weights
+    return pl.tolist(), pr.tolist(), pm.tolist()
+
+
+def _levels_from_powers(powers: List[List[float]], ref_db: float) -> List[List[float]]:
+    floor = ref_db - DYN_RANGE_DB
+    out = []
+    for row in powers:
+        out.append([_clamp01((10.0 * math.log10(p + 1e-12) - floor) / DYN_RANGE_DB) for p in row])
+    return out
+
+
+def _envelope(levels: List[List[float]], frame_rate: float) -> List[List[float]]:
+    rel = math.exp(-1.0 / max(1e-6, frame_rate * RELEASE_S))
+    prev = [0.0] * 7
+    out = []
+    for row in levels:
+        prev = [max(v, p * rel) for v, p in zip(row, prev)]
+        out.append(prev)
+    return out
+
+
+def _flux(levels: List[List[float]], bands: Sequence[int]) -> List[float]:
+    out = [0.0] * len(levels)
+    for t in range(1, len(levels)):
+        cur, prv = levels[t], levels[t - 1]
+        out[t] = sum(max(0.0, cur[b] - prv[b]) for b in bands)
+    return out
+
+
+def _pick_onsets(flux: List[float], frame_rate: float) -> List[int]:
+    """Adaptive-threshold peak picking (local mean + margin, min spacing)."""
+    n = len(flux)
+    if n < 3:
+        return []
+    w = max(1, int(round(frame_rate * 0.25)))
+    gap = max(1, int(round(frame_rate * ONSET_MIN_GAP_S)))
+    peak = max(flux)
+    if peak <= 1e-6:
+        return []
+    abs_thr = 0.1 * peak
+    # running window sum for the local mean
+    pre = [0.0]
+    for v in flux:
+        pre.append(pre[-1] + v)
+    out: List[int] = []
+    last = -gap
+    for t in range(1, n - 1):
+        v = flux[t]
+        if v < abs_thr or v < flux[t - 1] or v < flux[t + 1]:
+            continue
+        lo, hi = max(0, t - w), min(n, t + w + 1)
+        local = (pre[hi] - pre[lo]) / float(hi - lo)
+        if v < local * 1.5 + 0.02:
+            continue
+        if t - last < gap:
+            continue
+        out.append(t)
+        last = t
+    return out
+
+
+def estimate_bpm(flux: Sequence[float], frame_rate: float) -> Tuple[float, float]:
+    """Autocorrelation tempo estimate over the onset envelope -> (bpm, confidence 0..1)."""
+    n_win = int(BPM_WINDOW_S * frame_rate)
+    if len(flux) > n_win:
+        mid = len(flux) // 2
+        flux = flux[max(0, mid - n_win // 2):max(0, mid - n_win // 2) + n_win]
+    n = len(flux)
+    lag_lo = max(1, int(math.floor(60.0 * frame_rate / BPM_RANGE[1])))
+    lag_hi = int(math.ceil(60.0 * frame_rate / BPM_RANGE[0]))
+    if n <= lag_hi + 1:
+        return 120.0, 0.0
+    mean = sum(flux) / n
+    x = [v - mean for v in flux]
+    if _np is not None:
+        xa = _np.asarray(x, dtype=_np.float64)
+        ac0 = float(xa @ xa)
+        acs = [float(xa[:n - lag] @ xa[lag:]) for lag in range(lag_lo - 1, lag_hi + 2)]
+    else:
+        ac0 = sum(v * v for v in x)
+        acs = [sum(x[i] * x[i + lag] for i in range(n - lag)) for lag in range(lag_lo - 1, lag_hi + 2)]
+    if ac0 <= 1e-12:
+        return 120.0, 0.0
+    # acs[j] corresponds to lag (lag_lo - 1 + j); search lag_lo..lag_hi
+    best_j = max(range(1, len(acs) - 1), key=lambda j: acs[j])
+    y0, y1, y2 = acs[best_j - 1], acs[best_j], acs[best_j + 1]
+    denom = y0 - 2.0 * y1 + y2
+    shift = 0.5 * (y0 - y2) / denom if abs(denom) > 1e-12 else 0.0
+    lag = (lag_lo - 1 + best_j) + max(-0.5, min(0.5, shift))
+    bpm = 60.0 * frame_rate / lag
+    return float(bpm), _clamp01(y1 / ac0)
+
+
+def analyze_wav(path: Path, *, frame_rate: float = DEFAULT_FRAME_RATE) -> FeatureTrack:
+    """Decode + analyze a WAV into a FeatureTrack (no caching)."""
+    wav = decode_wav(Path(path))
+    fr = float(frame_rate)
+    hop = max(1, int(round(wav.sample_rate / fr)))
+    fr = wav.sample_rate / float(hop)
+    n_fft = _fft_size_for_hop(hop)
+    bands = _band_bins(n_fft, wav.sample_rate)
+    fn = _band_powers_numpy if _np is not None else _band_powers_python
+    pl, pr, pm = fn(wav.left, wav.right, wav.stereo, hop=hop, n_fft=n_fft, bands=bands)
+
+    # One reference for all channels keeps the stereo balance intact.
+    peak = max((max(row) for row in pl + pr + pm), default=0.0)
+    ref_db = 10.0 * math.log10(peak + 1e-12)
+    lv_l = _levels_from_powers(pl, ref_db)
+    lv_r = _levels_from_powers(pr, ref_db)
+    lv_m = _levels_from_powers(pm, ref_db)
+    env_l = _envelope(lv_l, fr)
+    env_r = _envelope(lv_r, fr)
+    env_m = _envelope(lv_m, fr)
+
+    flux_all = _flux(lv_m, range(7))
+    onsets = {
+        "kick": _pick_onsets(_flux(lv_m, (0, 1)), fr),
+        "snare": _pick_onsets(_flux(lv_m, (3, 4, 5)), fr),
+        "beat": _pick_onsets(flux_all, fr),
+    }
+    bpm, conf = estimate_bpm(flux_all, fr)
+
+    n_frames = len(env_m)
+    n_cols = len(COLUMNS)
+    data = bytearray(n_frames * n_cols)
+    for t in range(n_frames):
+        row = env_m[t]
+        base = t * n_cols
+        data[base] = _q8(sum(row) / 7.0)
+        for i in range(7):
+            data[base + 1 + i] = _q8(row[i])
+            data[base + 8 + i] = _q8(env_l[t][i])
+            data[base + 15 + i] = _q8(env_r[t][i])
+    for ev, frames in onsets.items():
+        ci = COLUMNS.index(ev)
+        for t in frames:
+            data[t * n_cols + ci] = 255
+    return FeatureTrack(frame_rate=fr, n_frames=n_frames, sample_rate=wav.sample_rate, bpm=bpm,
+                        bpm_conf=conf, columns=COLUMNS, data=bytes(data))
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def wav_cache_key(path: Path, *, frame_rate: float = DEFAULT_FRAME_RATE) -> str:
+    """Content hash of the WAV + analyzer settings."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    h.update(f"|v{ANALYZER_VERSION}|fr{float(frame_rate):.3f}".encode("ascii"))
+    return h.hexdigest()
+
+
+def feature_track_for_wav(path: Path, *, frame_rate: float = DEFAULT_FRAME_RATE,
+                          cache_dir: Optional[Path] = None) -> FeatureTrack:
+    """Return the cached FeatureTrack for a WAV, analyzing it on first use."""
+    key = wav_cache_key(Path(path), frame_rate=frame_rate)
+    cdir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    cpath = cdir / f"{key[:40]}.mlaf"
+    if cpath.exists():
+        try:
+            return FeatureTrack.load(cpath)
+        except FeatureTrackError:
+            pass  # corrupt/old entry: re-analyze below
+    track = analyze_wav(Path(path), frame_rate=frame_rate)
+    try:
+        track.save(cpath)
+    except OSError:
+        pass
+    return track
+
+
+# ---------------------------------------------------------------------------
+# AudioService backend
+# ---------------------------------------------------------------------------
+
+class WavFeatureBackend:
+    """AudioService backend that plays a cached FeatureTrack in simulation time.
+
+    Exposes the same canonical keys as AudioSim (energy, mono0..6, l0..6, r0..6,
+    mono/L/R lists) plus kick/snare/beat pulses and bpm/bpm_conf. Band levels are
+    linearly interpolated; event pulses report the max over the frames elapsed
+    since the previous step so fast onsets are never skipped at low render fps.
+    """
+
+    def __init__(self, track: FeatureTrack, *, source: str = "", loop: bool = False):
+        self.mode = "wav"
+        self.backend = "WavFeatureBackend"
+        self.status = "OK"
+        self.last_error = ""
+        self.track = track
+        self.source = str(source)
+        self.loop = bool(loop)
+        self._last_t: Optional[float] = None
+        self._last_pos: float = -1.0
+        self.state: Dict[str, object] = {}
+        self.step(0.0)
+
+    @classmethod
+    def from_wav(cls, path: Path, *, loop: bool = False, cache_dir: Optional[Path] = None) -> "WavFeatureBackend":
+        track = feature_track_for_wav(Path(path), cache_dir=cache_dir)
+        return cls(track, source=str(path), loop=loop)
+
+    @property
+    def duration(self) -> float:
+        return self.track.duration
+
+    def available_sources(self):
+        return sorted(k for k, v in self.state.items() if isinstance(v, float))
+
+    def step(self, t: float) -> None:
+        tr = self.track
+        tt = float(t)
+        pos = tt * tr.frame_rate
+        if self.loop and tr.n_frames > 0:
+            pos = pos % tr.n_frames
+        # Scrubbing backwards (or first step) resets the event window.
+        prev = self._last_pos if (self._last_pos >= 0.0 and self._last_pos <= pos) else pos - 1.0
+        self._last_t = tt
+        self._last_pos = pos
+
+        i0 = int(math.floor(pos))
+        frac = pos - i0
+        stride = len(tr.columns)
+        data = tr.data
+        st: Dict[str, object] = {}
+        if 0 <= i0 < tr.n_frames:
+            i1 = min(i0 + 1, tr.n_frames - 1)
+            a = i0 * stride
+            b = i1 * stride
+            for ci, name in enumerate(tr.columns):
+                if name in EVENT_COLUMNS:
+                    continue
+                st[name] = ((1.0 - frac) * data[a + ci] + frac * data[b + ci]) / 255.0
+            # Cap the window at ~1 s so a large forward scrub stays O(1).
+            lo = max(0, int(math.floor(prev)) + 1, i0 - int(tr.frame_rate))
+            for name in EVENT_COLUMNS:
+                ci = tr.columns.index(name)
+                st[name] = max((data[k * stride + ci] for k in range(lo, i0 + 1)), default=0) / 255.0
+            self.status = "OK"
+        else:
+            for name in tr.columns:
+                st[name] = 0.0
+            self.status = "ENDED" if i0 >= tr.n_frames else "OK"
+        st["bpm"] = float(tr.bpm)
+        st["bpm_conf"] = float(tr.bpm_conf)
+        st["mono"] = [float(st.get(f"mono{i}", 0.0)) for i in range(7)]
+        st["L"] = [float(st.get(f"l{i}", 0.0)) for i in range(7)]
+        st["R"] = [float(st.get(f"r{i}", 0.0)) for i in range(7)]
+        self.state = st
+
+
+def _q8(x: float) -> int:
+    return int(round(_clamp01(x) * 255.0))
+
+
+def _clamp01(x: float) -> float:
+    if x < 0.0: return 0.0
+    if x > 1.0: return 1.0
+    return x
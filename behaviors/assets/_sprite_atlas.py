@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+"""Pre-rasterized sprites/tiles and a row blitter shared by the tile/game behaviors.
+
+Assets (8-row bitmask tiles, row-major RGB assets, compiled tile strips) are rasterized
+once into per-row RGB lists plus a transparency mask stored as opaque runs. Blits are
+then bulk slice copies per run instead of per-pixel work:
+
+  - blit(): clipped sprite blit skipping transparent pixels
+  - blit_tiled(): horizontally repeating blit with a scroll offset (ground bands,
+    scrolling tile strips), i.e. pixel x samples column (x + offset) % w
+  - fill() / fill_span() / plot(): the trivial cases the grid games need
+
+compile_cached() memoizes compiled atlases keyed on the params that feed them, so
+user assets stored in layer params are parsed once per change, not once per frame.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import json
+import threading
+
+RGB = Tuple[int, int, int]
+Run = Tuple[int, int]
+
+
+class Sprite:
+    """Immutable w x h raster. rows[y][x] is an RGB or None (transparent)."""
+
+    __slots__ = ("w", "h", "rows", "runs", "_tiled")
+
+    def __init__(self, w: int, h: int, rows: Sequence[Sequence[Optional[RGB]]]):
+        self.w = int(w)
+        self.h = int(h)
+        self.rows: List[List[Optional[RGB]]] = [list(r) for r in rows]
+        self.runs: List[List[Run]] = [_opaque_runs(r) for r in self.rows]
+        # span -> (extended rows, extended runs) for blit_tiled()
+        self._tiled: Dict[int, Tuple[List[List[Optional[RGB]]], List[List[Run]]]] = {}
+
+    def tiled_rows(self, span: int):
+        """Rows repeated enough that [off:off+span] is valid for any off in [0, w)."""
+        got = self._tiled.get(span)
+        if got is None:
+            reps = 1 + (max(0, span - 1) + self.w - 1) // max(1, self.w) + 1
+            rows = [r * reps for r in self.rows]
+            got = (rows, [_opaque_runs(r) for r in rows])
+            self._tiled[span] = got
+        return got
+
+
+def _opaque_runs(row: Sequence[Optional[RGB]]) -> List[Run]:
+    runs: List[Run] = []
+    start = -1
+    for x, c in enumerate(row):
+        if c is None:
+            if start >= 0:
+                runs.append((start, x))
+                start = -1
+        elif start < 0:
+            start = x
+    if start >= 0:
+        runs.append((start, len(row)))
+    return runs
+
+
+def sprite_from_bitrows(bitrows: Sequence[int], color: RGB, *, width: int = 8, off: Optional[RGB] = None) -> Sprite:
+    """Bitmask rows (MSB -> LSB is x=0..width-1) -> Sprite; clear bits are `off` (None = transparent)."""
+    rows = []
+    for bits in bitrows:
+        bits = int(bits)
+        rows.append([color if (bits >> (width - 1 - x)) & 1 else off for x in range(width)])
+    return Sprite(width, len(rows), rows)
+
+
+def sprite_from_rgb(asset: Dict[str, Any], *, key: Optional[RGB] = None) -> Sprite:
+    """{"w","h","pix" row-major RGB} asset -> Sprite; pixels equal to `key` become transparent."""
+    w = int(asset["w"])
+    h = int(asset["h"])
+    pix = asset["pix"]
+    rows = []
+    for y in range(h):
+        row = list(pix[y * w:(y + 1) * w])
+        if key is not None:
+            row = [None if c == key else c for c in row]
+        rows.append(row)
+    return Sprite(w, h, rows)
+
+
+def _blit_rows(buf: List[RGB], mw: int, mh: int, rows, runs, src_x0: int, x0: int, y0: int,
+               h: int, span_w: int) -> None:
+    # Destination columns [x0, x0 + span_w) read source columns [src_x0, src_x0 + span_w).
+    n = len(buf)
+    lo = max(0, x0)
+    hi = min(mw, x0 + span_w)
+    if lo >= hi:
+        return
+    for y in range(max(0, -y0), min(h, mh - y0)):
+        off = (y0 + y) * mw
+        if off >= n:
+            break
+        row = rows[y]
+        for a, b in runs[y]:
+            # source run [a, b) -> destination columns, clipped to [lo, hi) and the buffer
+            da = max(lo, x0 + a - src_x0)
+            db = min(hi, x0 + b - src_x0, n - off)
+            if da < db:
+                sa = da - x0 + src_x0
+                buf[off + da:off + db] = row[sa:sa + (db - da)]
+
+
+def blit(buf: List[RGB], mw: int, mh: int, sprite: Sprite, x0: int, y0: int) -> None:
+    """Draw `sprite` with its top-left at (x0, y0), clipped to the mw x mh grid and len(buf).
+
+    Transparent (None) pixels are skipped; compile the asset without a key for an opaque blit.
+    """
+    _blit_rows(buf, mw, mh, sprite.rows, sprite.runs, 0, int(x0), int(y0), sprite.h, sprite.w)
+
+
+def blit_tiled(buf: List[RGB], mw: int, mh: int, sprite: Sprite, y0: int, offset: int = 0) -> None:
+    """Repeat `sprite` across the full width: pixel (x, y0+y) samples column (x + offset) % w."""
+    if sprite.w <= 0:
+        return
+    rows, runs = sprite.tiled_rows(int(mw))
+    _blit_rows(buf, mw, mh, rows, runs, int(offset) % sprite.w, 0, int(y0), sprite.h, int(mw))
+
+
+def fill(buf: List[RGB], color: RGB) -> None:
+    buf[:] = [color] * len(buf)
+
+
+def fill_span(buf: List[RGB], start: int, end: int, color: RGB) -> None:
+    """Fill buf[start:end] (clipped to the buffer) with one colour."""
+    start = max(0, int(start))
+    end = min(len(buf), int(end))
+    if start < end:
+        buf[start:end] = [color] * (end - start)
+
+
+def plot(buf: List[RGB], mw: int, mh: int, points: Iterable[Sequence[int]], color: RGB) -> None:
+    """Set each in-bounds (x, y) point to `color`."""
+    n = len(buf)
+    for p in points:
+        x, y = int(p[0]), int(p[1])
+        if 0 <= x < mw and 0 <= y < mh:
+            i = y * mw + x
+            if i < n:
+                buf[i] = color
+
+
+# --- compiled atlas cache -------------------------------------------------------------
+
+_CACHE: "OrderedDict[str, Any]" = OrderedDict()
+_CACHE_MAX = 32
+_LOCK = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+def atlas_key(namespace: str, inputs: Any) -> str:
+    return namespace + ":" + json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+def compile_cached(namespace: str, inputs: Any, build: Callable[[], Any]) -> Any:
+    """Return build() for these inputs, reusing the compiled result while inputs are unchanged."""
+    try:
+        key = atlas_key(namespace, inputs)
+    except Exception:
+        return build()
+    with _LOCK:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            stats["hits"] += 1
+            return _CACHE[key]
+    value = build()
+    with _LOCK:
+        stats["misses"] += 1
+        _CACHE[key] = value
+        while len(_CACHE) > _CACHE_MAX:
+            _CACHE.popitem(last=False)
+    return value
+
+
+def clear_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
+        stats["hits"] = 0
+        stats["misses"] = 0
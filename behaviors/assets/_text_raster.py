@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+"""Glyph raster cache + text layout for the bitmap-font clock behaviors.
+
+Fonts are wrapped in a small adapter exposing decoded glyph bits (GFXFontAdapter for
+Adafruit_GFX fonts, RowBitsFont for the tiny built-in digit fonts). On top of that:
+
+  - glyph_sprite(font, ch, scale, color): one glyph rasterized to a Sprite, cached
+  - text_sprite(font, text, scale, color): a laid-out string rasterized to one Sprite
+    plus its offset from the pen origin, cached
+  - draw_text(): blit a cached text sprite (behaviors.assets._sprite_atlas.blit)
+
+Clock text changes at most once a second, so nearly every frame is a cache hit and a
+handful of slice copies instead of a per-pixel glyph walk.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import threading
+
+from behaviors.assets._sprite_atlas import Sprite, blit
+
+RGB = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class GlyphBits:
+    """Decoded glyph in font units: rows[y][x] is True for lit pixels.
+
+    (x_off, y_off) is the top-left relative to the pen position; x_adv moves the pen.
+    """
+    w: int
+    h: int
+    x_off: int
+    y_off: int
+    x_adv: int
+    rows: Tuple[Tuple[bool, ...], ...]
+
+
+class GFXFontAdapter:
+    """Adafruit_GFX GFXFont (baseline-anchored; missing glyphs advance yAdvance // 2)."""
+
+    def __init__(self, font, key: str):
+        self.font = font
+        self.key = key
+        self.missing_advance = font.yAdvance // 2
+        self._glyphs: Dict[str, Optional[GlyphBits]] = {}
+
+    def glyph(self, ch: str) -> Optional[GlyphBits]:
+        if ch not in self._glyphs:
+            self._glyphs[ch] = self._decode(ch)
+        return self._glyphs[ch]
+
+    def _decode(self, ch: str) -> Optional[GlyphBits]:
+        g = self.font.glyphs.get(ord(ch))
+        if g is None:
+            return None
+        w, h = int(g.width), int(g.height)
+        rows = []
+        if w > 0 and h > 0:
+            bits = self.font.bitmaps
+            bo = g.bitmapOffset
+            # Rows are packed MSB-first and continue across byte boundaries.
+            for yy in range(h):
+                row = []
+                for xx in range(w):
+                    bit = yy * w + xx
+                    row.append((bits[bo + (bit >> 3)] & (0x80 >> (bit & 7))) != 0)
+                rows.append(tuple(row))
+        return GlyphBits(w if rows else 0, h if rows else 0, int(g.xOffset), int(g.yOffset),
+                         int(g.xAdvance), tuple(rows))
+
+
+class RowBitsFont:
+    """Fixed-width font from {char: [row bits]} (MSB -> LSB is x=0..width-1), top-left anchored."""
+
+    def __init__(self, key: str, table: Dict[str, Sequence[int]], *, width: int, spacing: int = 1,
+                 fallback: Optional[str] = " "):
+        self.key = key
+        self.width = int(width)
+        self.missing_advance = self.width + int(spacing)
+        self.fallback = fallback
+        self._glyphs: Dict[str, GlyphBits] = {}
+        for ch, rows in table.items():
+            decoded = tuple(tuple(bool((int(r) >> (self.width - 1 - x)) & 1) for x in range(self.width)) for r in rows)
+            self._glyphs[ch] = GlyphBits(self.width, len(decoded), 0, 0, self.missing_advance, decoded)
+
+    def glyph(self, ch: str) -> Optional[GlyphBits]:
+        g = self._glyphs.get(ch)
+        if g is None and self.fallback is not None:
+            g = self._glyphs.get(self.fallback)
+        return g
+
+
+_ADAPTERS: Dict[int, Tuple[Any, GFXFontAdapter]] = {}
+
+
+def font_adapter(font) -> Any:
+    """Adapter for a GFXFont (one per font object) or pass through an adapter."""
+    if hasattr(font, "glyph") and hasattr(font, "key"):
+        return font
+    got = _ADAPTERS.get(id(font))
+    if got is None or got[0] is not font:
+        # The entry holds the font, so its id cannot be reused while cached.
+        got = (font, GFXFontAdapter(font, key=f"gfx{len(_ADAPTERS)}:{id(font):x}"))
+        _ADAPTERS[id(font)] = got
+    return got[1]
+
+
+class _LRU:
+    def __init__(self, max_entries: int):
+        self.max_entries = int(max_entries)
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            v = self._data.get(key)
+            if v is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+            return v
+
+    def put(self, key, value):
+        with self._lock:
+            self.misses += 1
+            self._data[key] = value
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+GLYPH_CACHE = _LRU(1024)
+TEXT_CACHE = _LRU(256)
+
+
+def glyph_sprite(font, ch: str, scale: int, color: RGB) -> Optional[Tuple[Sprite, GlyphBits]]:
+    """Glyph `ch` rasterized at `scale` in `color` (None if the font lacks it)."""
+    ad = font_adapter(font)
+    scale = max(1, int(scale))
+    key = (ad.key, ch, scale, tuple(color))
+    got = GLYPH_CACHE.get(key)
+    if got is not None:
+        return got
+    g = ad.glyph(ch)
+    if g is None:
+        return None
+    col = tuple(color)
+    rows: List[List[Optional[RGB]]] = []
+    for bits in g.rows:
+        row = []
+        for on in bits:
+            row.extend([col if on else None] * scale)
+        for _ in range(scale):
+            rows.append(row)
+    got = (Sprite(g.w * scale, g.h * scale, rows), g)
+    GLYPH_CACHE.put(key, got)
+    return got
+
+
+def text_sprite(font, text: str, *, scale: int = 1, color: RGB = (255, 255, 255)) -> Tuple[Sprite, int, int]:
+    """Lay out `text` and rasterize it. Returns (sprite, dx, dy): draw at pen + (dx, dy)."""
+    ad = font_adapter(font)
+    scale = max(1, int(scale))
+    key = (ad.key, str(text), scale, tuple(color))
+    got = TEXT_CACHE.get(key)
+    if got is not None:
+        return got
+
+    placed = []
+    pen = 0
+    for ch in str(text):
+        gs = glyph_sprite(ad, ch, scale, color)
+        if gs is None:
+            pen += ad.missing_advance * scale
+            continue
+        spr, g = gs
+        if spr.w > 0 and spr.h > 0:
+            placed.append((spr, pen + g.x_off * scale, g.y_off * scale))
+        pen += g.x_adv * scale
+
+    if not placed:
+        got = (Sprite(0, 0, []), 0, 0)
+    else:
+        x0 = min(px for _, px, _ in placed)
+        y0 = min(py for _, _, py in placed)
+        x1 = max(px + s.w for s, px, _ in placed)
+        y1 = max(py + s.h for s, _, py in placed)
+        w, h = x1 - x0, y1 - y0
+        canvas: List[Optional[RGB]] = [None] * (w * h)
+        for spr, px, py in placed:
+            blit(canvas, w, h, spr, px - x0, py - y0)
+        got = (Sprite(w, h, [canvas[r * w:(r + 1) * w] for r in range(h)]), x0, y0)
+    TEXT_CACHE.put(key, got)
+    return got
+
+
+def draw_text(buf: List[RGB], mw: int, mh: int, font, text: str, x: int, y: int, color: RGB, *,
+              scale: int = 1) -> None:
+    """Draw `text` with its pen origin at (x, y): the baseline for GFX fonts, the top for row fonts."""
+    spr, dx, dy = text_sprite(font, text, scale=scale, color=color)
+    if spr.w > 0:
+        blit(buf, mw, mh, spr, int(x) + dx, int(y) + dy)
+
+
+def clear_caches() -> None:
+    GLYPH_CACHE.clear()
+    TEXT_CACHE.clear()
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import re
+import struct
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
@@ -64,7 +67,76 @@ def _extract_glyphs(text: str, array_name: str) -> Dict[int, Glyph]:
     return glyphs
 
 
-def load_gfx_font_from_header(header_path: str | Path, font_struct_name: Optional[str] = None) -> GFXFont:
+# --- compact binary cache of parsed headers ------------------------------------------
+# Layout (little-endian): magic, source fingerprint (size, mtime_ns, struct name),
+# first/last/yAdvance, glyph table (code + GFXglyph fields), then the raw bitmap bytes.
+# Stored under out/font_cache/ (override with $MODULO_FONT_CACHE), one file per resolved
+# header path + struct name; stale or unreadable cache files are ignored and rewritten.
+_CACHE_MAGIC = b"MLGFXF1\0"
+_HDR = struct.Struct("<QqHHHHHI")   # size, mtime_ns, len(name), first, last, yAdvance, n_glyphs, n_bitmap_bytes
+_GLYPH = struct.Struct("<HIhhhhh")  # code, bitmapOffset, width, height, xAdvance, xOffset, yOffset
+
+
+def _font_cache_dir() -> Path:
+    env = os.environ.get("MODULO_FONT_CACHE")
+    if env:
+        return Path(env)
+    return Path(__file__).resolve().parents[2] / "out" / "font_cache"
+
+
+def _font_cache_path(header: Path, struct_name: Optional[str]) -> Path:
+    # Same-named headers in different directories must not share (and thrash) one entry.
+    tag = hashlib.sha256(str(header.resolve()).encode("utf-8")).hexdigest()[:16]
+    return _font_cache_dir() / f"{header.stem}.{tag}.{struct_name or 'auto'}.mlgfx"
+
+
+def dump_font_cache(font: GFXFont, path: Path, *, src_size: int, src_mtime_ns: int, struct_name: str) -> None:
+    name = struct_name.encode("utf-8")
+    parts = [_CACHE_MAGIC,
+             _HDR.pack(src_size, src_mtime_ns, len(name), font.first, font.last, font.yAdvance,
+                       len(font.glyphs), len(font.bitmaps)),
+             name]
+    for code in sorted(font.glyphs):
+        g = font.glyphs[code]
+        parts.append(_GLYPH.pack(code, g.bitmapOffset, g.width, g.height, g.xAdvance, g.xOffset, g.yOffset))
+    parts.append(bytes(font.bitmaps))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(b"".join(parts))
+    os.replace(tmp, path)
+
+
+def load_font_cache(path: Path, *, src_size: int, src_mtime_ns: int, struct_name: Optional[str]) -> Optional[GFXFont]:
+    """Return the cached font if `path` matches the source fingerprint, else None."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        if not data.startswith(_CACHE_MAGIC):
+            return None
+        off = len(_CACHE_MAGIC)
+        size, mtime_ns, n_name, first, last, y_adv, n_glyphs, n_bytes = _HDR.unpack_from(data, off)
+        off += _HDR.size
+        name = data[off:off + n_name].decode("utf-8")
+        off += n_name
+        if size != src_size or mtime_ns != src_mtime_ns or (struct_name is not None and name != struct_name):
+            return None
+        glyphs: Dict[int, Glyph] = {}
+        for _ in range(n_glyphs):
+            code, *vals = _GLYPH.unpack_from(data, off)
+            off += _GLYPH.size
+            glyphs[code] = Glyph(*vals)
+        bitmaps = data[off:off + n_bytes]
+        if len(bitmaps) != n_bytes:
+            return None
+        return GFXFont(bitmaps=bitmaps, glyphs=glyphs, first=first, last=last, yAdvance=y_adv)
+    except (struct.error, UnicodeDecodeError, TypeError):
+        return None
+
+
+def load_gfx_font_from_header(header_path: str | Path, font_struct_name: Optional[str] = None, *,
+                              use_cache: bool = True) -> GFXFont:
     """Load an Adafruit_GFX GFXfont from a .h file.
 
     Returns a GFXFont with glyphs mapped by character code.
@@ -72,8 +144,35 @@ def load_gfx_font_from_header(header_path: str | Path, font_struct_name: Optiona
     Notes:
     - We assume the header defines: <Name>Bitmaps, <Name>Glyphs, and a GFXfont <Name>.
     - If font_struct_name is omitted, we auto-detect the first 'const GFXfont <name> PROGMEM = {' occurrence.
+    - The parsed font is stored in a binary cache keyed on the header's size/mtime, so
+      later loads skip the regex parse (use_cache=False always parses the header).
     """
     p = Path(header_path)
+    cache_path = None
+    st = None
+    if use_cache:
+        try:
+            st = p.stat()
+            cache_path = _font_cache_path(p, font_struct_name)
+            cached = load_font_cache(cache_path, src_size=st.st_size, src_mtime_ns=st.st_mtime_ns,
+                                     struct_name=font_struct_name)
+            if cached is not None:
+                return cached
+        except OSError:
+            cache_path = None
+
+    font = _parse_gfx_font_header(p, font_struct_name)
+
+    if cache_path is not None and st is not None:
+        try:
+            dump_font_cache(font, cache_path, src_size=st.st_size, src_mtime_ns=st.st_mtime_ns,
+                            struct_name=font_struct_name or "")
+        except OSError:
+            pass
+    return font
+
+
+def _parse_gfx_font_header(p: Path, font_struct_name: Optional[str]) -> GFXFont:
     text = p.read_text(encoding='utf-8', errors='ignore')
 
     if font_struct_name is None:
@@ -138,36 +237,7 @@ def draw_text_to_buffer(
       (We keep this API so we can extend later.)
     """
 
-    cursor_x = int(x)
-    cursor_y = int(y_baseline)
-
-    for ch in text:
-        code = ord(ch)
-        g = font.glyphs.get(code)
-        if g is None:
-            cursor_x += font.yAdvance // 2
-            continue
-
-        w, h = g.width, g.height
-        if w <= 0 or h <= 0:
-            cursor_x += g.xAdvance
-            continue
+    # Glyphs and laid-out strings are rasterized once and cached (behaviors.assets._text_raster).
+    from behaviors.assets._text_raster import draw_text
 
-        # Each row in the bitmap is packed MSB-first across bytes
-        bo = g.bitmapOffset
-        bit_index = 0
-        for yy in range(h):
-            for xx in range(w):
-                byte = font.bitmaps[bo + (bit_index // 8)]
-                mask = 0x80 >> (bit_index % 8)
-                on = (byte & mask) != 0
-                bit_index += 1
-                if not on:
-                    continue
-
-                px = cursor_x + g.xOffset + xx
-                py = cursor_y + g.yOffset + yy
-                if 0 <= px < mw and 0 <= py < mh:
-                    buf[py * mw + px] = color
-
-        cursor_x += g.xAdvance
+    draw_text(buf, mw, mh, font, text, x, y_baseline, color)
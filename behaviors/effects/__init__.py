@@ -3,11 +3,13 @@
 IMPORTANT:
 - We do NOT auto-import every .py module in this folder.
   Auto-import scanning caused fragile imports for experimental demos.
-- Shipped effects are registered explicitly via behaviors.auto_load.register_all().
+- Shipped effects are listed by behaviors.auto_load.register_all(). The generated
+  behavior manifest (behaviors.manifest) declares them in the registry without
+  importing; each module is imported on first lookup of one of its keys.
 """
 from __future__ import annotations
 
-from behaviors.auto_load import register_all
+from behaviors.manifest import install
 
-# Register shipped effects only
-register_all()
+# Declare shipped effects only (rebuilds the manifest eagerly when stale)
+install()
@@ -35,6 +35,21 @@ def _noise1(x: float, seed: int) -> float:
     v1 = _u01(_hash_u32(x1 ^ seed))
     return _lerp(v0, v1, t)
 
+def _noise1_row(xs: List[float], seed: int) -> List[float]:
+    """_noise1 for every x in xs, hashing each lattice point once per call (bit-identical)."""
+    lat = {}
+    out = []
+    for x in xs:
+        x0 = int(math.floor(x))
+        v0 = lat.get(x0)
+        if v0 is None:
+            v0 = lat[x0] = _u01(_hash_u32(x0 ^ seed))
+        v1 = lat.get(x0 + 1)
+        if v1 is None:
+            v1 = lat[x0 + 1] = _u01(_hash_u32((x0 + 1) ^ seed))
+        out.append(_lerp(v0, v1, x - float(x0)))
+    return out
+
 def _hsv_to_rgb(h: float, s: float, v: float) -> RGB:
     h = (h % 1.0) * 6.0
     i = int(h) % 6
@@ -68,14 +83,19 @@ def _preview_emit(*, num_leds: int, params: dict, t: float) -> List[RGB]:
     scroll = t * max(0.1, speed) * 0.5
     contrast = 1.5 - softness * 1.0  # 0.5..1.5-ish
 
+    xs = [i / max(1.0, (n-1)) for i in range(n)]
+    # layered moving noise -> curtain intensity (one row per layer and tick)
+    n1 = _noise1_row([x*spatial + scroll*1.0 for x in xs], 777)
+    n2 = _noise1_row([x*spatial*2.0 + scroll*1.7 for x in xs], 888)
+    n3 = _noise1_row([x*spatial*4.0 + scroll*3.1 for x in xs], 999)
+
     out: List[RGB] = []
     for i in range(n):
-        x = i / max(1.0, (n-1))
-        # layered moving noise -> curtain intensity
+        x = xs[i]
         v = 0.0
-        v += 0.55 * _noise1(x*spatial + scroll*1.0, 777)
-        v += 0.30 * _noise1(x*spatial*2.0 + scroll*1.7, 888)
-        v += 0.15 * _noise1(x*spatial*4.0 + scroll*3.1, 999)
+        v += 0.55 * n1[i]
+        v += 0.30 * n2[i]
+        v += 0.15 * n3[i]
         v = (v - 0.5) * contrast + 0.5
         v = _clamp01(v)
         # hue varies slowly with x and time, value from v
@@ -6,6 +6,7 @@ from typing import Dict, Any, List, Tuple
 
 from behaviors.registry import BehaviorDef, register
 from behaviors.state import rng_load, rng_save
+from behaviors.assets._sprite_atlas import fill, fill_span
 
 USES = ["preview", "arduino"]
 
@@ -372,8 +373,7 @@ def _render(state: Dict[str, Any], params: Dict[str, Any]) -> List[Tuple[int, in
     # If all destroyed: render a one-tick blue flash.
     # Respawn is handled in the fixed-tick update to keep render side-effect free.
     if int(state.get('_flash_ticks', 0) or 0) > 0:
-        for i in range(num_leds):
-            out[i] = (0, 0, 255)
+        fill(out, (0, 0, 255))
         return out
 
     # draw blocks as single pixels with intensity by health
@@ -401,9 +401,7 @@ def _render(state: Dict[str, Any], params: Dict[str, Any]) -> List[Tuple[int, in
             out[pos] = (r, g, b)
 
     # draw ball (red) over blocks
-    for i in range(ball_pos, min(num_leds, ball_pos + ball_size)):
-        if 0 <= i < num_leds:
-            out[i] = (255, 0, 0)
+    fill_span(out, ball_pos, ball_pos + ball_size, (255, 0, 0))
 
     return out
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Tuple
 
 from behaviors.registry import BehaviorDef, register
+from behaviors.assets._text_raster import RowBitsFont, draw_text
 
 RGB = Tuple[int, int, int]
 
@@ -68,19 +69,7 @@ def _read_clock(audio: dict | None, t: float) -> tuple[int,int,int]:
         s = int(t) % 60
     return h%24, m%60, s%60
 
-def _draw_glyph(out: List[RGB], mw: int, mh: int, gx: int, gy: int, glyph_rows, col: RGB, scale: int = 1):
-    if mw <= 0 or mh <= 0:
-        return
-    scale = max(1, int(scale))
-    for ry, row_bits in enumerate(glyph_rows):
-        for rx in range(3):
-            if (row_bits >> (2 - rx)) & 1:
-                for sy in range(scale):
-                    for sx in range(scale):
-                        x = gx + rx*scale + sx
-                        y = gy + ry*scale + sy
-                        if 0 <= x < mw and 0 <= y < mh:
-                            out[y*mw + x] = col
+_FONT = RowBitsFont("clock_hhmm_3x5", _FONT_3X5, width=3, spacing=1, fallback=" ")
 
 def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=None, dt: float = 0.0, audio=None) -> List[RGB]:
     n = max(1, int(num_leds))
@@ -121,11 +110,9 @@ def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=N
         total_w = len(text)*glyph_w + (len(text)-1)*spacing
         x = max(0, mw - total_w - int(p.get("margin", 1) or 1))
 
-    cx = x
-    for ch in text:
-        glyph = _FONT_3X5.get(ch, _FONT_3X5[" "])
-        _draw_glyph(out, mw, mh, cx, y, glyph, col, scale=scale)
-        cx += 3*scale + scale
+    # Laid-out text is cached per (text, scale, colour): between minute changes this is a blit.
+    if mw > 0 and mh > 0:
+        draw_text(out, mw, mh, _FONT, text, x, y, col, scale=scale)
 
     return out
 
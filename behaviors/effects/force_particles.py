@@ -1511,10 +1511,11 @@ def _update(*, state: EffectState, params: dict, dt: float, t: float, audio: dic
         pp_r = float(params.get('pp_radius', 1.25) or 1.25)
     except Exception:
         pp_r = 1.25
+    # 0 (default) = exact broadphase counts; >0 = legacy budget on pair checks
     try:
-        pp_max = int(params.get('pp_max_pairs', 2000) or 2000)
+        pp_max = int(params.get('pp_max_pairs', 0) or 0)
     except Exception:
-        pp_max = 2000
+        pp_max = 0
 
     pp_near, pp_coll = count_pairs_within_radius_v1(
         parts=parts,
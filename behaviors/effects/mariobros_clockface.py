@@ -9,10 +9,11 @@ This effect intentionally redraws the whole scene every frame so UI toggle/state
 can't leave stale pixels behind.
 """
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 import math
 
 from behaviors.registry import BehaviorDef, register
+from behaviors.assets._sprite_atlas import Sprite, blit, blit_tiled, compile_cached, sprite_from_rgb
 from behaviors.assets.mariobros_clock_assets import ASSETS, SKY
 from behaviors.assets.mariobros_font import get_font
 from behaviors.assets.adafruit_gfx_font import draw_text_to_buffer
@@ -28,30 +29,36 @@ def _get_layout_wh(num_leds: int, params: dict, layout: dict) -> Tuple[int, int]
     return max(1, mw), max(1, mh)
 
 
-def _fill(buf: List[RGB], color: RGB):
-    for i in range(len(buf)):
-        buf[i] = color
+_SPRITES: Dict[Tuple[str, bool], Sprite] = {}
+
+
+def _sprite(asset_name: str, transparent: bool = True) -> Sprite:
+    key = (asset_name, bool(transparent))
+    spr = _SPRITES.get(key)
+    if spr is None:
+        spr = sprite_from_rgb(ASSETS[asset_name], key=SKY if transparent else None)
+        _SPRITES[key] = spr
+    return spr
 
 
 def _blit(buf: List[RGB], mw: int, mh: int, asset_name: str, x0: int, y0: int, *, transparent: bool = True):
-    a = ASSETS[asset_name]
-    w = int(a["w"])
-    h = int(a["h"])
-    pix: List[RGB] = a["pix"]  # row-major
-    for y in range(h):
-        yy = y0 + y
-        if yy < 0 or yy >= mh:
-            continue
-        row_off = y * w
-        out_off = yy * mw
-        for x in range(w):
-            xx = x0 + x
-            if xx < 0 or xx >= mw:
-                continue
-            c = pix[row_off + x]
-            if transparent and c == SKY:
-                continue
-            buf[out_off + xx] = c
+    blit(buf, mw, mh, _sprite(asset_name, transparent), x0, y0)
+
+
+def _background(mw: int, mh: int) -> List[RGB]:
+    buf: List[RGB] = [SKY] * (mw * mh)
+    ground_y = mh - int(ASSETS["GROUND"]["h"])
+    blit_tiled(buf, mw, mh, _sprite("GROUND", False), ground_y, 0)
+
+    _blit(buf, mw, mh, "BUSH", 43, 47)
+    _blit(buf, mw, mh, "HILL", 0, 34)
+    _blit(buf, mw, mh, "CLOUD1", 0, 21)
+    _blit(buf, mw, mh, "CLOUD2", 51, 7)
+
+    # Blocks (hour/minute)
+    _blit(buf, mw, mh, "BLOCK", 13, 8)
+    _blit(buf, mw, mh, "BLOCK", 32, 8)
+    return buf
 
 
 def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=None, dt: float = 0.0, audio=None):
@@ -60,7 +67,6 @@ def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=N
     st = state if isinstance(state, dict) else {}
 
     mw, mh = _get_layout_wh(num_leds, p, layout or {})
-    buf = [(0, 0, 0)] * (mw * mh)
 
     # Time source (preview): uses t as seconds since midnight for determinism.
     total_seconds = int(t) % (24 * 3600)
@@ -92,22 +98,8 @@ def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=N
             st["last_min"] = mm
 
     # --- Background (match upstream placement; no scrolling) ---
-    _fill(buf, SKY)
-
-    ground_w = int(ASSETS["GROUND"]["w"])
-    ground_h = int(ASSETS["GROUND"]["h"])
-    ground_y = mh - ground_h
-    for x in range(0, mw, ground_w):
-        _blit(buf, mw, mh, "GROUND", x, ground_y, transparent=False)
-
-    _blit(buf, mw, mh, "BUSH", 43, 47)
-    _blit(buf, mw, mh, "HILL", 0, 34)
-    _blit(buf, mw, mh, "CLOUD1", 0, 21)
-    _blit(buf, mw, mh, "CLOUD2", 51, 7)
-
-    # Blocks (hour/minute)
-    _blit(buf, mw, mh, "BLOCK", 13, 8)
-    _blit(buf, mw, mh, "BLOCK", 32, 8)
+    # Static for a given matrix size: rasterized once, copied per frame.
+    buf = list(compile_cached("mariobros_clockface.bg", [mw, mh], lambda: _background(mw, mh)))
 
     # Text (Adafruit_GFX font port; upstream uses Mario font)
     font = get_font()
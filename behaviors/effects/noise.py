@@ -37,6 +37,21 @@ def _noise1(x: float, seed: int) -> float:
     v1 = _u01(h1)
     return _lerp(v0, v1, t)
 
+def _noise1_row(xs: List[float], seed: int) -> List[float]:
+    """_noise1 for every x in xs, hashing each lattice point once per call (bit-identical)."""
+    lat = {}
+    out = []
+    for x in xs:
+        x0 = int(math.floor(x))
+        v0 = lat.get(x0)
+        if v0 is None:
+            v0 = lat[x0] = _u01(_hash_u32(x0 ^ seed))
+        v1 = lat.get(x0 + 1)
+        if v1 is None:
+            v1 = lat[x0 + 1] = _u01(_hash_u32((x0 + 1) ^ seed))
+        out.append(_lerp(v0, v1, x - float(x0)))
+    return out
+
 def _apply_brightness(rgb: RGB, br: float) -> RGB:
     br = _clamp01(float(br))
     r,g,b = rgb
@@ -57,11 +72,14 @@ def _preview_emit(*, num_leds: int, params: dict, t: float) -> List[RGB]:
     spatial = 0.25 + (1.0/width) * 0.35
     scroll = t * max(0.1, speed) * 1.1
 
+    n1 = _noise1_row([i*spatial + scroll*1.0 for i in range(n)], 101)
+    n2 = _noise1_row([i*spatial*2.0 + scroll*2.1 for i in range(n)], 202)
+
     out: List[RGB] = []
     for i in range(n):
         v = 0.0
-        v += 0.65 * _noise1(i*spatial + scroll*1.0, 101)
-        v += 0.35 * _noise1(i*spatial*2.0 + scroll*2.1, 202)
+        v += 0.65 * n1[i]
+        v += 0.35 * n2[i]
         # contrast via softness (softness high => lower contrast)
         c = 1.4 - softness * 0.9
         v = (v - 0.5) * c + 0.5
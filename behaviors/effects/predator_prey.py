@@ -127,9 +127,8 @@ class PredatorPrey:
         if not isinstance(trail, list) or len(trail) != w * h:
             trail = [0.0] * (w * h)
             state["trail"] = trail
-        # decay trail
-        for i in range(len(trail)):
-            trail[i] *= 0.93
+        # decay trail (one pass, in place: state aliases the list)
+        trail[:] = [v * 0.93 for v in trail]
 
         px, py = prey.ent.x, prey.ent.y
         rx, ry = pred.ent.x, pred.ent.y
@@ -13,9 +13,10 @@ Export is intentionally blocked for now (sprite tables + blitter would need
 firmware support in the exporter).
 """
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from behaviors.registry import BehaviorDef, register
+from behaviors.assets._sprite_atlas import Sprite, blit, blit_tiled, fill, sprite_from_rgb
 from behaviors.assets.red_hat_assets import ASSETS, SKY
 
 RGB = Tuple[int, int, int]
@@ -29,30 +30,20 @@ def _get_layout_wh(num_leds: int, params: dict, layout: dict) -> Tuple[int, int]
     return max(1, mw), max(1, mh)
 
 
-def _fill(buf: List[RGB], color: RGB):
-    for i in range(len(buf)):
-        buf[i] = color
+_SPRITES: Dict[Tuple[str, bool], Sprite] = {}
+
+
+def _sprite(asset_name: str, transparent: bool = True) -> Sprite:
+    key = (asset_name, bool(transparent))
+    spr = _SPRITES.get(key)
+    if spr is None:
+        spr = sprite_from_rgb(ASSETS[asset_name], key=SKY if transparent else None)
+        _SPRITES[key] = spr
+    return spr
 
 
 def _blit(buf: List[RGB], mw: int, mh: int, asset_name: str, x0: int, y0: int, *, transparent: bool = True):
-    a = ASSETS[asset_name]
-    w = int(a["w"])
-    h = int(a["h"])
-    pix: List[RGB] = a["pix"]  # row-major
-    for y in range(h):
-        yy = y0 + y
-        if yy < 0 or yy >= mh:
-            continue
-        row_off = y * w
-        out_off = yy * mw
-        for x in range(w):
-            xx = x0 + x
-            if xx < 0 or xx >= mw:
-                continue
-            c = pix[row_off + x]
-            if transparent and c == SKY:
-                continue
-            buf[out_off + xx] = c
+    blit(buf, mw, mh, _sprite(asset_name, transparent), x0, y0)
 
 
 def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=None, dt: float = 0.0, audio=None):
@@ -152,13 +143,12 @@ def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=N
         st["frame"] = (int(st.get("frame", 0)) + 1) % 2
 
     # --- render ---
-    _fill(buf, (20, 40, 90))
+    fill(buf, (20, 40, 90))
 
     # ground tiling
     gw = ASSETS["GROUND"]["w"]
     gx_off = -int(st.get("scroll", 0.0)) % gw
-    for x in range(-gw + gx_off, mw + gw, gw):
-        _blit(buf, mw, mh, "GROUND", x, ground_y, transparent=False)
+    blit_tiled(buf, mw, mh, _sprite("GROUND", False), ground_y, -gx_off)
 
     # obstacles
     for ox in st.get("obstacles", []):
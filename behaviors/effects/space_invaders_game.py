@@ -6,6 +6,7 @@ import random
 from typing import Dict, Any, List
 
 from behaviors.registry import BehaviorDef, register
+from behaviors.assets._sprite_atlas import plot
 
 USES = ["preview", "arduino"]
 
@@ -150,19 +151,13 @@ def _preview_emit(*, num_leds: int, params: Dict[str, Any], t: float, state: Dic
     def _i(x: int, y: int) -> int:
         return int(y) * mw + int(x)
 
-    for p in (state.get("invaders") or []):
-        x, y = int(p[0]), int(p[1])
-        if 0 <= x < mw and 0 <= y < mh:
-            out[_i(x, y)] = (180, 0, 255)
+    plot(out, mw, mh, state.get("invaders") or [], (180, 0, 255))
 
     px = int(state.get("player_x", mw // 2) or mw // 2)
     py = int(state.get("player_y", mh - 2) or mh - 2)
     out[_i(px, py)] = (0, 150, 255)
 
-    for b in (state.get("bullets") or []):
-        x, y = int(b[0]), int(b[1])
-        if 0 <= x < mw and 0 <= y < mh:
-            out[_i(x, y)] = (255, 255, 255)
+    plot(out, mw, mh, state.get("bullets") or [], (255, 255, 255))
 
     return out
 
@@ -3,6 +3,7 @@ from typing import List, Tuple, Dict, Any
 import math
 
 from behaviors.registry import BehaviorDef, register
+from behaviors.assets._sprite_atlas import Sprite, blit, blit_tiled, compile_cached, sprite_from_bitrows
 
 RGB = Tuple[int, int, int]
 
@@ -167,15 +168,76 @@ def _load_user_assets(params: dict) -> dict:
 
     return {"tiles": tiles, "map": tmap, "legend": legend, "frames": frames}
 
-def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=None, dt: float = 0.0, audio=None) -> List[RGB]:
-    n = max(1, int(num_leds))
-    mw, mh = _get_layout_wh(n, params or {}, layout or {})
+# Layer params that feed _load_user_assets(); part of the compiled-scene cache key.
+_ASSET_PARAMS = ("tilemap_tiles", "tilemap_map", "tilemap_legend", "sprite_frames")
 
-    assets = _load_user_assets(params or {})
+# Procedural background repeats every lcm(7, 11) tiles horizontally.
+_PROC_PERIOD_TILES = 77
+
+def _compile_scene(params: dict, mw: int, mh: int, palette: Tuple[RGB, ...]) -> dict:
+    """Rasterize the background strip(s) and sprite frames for one params/layout revision.
+
+    scroll_layer: one period of the scrolling background (sky-filled, opaque), blitted
+                  with offset=scroll. band: the non-scrolling procedural grass rows.
+    """
+    sky, brick, question, grass, sprite_rgb = palette
+    assets = _load_user_assets(params)
     user_tiles = assets.get('tiles') or {}
     user_map = assets.get('map')
     legend = assets.get('legend') or {}
-    user_frames = assets.get('frames')
+    ts = 8
+
+    tile_brick = user_tiles.get("brick", TILE_BRICK)
+    tile_question = user_tiles.get("question", TILE_QUESTION)
+    tile_grass = user_tiles.get("grass", TILE_GRASS)
+
+    band = None
+    band_y = mh
+    if user_map:
+        map_h = len(user_map)
+        map_w = max(1, max(len(r) for r in user_map))
+        tileset = {"brick": (tile_brick, brick), "question": (tile_question, question), "grass": (tile_grass, grass)}
+        period = ts * map_w
+        rows = []
+        for y in range(mh):
+            row = user_map[(y // ts) % map_h]
+            out_row = []
+            for s in range(period):
+                tx = (s // ts) % map_w
+                ch = row[tx] if tx < len(row) else "."
+                tile = tileset.get(legend.get(ch, "sky"))
+                out_row.append(tile[1] if (tile is not None and _tile_bit(tile[0], s % ts, y % ts)) else sky)
+            rows.append(out_row)
+        scroll_layer = Sprite(period, mh, rows)
+    else:
+        top = max(0, mh - ts)
+        period = ts * _PROC_PERIOD_TILES
+        rows = []
+        for y in range(top):
+            ty = y // ts
+            out_row = []
+            for s in range(period):
+                tx = s // ts
+                col = sky
+                if ty % 5 == 2 and tx % 11 == 5:
+                    if _tile_bit(tile_question, s % ts, y % ts):
+                        col = question
+                elif ty % 3 == 1 and tx % 7 in (2, 3):
+                    if _tile_bit(tile_brick, s % ts, y % ts):
+                        col = brick
+                out_row.append(col)
+            rows.append(out_row)
+        scroll_layer = Sprite(period, top, rows)
+        band = Sprite(ts, mh - top, [[grass if _tile_bit(tile_grass, x, y % ts) else sky for x in range(ts)]
+                                     for y in range(top, mh)])
+        band_y = top
+
+    frames = [sprite_from_bitrows(f, sprite_rgb) for f in (assets.get('frames') or [SPRITE])]
+    return {"scroll_layer": scroll_layer, "band": band, "band_y": band_y, "frames": frames}
+
+def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=None, dt: float = 0.0, audio=None) -> List[RGB]:
+    n = max(1, int(num_leds))
+    mw, mh = _get_layout_wh(n, params or {}, layout or {})
 
     # Controls
     speed = float((params or {}).get('speed', 1.0))
@@ -229,81 +291,26 @@ def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=N
     # Tile size fixed 8 for parity with Arduino emitter
     ts = 8
 
-
-    # Resolve tile assets (built-in unless overridden)
-    TILE_BRICK_U = user_tiles.get("brick", TILE_BRICK)
-    TILE_QUESTION_U = user_tiles.get("question", TILE_QUESTION)
-    TILE_GRASS_U = user_tiles.get("grass", TILE_GRASS)
-    
     # Background scroll (pixels)
     scroll = int((t * 12.0 * max(0.0, speed)) % max(1, mw))
 
+    # Tiles, tilemap and sprite frames are pre-rasterized once per params change.
+    scene = compile_cached(
+        "tilemap_sprite",
+        {
+            "mw": mw, "mh": mh,
+            "palette": [sky, brick, question, grass, sprite_rgb],
+            "assets": [(params or {}).get(k) for k in _ASSET_PARAMS],
+        },
+        lambda: _compile_scene(params or {}, mw, mh, (sky, brick, question, grass, sprite_rgb)),
+    )
+
     # Simple level: sky everywhere, grass band at bottom, bricks/questions sprinkled
     out = [sky] * n
+    blit_tiled(out, mw, mh, scene["scroll_layer"], 0, scroll)
+    if scene["band"] is not None:
+        blit_tiled(out, mw, mh, scene["band"], scene["band_y"], 0)
 
-    def set_xy(x: int, y: int, col: RGB):
-        if x < 0 or y < 0 or x >= mw or y >= mh:
-            return
-        i = y * mw + x
-        if 0 <= i < n:
-            out[i] = col
-
-
-
-
-    # If a user tilemap is provided, render it instead of the procedural background.
-    if user_map:
-        map_h = len(user_map)
-        map_w = max(1, max(len(r) for r in user_map))
-        tileset = {
-            "brick": TILE_BRICK_U,
-            "question": TILE_QUESTION_U,
-            "grass": TILE_GRASS_U,
-        }
-        for y in range(mh):
-            ty = (y // ts) % map_h
-            row = user_map[ty]
-            for x in range(mw):
-                tx = ((x + scroll) // ts) % map_w
-                ch = row[tx] if tx < len(row) else "."
-                tkey = legend.get(ch, "sky")
-                tile = tileset.get(tkey)
-                if tile is None:
-                    continue
-                if _tile_bit(tile, (x + scroll) % ts, y % ts):
-                    if tkey == "brick":
-                        set_xy(x, y, brick)
-                    elif tkey == "question":
-                        set_xy(x, y, question)
-                    else:
-                        set_xy(x, y, grass)
-    else:
-        # Draw background tiles
-        for y in range(mh):
-            for x in range(mw):
-                # grass band near bottom
-                if y >= mh - ts:
-                    if _tile_bit(TILE_GRASS_U, x % ts, y % ts):
-                        set_xy(x, y, grass)
-                    continue
-    
-                # parallax-ish: only tile on some rows
-                tx = ((x + scroll) // ts)
-                ty = (y // ts)
-    
-                tile_kind = 0
-                if ty % 3 == 1 and tx % 7 in (2,3):
-                    tile_kind = 1  # brick
-                if ty % 5 == 2 and tx % 11 == 5:
-                    tile_kind = 2  # question
-    
-                if tile_kind == 1:
-                    if _tile_bit(TILE_BRICK_U, (x + scroll) % ts, y % ts):
-                        set_xy(x, y, brick)
-                elif tile_kind == 2:
-                    if _tile_bit(TILE_QUESTION_U, (x + scroll) % ts, y % ts):
-                        set_xy(x, y, question)
-    
     # Sprite bob (runs along ground)
     ground_y = mh - ts - 8
     bob = int(2.0 * math.sin(t * 6.0 * max(0.0, speed)))
@@ -348,18 +355,14 @@ def _preview_emit(*, num_leds: int, params: dict, t: float, state=None, layout=N
         sy = max(0, min(mh - 8, sy))
 
     # Resolve sprite frame
-    sprite_bits = SPRITE
-    if user_frames:
+    frames = scene["frames"]
+    sprite = frames[0]
+    if len(frames) > 1:
         try:
-            fi = int((t * 6.0 * max(0.0, speed))) % max(1, len(user_frames))
-            sprite_bits = user_frames[fi]
+            sprite = frames[int((t * 6.0 * max(0.0, speed))) % len(frames)]
         except Exception:
-            sprite_bits = user_frames[0]
-    
-    for py in range(8):
-        for px in range(8):
-            if _tile_bit(sprite_bits, px, py):
-                set_xy(sx + px, sy + py, sprite_rgb)
+            sprite = frames[0]
+    blit(out, mw, mh, sprite, sx, sy)
 
     # If strip (mh==1), compress the 2D out buffer down to strip pixels by sampling.
     if mh == 1 and mw == n:
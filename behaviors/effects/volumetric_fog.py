@@ -35,6 +35,21 @@ def _noise1(x: float, seed: int) -> float:
     v1 = _u01(_hash_u32(x1 ^ seed))
     return _lerp(v0, v1, t)
 
+def _noise1_row(xs: List[float], seed: int) -> List[float]:
+    """_noise1 for every x in xs, hashing each lattice point once per call (bit-identical)."""
+    lat = {}
+    out = []
+    for x in xs:
+        x0 = int(math.floor(x))
+        v0 = lat.get(x0)
+        if v0 is None:
+            v0 = lat[x0] = _u01(_hash_u32(x0 ^ seed))
+        v1 = lat.get(x0 + 1)
+        if v1 is None:
+            v1 = lat[x0 + 1] = _u01(_hash_u32((x0 + 1) ^ seed))
+        out.append(_lerp(v0, v1, x - float(x0)))
+    return out
+
 def _fbm(x: float, seed: int) -> float:
     a = 0.0
     amp = 0.6
@@ -45,6 +60,19 @@ def _fbm(x: float, seed: int) -> float:
         amp *= 0.5
     return a
 
+def _fbm_row(xs: List[float], seed: int) -> List[float]:
+    """_fbm for every x in xs (same octave order, so bit-identical)."""
+    acc = [0.0] * len(xs)
+    amp = 0.6
+    freq = 1.0
+    for o in range(4):
+        row = _noise1_row([x*freq for x in xs], seed + o*101)
+        for i, v in enumerate(row):
+            acc[i] += amp * v
+        freq *= 2.0
+        amp *= 0.5
+    return acc
+
 USES = ["color","brightness","speed","width","softness","density"]
 
 def _preview_emit(*, num_leds: int, params: dict, t: float) -> List[RGB]:
@@ -62,12 +90,14 @@ def _preview_emit(*, num_leds: int, params: dict, t: float) -> List[RGB]:
     fog = 0.10 + softness*0.55
     contrast = 0.6 + density*1.3
 
+    xs = [i / max(1.0,(n-1)) for i in range(n)]
+    fbm = _fbm_row([x*scale + t*speed*0.15 for x in xs], 7777)
     out=[]
     for i in range(n):
-        x = i / max(1.0,(n-1))
+        x = xs[i]
         d = abs(x-0.5)*2.0
         depth = 1.0 / (1.0 + d*2.8)
-        v = _fbm(x*scale + t*speed*0.15, 7777)
+        v = fbm[i]
         v = _clamp01((v - 0.35)*contrast + 0.35)
         # depth & fog lift blacks
         v = _clamp01(v*depth + fog*(1.0-depth))
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+"""Generated behavior manifest: list shipped behaviors without importing them.
+
+The manifest maps each shipped key to the module + register_*() function that defines
+it, plus its title, uses, capabilities and export eligibility. install() loads it into
+behaviors.registry.REGISTRY as declared keys; modules are imported on first lookup.
+
+Staleness: the manifest stores (mtime_ns, size) for auto_load.py, the capabilities
+catalog, the export eligibility table and every effect module it names. If any differ
+(or a file is missing) the manifest is rebuilt by running the eager registration
+(behaviors.auto_load.register_all's calls, in order) and rewritten atomically.
+Writing is best-effort: on a read-only install the rebuilt manifest is used for this
+process only, and any failure while building it falls back to eager registration.
+
+Set MODULO_EAGER_BEHAVIORS=1 to skip the manifest and register everything at import.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+MANIFEST_VERSION = 1
+
+# How the last install() populated the registry ("manifest", "rebuilt", "eager").
+LAST_MODE = ""
+
+# Files whose edits change what the manifest records (besides the effect modules).
+_CORE_FILES = (
+    "behaviors/auto_load.py",
+    "behaviors/capabilities_catalog.json",
+    "export/export_eligibility.py",
+)
+
+
+def manifest_path() -> Path:
+    env = os.environ.get("MODULO_BEHAVIOR_MANIFEST")
+    if env:
+        return Path(env)
+    return ROOT / "out" / "behavior_manifest.json"
+
+
+def _stamp(rel: str) -> Optional[List[int]]:
+    try:
+        st = (ROOT / rel).stat()
+        return [int(st.st_mtime_ns), int(st.st_size)]
+    except Exception:
+        return None
+
+
+def _module_relpath(module: str) -> str:
+    return module.replace(".", "/") + ".py"
+
+
+def register_all_calls() -> List[str]:
+    """Names of the register_*() functions register_all() calls, in order (AST, no import)."""
+    import ast  # only needed when rebuilding
+
+    src = (ROOT / "behaviors" / "auto_load.py").read_text(encoding="utf-8")
+    for node in ast.parse(src).body:
+        if isinstance(node, ast.FunctionDef) and node.name == "register_all":
+            out = []
+            for st in node.body:
+                if (isinstance(st, ast.Expr) and isinstance(st.value, ast.Call)
+                        and isinstance(st.value.func, ast.Name)):
+                    out.append(st.value.func.id)
+            return out
+    return []
+
+
+def build_manifest() -> Dict[str, Any]:
+    """Eagerly register every shipped behavior and record the manifest for it."""
+    from behaviors import auto_load
+    from behaviors.registry import REGISTRY
+    from export.export_eligibility import get_eligibility
+
+    behaviors: Dict[str, Dict[str, Any]] = {}
+    modules = set()
+    for name in register_all_calls():
+        fn = getattr(auto_load, name)
+        before = set(dict.keys(REGISTRY))
+        fn()
+        module = str(getattr(fn, "__module__", "") or "")
+        modules.add(module)
+        for key in [k for k in dict.keys(REGISTRY) if k not in before]:
+            d = dict.__getitem__(REGISTRY, key)
+            elig = get_eligibility(key)
+            behaviors[key] = {
+                "module": module,
+                "register": name,
+                "title": d.title,
+                "uses": list(d.uses),
+                "capabilities": dict(d.capabilities),
+                "export": {"status": str(elig.status), "reason": str(elig.reason or "")},
+            }
+    files = {rel: _stamp(rel) for rel in _CORE_FILES}
+    for m in sorted(modules):
+        rel = _module_relpath(m)
+        files[rel] = _stamp(rel)
+    return {"version": MANIFEST_VERSION, "files": files, "behaviors": behaviors}
+
+
+def is_fresh(manifest: Dict[str, Any]) -> bool:
+    try:
+        if int(manifest.get("version", 0)) != MANIFEST_VERSION:
+            return False
+        files = manifest.get("files") or {}
+        if any(rel not in files for rel in _CORE_FILES):
+            return False
+        for rel, stamp in files.items():
+            cur = _stamp(rel)
+            if cur is None or list(stamp or []) != cur:
+                return False
+        return bool(manifest.get("behaviors"))
+    except Exception:
+        return False
+
+
+def load_manifest(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """The on-disk manifest if it exists and is fresh, else None."""
+    p = Path(path) if path is not None else manifest_path()
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) and is_fresh(data) else None
+
+
+def write_manifest(manifest: Dict[str, Any], path: Optional[Path] = None) -> Optional[Path]:
+    """Atomically write the manifest; returns the path, or None if it could not be written."""
+    p = Path(path) if path is not None else manifest_path()
+    tmp = p.with_name(p.name + f".tmp{os.getpid()}")
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+        os.replace(tmp, p)
+        return p
+    except Exception:
+        try:
+            tmp.unlink()
+        except Exception:
+            pass
+        return None
+
+
+def install(*, eager: Optional[bool] = None) -> str:
+    """Populate REGISTRY: from a fresh manifest (lazy) or by eager registration.
+
+    Returns "manifest", "rebuilt" or "eager".
+    """
+    global LAST_MODE
+    from behaviors.registry import REGISTRY, reset_capabilities_cache
+
+    if eager is None:
+        eager = os.environ.get("MODULO_EAGER_BEHAVIORS", "").strip() not in ("", "0")
+    if eager:
+        from behaviors.auto_load import register_all
+        register_all()
+        LAST_MODE = "eager"
+        return LAST_MODE
+
+    manifest = load_manifest()
+    mode = "manifest"
+    if manifest is None:
+        try:
+            manifest = build_manifest()
+        except Exception:
+            # Never fail the import over the manifest: register everything the slow way.
+            from behaviors.auto_load import register_all
+            register_all()
+            LAST_MODE = "eager"
+            return LAST_MODE
+        write_manifest(manifest)  # best-effort; None on a read-only tree
+        mode = "rebuilt"
+    REGISTRY.declare(manifest.get("behaviors") or {})
+    # The catalog's shipped flags come from the declared keys.
+    reset_capabilities_cache()
+    LAST_MODE = mode
+    return mode
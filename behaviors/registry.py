@@ -1,14 +1,104 @@
 from __future__ import annotations
 from export.export_eligibility import get_eligibility, ExportStatus
 
-REGISTRY = {}
-# Back-compat alias used by older diagnostics/utilities.
-EFFECTS = REGISTRY
-
+import importlib
 import json
 from pathlib import Path
 import re
 
+
+class _LazyRegistry(dict):
+    """Behavior registry that lists manifest keys without importing their modules.
+
+    The dict itself holds loaded BehaviorDefs. Keys declared by the behavior manifest
+    (behaviors/manifest.py) are visible to `in`, iteration, len() and keys(); the owning
+    module is imported and its register_*() run on first get()/[] for one of its keys.
+    values()/items() load everything.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._declared = {}
+        self._ran = set()
+        self.load_errors = {}
+
+    def declare(self, entries):
+        """Replace the manifest entries ({key: {module, register, title, ...}})."""
+        self._declared = dict(entries or {})
+        self._ran = set()
+        self.load_errors = {}
+
+    def declared(self, key):
+        return self._declared.get(str(key))
+
+    def is_loaded(self, key) -> bool:
+        return dict.__contains__(self, key)
+
+    def _load(self, key):
+        ent = self._declared.get(key)
+        if ent is None:
+            return None
+        tag = (ent.get('module'), ent.get('register'))
+        if tag not in self._ran:
+            self._ran.add(tag)
+            try:
+                mod = importlib.import_module(str(tag[0]))
+                getattr(mod, str(tag[1]))()
+            except Exception as e:
+                self.load_errors[key] = f"{type(e).__name__}: {e}"
+        return dict.get(self, key)
+
+    def load_all(self):
+        for k in list(self._declared):
+            if not dict.__contains__(self, k):
+                self._load(k)
+
+    def _all_keys(self):
+        out = list(self._declared)
+        out.extend(k for k in dict.keys(self) if k not in self._declared)
+        return out
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        d = self._load(key)
+        return default if d is None else d
+
+    def __getitem__(self, key):
+        d = self.get(key)
+        if d is None:
+            raise KeyError(key)
+        return d
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._declared
+
+    def __iter__(self):
+        return iter(self._all_keys())
+
+    def __len__(self):
+        return len(self._all_keys())
+
+    def keys(self):
+        return dict.fromkeys(self._all_keys()).keys()
+
+    def values(self):
+        self.load_all()
+        return [dict.__getitem__(self, k) for k in self._all_keys() if dict.__contains__(self, k)]
+
+    def items(self):
+        self.load_all()
+        return [(k, dict.__getitem__(self, k)) for k in self._all_keys() if dict.__contains__(self, k)]
+
+    def clear(self):
+        dict.clear(self)
+        self.declare({})
+
+
+REGISTRY = _LazyRegistry()
+# Back-compat alias used by older diagnostics/utilities.
+EFFECTS = REGISTRY
+
 def _parse_auto_load_shipped_keys(root: Path) -> set[str]:
     """Return set of shipped effect keys by parsing behaviors/auto_load.py register_*() calls."""
     p = root/'behaviors'/'auto_load.py'
@@ -22,6 +112,19 @@ def _parse_auto_load_shipped_keys(root: Path) -> set[str]:
 
 _CAPS_CACHE = None
 
+
+def _shipped_keys(root: Path) -> set[str]:
+    """Shipped keys: the behavior manifest when installed, else parsed from auto_load.py."""
+    declared = list(REGISTRY._declared)
+    if declared:
+        return set(declared)
+    return _parse_auto_load_shipped_keys(root)
+
+
+def reset_capabilities_cache() -> None:
+    global _CAPS_CACHE
+    _CAPS_CACHE = None
+
 def load_capabilities_catalog():
     global _CAPS_CACHE
     if _CAPS_CACHE is not None:
@@ -32,9 +135,9 @@ def load_capabilities_catalog():
         _CAPS_CACHE = {'version':1,'effects':{}}
         return _CAPS_CACHE
     _CAPS_CACHE = json.loads(p.read_text(encoding='utf-8'))
-    # Merge shipped status from behaviors/auto_load.py so UI can reliably list shipped effects
+    # Merge shipped status (manifest / auto_load.py) so UI can reliably list shipped effects
     try:
-        shipped = _parse_auto_load_shipped_keys(root)
+        shipped = _shipped_keys(root)
         eff = _CAPS_CACHE.setdefault('effects', {})
         for k, v in eff.items():
             if isinstance(v, dict):
@@ -49,17 +152,24 @@ def load_capabilities_catalog():
 
 class BehaviorDef:
     # stateful=True means preview_emit receives and may mutate EffectState
+    # state_version: layout of the per-layer state; hot reload (behaviors.reload) keeps live
+    # state when old and new versions match, else calls migrate_state(state, old_version)
+    # -> new state when given, else resets the state.
 
-    def __init__(self, key, *, preview_emit, arduino_emit, uses=None, title=None, capabilities=None):
+    def __init__(self, key, *, preview_emit, arduino_emit, uses=None, title=None, capabilities=None,
+                 state_version=None, migrate_state=None):
         self.key = str(key)
         self.title = title or self.key
         self.preview_emit = preview_emit
         self.arduino_emit = arduino_emit
         self.uses = list(uses or [])
         self.capabilities = dict(capabilities or {})
+        self.state_version = state_version
+        self.migrate_state = migrate_state
 
 def register(defn: BehaviorDef):
-    if defn.key in REGISTRY:
+    # Manifest-declared keys are registered by their module on first use.
+    if REGISTRY.is_loaded(defn.key):
         raise ValueError(f"Duplicate behavior key: {defn.key}")
     if defn.preview_emit is None or defn.arduino_emit is None:
         raise ValueError(f"Behavior '{defn.key}' missing parity (preview_emit + arduino_emit required).")
@@ -78,6 +188,17 @@ def register_effect(defn: BehaviorDef):
 def get_effect(key: str):
     return REGISTRY.get(str(key))
 
+def describe_effect(key: str):
+    """Manifest summary for `key` (title, uses, capabilities, export) without importing it."""
+    key = str(key)
+    ent = REGISTRY.declared(key)
+    if ent is not None:
+        return dict(ent)
+    d = REGISTRY.get(key) if REGISTRY.is_loaded(key) else None
+    if d is None:
+        return None
+    return {'title': d.title, 'uses': list(d.uses), 'capabilities': dict(d.capabilities)}
+
 def list_effects():
     return list(REGISTRY.keys())
 
@@ -116,20 +116,11 @@ def circle_collide(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
     return (dx*dx + dy*dy) <= (ar+br)*(ar+br)
 
 def find_collisions(state: Dict[str, Any], *, tag_a: str="", tag_b: str="") -> List[Tuple[int,int]]:
+    """Colliding (id, id) pairs among alive entities, in list order (grid broadphase)."""
+    from runtime.broadphase_v1 import BroadphaseV1  # local: runtime imports this module
     lst = [e for e in entities_from_state(state) if bool(e.get("alive",True))]
-    hits=[]
-    for i in range(len(lst)):
-        for j in range(i+1, len(lst)):
-            ea, eb = lst[i], lst[j]
-            if tag_a and str(ea.get("tag","")) != tag_a and str(eb.get("tag","")) != tag_a:
-                continue
-            if tag_b:
-                ta, tb = str(ea.get("tag","")), str(eb.get("tag",""))
-                if not ((ta==tag_a and tb==tag_b) or (ta==tag_b and tb==tag_a)):
-                    continue
-            if circle_collide(ea, eb):
-                hits.append((int(ea.get("id",0)), int(eb.get("id",0))))
-    return hits
+    bp = BroadphaseV1().rebuild_dicts(lst)
+    return [(int(lst[i].get("id",0)), int(lst[j].get("id",0))) for i, j in bp.overlapping_pairs(tag_a, tag_b)]
 
 def grid_xy_from_strip(i: int, w: int, h: int) -> Tuple[int,int]:
     """Map strip index to x,y in row-major w*h (for simple sims on strip)."""
@@ -157,19 +148,27 @@ def apply_projectile_hits(state: Dict[str, Any], *, bullet_tag: str="bullet", ta
     bullets = [e for e in lst if bool(e.get("alive",True)) and str(e.get("tag","")) == bullet_tag]
     targets = [e for e in lst if bool(e.get("alive",True)) and str(e.get("tag","")) == target_tag]
     hits = 0
-    for b in bullets:
-        for t in targets:
-            if not bool(b.get("alive",True)) or not bool(t.get("alive",True)):
+    if not bullets or not targets:
+        return 0
+    from runtime.broadphase_v1 import BroadphaseV1, arrays_from_dicts
+    bp = BroadphaseV1().rebuild_dicts(targets)
+    bxs, bys, brs = arrays_from_dicts(bullets)[:3]
+    for k, b in enumerate(bullets):
+        if not bool(b.get("alive",True)):
+            continue  # killed as a target earlier (bullet_tag == target_tag)
+        # targets overlapping this bullet, in list order; first alive one takes the hit
+        for ti in bp.query_circle(bxs[k], bys[k], brs[k]):
+            t = targets[ti]
+            if not bool(t.get("alive",True)):
                 continue
-            if circle_collide(b, t):
-                b["alive"] = False
-                hp = int(t.get("hp", 1))
-                hp -= int(damage)
-                t["hp"] = hp
-                hits += 1
-                if hp <= 0:
-                    t["alive"] = False
-                break
+            b["alive"] = False
+            hp = int(t.get("hp", 1))
+            hp -= int(damage)
+            t["hp"] = hp
+            hits += 1
+            if hp <= 0:
+                t["alive"] = False
+            break
     if hits:
         purge_dead(state)
     return hits
@@ -9,6 +9,11 @@ from params.purpose_contract import ensure as ensure_purpose, clamp as clamp_pur
 # Exportable surface matrix (single source of truth)
 from export.exportable_surface import RULES_LAYER_PARAMS_EXPORTABLE
 from export.export_eligibility import get_eligibility, ExportStatus
+from export.export_cache import SECTION_CACHE
+from export.fixed_math import emit_math_blocks, normalize_math_mode, resolve_math_mode
+from export.telemetry import emit_telemetry_blocks, telemetry_config
+from export.budget import KernelCost, LookupTablePlan, plan_lookup_tables, plan_rules_mode
+from export.luts import emit_gamma_luts, emit_xy_impl, lut_storage_prelude, matrix_xy_table
 
 
 TOKEN_RE = re.compile(r"@@[A-Z0-9_]+@@")
@@ -182,6 +187,187 @@ def _emit_postfx_blocks(*, project: dict, shape: str, num_leds: int) -> tuple[st
     apply.append("")
 
     return ("\n".join(decls) + "\n", "\n".join(apply) + "\n")
+
+
+def _rules_v6_order(rules: list) -> list:
+    """Rules in stable emission order (name, id); non-dict entries dropped."""
+    def _rk(r: dict):
+        return (str(r.get("name","") or ""), str(r.get("id","") or ""))
+    out = [r for r in rules if isinstance(r, dict)]
+    out.sort(key=_rk)
+    return out
+
+
+def _rules_v6_vars(p: dict) -> tuple[dict, dict, dict, dict]:
+    """(number vars, toggle vars, number name -> index, toggle name -> index) from project.variables."""
+    vars0 = (p.get("variables") or {}) if isinstance(p.get("variables"), dict) else {}
+    num_vars = vars0.get("number") if isinstance(vars0.get("number"), dict) else {}
+    tog_vars = vars0.get("toggle") if isinstance(vars0.get("toggle"), dict) else {}
+    num_map = {str(k): i for i, k in enumerate(num_vars.keys())}
+    tog_map = {str(k): i for i, k in enumerate(tog_vars.keys())}
+    return num_vars, tog_vars, num_map, tog_map
+
+
+def _rules_v6_var_decls(num_vars: dict, tog_vars: dict) -> list[str]:
+    num_names = list(num_vars.keys())
+    tog_names = list(tog_vars.keys())
+    decls: list[str] = []
+    decls.append(f"static const uint8_t VNUM_N = {len(num_names)};")
+    decls.append(f"static const uint8_t VTOG_N = {len(tog_names)};")
+    if num_names:
+        decls.append("static float VNUM[VNUM_N] = {" + ", ".join(f"{float(num_vars.get(n,0.0)):.6f}f" for n in num_names) + "};")
+    else:
+        decls.append("static float VNUM[1] = {0.0f};")
+    if tog_names:
+        decls.append("static bool VTOG[VTOG_N] = {" + ", ".join("true" if bool(tog_vars.get(n, False)) else "false" for n in tog_names) + "};")
+    else:
+        decls.append("static bool VTOG[1] = {false};")
+    return decls
+
+
+def _rules_signal_expr(sigkey: str, num_map: dict, tog_map: dict) -> str:
+    """Map a project signal key -> Arduino expression.
+
+    This exporter supports both legacy and new-style keys:
+      - Legacy audio keys: audio_energy, audio_mono_0..6, audio_left_0..6, audio_right_0..6
+      - New signal-bus keys: audio.energy, audio.mono0..6, audio.L0..6, audio.R0..6
+      - Variable keys: vars.number.<name>, vars.toggle.<name>
+
+    Unknown keys resolve to 0.0f (fail-closed semantics for expressions); audio_peak
+    raises ExportValidationError.
+    """
+    # Import mapping lazily
+    try:
+        from export.signal_expr_map import arduino_expr_for_signal
+    except Exception:
+        arduino_expr_for_signal = None
+
+    if not isinstance(sigkey, str) or not sigkey.strip():
+        return "0.0f"
+    k = sigkey.strip()
+
+    # Variables (Phase 6.2 bridge)
+    if k.startswith("vars.number."):
+        nm = k[len("vars.number."):]
+        if nm in num_map:
+            return f"(float)(VNUM[{num_map[nm]}])"
+        return "0.0f"
+    if k.startswith("vars.toggle."):
+        nm = k[len("vars.toggle."):]
+        if nm in tog_map:
+            return f"(VTOG[{tog_map[nm]}] ? 1.0f : 0.0f)"
+        return "0.0f"
+
+    # Normalize new-style audio keys to legacy keys understood by signal_expr_map
+    # audio.energy -> audio_energy
+    if k == "audio.energy":
+        k = "audio_energy"
+    elif k.startswith("audio.mono"):
+        suf = k[len("audio.mono"):]
+        if suf.isdigit():
+            k = f"audio_mono_{suf}"
+    elif k.startswith("audio.L"):
+        suf = k[len("audio.L"):]
+        if suf.isdigit():
+            k = f"audio_left_{suf}"
+    elif k.startswith("audio.R"):
+        suf = k[len("audio.R"):]
+        if suf.isdigit():
+            k = f"audio_right_{suf}"
+
+    if k == "audio_peak":
+        # Listed in the beta signal set, but no engine source produces it: the preview reads
+        # it as 0 and no export template declares a peak global.
+        raise ExportValidationError(
+            "[E_RULE_SIGNAL_NOT_EXPORTABLE] rules_v6 signal 'audio_peak' has no engine source; "
+            "use audio.energy or an audio.monoN band."
+        )
+    if arduino_expr_for_signal is None:
+        return "0.0f"
+    ex = arduino_expr_for_signal(k)
+    return "0.0f" if ex is None else f"(float)({ex})"
+
+
+def _validate_rule_v6_action(p: dict, rid: str, action: dict, num_map: dict, tog_map: dict) -> None:
+    """Fail-closed checks shared by both Rules V6 emitters.
+
+    Resolves the operator slot for op_gain/op_gamma (stored on the action as
+    _op_gain_slot/_op_gamma_slot) and checks var references.
+    """
+    kind = str(action.get("kind","") or "")
+    # Phase A3.6+: allow only the canonical exportable surface for set_layer_param.
+    if kind == "set_layer_param":
+        _p = str(action.get("param","") or "").strip().lower()
+        if _p not in set(RULES_LAYER_PARAMS_EXPORTABLE):
+            allowed = ", ".join([repr(x) for x in RULES_LAYER_PARAMS_EXPORTABLE])
+            raise ExportValidationError(
+                f"[E_RULE_LAYER_PARAM_UNSUPPORTED] rules_v6 rule '{rid}' uses set_layer_param for '{_p}' (exportable params: {allowed})."
+            )
+
+        for param, op_kind, code in (("op_gain", "gain", "E_RULE_OP_GAIN_NO_OPERATOR"),
+                                     ("op_gamma", "gamma", "E_RULE_OP_GAMMA_NO_OPERATOR")):
+            if _p != param:
+                continue
+            # Resolve deterministic operator slot on the referenced layer.
+            try:
+                li = int(action.get("layer", 0) or 0)
+            except Exception:
+                li = 0
+            layers0 = p.get("layers") or []
+            layer = layers0[li] if (isinstance(layers0, list) and 0 <= li < len(layers0)) else None
+            ops0 = (layer or {}).get("operators") if isinstance(layer, dict) else None
+            if not isinstance(ops0, list):
+                ops0 = []
+            slot = -1
+            for i, od in enumerate(ops0[:2]):  # OPS_PER_LAYER is 2
+                if not isinstance(od, dict):
+                    continue
+                if not bool(od.get("enabled", True)):
+                    continue
+                if str(od.get("kind","") or "").strip().lower() == op_kind:
+                    slot = i
+                    break
+            if slot < 0:
+                raise ExportValidationError(
+                    f"[{code}] rules_v6 rule '{rid}' requests {param} on layer {li}, but that layer has no enabled {op_kind} operator in the first {2} slots."
+                )
+            # Store for the emitter
+            action[f"_{param}_slot"] = slot
+
+    var_kind = str(action.get("var_kind","number") or "number")
+    var_name = str(action.get("var","") or "")
+
+    # Validate var existence
+    if kind in ("set_var","add_var"):
+        if var_kind != "number":
+            raise ExportValidationError(f"[E_RULE_BAD_VAR_KIND] rules_v6 rule '{rid}' kind={kind} requires var_kind=number.")
+        if var_name not in num_map:
+            raise ExportValidationError(f"[E_RULE_UNKNOWN_VAR] rules_v6 rule '{rid}' refers to unknown number var '{var_name}'. Define it in project.variables.number.")
+    if kind == "flip_toggle":
+        if var_kind != "toggle":
+            raise ExportValidationError(f"[E_RULE_BAD_VAR_KIND] rules_v6 rule '{rid}' flip_toggle requires var_kind=toggle.")
+        if var_name not in tog_map:
+            raise ExportValidationError(f"[E_RULE_UNKNOWN_VAR] rules_v6 rule '{rid}' refers to unknown toggle var '{var_name}'. Define it in project.variables.toggle.")
+
+
+def _rule_op_index(action: dict, slot_key: str) -> int:
+    """Operator slot for op_gain/op_gamma: explicit op_index, else the slot resolved at validation, else 0."""
+    try:
+        oi = int(action.get("op_index", -1) or -1)
+    except Exception:
+        oi = -1
+    # If not specified, we'll use a precomputed slot stored on action by the exporter.
+    try:
+        oi2 = int(action.get(slot_key, -1) or -1)
+    except Exception:
+        oi2 = -1
+    if oi < 0:
+        oi = oi2
+    if oi < 0:
+        oi = 0
+    return oi
+
+
 def _emit_rules_v6_blocks(*, project: dict) -> tuple[str, str]:
     """Phase 6.3: Arduino Rules V6 runtime (minimal deterministic subset).
 
@@ -194,58 +380,24 @@ def _emit_rules_v6_blocks(*, project: dict) -> tuple[str, str]:
     Notes:
       - Variables must be declared in project['variables'] (fail-closed on unknown var).
       - Uses export.signal_expr_map for known exportable signals (audio_*).
+      - Each rule is unrolled into straight-line code; _emit_rules_v6_table_blocks
+        encodes the same rules as a table for large rule sets.
     """
     p = project or {}
     rules = p.get("rules_v6") or []
     if not isinstance(rules, list) or not rules:
         return ("// Rules V6 disabled\n", "// Rules V6 disabled\n")
 
-    # Import mapping lazily
-    try:
-        from export.signal_expr_map import arduino_expr_for_signal
-    except Exception:
-        arduino_expr_for_signal = None
+    num_vars, tog_vars, num_map, tog_map = _rules_v6_vars(p)
+    rules_list = _rules_v6_order(rules)
 
-    # Variables (explicit names)
-    vars0 = (p.get("variables") or {}) if isinstance(p.get("variables"), dict) else {}
-    num_vars = vars0.get("number") if isinstance(vars0.get("number"), dict) else {}
-    tog_vars = vars0.get("toggle") if isinstance(vars0.get("toggle"), dict) else {}
-
-    # Stable order by (name,id)
-    def _rk(r: dict):
-        rr = r if isinstance(r, dict) else {}
-        return (str(rr.get("name","") or ""), str(rr.get("id","") or ""))
-    rules_list = [r for r in rules if isinstance(r, dict)]
-    rules_list.sort(key=_rk)
-
-    # Sanitize identifiers
-    def _sid(s: str) -> str:
-        s = re.sub(r"[^A-Za-z0-9_]+", "_", str(s or ""))
-        if not s:
-            s = "x"
-        if s[0].isdigit():
-            s = "_" + s
-        return s
-
-    # Build var index maps
-    num_names = list(num_vars.keys())
-    tog_names = list(tog_vars.keys())
-    num_map = {str(k): i for i, k in enumerate(num_names)}
-    tog_map = {str(k): i for i, k in enumerate(tog_names)}
+    def _ardu_expr_signal(sigkey: str) -> str:
+        return _rules_signal_expr(sigkey, num_map, tog_map)
 
     decls: list[str] = []
     decls.append("// RULES_V6 (Phase 6.3): minimal deterministic runtime")
     decls.append(f"#define MODULA_RULES_V6_ENABLED 1")
-    decls.append(f"static const uint8_t VNUM_N = {len(num_names)};")
-    decls.append(f"static const uint8_t VTOG_N = {len(tog_names)};")
-    if num_names:
-        decls.append("static float VNUM[VNUM_N] = {" + ", ".join(f"{float(num_vars.get(n,0.0)):.6f}f" for n in num_names) + "};")
-    else:
-        decls.append("static float VNUM[1] = {0.0f};")
-    if tog_names:
-        decls.append("static bool VTOG[VTOG_N] = {" + ", ".join("true" if bool(tog_vars.get(n, False)) else "false" for n in tog_names) + "};")
-    else:
-        decls.append("static bool VTOG[1] = {false};")
+    decls.extend(_rules_v6_var_decls(num_vars, tog_vars))
 
     # Rule state arrays
     n_rules = len([r for r in rules_list if str(r.get("id","") or "")])
@@ -297,84 +449,10 @@ def _emit_rules_v6_blocks(*, project: dict) -> tuple[str, str]:
 
         action = r.get("action") if isinstance(r.get("action"), dict) else {}
         kind = str(action.get("kind","") or "")
-        # Phase A3.6+: allow only the canonical exportable surface for set_layer_param.
-        if kind == "set_layer_param":
-            _p = str(action.get("param","") or "").strip().lower()
-            if _p not in set(RULES_LAYER_PARAMS_EXPORTABLE):
-                allowed = ", ".join([repr(x) for x in RULES_LAYER_PARAMS_EXPORTABLE])
-                raise ExportValidationError(
-                    f"[E_RULE_LAYER_PARAM_UNSUPPORTED] rules_v6 rule '{rid}' uses set_layer_param for '{_p}' (exportable params: {allowed})."
-                )
+        _validate_rule_v6_action(p, rid, action, num_map, tog_map)
 
-            if _p == "op_gain":
-                # Resolve deterministic operator slot for gain on the referenced layer.
-                try:
-                    li = int(action.get("layer", 0) or 0)
-                except Exception:
-                    li = 0
-                layers0 = p.get("layers") or []
-                layer = layers0[li] if (isinstance(layers0, list) and 0 <= li < len(layers0)) else None
-                ops0 = (layer or {}).get("operators") if isinstance(layer, dict) else None
-                if not isinstance(ops0, list):
-                    ops0 = []
-                slot = -1
-                for i, od in enumerate(ops0[:2]):  # OPS_PER_LAYER is 2
-                    if not isinstance(od, dict):
-                        continue
-                    if not bool(od.get("enabled", True)):
-                        continue
-                    if str(od.get("kind","") or "").strip().lower() == "gain":
-                        slot = i
-                        break
-                if slot < 0:
-                    raise ExportValidationError(
-                        f"[E_RULE_OP_GAIN_NO_OPERATOR] rules_v6 rule '{rid}' requests op_gain on layer {li}, but that layer has no enabled gain operator in the first {2} slots."
-                    )
-
-                # Store for the emitter
-                action["_op_gain_slot"] = slot
-
-            if _p == "op_gamma":
-                # Resolve deterministic operator slot for gamma on the referenced layer.
-                try:
-                    li = int(action.get("layer", 0) or 0)
-                except Exception:
-                    li = 0
-                layers0 = p.get("layers") or []
-                layer = layers0[li] if (isinstance(layers0, list) and 0 <= li < len(layers0)) else None
-                ops0 = (layer or {}).get("operators") if isinstance(layer, dict) else None
-                if not isinstance(ops0, list):
-                    ops0 = []
-                slot = -1
-                for i, od in enumerate(ops0[:2]):
-                    if not isinstance(od, dict):
-                        continue
-                    if not bool(od.get("enabled", True)):
-                        continue
-                    if str(od.get("kind","") or "").strip().lower() == "gamma":
-                        slot = i
-                        break
-                if slot < 0:
-                    raise ExportValidationError(
-                        f"[E_RULE_OP_GAMMA_NO_OPERATOR] rules_v6 rule '{rid}' requests op_gamma on layer {li}, but that layer has no enabled gamma operator in the first {2} slots."
-                    )
-                action["_op_gamma_slot"] = slot
-
-        var_kind = str(action.get("var_kind","number") or "number")
         var_name = str(action.get("var","") or "")
 
-        # Validate var existence
-        if kind in ("set_var","add_var"):
-            if var_kind != "number":
-                raise ExportValidationError(f"[E_RULE_BAD_VAR_KIND] rules_v6 rule '{rid}' kind={kind} requires var_kind=number.")
-            if var_name not in num_map:
-                raise ExportValidationError(f"[E_RULE_UNKNOWN_VAR] rules_v6 rule '{rid}' refers to unknown number var '{var_name}'. Define it in project.variables.number.")
-        if kind == "flip_toggle":
-            if var_kind != "toggle":
-                raise ExportValidationError(f"[E_RULE_BAD_VAR_KIND] rules_v6 rule '{rid}' flip_toggle requires var_kind=toggle.")
-            if var_name not in tog_map:
-                raise ExportValidationError(f"[E_RULE_UNKNOWN_VAR] rules_v6 rule '{rid}' refers to unknown toggle var '{var_name}'. Define it in project.variables.toggle.")
-
         # Expression for action
         expr = action.get("expr") if isinstance(action.get("expr"), dict) else {"src":"const","const":0.0}
         src = str(expr.get("src","const") or "const")
@@ -382,55 +460,6 @@ def _emit_rules_v6_blocks(*, project: dict) -> tuple[str, str]:
         bias = float(expr.get("bias", 0.0) or 0.0)
         as_bool = bool(expr.get("as_bool", False))
 
-        def _ardu_expr_signal(sigkey: str) -> str:
-            """Map a project signal key -> Arduino expression.
-
-            This exporter supports both legacy and new-style keys:
-              - Legacy audio keys: audio_energy, audio_mono_0..6, audio_left_0..6, audio_right_0..6
-              - New signal-bus keys: audio.energy, audio.mono0..6, audio.L0..6, audio.R0..6
-              - Variable keys: vars.number.<name>, vars.toggle.<name>
-
-            Unknown keys resolve to 0.0f (fail-closed semantics for expressions).
-            """
-
-            if not isinstance(sigkey, str) or not sigkey.strip():
-                return "0.0f"
-            k = sigkey.strip()
-
-            # Variables (Phase 6.2 bridge)
-            if k.startswith("vars.number."):
-                nm = k[len("vars.number."):]
-                if nm in num_map:
-                    return f"(float)(VNUM[{num_map[nm]}])"
-                return "0.0f"
-            if k.startswith("vars.toggle."):
-                nm = k[len("vars.toggle."):]
-                if nm in tog_map:
-                    return f"(VTOG[{tog_map[nm]}] ? 1.0f : 0.0f)"
-                return "0.0f"
-
-            # Normalize new-style audio keys to legacy keys understood by signal_expr_map
-            # audio.energy -> audio_energy
-            if k == "audio.energy":
-                k = "audio_energy"
-            elif k.startswith("audio.mono"):
-                suf = k[len("audio.mono"):]
-                if suf.isdigit():
-                    k = f"audio_mono_{suf}"
-            elif k.startswith("audio.L"):
-                suf = k[len("audio.L"):]
-                if suf.isdigit():
-                    k = f"audio_left_{suf}"
-            elif k.startswith("audio.R"):
-                suf = k[len("audio.R"):]
-                if suf.isdigit():
-                    k = f"audio_right_{suf}"
-
-            if arduino_expr_for_signal is None:
-                return "0.0f"
-            ex = arduino_expr_for_signal(k)
-            return "0.0f" if ex is None else f"(float)({ex})"
-
         def _emit_expr(e: dict) -> str:
             ssrc = str(e.get("src","const") or "const")
             sscale = float(e.get("scale", 1.0) or 1.0)
@@ -547,19 +576,7 @@ def _emit_rules_v6_blocks(*, project: dict) -> tuple[str, str]:
                 # Rules→Operators bridge: set gain operator param0 at a deterministic slot.
                 # Uses first gain operator slot on the layer (computed at export time).
                 # If no gain operator exists for this layer, export is blocked earlier.
-                try:
-                    oi = int(action.get("op_index", -1) or -1)
-                except Exception:
-                    oi = -1
-                # If not specified, we'll use a precomputed slot stored on action by the exporter.
-                try:
-                    oi2 = int(action.get("_op_gain_slot", -1) or -1)
-                except Exception:
-                    oi2 = -1
-                if oi < 0:
-                    oi = oi2
-                if oi < 0:
-                    oi = 0
+                oi = _rule_op_index(action, "_op_gain_slot")
                 apply.append(f"          const int oi = {oi};")
                 apply.append("          if (oi >= 0 && oi < OPS_PER_LAYER) {")
                 apply.append(f"            float v = (float)({_arduino_clamp_expr('operator_gain', ex)});")
@@ -577,19 +594,7 @@ def _emit_rules_v6_blocks(*, project: dict) -> tuple[str, str]:
                 # Rules→Operators bridge: set gamma operator param0 at a deterministic slot.
                 # Uses first gamma operator slot on the layer (computed at export time).
                 # If no gamma operator exists for this layer, export is blocked earlier.
-                try:
-                    oi = int(action.get("op_index", -1) or -1)
-                except Exception:
-                    oi = -1
-                # If not specified, we'll use a precomputed slot stored on action by the exporter.
-                try:
-                    oi2 = int(action.get("_op_gamma_slot", -1) or -1)
-                except Exception:
-                    oi2 = -1
-                if oi < 0:
-                    oi = oi2
-                if oi < 0:
-                    oi = 0
+                oi = _rule_op_index(action, "_op_gamma_slot")
                 apply.append(f"          const int oi = {oi};")
                 apply.append("          if (oi >= 0 && oi < OPS_PER_LAYER) {")
                 apply.append(f"            float v = (float)({_arduino_clamp_expr('gamma', ex)});")
@@ -665,6 +670,332 @@ def _emit_rules_v6_blocks(*, project: dict) -> tuple[str, str]:
     return ("\n".join(decls) + "\n", "\n".join(apply) + "\n")
 
 
+# Rules V6 table mode: row encodings shared with the interpreter in RULES_TABLE_RUNTIME.
+RULES_TABLE_TRIGGERS = {"tick": 0, "rising": 1, "above": 2, "below": 3}
+RULES_TABLE_ACTIONS = {"set_var": 1, "add_var": 2, "flip_toggle": 3, "set_layer_param": 4}  # 0 = ignored
+RULES_TABLE_PARAMS = {"opacity": 0, "brightness": 1, "op_gain": 2, "op_gamma": 3,
+                      "postfx_trail": 4, "postfx_bleed": 5, "postfx_bleed_radius": 6}
+RULES_TABLE_OPS = {">": 0, ">=": 1, "<": 2, "<=": 3, "==": 4}
+RULES_TABLE_CONFLICTS = {"last": 0, "first": 1, "max": 2, "min": 3}
+
+RULES_TABLE_DECLS = """// Rules V6 table mode: one RuleRow per enabled rule, interpreted by rules_tab_run()
+#define RT_TICK 0
+#define RT_RISING 1
+#define RT_ABOVE 2
+#define RT_BELOW 3
+#define RA_NONE 0
+#define RA_SET_VAR 1
+#define RA_ADD_VAR 2
+#define RA_FLIP_TOGGLE 3
+#define RA_SET_PARAM 4
+#define RC_LAST 0
+#define RC_FIRST 1
+#define RC_MAX 2
+#define RC_MIN 3
+typedef struct {
+  float thr, hyst;            // threshold triggers
+  float k, scale, bias;       // action value: (esig ? signal : k) * scale + bias
+  uint16_t cond0;             // conditions RULE_CONDS[cond0 .. cond0+cond_n)
+  int16_t layer;
+  uint8_t trig, sig, cond_n, cond_any;
+  uint8_t act, arg, conflict, esig, as_bool;
+  int8_t slot;
+} RuleRow;
+typedef struct {
+  float v;
+  uint8_t sig, op;            // op: 0 >, 1 >=, 2 <, 3 <=, 4 ==
+} RuleCond;
+#if MODULO_LUT_PROGMEM
+#define RULES_ROW(dst, tab, i) memcpy_P(&(dst), &(tab)[(i)], sizeof(dst))
+#else
+#define RULES_ROW(dst, tab, i) ((dst) = (tab)[(i)])
+#endif
+"""
+
+RULES_TABLE_RUNTIME = """// --- Rules V6 table interpreter (fixed loop over RULES_TAB) ---
+static inline float rules_read_signal(uint8_t sk){
+  // 0 = no/unknown signal; ids assigned at export
+  switch(sk){
+@@SIGNAL_CASES@@    default: return 0.0f;
+  }
+}
+
+static inline bool rules_cmp(float a, uint8_t op, float b){
+  switch(op){
+    case 1: return a >= b;
+    case 2: return a < b;
+    case 3: return a <= b;
+    case 4: return a == b;
+    default: return a > b;
+  }
+}
+
+static inline void rules_store_f(float &rt, bool &set, float v, uint8_t cf){
+  if (cf == RC_FIRST) { if (!set) { rt = v; set = true; } }
+  else if (cf == RC_MAX) { if (!set) { rt = v; set = true; } else { rt = fmaxf(rt, v); } }
+  else if (cf == RC_MIN) { if (!set) { rt = v; set = true; } else { rt = fminf(rt, v); } }
+  else { rt = v; set = true; }
+}
+
+static inline void rules_store_u8(uint8_t &rt, bool &set, uint8_t v, uint8_t cf){
+  if (cf == RC_FIRST) { if (!set) { rt = v; set = true; } }
+  else if (cf == RC_MAX) { if (!set) { rt = v; set = true; } else { rt = (rt > v) ? rt : v; } }
+  else if (cf == RC_MIN) { if (!set) { rt = v; set = true; } else { rt = (rt < v) ? rt : v; } }
+  else { rt = v; set = true; }
+}
+
+static void rules_set_param(const RuleRow &r, float x){
+  const int li = r.layer;
+  if (!(li >= 0 && li < LAYERS)) return;
+  switch(r.arg){
+@@PARAM_CASES@@  }
+}
+
+static void rules_tab_run(){
+  for (uint16_t ri=0; ri<RULES_TAB_N; ri++){
+    RuleRow r;
+    RULES_ROW(r, RULES_TAB, ri);
+    float cur = rules_read_signal(r.sig);
+    bool cond_ok = !r.cond_any;
+    for (uint8_t ci=0; ci<r.cond_n; ci++){
+      RuleCond c;
+      RULES_ROW(c, RULE_CONDS, r.cond0 + ci);
+      bool cpass = rules_cmp(rules_read_signal(c.sig), c.op, c.v);
+      cond_ok = r.cond_any ? (cond_ok || cpass) : (cond_ok && cpass);
+    }
+    bool fired;
+    if (r.trig == RT_TICK) {
+      fired = cond_ok;
+    } else if (r.trig == RT_RISING) {
+      bool now_on = (cur > 0.5f);
+      fired = cond_ok && (now_on && !RULE_PREV[ri]);
+      RULE_PREV[ri] = now_on;
+    } else {
+      // hysteresis: on threshold thr+hyst / off threshold thr-hyst (inverted for RT_BELOW)
+      bool prev = RULE_LATCH[ri];
+      bool now_on;
+      if (r.trig == RT_BELOW) {
+        float on_thr = r.thr - r.hyst;
+        float off_thr = r.thr + r.hyst;
+        now_on = prev ? (cur <= off_thr) : (cur <= on_thr);
+      } else {
+        float on_thr = r.thr + r.hyst;
+        float off_thr = r.thr - r.hyst;
+        now_on = prev ? (cur >= off_thr) : (cur >= on_thr);
+      }
+      RULE_LATCH[ri] = now_on;
+      fired = cond_ok && (now_on && !prev);
+    }
+    if (!fired || r.act == RA_NONE) continue;
+    if (r.act == RA_FLIP_TOGGLE) { VTOG[r.arg] = !VTOG[r.arg]; continue; }
+    float x = (r.esig ? rules_read_signal(r.esig) : r.k) * r.scale + r.bias;
+    if (r.as_bool) x = (x > 0.5f) ? 1.0f : 0.0f;
+    if (r.act == RA_SET_VAR) VNUM[r.arg] = x;
+    else if (r.act == RA_ADD_VAR) VNUM[r.arg] += x;
+    else rules_set_param(r, x);
+  }
+}
+
+"""
+
+
+def _rules_table_param_case(param_id: int) -> str:
+    """rules_set_param() case for one RULES_TABLE_PARAMS id; same clamps/stores as the unrolled emitter."""
+    P = RULES_TABLE_PARAMS
+    if param_id == P["brightness"]:
+        return ("    case 1: { // brightness\n"
+                f"      float v = clamp01((float)({_arduino_clamp_expr('layer_brightness', 'x')}));\n"
+                "      rules_store_f(L_BR_RT[li], L_BR_SET[li], v, r.conflict);\n"
+                "      break;\n"
+                "    }\n")
+    if param_id in (P["op_gain"], P["op_gamma"]):
+        key, name = ("operator_gain", "op_gain") if param_id == P["op_gain"] else ("gamma", "op_gamma")
+        return (f"    case {param_id}: {{ // {name}\n"
+                "      const int oi = r.slot;\n"
+                "      if (oi >= 0 && oi < OPS_PER_LAYER) {\n"
+                f"        float v = (float)({_arduino_clamp_expr(key, 'x')});\n"
+                "        int idx = li * OPS_PER_LAYER + oi;\n"
+                "        rules_store_f(OP_P0_RT[idx], OP_P0_SET[idx], v, r.conflict);\n"
+                "      }\n"
+                "      break;\n"
+                "    }\n")
+    if param_id in (P["postfx_trail"], P["postfx_bleed"]):
+        key, var = ("postfx_trail", "PFX_TRAIL") if param_id == P["postfx_trail"] else ("postfx_bleed", "PFX_BLEED")
+        return (f"    case {param_id}: {{ // {key}\n"
+                "#if MODULA_POSTFX_ENABLED\n"
+                f"      float vf = clamp01((float)({_arduino_clamp_expr(key, 'x')}));\n"
+                "      uint8_t v = (uint8_t)(vf * 255.0f + 0.5f);\n"
+                f"      rules_store_u8({var}_RT, {var}_SET, v, r.conflict);\n"
+                "#endif\n"
+                "      break;\n"
+                "    }\n")
+    if param_id == P["postfx_bleed_radius"]:
+        return ("    case 6: { // postfx_bleed_radius\n"
+                "#if MODULA_POSTFX_ENABLED\n"
+                f"      float vf = (float)({_arduino_clamp_expr('postfx_bleed_radius', 'x')});\n"
+                "      int rv = (int)(vf + 0.5f);\n"
+                "      if (rv < 1) rv = 1; if (rv > 2) rv = 2;\n"
+                "      rules_store_u8(PFX_BLEED_R_RT, PFX_BLEED_R_SET, (uint8_t)rv, r.conflict);\n"
+                "#endif\n"
+                "      break;\n"
+                "    }\n")
+    return ("    default: { // opacity\n"
+            f"      float v = clamp01((float)({_arduino_clamp_expr('layer_opacity', 'x')}));\n"
+            "      rules_store_f(L_OP_RT[li], L_OP_SET[li], v, r.conflict);\n"
+            "      break;\n"
+            "    }\n")
+
+
+def _emit_rules_v6_table_blocks(*, project: dict, storage: str = "const") -> tuple[str, str, str]:
+    """Rules V6 as a compact rule table + fixed interpreter loop: (decls, runtime, apply).
+
+    Same rules, validation, order and per-frame semantics as _emit_rules_v6_blocks, but
+    each enabled rule is one RuleRow (trigger, signal ids, threshold/hysteresis,
+    condition range, action opcode + args) instead of straight-line code, so flash
+    grows by a row per rule. Signals become small ids read through one
+    rules_read_signal() switch. Rows live in PROGMEM when storage is "progmem"
+    (export/luts.py). runtime goes after all globals (the interpreter writes the
+    layer/operator/PostFX override arrays).
+    """
+    p = project or {}
+    rules = p.get("rules_v6") or []
+    if not isinstance(rules, list) or not rules:
+        return ("// Rules V6 disabled\n", "", "// Rules V6 disabled\n")
+
+    num_vars, tog_vars, num_map, tog_map = _rules_v6_vars(p)
+    rules_list = _rules_v6_order(rules)
+
+    signal_ids: dict[str, int] = {}
+
+    def _sig_id(sigkey: str) -> int:
+        ex = _rules_signal_expr(sigkey, num_map, tog_map) if sigkey else "0.0f"
+        if ex == "0.0f":
+            return 0
+        if ex not in signal_ids:
+            if len(signal_ids) >= 255:
+                raise ExportValidationError("[E_RULE_TABLE_LIMIT] rules_v6 table mode supports at most 255 distinct signals.")
+            signal_ids[ex] = len(signal_ids) + 1
+        return signal_ids[ex]
+
+    def _f(v: float) -> str:
+        return f"{v:.6f}f"
+
+    rows: list[str] = []
+    cond_rows: list[str] = []
+    used_params: set[int] = set()
+    for r in rules_list:
+        rid = str(r.get("id","") or "")
+        if not rid:
+            continue
+        if not bool(r.get("enabled", True)):
+            continue
+
+        trigger = str(r.get("trigger","tick") or "tick")
+        when = r.get("when") if isinstance(r.get("when"), dict) else {}
+        w_sig = str((when or {}).get("signal","") or "")
+        w_op = str((when or {}).get("op",">") or ">")
+        w_val = float((when or {}).get("value", 0.0) or 0.0)
+        w_hyst = float((when or {}).get("hyst", 0.0) or 0.0)
+        if trigger in ("tick", "rising"):
+            trig = RULES_TABLE_TRIGGERS[trigger]
+        else:
+            trig = RULES_TABLE_TRIGGERS["below" if w_op in ("<","<=") else "above"]
+
+        conds = r.get("conditions") if isinstance(r.get("conditions"), list) else []
+        cond_mode = str(r.get("cond_mode","all") or "all").lower()
+        cond0 = len(cond_rows)
+        for c in conds:
+            if not isinstance(c, dict):
+                continue
+            cop = str(c.get("op",">") or ">")
+            cval = float(c.get("value",0.0) or 0.0)
+            csig = _sig_id(str(c.get("signal","") or ""))
+            cond_rows.append(f"  {{{_f(cval)}, {csig}, {RULES_TABLE_OPS.get(cop, 0)}}},")
+        cond_n = len(cond_rows) - cond0
+        if cond_n > 255:
+            raise ExportValidationError(f"[E_RULE_TABLE_LIMIT] rules_v6 rule '{rid}' has {cond_n} conditions (table mode supports 255).")
+        # "any" over an empty list of valid conditions never passes (as unrolled).
+        cond_any = 1 if (conds and cond_mode == "any") else 0
+
+        action = r.get("action") if isinstance(r.get("action"), dict) else {}
+        kind = str(action.get("kind","") or "")
+        _validate_rule_v6_action(p, rid, action, num_map, tog_map)
+        var_name = str(action.get("var","") or "")
+
+        act = RULES_TABLE_ACTIONS.get(kind, 0)
+        arg, layer, slot, conflict = 0, 0, 0, 0
+        if kind == "flip_toggle":
+            arg = tog_map[var_name]
+        elif kind in ("set_var","add_var"):
+            arg = num_map[var_name]
+        elif kind == "set_layer_param":
+            try:
+                layer = int(action.get("layer", 0) or 0)
+            except Exception:
+                layer = 0
+            layer = layer if -32768 <= layer <= 32767 else -1
+            _p = str(action.get("param", "opacity") or "opacity").strip().lower()
+            arg = RULES_TABLE_PARAMS.get(_p, RULES_TABLE_PARAMS["opacity"])
+            used_params.add(arg)
+            if _p in ("op_gain", "op_gamma"):
+                slot = _rule_op_index(action, f"_{_p}_slot")
+                slot = slot if slot <= 127 else -1
+            conflict = RULES_TABLE_CONFLICTS.get(str(action.get("conflict", "last") or "last").strip().lower(), 0)
+
+        expr = action.get("expr") if isinstance(action.get("expr"), dict) else {"src":"const","const":0.0}
+        scale = float(expr.get("scale", 1.0) or 1.0)
+        bias = float(expr.get("bias", 0.0) or 0.0)
+        as_bool = 1 if bool(expr.get("as_bool", False)) else 0
+        esig, k = 0, 0.0
+        if act in (RULES_TABLE_ACTIONS["set_var"], RULES_TABLE_ACTIONS["add_var"], RULES_TABLE_ACTIONS["set_layer_param"]):
+            if str(expr.get("src","const") or "const") == "signal":
+                esig = _sig_id(str(expr.get("signal","") or ""))
+            else:
+                k = float(expr.get("const", 0.0) or 0.0)
+
+        label = re.sub(r"\s+", " ", rid)
+        rows.append(f"  {{{_f(w_val)}, {_f(abs(w_hyst))}, {_f(k)}, {_f(scale)}, {_f(bias)}, {cond0}, {layer}, "
+                    f"{trig}, {_sig_id(w_sig)}, {cond_n}, {cond_any}, {act}, {arg}, {conflict}, {esig}, {as_bool}, {slot}}}, // {label}")
+
+    if len(rows) > 65535 or len(cond_rows) > 65535:
+        raise ExportValidationError("[E_RULE_TABLE_LIMIT] rules_v6 table mode supports at most 65535 rules and conditions.")
+
+    n_rules = len([r for r in rules_list if str(r.get("id","") or "")])
+    decls: list[str] = []
+    decls.append("// RULES_V6 (Phase 6.3): minimal deterministic runtime (table-driven)")
+    decls.append(f"#define MODULA_RULES_V6_ENABLED 1")
+    decls.append(f"#define MODULA_RULES_V6_TABLE 1")
+    decls.extend(_rules_v6_var_decls(num_vars, tog_vars))
+    decls.append(f"static const uint16_t RULES_N = {n_rules};")
+    decls.append("static bool RULE_PREV[RULES_N];")
+    decls.append("static bool RULE_LATCH[RULES_N]; // threshold state w/ hysteresis")
+    decls.append("")
+    decls.append(lut_storage_prelude(storage).rstrip("\n"))
+    decls.append(RULES_TABLE_DECLS.rstrip("\n"))
+    decls.append(f"static const uint16_t RULES_TAB_N = {len(rows)};")
+    decls.append(f"static const RuleRow RULES_TAB[{max(1, len(rows))}] MODULO_LUT_ATTR = {{")
+    decls.extend(rows or ["  {0.0f, 0.0f, 0.0f, 0.0f, 0.0f, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0},"])
+    decls.append("};")
+    decls.append(f"static const RuleCond RULE_CONDS[{max(1, len(cond_rows))}] MODULO_LUT_ATTR = {{")
+    decls.extend(cond_rows or ["  {0.0f, 0, 0},"])
+    decls.append("};")
+    decls.append("")
+
+    signal_cases = "".join(f"    case {i}: return {ex};\n" for ex, i in signal_ids.items())
+    param_cases = "".join(_rules_table_param_case(pid) for pid in sorted(used_params, key=lambda x: (x == 0, x)))
+    runtime = (RULES_TABLE_RUNTIME.replace("@@SIGNAL_CASES@@", signal_cases)
+               .replace("@@PARAM_CASES@@", param_cases))
+
+    apply: list[str] = []
+    apply.append("// --- Rules V6 evaluate (runs once per frame, table-driven) ---")
+    apply.append("  // NOTE: rules are evaluated before layer params/behaviors")
+    apply.append("  for (uint16_t ri=0; ri<RULES_N; ri++){ /* init safety */ if (now==0) { RULE_PREV[ri]=false; RULE_LATCH[ri]=false; } }")
+    apply.append("  rules_tab_run();")
+    apply.append("  // --- end rules ---")
+
+    return ("\n".join(decls) + "\n", runtime, "\n".join(apply) + "\n")
+
+
 def _runtime_state_h() -> str:
     """Inline Arduino state runtime (single-file export)."""
     return """// ---- Modulo Stateful Runtime (Phase 5S: Generic State Slots) ----
@@ -744,6 +1075,10 @@ FASTLED_LED_IMPL = r"""// Modulo export: """ + EXPORT_MARKER + r"""\n// Safe def
 #include <string.h>
 CRGB leds[NUM_LEDS];
 
+#ifndef MODULO_WIFI_ENABLE
+  #define MODULO_WIFI_ENABLE 0
+#endif
+#if MODULO_WIFI_ENABLE
 static void modulo_wifi_init() {
     // Choose credentials: exported constants win; otherwise use stored device creds.
     String ssid = (MODULO_WIFI_SSID && MODULO_WIFI_SSID[0]) ? String(MODULO_WIFI_SSID) : __modulo_load_ssid();
@@ -804,6 +1139,10 @@ static void modulo_wifi_init() {
   }
 
   static void modulo_wifi_tick() {}
+#else
+static void modulo_wifi_init() {}
+static void modulo_wifi_tick() {}
+#endif
 
 static void modulo_led_init() {
   FastLED.addLeds<LED_TYPE, LED_PIN, COLOR_ORDER>(leds, NUM_LEDS);
@@ -828,6 +1167,10 @@ struct CRGB {
 
 CRGB leds[NUM_LEDS];
 
+#ifndef MODULO_WIFI_ENABLE
+  #define MODULO_WIFI_ENABLE 0
+#endif
+#if MODULO_WIFI_ENABLE
 static void modulo_wifi_init() {
     // Choose credentials: exported constants win; otherwise use stored device creds.
     String ssid = (MODULO_WIFI_SSID && MODULO_WIFI_SSID[0]) ? String(MODULO_WIFI_SSID) : __modulo_load_ssid();
@@ -886,6 +1229,10 @@ static void modulo_wifi_init() {
   }
 
   static void modulo_wifi_tick() {}
+#else
+static void modulo_wifi_init() {}
+static void modulo_wifi_tick() {}
+#endif
 
 // WS2812/SK6812 class using ESP32 RMT.
 // NOTE: For simplicity, this backend assumes GRB order (NeoGrbFeature).
@@ -1198,63 +1545,7 @@ __modulo_server.on("/wifi", HTTP_POST, []() {
     }
   }
 #else
-  static void modulo_wifi_init() {
-    // Choose credentials: exported constants win; otherwise use stored device creds.
-    String ssid = (MODULO_WIFI_SSID && MODULO_WIFI_SSID[0]) ? String(MODULO_WIFI_SSID) : __modulo_load_ssid();
-    String pass = (MODULO_WIFI_SSID && MODULO_WIFI_SSID[0]) ? String(MODULO_WIFI_PASS) : __modulo_load_pass();
-
-    bool have_creds = (ssid.length() > 0);
-    if (have_creds) {
-      WiFi.mode(WIFI_STA);
-      WiFi.begin(ssid.c_str(), pass.c_str());
-      unsigned long t0 = millis();
-      while (WiFi.status() != WL_CONNECTED && (millis() - t0) < 15000UL) {
-        delay(50);
-      }
-    }
-
-    if (WiFi.status() == WL_CONNECTED) {
-      if (MODULO_WIFI_HOST && MODULO_WIFI_HOST[0]) {
-        if (MDNS.begin(MODULO_WIFI_HOST)) {
-          MDNS.addService("http", "tcp", 80);
-        }
-      }
-      __modulo_http_setup();
-
-      Serial.println();
-      Serial.println("[Modulo] WiFi connected");
-      Serial.print("[Modulo] IP: "); Serial.println(WiFi.localIP());
-      if (MODULO_WIFI_HOST && MODULO_WIFI_HOST[0]) {
-        Serial.print("[Modulo] mDNS: http://");
-        Serial.print(MODULO_WIFI_HOST);
-        Serial.println(".local/");
-      }
-      Serial.println("[Modulo] Web update: http://<ip>/ (upload .bin)");
-      Serial.println("[Modulo] Info: http://<ip>/info");
-      return;
-    }
-
-    // If WiFi is enabled but we couldn't connect, optionally start a setup AP.
-    if (MODULO_WIFI_AP_FALLBACK) {
-      String base = (MODULO_WIFI_HOST && MODULO_WIFI_HOST[0]) ? String(MODULO_WIFI_HOST) : String("modulo-hub75");
-      String ap_ssid = base + String("-setup");
-      const char* ap_pass = (strlen(MODULO_WIFI_AP_PASSWORD) >= 8) ? MODULO_WIFI_AP_PASSWORD : nullptr; // ESP32 requires >=8 or open
-      WiFi.mode(WIFI_AP);
-      if (ap_pass) WiFi.softAP(ap_ssid.c_str(), ap_pass);
-      else WiFi.softAP(ap_ssid.c_str());
-
-      __modulo_http_setup();
-
-      Serial.println();
-      Serial.println("[Modulo] WiFi not connected; started setup AP");
-      Serial.print("[Modulo] AP SSID: "); Serial.println(ap_ssid);
-      if (ap_pass) Serial.println("[Modulo] AP password: (set in export)");
-      else Serial.println("[Modulo] AP password: (open)");
-      Serial.println("[Modulo] Setup: http://192.168.4.1/wifi");
-      Serial.println("[Modulo] Web update: http://192.168.4.1/");
-    }
-  }
-
+  static void modulo_wifi_init() {}
     static void modulo_wifi_tick() {}
 #endif
 
@@ -1481,13 +1772,32 @@ def validate_export_text(text: str) -> None:
     if missing:
         raise ExportValidationError(f"Export missing required definitions: {missing}")
 
+_TEMPLATE_TEXT: dict = {}
+
+
+def _read_template(path: Path) -> str:
+    """Template text, re-read only when the file's mtime/size change."""
+    try:
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    hit = _TEMPLATE_TEXT.get(str(path))
+    if stamp is not None and hit is not None and hit[0] == stamp:
+        return hit[1]
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    if stamp is not None:
+        _TEMPLATE_TEXT[str(path)] = (stamp, text)
+    return text
+
+
 def export_sketch(*, sketch_code: str, template_path: Path, out_path: Path, replacements: dict | None = None) -> Path:
     """Write a sketch file by filling a token template.
 
     Token format is @@TOKEN@@.
     Always replaces @@SKETCH@@. Optional `replacements` can fill additional tokens.
     """
-    tpl = Path(template_path).read_text(encoding="utf-8", errors="ignore")
+    tpl = _read_template(Path(template_path))
     out = tpl.replace("@@SKETCH@@", str(sketch_code).rstrip() + "\n")
 
     if replacements:
@@ -1902,44 +2212,148 @@ def make_external_audio_streamer_sketch(export_audio_cfg: dict) -> str:
     validate_export_text(out)
     return out
 
-def make_layerstack_sketch(*, project: dict) -> str:
-    """Generate an Arduino sketch that renders a stack of layers (solid/chase/wipe/sparkle/scanner)
-    with per-layer opacity, blend_mode, target masks, and basic modulotors (LFO + passthrough for future audio).
-
-    Inputs are project dict matching app export payload.
-    """
-    layout = project.get("layout", {}) or {}
-    expcfg = (project.get("export") or {}) if isinstance(project.get("export"), dict) else {}
-    DBG_PURPOSE = bool(expcfg.get("debug_purpose_serial", False))
+def _ca_modules_signature() -> tuple:
+    """Registered CA modules (name + step body): part of the layer-section cache key."""
     try:
-        DBG_BAUD = int(expcfg.get("debug_serial_baud", 115200) or 115200)
+        from runtime.ca_modules_v1 import list_ca_modules, get_ca_module
+        return tuple((n, str(getattr(get_ca_module(n), "cpp_step_body", "") or "")) for n in list_ca_modules())
     except Exception:
-        DBG_BAUD = 115200
-    # Layout normalization: support both legacy (shape/num_leds) and canonical (kind/width/height)
-    layout_kind = str(layout.get("kind") or "").strip().lower()
-    shape = str(layout.get("shape") or layout_kind or "strip").strip().lower()
-    if shape == "matrix":
-        shape = "cells"
-    # Matrix dims (canonical)
-    mw = int(layout.get("mw", layout.get("width", 16)))
-    mh = int(layout.get("mh", layout.get("height", 16)))
-    # LED count (canonical matrix uses width*height)
-    if shape == "cells" and ("width" in layout or "height" in layout):
-        num_leds = int(mw * mh)
-    else:
-        num_leds = int(layout.get("num_leds", 60))
-    led_pin = int(layout.get("led_pin", 6))
-    cell = int(layout.get("cell", 14))
-    matrix_serp = bool(layout.get("matrix_serpentine", False))
-    flip_x = bool(layout.get("matrix_flip_x", False))
-    flip_y = bool(layout.get("matrix_flip_y", False))
-    rotate = int(layout.get("matrix_rotate", 0))
-    rotate = rotate if rotate in (0,90,180,270) else 0
+        return ()
 
-    postfx_decls, postfx_apply = _emit_postfx_blocks(project=project, shape=shape, num_leds=num_leds)
-    rules_decls, rules_apply = _emit_rules_v6_blocks(project=project)
 
 
+def _layers_cache_view(layers: list) -> list:
+    """Layers as the layer section sees them: purpose defaults are filled in place by the
+    first export, so key on the ensured/clamped params to keep repeat exports stable."""
+    out = []
+    for L in layers:
+        if isinstance(L, dict) and isinstance(L.get("params"), dict):
+            L = dict(L)
+            L["params"] = clamp_purpose(ensure_purpose(dict(L["params"])))
+        out.append(L)
+    return out
+
+
+# Layer-stack kernel id per behavior key (L_BEH); unknown keys render the rainbow kernel.
+LAYERSTACK_BEH_IDS = {"solid":0, "chase":1, "wipe":2, "sparkle":3, "scanner":4, "fade":5, "strobe":6, "rainbow":7, "bouncer":8, "breakout_lite":9, "breakout_game":9, "demo_breakout":9, "asteroids_lite":10, "asteroids_game":10, "demo_asteroids":10, "tilemap_sprite":11, "red_hat_runner":11, "mariobros_clockface":11, "brians_brain":12, "game_of_life":12, "elementary_ca":12, "langtons_ant":12, "msgeq7_visualizer_575":13, "msgeq7_reactive_ino":13, "snake_game":14, "snake_game_ino":14, "space_invaders_game":15, "shooter_game_ino":16, "blocks_ball_game_ino":17, "kernel_dsl":22, "write_the_loop":23, "fsm_phases":23, "ca_module":12,
+                      "boids_swarm":18, "predator_prey":19, "memory_heatmap":20, "ambient_dashboard":21}
+LAYERSTACK_FALLBACK_BEH_ID = 7
+
+# Firmware cost of each layer-stack kernel (export.budget.estimate_firmware_cost).
+# Cycles are ATmega328P cycles at -Os with soft float (scaled per arch by the estimator):
+# per pixel for the kernel branch in render_pixel(), per frame for its update*() step.
+# RAM/flash are the kernel's own statics and code; the pixel loop dispatches on L_BEH at
+# runtime, so every kernel here is linked into every layer-stack sketch.
+# Calibration: time solid on the device (tools/firmware_telemetry.py) and set entry 0, then
+# run `python tools/host_harness.py --calibrate-kernels`; it scales host per-pixel timings
+# of every kernel to entry 0 (export.host_harness.calibrate_kernel_costs). Per-frame cycles
+# and flash come from on-device telemetry and the avr-size report, not from the host.
+LAYERSTACK_KERNEL_COSTS = {
+    0: KernelCost(cycles_per_pixel=500, flash_bytes=120),                                     # solid
+    1: KernelCost(cycles_per_pixel=1500, flash_bytes=420),                                    # chase
+    2: KernelCost(cycles_per_pixel=900, flash_bytes=260),                                     # wipe
+    3: KernelCost(cycles_per_pixel=1200, flash_bytes=300),                                    # sparkle
+    4: KernelCost(cycles_per_pixel=1600, flash_bytes=380),                                    # scanner
+    5: KernelCost(cycles_per_pixel=2400, flash_bytes=260),                                    # fade (sinf)
+    6: KernelCost(cycles_per_pixel=1000, flash_bytes=200),                                    # strobe
+    7: KernelCost(cycles_per_pixel=3000, flash_bytes=520),                                    # rainbow (hsv)
+    8: KernelCost(cycles_per_pixel=1500, cycles_per_frame=3000, flash_bytes=700),             # bouncer
+    9: KernelCost(cycles_per_pixel=1600, cycles_per_frame=20000, flash_bytes=2000),           # breakout
+    10: KernelCost(cycles_per_pixel=1800, cycles_per_frame=40000, flash_bytes=2200),          # asteroids
+    11: KernelCost(cycles_per_pixel=2200, flash_bytes=3000),                                  # tilemap/sprite
+    12: KernelCost(cycles_per_pixel=750, cycles_per_frame=2000, ram_bytes=16, ram_per_led=2,
+                   flash_bytes=1500),                                                         # CA cluster
+    13: KernelCost(cycles_per_pixel=1500, flash_bytes=700),                                   # msgeq7 bars
+    14: KernelCost(cycles_per_pixel=1200, cycles_per_frame=8000, flash_bytes=1100),           # snake
+    15: KernelCost(cycles_per_pixel=1400, cycles_per_frame=15000, flash_bytes=1200),          # invaders
+    16: KernelCost(cycles_per_pixel=1400, cycles_per_frame=15000, flash_bytes=1200),          # shooter
+    17: KernelCost(cycles_per_pixel=1400, cycles_per_frame=20000, flash_bytes=1300),          # blocks + ball
+    18: KernelCost(cycles_per_pixel=13000, flash_bytes=900),                                  # boids (3x sinf + gauss)
+    19: KernelCost(cycles_per_pixel=600, cycles_per_frame=60000, flash_bytes=1400),           # predator/prey
+    20: KernelCost(cycles_per_pixel=5000, cycles_per_frame=30000, flash_bytes=1200),          # memory heatmap
+    21: KernelCost(cycles_per_pixel=2500, flash_bytes=900),                                   # ambient dashboard
+    22: KernelCost(cycles_per_pixel=3000, flash_bytes=400),                                   # kernel DSL body
+    23: KernelCost(cycles_per_pixel=3000, flash_bytes=400),                                   # write_the_loop / fsm
+}
+
+
+OP_KIND_MAP = {
+    "none": 0,
+    "gain": 1,
+    "gamma": 2,
+    "posterize": 3,
+}
+
+
+def _layer_export_operators(L: dict, ops_per_layer: int = 2) -> list[tuple[int, float]]:
+    """(kind id, param0) for the exported operator slots of a layer, padded with none."""
+    ops_all = list(L.get("operators", []) or [])
+    ops = []
+    layer_effect_kind = str(L.get("effect") or L.get("behavior") or "").strip().lower()
+    for oi, op in enumerate(ops_all):
+        if not isinstance(op, dict):
+            continue
+        # Slot-0 may be a mirrored behavior entry (legacy LayerStack sync). Treat it as behavior, not PostFX.
+        kind0 = str(op.get("kind") or op.get("op") or op.get("type") or "none").strip().lower()
+        if oi == 0 and layer_effect_kind and kind0 == layer_effect_kind and kind0 not in OP_KIND_MAP:
+            continue
+        if bool(op.get("enabled", True)) is False:
+            continue
+        ops.append(op)
+    ops = ops[:ops_per_layer]
+    while len(ops) < ops_per_layer:
+        ops.append({"kind": "none", "p0": 0.0})
+
+    out: list[tuple[int, float]] = []
+    for op in ops:
+        # Operators schema supports both legacy flat form and newer nested params form:
+        # - Legacy (fixtures/older saves): {"kind": "gain", "p0": 1.2}
+        # - New (UI/preview): {"type": "gain", "params": {"gain": 1.2}, ...}
+        params_op = op.get("params") if isinstance(op.get("params"), dict) else {}
+        kind = str(op.get("kind") or op.get("op") or op.get("type") or "none").strip().lower()
+        kid = OP_KIND_MAP.get(kind)
+        if kid is None:
+            raise ExportValidationError(f"Unsupported operator kind for export: {kind!r}")
+        kid = int(kid)
+        # Normalize parameters
+        if kid == 1:
+            # gain
+            p0 = float(op.get("gain", params_op.get("gain", op.get("p0", 1.0))))
+        elif kid == 2:
+            # gamma
+            p0 = float(op.get("gamma", params_op.get("gamma", op.get("p0", 2.2))))
+        elif kid == 3:
+            # posterize levels
+            p0 = float(op.get("levels", op.get("steps", params_op.get("posterize_levels", op.get("p0", 8)))))
+        else:
+            p0 = float(op.get("p0", 0.0))
+        out.append((kid, p0))
+    return out
+
+
+def _export_gamma_values(project: dict) -> list[float]:
+    """Distinct gamma operator params in layer order (candidates for baked curves)."""
+    out: list[float] = []
+    for L in (project or {}).get("layers") or []:
+        if not isinstance(L, dict):
+            continue
+        try:
+            ops = _layer_export_operators(L)
+        except ExportValidationError:
+            continue
+        for kid, p0 in ops:
+            if kid == 2 and p0 not in out:
+                out.append(p0)
+    return out
+
+
+def _emit_layer_tables(*, project: dict, num_leds: int) -> tuple[str, str, str, dict[str, str]]:
+    """Per-layer tables, kernel/CA module blocks and groups payload for the layer-stack sketch.
+
+    Also performs the per-layer export validation (operators, kernel DSL, write_the_loop,
+    CA modules). Returns (kernel_cases, ca_module_decls, ca_module_dispatch, tables); tables
+    maps array names and counts to the text substituted into the sketch template.
+    """
     layers = [
         L for L in list(project.get("layers", []) or [])
         if bool((L or {}).get("enabled", True))
@@ -2007,8 +2421,7 @@ def make_layerstack_sketch(*, project: dict) -> str:
 
 
     # behavior ids
-    beh_map = {"solid":0, "chase":1, "wipe":2, "sparkle":3, "scanner":4, "fade":5, "strobe":6, "rainbow":7, "bouncer":8, "breakout_lite":9, "breakout_game":9, "demo_breakout":9, "asteroids_lite":10, "asteroids_game":10, "demo_asteroids":10, "tilemap_sprite":11, "red_hat_runner":11, "mariobros_clockface":11, "brians_brain":12, "game_of_life":12, "elementary_ca":12, "langtons_ant":12, "msgeq7_visualizer_575":13, "msgeq7_reactive_ino":13, "snake_game":14, "snake_game_ino":14, "space_invaders_game":15, "shooter_game_ino":16, "blocks_ball_game_ino":17, "kernel_dsl":22, "write_the_loop":23, "fsm_phases":23, "ca_module":12,
-               "boids_swarm":18, "predator_prey":19, "memory_heatmap":20, "ambient_dashboard":21}
+    beh_map = LAYERSTACK_BEH_IDS
 
     def _clamp01(x):
         try:
@@ -2049,12 +2462,6 @@ def make_layerstack_sketch(*, project: dict) -> str:
     OP_KIND = []   # 0=none,1=gain,2=gamma,3=posterize
     OP_P0 = []     # param0 (gain/gamma/levels)
 
-    OP_KIND_MAP = {
-        "none": 0,
-        "gain": 1,
-        "gamma": 2,
-        "posterize": 3,
-    }
 
     # modulotors: flatten up to 2 per layer
     # Source ids: none=0, lfo_sine=1 (audio placeholders: 10+)
@@ -2081,7 +2488,7 @@ def make_layerstack_sketch(*, project: dict) -> str:
 
     for L in layers:
         beh = str(L.get("behavior","solid")).lower().strip()
-        beh_id = beh_map.get(beh, 7)
+        beh_id = beh_map.get(beh, LAYERSTACK_FALLBACK_BEH_ID)
         L_BEH.append(beh_id)
 
         params = L.get("params", {}) or {}
@@ -2093,7 +2500,13 @@ def make_layerstack_sketch(*, project: dict) -> str:
         #   0=brians_brain, 1=game_of_life, 2=elementary_ca, 3=langtons_ant
         # MSGEQ7 Cluster:
         #   0=bars, 1=reactive strobe
-        if beh == 'red_hat_runner':
+        if beh == 'chase':
+            # Preview fills chase params from the registry (width 4 px, not the generic 0.2 strip
+            # fraction) and clamps them to its ranges (width >= 1 px); export the same values.
+            from params.ensure import ensure_params
+            from params.resolve import resolve as resolve_params
+            params = resolve_params(ensure_params(params, ["color", "brightness", "speed", "width"]), 0.0)
+        elif beh == 'red_hat_runner':
             params = dict(params)
             params.setdefault('pi0', 1)
             params.setdefault('pf1', 0.6)  # jump height
@@ -2251,24 +2664,24 @@ def make_layerstack_sketch(*, project: dict) -> str:
         if beh in ("write_the_loop", "fsm_phases"):
             cpp_body = str((params or {}).get("cpp") or "").strip()
             if not cpp_body:
-                cpp_body = r"""\
-// Default rainbow demo\
-float h = fmodf(x + t * 0.1f, 1.0f);\
-if (h < 0.0f) h += 1.0f;\
-const float s = 1.0f;\
-const float v = 1.0f;\
-float k = fmodf(h * 6.0f, 6.0f);\
-float f = k - floorf(k);\
-float p = v * (1.0f - s);\
-float q = v * (1.0f - s * f);\
-float rr = v * (1.0f - s * (1.0f - f));\
-int ki = (int)floorf(k);\
-if (ki == 0) { r = v; g = rr; b = p; }\
-else if (ki == 1) { r = q; g = v; b = p; }\
-else if (ki == 2) { r = p; g = v; b = rr; }\
-else if (ki == 3) { r = p; g = q; b = v; }\
-else if (ki == 4) { r = rr; g = p; b = v; }\
-else { r = v; g = p; b = q; }\
+                cpp_body = """
+// Default rainbow demo
+float h = fmodf(x + t * 0.1f, 1.0f);
+if (h < 0.0f) h += 1.0f;
+const float s = 1.0f;
+const float v = 1.0f;
+float k = fmodf(h * 6.0f, 6.0f);
+float f = k - floorf(k);
+float p = v * (1.0f - s);
+float q = v * (1.0f - s * f);
+float rr = v * (1.0f - s * (1.0f - f));
+int ki = (int)floorf(k);
+if (ki == 0) { r = v; g = rr; b = p; }
+else if (ki == 1) { r = q; g = v; b = p; }
+else if (ki == 2) { r = p; g = v; b = rr; }
+else if (ki == 3) { r = p; g = q; b = v; }
+else if (ki == 4) { r = rr; g = p; b = v; }
+else { r = v; g = p; b = q; }
 """.strip()
             if "#" in cpp_body:
                 raise ExportValidationError("[E_WRITE_LOOP_INVALID] write_the_loop cpp body may not contain preprocessor directives (#).")
@@ -2386,45 +2799,7 @@ else { r = v; g = p; b = q; }\
             M_PHASE.append(float(m.get("phase", 0.0)))
 
         # Operators: flatten up to OPS_PER_LAYER per layer
-        ops_all = list(L.get("operators", []) or [])
-        ops = []
-        layer_effect_kind = str(L.get("effect") or L.get("behavior") or "").strip().lower()
-        for oi, op in enumerate(ops_all):
-            if not isinstance(op, dict):
-                continue
-            # Slot-0 may be a mirrored behavior entry (legacy LayerStack sync). Treat it as behavior, not PostFX.
-            kind0 = str(op.get("kind") or op.get("op") or op.get("type") or "none").strip().lower()
-            if oi == 0 and layer_effect_kind and kind0 == layer_effect_kind and kind0 not in OP_KIND_MAP:
-                continue
-            if bool(op.get("enabled", True)) is False:
-                continue
-            ops.append(op)
-        ops = ops[:OPS_PER_LAYER]
-        while len(ops) < OPS_PER_LAYER:
-            ops.append({"kind": "none", "p0": 0.0})
-
-        for op in ops:
-            # Operators schema supports both legacy flat form and newer nested params form:
-            # - Legacy (fixtures/older saves): {"kind": "gain", "p0": 1.2}
-            # - New (UI/preview): {"type": "gain", "params": {"gain": 1.2}, ...}
-            params_op = op.get("params") if isinstance(op.get("params"), dict) else {}
-            kind = str(op.get("kind") or op.get("op") or op.get("type") or "none").strip().lower()
-            kid = OP_KIND_MAP.get(kind)
-            if kid is None:
-                raise ExportValidationError(f"Unsupported operator kind for export: {kind!r}")
-            kid = int(kid)
-            # Normalize parameters
-            if kid == 1:
-                # gain
-                p0 = float(op.get("gain", params_op.get("gain", op.get("p0", 1.0))))
-            elif kid == 2:
-                # gamma
-                p0 = float(op.get("gamma", params_op.get("gamma", op.get("p0", 2.2))))
-            elif kid == 3:
-                # posterize levels
-                p0 = float(op.get("levels", op.get("steps", params_op.get("posterize_levels", op.get("p0", 8)))))
-            else:
-                p0 = float(op.get("p0", 0.0))
+        for kid, p0 in _layer_export_operators(L, OPS_PER_LAYER):
             OP_KIND.append(kid)
             OP_P0.append(p0)
 
@@ -2434,6 +2809,8 @@ else { r = v; g = p; b = q; }\
         # Keep expression short-ish and safe (already validated by compile_kernel_expr).
         kernel_cases_lines.append(f"    case {li}: v = {expr}; break;")
     kernel_cases = "\n".join(kernel_cases_lines) if kernel_cases_lines else "    default: v = 0.0f; break;"
+    write_loop_cases = "\n".join(
+        f"    case {li}: {{\n{body}\n    }} break;" for li, body in enumerate(W_CPP) if body)
     # Phase 3.5: CA module export codegen (custom CA rules).
     ca_module_decls_lines = []
     ca_module_case_lines = []
@@ -2527,7 +2904,131 @@ else { r = v; g = p; b = q; }\
     if not zone_start: zone_start=[0]
     if not zone_end: zone_end=[0]
 
-    sketch = """/ Generated by Modulo (Layer Stack)
+    # Initializer lists for the sketch's {{{_csv(NAME)}}} slots, keyed by array name.
+    tables = {name: _csv(arr) for name, arr in (
+        ("L_BEH", L_BEH), ("LR", LR), ("LG", LG), ("LB", LB),
+        ("L_R2", L_R2), ("L_G2", L_G2), ("L_B2", L_B2),
+        ("L_DUTY", L_DUTY), ("L_HUEOFF", L_HUEOFF), ("L_HUESPAN", L_HUESPAN),
+        ("L_BR", L_BR), ("L_SP", L_SP), ("L_WD", L_WD), ("L_SO", L_SO), ("L_DN", L_DN), ("L_DIR", L_DIR),
+        ("L_PF0", L_PF0), ("L_PF1", L_PF1), ("L_PF2", L_PF2), ("L_PF3", L_PF3),
+        ("L_PI0", L_PI0), ("L_PI1", L_PI1), ("L_PI2", L_PI2), ("L_PI3", L_PI3),
+        ("L_OP", L_OP), ("L_BLEND", L_BLEND), ("L_TK", L_TK), ("L_TR", L_TR),
+        ("OP_KIND", OP_KIND), ("OP_P0", OP_P0),
+        ("M_SRC", M_SRC), ("M_TGT", M_TGT), ("M_MODE", M_MODE), ("M_AMT", M_AMT),
+        ("M_RATE", M_RATE), ("M_BIAS", M_BIAS), ("M_SMOOTH", M_SMOOTH),
+        ("group_offs", group_offs), ("group_lens", group_lens), ("group_indexes", group_indexes),
+        ("zone_start", zone_start), ("zone_end", zone_end),
+    )}
+    tables.update({
+        "LAYER_COUNT": str(len(layers)),
+        "GROUP_COUNT": str(len(groups)),
+        "ZONE_COUNT": str(len(zones)),
+        "GROUP_INDEXES_LEN": str(len(group_indexes)),
+        "OPS_PER_LAYER": str(OPS_PER_LAYER),
+        "MODS_PER_LAYER": str(MODS_PER_LAYER),
+        "KERNEL_DSL_CASES": "\n".join(kernel_cases_lines),
+        "WRITE_LOOP_CASES": write_loop_cases,
+    })
+    return kernel_cases, ca_module_decls, ca_module_dispatch, tables
+
+
+# Per-pixel layer param evaluation of the float sketch (replaced in fixed math mode).
+_FLOAT_LAYER_PARAMS_PIXEL = """      float br, sp, wd, so, dn, dir;
+      float pf0=0.0f, pf1=0.0f, pf2=0.0f, pf3=0.0f;
+      float pi0=0.0f, pi1=0.0f, pi2=0.0f, pi3=0.0f;
+      computeLayerParams(li, t, br, sp, wd, so, dn, dir, pf0, pf1, pf2, pf3, pi0, pi1, pi2, pi3);
+"""
+
+
+# Per-layer array slots of the layer-stack template: {{{_csv(NAME)}}} or {{{_csv(NAME if ... else [0])}}}.
+_LAYERSTACK_CSV_SLOT_RE = re.compile(r"\{\{\{_csv\((\w+).*?\)\}\}\}")
+
+
+def _render_layerstack_template(template: str, tables: dict[str, str]) -> str:
+    """Resolve the f-string-style parts of the layer-stack template.
+
+    Most of the template body doubles its C braces and carries {{{_csv(NAME)}}} array slots.
+    Fill the slots from tables, then un-double the braces. This must run on the raw template,
+    before any generated block (single C braces) is substituted in.
+    """
+    text = _LAYERSTACK_CSV_SLOT_RE.sub(lambda m: "{" + tables[m.group(1)] + "}", template)
+    text = text.replace("{{", "{").replace("}}", "}")
+    text = text.replace("{max(0, len(groups))}", tables["GROUP_COUNT"])
+    text = text.replace("{max(0, len(zones))}", tables["ZONE_COUNT"])
+    for key in ("LAYER_COUNT", "GROUP_INDEXES_LEN"):
+        text = text.replace(f"@@{key}@@", tables[key])
+    for key in ("OPS_PER_LAYER", "MODS_PER_LAYER", "KERNEL_DSL_CASES", "WRITE_LOOP_CASES"):
+        text = text.replace("{" + key + "}", tables[key])
+    return text
+
+
+def make_layerstack_sketch(*, project: dict, math_mode: str | None = None, lut_plan: LookupTablePlan | None = None,
+                           rules_mode: str | None = None) -> str:
+    """Generate an Arduino sketch that renders a stack of layers (solid/chase/wipe/sparkle/scanner)
+    with per-layer opacity, blend_mode, target masks, and basic modulotors (LFO + passthrough for future audio).
+
+    Inputs are project dict matching app export payload.
+    math_mode: "float" | "fixed" (export/fixed_math.py); None resolves from project.export.
+    lut_plan: baked gamma curves (export/luts.py); None keeps the computed form.
+    rules_mode: "unrolled" | "table" Rules V6 emission; None plans it without a target
+    (export.budget.plan_rules_mode).
+    """
+    layout = project.get("layout", {}) or {}
+    expcfg = (project.get("export") or {}) if isinstance(project.get("export"), dict) else {}
+    math_mode = normalize_math_mode(math_mode) or resolve_math_mode(project)
+    math_decls, math_frame, layer_params_pixel = emit_math_blocks(math_mode, _FLOAT_LAYER_PARAMS_PIXEL)
+    gamma_decls, gamma_branch = emit_gamma_luts(lut_plan.gamma if lut_plan else (), lut_plan.storage if lut_plan else "const")
+    DBG_PURPOSE = bool(expcfg.get("debug_purpose_serial", False))
+    try:
+        DBG_BAUD = int(expcfg.get("debug_serial_baud", 115200) or 115200)
+    except Exception:
+        DBG_BAUD = 115200
+    # Layout normalization: support both legacy (shape/num_leds) and canonical (kind/width/height)
+    layout_kind = str(layout.get("kind") or "").strip().lower()
+    shape = str(layout.get("shape") or layout_kind or "strip").strip().lower()
+    if shape == "matrix":
+        shape = "cells"
+    # Matrix dims (canonical)
+    mw = int(layout.get("mw", layout.get("width", 16)))
+    mh = int(layout.get("mh", layout.get("height", 16)))
+    # LED count (canonical matrix uses width*height)
+    if shape == "cells" and ("width" in layout or "height" in layout):
+        num_leds = int(mw * mh)
+    else:
+        num_leds = int(layout.get("num_leds", 60))
+    led_pin = int(layout.get("led_pin", 6))
+    cell = int(layout.get("cell", 14))
+    matrix_serp = bool(layout.get("matrix_serpentine", False))
+    flip_x = bool(layout.get("matrix_flip_x", False))
+    flip_y = bool(layout.get("matrix_flip_y", False))
+    rotate = int(layout.get("matrix_rotate", 0))
+    rotate = rotate if rotate in (0,90,180,270) else 0
+
+    # Sections are memoized on the project subset each one reads (export/export_cache.py),
+    # so wiring-only changes and repeat exports skip emission + validation.
+    layers0 = project.get("layers") or []
+    postfx_decls, postfx_apply = SECTION_CACHE.memo(
+        "postfx", (project.get("postfx"), project.get("rules_v6"), shape, num_leds),
+        lambda: _emit_postfx_blocks(project=project, shape=shape, num_leds=num_leds))
+    rules_mode = rules_mode or plan_rules_mode(project, None)
+    rules_key = (project.get("rules_v6"), project.get("variables"),
+                 [L.get("operators") if isinstance(L, dict) else None for L in layers0])
+    if rules_mode == "table":
+        rules_storage = lut_plan.storage if lut_plan else "const"
+        rules_decls, rules_runtime, rules_apply = SECTION_CACHE.memo(
+            "rules_v6_table", rules_key + (rules_storage,),
+            lambda: _emit_rules_v6_table_blocks(project=project, storage=rules_storage))
+    else:
+        rules_decls, rules_apply = SECTION_CACHE.memo(
+            "rules_v6", rules_key, lambda: _emit_rules_v6_blocks(project=project))
+        rules_runtime = ""
+    ui0 = project.get("ui") if isinstance(project.get("ui"), dict) else {}
+    kernel_cases, ca_module_decls, ca_module_dispatch, tables = SECTION_CACHE.memo(
+        "layers", (_layers_cache_view(layers0), project.get("groups"), project.get("zones"), project.get("masks"),
+                   ui0.get("target_mask"), num_leds, _ca_modules_signature()),
+        lambda: _emit_layer_tables(project=project, num_leds=num_leds))
+
+    sketch = """// Generated by Modulo (Layer Stack)
 // Export build: {EXPORT_MARKER}
 
 // Debug option: print purpose channels over Serial
@@ -2592,7 +3093,7 @@ int16_t purpose_i0 = 0, purpose_i1 = 0, purpose_i2 = 0, purpose_i3 = 0;
 
 // Modulotion runtime tables (defaults)
 #ifndef MODS_PER_LAYER
-#define MODS_PER_LAYER 4
+#define MODS_PER_LAYER {MODS_PER_LAYER}
 #endif
 #ifndef MODS_TOTAL
 #define MODS_TOTAL (LAYERS * MODS_PER_LAYER)
@@ -2660,6 +3161,15 @@ static inline float clamp01(float x) {{
   return x;
 }}
 
+// Range clamps used by Rules V6 set_layer_param (_arduino_clamp_expr).
+static inline float clampf(float x, float lo, float hi) {{
+  return x < lo ? lo : (x > hi ? hi : x);
+}}
+
+static inline int clampi(int x, int lo, int hi) {{
+  return x < lo ? lo : (x > hi ? hi : x);
+}}
+
 static inline float clamp255(float x) {{
   if (x < 0.0f) return 0.0f;
   if (x > 255.0f) return 255.0f;
@@ -2667,7 +3177,7 @@ static inline float clamp255(float x) {{
 }}
 
 // Operators runtime (per-layer, pre-blend)
-static inline void apply_one_operator(uint8_t kind, float p0, float &r, float &g, float &b) {{
+{GAMMA_LUT_DECLS}static inline void apply_one_operator(uint8_t kind, float p0, float &r, float &g, float &b) {{
   if (kind == 1) {{ // gain
     float k = fmaxf(0.0f, p0);
     r = clamp255(r * k);
@@ -2676,7 +3186,7 @@ static inline void apply_one_operator(uint8_t kind, float p0, float &r, float &g
     return;
   }}
   if (kind == 2) {{ // gamma
-    float gamma = fmaxf(0.001f, p0);
+{GAMMA_LUT_BRANCH}    float gamma = fmaxf(0.001f, p0);
     float inv = 1.0f / gamma;
     r = powf(clamp01(r/255.0f), inv) * 255.0f;
     g = powf(clamp01(g/255.0f), inv) * 255.0f;
@@ -2830,7 +3340,7 @@ sig = (v - 0.5f) * 2.0f; // back to [-1..1]
     else if (tgt == 4) dn = clamp01(dn + sig * amt + bias);
     else if (tgt == 5) dir = applyMode(dir, sig, mode, amt);
   }}
-}}
+}}{MATH_FIXED_DECLS}
 
 // Behavior evaluators: return layer RGB (0..255 floats) for LED i at time t.
 static inline void evalSolid(int li, float br, float &r, float &g, float &b) {{
@@ -2895,13 +3405,17 @@ static inline void evalRainbow(int li, int i, float t, float br, float sp, uint8
   b = bb * br;
 }}
 
-static inline void evalChase(int li, int i, float t, float br, float sp, float wd, float dir, float &r, float &g, float &b) {{
-  float phase = fmodf(t * fmaxf(0.0f, sp), 1.0f);
-  float pos01 = (dir >= 0.0f) ? phase : (1.0f - phase);
-  float pos = pos01 * (float)(NUM_LEDS - 1);
-  float halfw = fmaxf(0.5f, wd * (float)NUM_LEDS * 0.5f);
-  float d = fabsf((float)i - pos);
-  float a = (d <= halfw) ? (1.0f - (d/halfw)) : 0.0f;
+static inline void evalChase(int li, int i, double t, float br, float sp, float wd, float &r, float &g, float &b) {{
+  // Same run as behaviors/effects/chase.py: w lit pixels stepping 10*speed px/s (wd <= 1: strip fraction).
+  // t is the double sim clock: a float step position rounds across pixel boundaries where the preview's does not.
+  int w = (wd <= 1.0f) ? (int)rintf(fmaxf(0.01f, wd) * (float)NUM_LEDS) : (int)rintf(wd);
+  if (w < 1) w = 1;
+  if (w > NUM_LEDS) w = NUM_LEDS;
+  double p = fmod(t * (double)sp * 10.0, (double)NUM_LEDS);
+  if (p < 0.0) p += (double)NUM_LEDS;
+  int d = i - (int)p;
+  if (d < 0) d += NUM_LEDS;
+  float a = (d < w) ? 1.0f : 0.0f;
   r = (float)L_R[li] * br * a;
   g = (float)L_G[li] * br * a;
   b = (float)L_B[li] * br * a;
@@ -4120,8 +4634,13 @@ static uint32_t PROF_PIXELS_US = 0;
 static uint32_t PROF_FRAME = 0;
 #endif
 
+{RULES_RUNTIME}{TELEMETRY_DECLS}// Effect time follows preview/sim_clock.py: fixed 60 Hz steps, 0.5 s catch-up clamp.
+// double keeps the host build step-for-step with the preview (AVR double is float).
 static uint32_t __last_ms = 0;
-static float    __accum_s = 0.0f;
+static bool     __clock_started = false;
+static double   __accum_s = 0.0;
+static double   __sim_t = 0.0;
+static const double __SIM_DT = 1.0/60.0;
 static const float __FIXED_DT = 1.0f/60.0f;
 
 static uint8_t LAST_BEH[LAYERS];
@@ -4131,7 +4650,7 @@ void setup() {{
     Serial.begin(DBG_SERIAL_BAUD);
     delay(10);
   }}
-
+{TM_SETUP}
   modulo_led_init();
   msgeq7_setup();
   modulo_wifi_init();
@@ -4143,10 +4662,19 @@ void loop() {{
   uint32_t __prof_loop0 = micros();
   uint32_t __prof_pix0 = 0;
 #endif
-  modulo_wifi_tick();
-  float t = (float)now / 1000.0f;
+{TM_FRAME_BEGIN}  modulo_wifi_tick();
+  if (!__clock_started) {{ __clock_started = true; __last_ms = now; }}
+  double __dt_real = (double)now / 1000.0 - (double)__last_ms / 1000.0;
+  __last_ms = now;
+  if (__dt_real > 0.5) __dt_real = 0.5;
+  if (__dt_real > 0.0) __accum_s += __dt_real;
+  while (__accum_s >= __SIM_DT) {{
+    __accum_s -= __SIM_DT;
+    __sim_t += __SIM_DT;
+  }}
+  float t = (float)__sim_t;
   msgeq7_read();
-
+{TM_INPUT}
   // Reset per-frame rule-driven runtime overrides
 #if MODULA_POSTFX_ENABLED
   PFX_TRAIL_RT = PFX_TRAIL_BASE; PFX_TRAIL_SET = false;
@@ -4165,22 +4693,20 @@ void loop() {{
   }}
 
 {rules_apply}
-
-  for (int i=0; i<NUM_LEDS; i++) {{
+{TM_RULES}
+{MATH_FIXED_FRAME}  for (int i=0; i<NUM_LEDS; i++) {{
 #if MODULO_PROFILE
   __prof_pix0 = micros();
 #endif
     float outR = 0.0f, outG = 0.0f, outB = 0.0f;
-
+{TM_PIXEL_BEGIN}
     for (int li=0; li<LAYERS; li++) {{
-      if (!targetContains((uint16_t)i, L_TGT_KIND[li], L_TGT_REF[li])) continue;
-
-      float br, sp, wd, so, dn, dir;
-      float pf0=0.0f, pf1=0.0f, pf2=0.0f, pf3=0.0f;
-      float pi0=0.0f, pi1=0.0f, pi2=0.0f, pi3=0.0f;
-      computeLayerParams(li, t, br, sp, wd, so, dn, dir, pf0, pf1, pf2, pf3, pi0, pi1, pi2, pi3);
+      if (!targetContains((uint16_t)i, L_TGT_KIND[li], L_TGT_REF[li])) {{
+{TM_LAYER_SKIP}        continue;
+      }}
 
-      float lr=0.0f, lg=0.0f, lb=0.0f;
+{LAYER_PARAMS_PIXEL}
+{TM_LAYER_PARAMS}      float lr=0.0f, lg=0.0f, lb=0.0f;
       uint8_t beh = L_BEH[li];
       if (beh == 0) evalSolid(li, br, lr, lg, lb);
       else if (beh == 8) evalBouncer(li, i, br, sp, wd, lr, lg, lb);
@@ -4201,8 +4727,8 @@ void loop() {{
       else if (beh == 20) evalMemoryHeatmap(li, i, br, wd, lr, lg, lb);
       else if (beh == 21) evalAmbientDashboard(li, i, t, br, pf0, pf1, pf2, pf3, lr, lg, lb);
       else if (beh == 22) evalKernelDSL(li, i, t, br, (uint32_t)L_PI1[li], lr, lg, lb);
-      else if (beh == 23) evalWriteLoop(li, i, t, dt, br, (uint32_t)L_PI1[li], pf0, pf1, pf2, pf3, lr, lg, lb);
-      else if (beh == 1) evalChase(li, i, t, br, sp, wd, dir, lr, lg, lb);
+      else if (beh == 23) evalWriteLoop(li, i, t, __FIXED_DT, br, (uint32_t)L_PI1[li], pf0, pf1, pf2, pf3, lr, lg, lb);
+      else if (beh == 1) evalChase(li, i, __sim_t, br, sp, wd, lr, lg, lb);
       else if (beh == 2) evalWipe(li, i, t, br, sp, so, dir, lr, lg, lb);
       else if (beh == 3) evalSparkle(li, i, t, br, dn, lr, lg, lb);
       else if (beh == 4) evalScanner(li, i, t, br, sp, wd, so, dir, lr, lg, lb);
@@ -4220,14 +4746,14 @@ void loop() {{
       outR = outR * (1.0f - op) + blendedR * op;
       outG = outG * (1.0f - op) + blendedG * op;
       outB = outB * (1.0f - op) + blendedB * op;
-    }}
+{TM_LAYER}    }}
 
-    leds[i] = CRGB((uint8_t)clamp01(outR/255.0f)*255, (uint8_t)clamp01(outG/255.0f)*255, (uint8_t)clamp01(outB/255.0f)*255);
-  }}
+    leds[i] = CRGB((uint8_t)fminf(255.0f, fmaxf(0.0f, outR)), (uint8_t)fminf(255.0f, fmaxf(0.0f, outG)), (uint8_t)fminf(255.0f, fmaxf(0.0f, outB)));
+{TM_PIXELS}  }}
 
 {postfx_apply}
-  modulo_led_show();
-
+{TM_POSTFX}  modulo_led_show();
+{TM_SHOW}
 #if MODULO_PROFILE
   PROF_PIXELS_US = (uint32_t)(micros() - __prof_pix0);
   PROF_LAST_US = (uint32_t)(micros() - __prof_loop0);
@@ -4243,6 +4769,8 @@ void loop() {{
 }}
 
 """
+    sketch = _render_layerstack_template(sketch, tables)
+    sketch = sketch.replace("{EXPORT_MARKER}", EXPORT_MARKER)
     sketch = sketch.replace("{1 if DBG_PURPOSE else 0}", str(1 if DBG_PURPOSE else 0))
     sketch = sketch.replace("{CA_MODULE_DECLS}", str(ca_module_decls))
     sketch = sketch.replace("{CA_MODULE_DISPATCH}", str(ca_module_dispatch))
@@ -4250,34 +4778,66 @@ void loop() {{
     sketch = sketch.replace("{num_leds}", str(num_leds))
     sketch = sketch.replace("{int(num_leds)}", str(int(num_leds)))
     sketch = sketch.replace("{int(led_pin)}", str(int(led_pin)))
+    sketch = sketch.replace("{led_pin}", str(led_pin))
+    sketch = sketch.replace("{postfx_decls}", postfx_decls)
+    sketch = sketch.replace("{postfx_apply}", postfx_apply)
+    sketch = sketch.replace("{MATH_FIXED_DECLS}", ("\n\n" + math_decls.rstrip("\n")) if math_decls else "")
+    sketch = sketch.replace("{MATH_FIXED_FRAME}", math_frame)
+    sketch = sketch.replace("{LAYER_PARAMS_PIXEL}", layer_params_pixel)
+    sketch = sketch.replace("{GAMMA_LUT_DECLS}", (gamma_decls + "\n") if gamma_decls else "")
+    sketch = sketch.replace("{GAMMA_LUT_BRANCH}", gamma_branch)
+    sketch = sketch.replace("{rules_decls}", rules_decls)
+    sketch = sketch.replace("{RULES_RUNTIME}", rules_runtime)
+    sketch = sketch.replace("{rules_apply}", rules_apply)
+    for k, v in emit_telemetry_blocks(telemetry_config(project)).items():
+        sketch = sketch.replace(k, v)
     return sketch
 
 
-def export_project_layerstack(*, project: dict, template_path, out_path, replacements: dict | None = None):
-    code = make_layerstack_sketch(project=project)
+def _matrix_xy_from_replacements(rep: dict) -> list[int]:
+    """XY map for the matrix settings export_project_validated resolved into tokens."""
+    def _int(k, d=0):
+        try:
+            return int(str(rep.get(k, d)).strip())
+        except Exception:
+            return d
+    return matrix_xy_table(
+        _int("MATRIX_WIDTH"), _int("MATRIX_HEIGHT"),
+        serpentine=_int("MATRIX_SERPENTINE") != 0,
+        origin=str(rep.get("MATRIX_ORIGIN") or ""),
+        rotate=_int("MATRIX_ROTATE"),
+        flip_x=_int("MATRIX_FLIP_X") != 0,
+        flip_y=_int("MATRIX_FLIP_Y") != 0,
+    )
+
+
+def export_project_layerstack(*, project: dict, template_path, out_path, replacements: dict | None = None,
+                              math_mode: str | None = None, target_meta: dict | None = None):
+    rep0 = replacements or {}
+    layout0 = (project or {}).get("layout") or {}
+    is_matrix = str(layout0.get("kind") or layout0.get("shape") or "").strip().lower() in ("matrix", "cells")
+    cells = 0
+    if is_matrix:
+        try:
+            cells = int(str(rep0.get("MATRIX_WIDTH", 0)).strip()) * int(str(rep0.get("MATRIX_HEIGHT", 0)).strip())
+        except Exception:
+            cells = 0
+    lut_plan = plan_lookup_tables(project, target_meta, matrix_cells=cells,
+                                  gamma_values=_export_gamma_values(project))
+    code = make_layerstack_sketch(project=project, math_mode=math_mode, lut_plan=lut_plan,
+                                  rules_mode=plan_rules_mode(project, target_meta))
     # Optional low-level target hooks (includes/defines/setup/loop injections)
     _hooks = _load_target_hooks(Path(template_path) if template_path is not None else None)
     code = _inject_target_hooks(code, _hooks)
     rep = dict(replacements or {})
 
-    # derived counts for token replacements
-    layers_list = list((project or {}).get('layers') or [])
-    rep.setdefault('LAYER_COUNT', str(len(layers_list)))
-    if 'GROUP_INDEXES_LEN' not in rep:
-        gi = rep.get('GROUP_INDEXES')
-        if isinstance(gi, str):
-            s = gi.strip()
-            if s.startswith('{') and s.endswith('}'):
-                inner = s[1:-1].strip()
-                if not inner:
-                    rep['GROUP_INDEXES_LEN'] = '0'
-                else:
-                    rep['GROUP_INDEXES_LEN'] = str(len([p for p in inner.split(',') if p.strip()]))
-        if 'GROUP_INDEXES_LEN' not in rep:
-            rep['GROUP_INDEXES_LEN'] = '0'
-
     # Ensure LED backend is always defined; targets may override this token.
     rep.setdefault("LED_IMPL", FASTLED_LED_IMPL)
+    # The layer stack places the backend after its NUM_LEDS/LED_PIN defines; emit it there
+    # only, so the template's earlier @@LED_IMPL@@ slot does not define leds[] twice.
+    if "@@LED_IMPL@@" in code:
+        code = code.replace("@@LED_IMPL@@", str(rep["LED_IMPL"]))
+        rep["LED_IMPL"] = "// LED backend: emitted with the layer stack (after NUM_LEDS)"
 
     # Matrix implementation
     rep.setdefault("MATRIX_IMPL", "")
@@ -4288,6 +4848,8 @@ def export_project_layerstack(*, project: dict, template_path, out_path, replace
             rep["MATRIX_IMPL"] = MATRIX_IMPL
     except Exception:
         rep["MATRIX_IMPL"] = ""
+    rep.setdefault("MATRIX_XY_IMPL", emit_xy_impl(_matrix_xy_from_replacements(rep) if lut_plan.xy_map else None,
+                                                  lut_plan.storage))
     return export_sketch(sketch_code=code, template_path=template_path, out_path=out_path, replacements=rep)
 
 
@@ -4329,8 +4891,12 @@ def validate_project_layout_compat(project: dict) -> None:
         msg += "Fix: change layout OR remove/replace those layers."
         raise ExportValidationError(msg)
 
-def export_project_validated(project: dict, out_path: Path, *, template_path: Path | None = None, replacements: dict | None = None) -> Path:
-    """Validated export entrypoint used by UI."""
+def export_project_validated(project: dict, out_path: Path, *, template_path: Path | None = None, replacements: dict | None = None, math_mode: str | None = None, target_meta: dict | None = None) -> Path:
+    """Validated export entrypoint used by UI.
+
+    math_mode: "float" | "fixed" (target packs pass their resolved mode; None = project.export).
+    target_meta: target.json of the selected pack; sizes lookup tables (export.budget). None = computed form.
+    """
     res = _check_preconditions(project or {})
     if isinstance(res, tuple) and len(res) == 3:
         ok, problems, _warns = res
@@ -4545,7 +5111,7 @@ def export_project_validated(project: dict, out_path: Path, *, template_path: Pa
         bv = 255
     replacements.setdefault("LED_BRIGHTNESS", str(bv))
 
-    return export_project_layerstack(project=project, template_path=tpl, out_path=out_path, replacements=replacements)
+    return export_project_layerstack(project=project, template_path=tpl, out_path=out_path, replacements=replacements, math_mode=math_mode, target_meta=target_meta)
 
 
 
@@ -4620,13 +5186,18 @@ static inline uint16_t modulo_xy(uint16_t x, uint16_t y) {
   }
 }
 
+@@MATRIX_XY_IMPL@@
 // Map logical linear index -> physical linear index.
 static inline uint16_t modulo_map_index(uint16_t i) {
   uint16_t n = (uint16_t)(MATRIX_WIDTH * MATRIX_HEIGHT);
   if (i >= n) return i;
+#ifdef MODULO_XY_LUT
+  return (uint16_t)MODULO_LUT_U16(MODULO_XY_MAP, i);
+#else
   uint16_t x = (uint16_t)(i % MATRIX_WIDTH);
   uint16_t y = (uint16_t)(i / MATRIX_WIDTH);
   return modulo_xy(x, y);
+#endif
 }
 
 
@@ -12,6 +12,7 @@ class BudgetEstimate:
     ram_limit_bytes: Optional[int] = None
     max_leds_recommended: Optional[int] = None
     max_leds_hard: Optional[int] = None
+    firmware: Optional[FirmwareCostEstimate] = None  # target-aware RAM/flash/FPS model
 
 # Conservative defaults for classic AVR boards
 UNO_RAM = 2048
@@ -50,7 +51,19 @@ def estimate_project_budget_for_target(project: Dict[str, Any], target_meta: Dic
     ram_limit = target_meta.get("ram_limit_bytes")
     max_leds = target_meta.get("max_leds_recommended")
     max_leds_hard = target_meta.get("max_leds_hard")
-    return estimate_project_budget_for_limits(project, ram_limit_bytes=ram_limit, max_leds_recommended=max_leds, max_leds_hard=max_leds_hard)
+    est = estimate_project_budget_for_limits(project, ram_limit_bytes=ram_limit, max_leds_recommended=max_leds, max_leds_hard=max_leds_hard)
+    if not (str(target_meta.get("arch") or "").strip().lower() in DEFAULT_CPU_HZ or target_meta.get("cpu_hz")):
+        return est  # no clock to scale by; leave FPS unpredicted rather than assume an Uno
+    try:
+        est.firmware = estimate_firmware_cost(project, target_meta)
+    except Exception:
+        est.firmware = None  # malformed layers are reported by export validation, not here
+    if est.firmware is not None:
+        # The firmware model supersedes the LED-count RAM formula; export.gating checks
+        # its RAM and flash totals against the target limits.
+        est.est_ram_bytes = est.firmware.ram_bytes
+        est.notes = [n for n in est.notes if not n.startswith("Estimated RAM")]
+    return est
 
 def estimate_project_budget_for_limits(
     project: Dict[str, Any],
@@ -99,3 +112,370 @@ def estimate_project_budget_for_limits(
         max_leds_recommended=max_leds_recommended if isinstance(max_leds_recommended, int) else None,
         max_leds_hard=max_leds_hard if isinstance(max_leds_hard, int) else None,
     )
+
+
+# --- Lookup-table planning (export/luts.py) ---
+
+# Flash defaults when a target pack does not declare flash_limit_bytes.
+UNO_FLASH = 32768
+MEGA_FLASH = 262144
+DEFAULT_FLASH_BY_ARCH = {"esp8266": 1048576, "esp32": 4194304, "rp2040": 2097152, "stm32": 131072,
+                         "teensy": 2031616, "arm": 2031616}
+# Conservative flash taken by the layer-stack sketch + LED/audio libraries.
+SKETCH_FLASH_ESTIMATE = 20480
+# Share of the remaining flash lookup tables may use.
+LUT_FLASH_SHARE = 0.25
+# Boards whose plain `const` data is copied to RAM (tables go to PROGMEM there).
+PROGMEM_ARCHES = ("avr", "esp8266")
+
+@dataclass
+class LookupTablePlan:
+    storage: str                 # "progmem" | "const"
+    xy_map: bool
+    gamma: List[float]           # gamma operator values baked as curves
+    table_bytes: int
+    budget_bytes: int
+    notes: List[str]
+
+def target_flash_limit(target_meta: Dict[str, Any]) -> int:
+    v = (target_meta or {}).get("flash_limit_bytes")
+    if isinstance(v, int) and v > 0:
+        return v
+    arch = str((target_meta or {}).get("arch") or "").strip().lower()
+    if arch == "avr":
+        ram = (target_meta or {}).get("ram_limit_bytes")
+        return UNO_FLASH if (isinstance(ram, int) and ram <= UNO_RAM) else MEGA_FLASH
+    return DEFAULT_FLASH_BY_ARCH.get(arch, MEGA_FLASH)
+
+def plan_lookup_tables(
+    project: Dict[str, Any],
+    target_meta: Optional[Dict[str, Any]],
+    *,
+    matrix_cells: int = 0,
+    gamma_values: Optional[List[float]] = None,
+) -> LookupTablePlan:
+    """Choose table vs computed form for the XY map and gamma curves from the target's flash.
+
+    Tables are added in hot-path order (XY map, then gamma curves) while they fit in
+    LUT_FLASH_SHARE of the flash left after SKETCH_FLASH_ESTIMATE. No target meta means
+    no tables (computed form, unchanged sketch). project.export.lut_mode may force
+    "tables" or "computed"; default "auto".
+    """
+    exp = (project or {}).get("export") or {}
+    mode = str(exp.get("lut_mode") or "auto").strip().lower() if isinstance(exp, dict) else "auto"
+    arch = str((target_meta or {}).get("arch") or "").strip().lower()
+    storage = "progmem" if arch in PROGMEM_ARCHES else "const"
+    notes: List[str] = []
+    if target_meta is None or mode == "computed":
+        return LookupTablePlan(storage, False, [], 0, 0, notes)
+
+    flash = target_flash_limit(target_meta)
+    budget = int(max(0, flash - SKETCH_FLASH_ESTIMATE) * LUT_FLASH_SHARE)
+    if mode == "tables":
+        budget = flash
+    used = 0
+    xy = False
+    if matrix_cells > 0:
+        need = int(matrix_cells) * 2
+        if used + need <= budget:
+            xy = True
+            used += need
+        else:
+            notes.append(f"XY map ({need} bytes) exceeds lookup-table budget {budget - used} bytes; using computed mapping.")
+    gammas: List[float] = []
+    for g in gamma_values or []:
+        if g in gammas:
+            continue
+        if used + 256 <= budget:
+            gammas.append(g)
+            used += 256
+        else:
+            notes.append(f"Gamma {g} curve (256 bytes) exceeds lookup-table budget; using powf.")
+    return LookupTablePlan(storage, xy, gammas, used, budget, notes)
+
+
+# --- Firmware cost model (RAM / flash / frame time per target) ---
+
+@dataclass(frozen=True)
+class KernelCost:
+    """Declared cost of one exported layer kernel (AVR cycles; see LAYERSTACK_KERNEL_COSTS)."""
+    cycles_per_pixel: int
+    cycles_per_frame: int = 0
+    ram_bytes: int = 0
+    ram_per_led: int = 0
+    flash_bytes: int = 0
+
+# Core clock when a target pack does not declare cpu_hz.
+DEFAULT_CPU_HZ = {"avr": 16_000_000, "esp8266": 80_000_000, "esp32": 240_000_000, "rp2040": 133_000_000,
+                  "stm32": 72_000_000, "teensy": 600_000_000, "arm": 48_000_000}
+# Cycles per AVR-equivalent cycle (32-bit ALU, hardware multiply/FPU where present).
+ARCH_CYCLE_FACTOR = {"avr": 1.0, "esp8266": 0.5, "esp32": 0.1, "rp2040": 0.35, "stm32": 0.4,
+                     "teensy": 0.08, "arm": 0.5}
+# One analogRead(); msgeq7_read() strobes 7 bands with a 30us settle and reads both channels.
+ADC_READ_US = {"avr": 112.0}
+ADC_READ_US_DEFAULT = 20.0
+# LED output: clockless chips shift 24 bits at 800 kHz (interrupts off), then latch.
+CLOCKLESS_US_PER_LED = 30.0
+CLOCKLESS_LATCH_US = 50.0
+SPI_US_PER_LED = 4.0
+SPI_LED_TYPES = ("APA102", "SK9822", "WS2801", "LPD8806", "P9813")
+
+# Layer-stack runtime, per pixel: layer params + blend (per enabled layer) and the output write.
+LAYER_PIXEL_CYCLES = {"float": 2700, "fixed": 1900}
+PIXEL_OUT_CYCLES = 600
+# Modulators: float mode evaluates them per pixel, fixed mode once per frame.
+MOD_PIXEL_CYCLES = {"lfo": 2500, "audio": 800}
+MOD_FRAME_CYCLES = 900
+# Operators per pixel (gamma is 3x powf, or a baked curve lookup).
+OP_PIXEL_CYCLES = {1: 450, 2: 13500, 3: 1500}
+GAMMA_LUT_PIXEL_CYCLES = 240
+# PostFX per pixel: trail blend, and one bleed tap (XY() computed vs baked map).
+POSTFX_TRAIL_CYCLES = 700
+POSTFX_BLEED_TAP_CYCLES = 350
+POSTFX_XY_CYCLES = 400
+# Rules V6: evaluated once per frame. Unrolled mode emits straight-line code per rule.
+RULE_FRAME_CYCLES = 400
+RULE_FLASH_BYTES = 160
+RULE_RAM_BYTES = 6
+VAR_RAM_BYTES = 4
+# Table mode: a RuleRow/RuleCond per rule/condition, one rules_read_signal() case per
+# distinct signal and a fixed interpreter; each rule pays a row copy + dispatch.
+RULE_TABLE_ROW_BYTES = 34
+RULE_TABLE_COND_BYTES = 6
+RULE_TABLE_SIGNAL_FLASH_BYTES = 24
+RULE_TABLE_RUNTIME_FLASH_BYTES = 1800
+RULE_TABLE_FRAME_CYCLES = 900
+RULE_TABLE_RAM_BYTES = 2
+# Auto rules mode: unrolled up to this many rules while they fit RULES_FLASH_SHARE of
+# the flash left after SKETCH_FLASH_ESTIMATE.
+RULES_UNROLLED_MAX = 48
+RULES_FLASH_SHARE = 0.25
+# Static footprint: per-layer const tables, per-layer state/overrides, runtime + libraries.
+LAYER_TABLE_BYTES = 130
+LAYER_STATE_BYTES = 128
+RUNTIME_RAM_BYTES = 512
+RUNTIME_FLASH_BYTES = 9000
+# Gate warning threshold (project.export.min_fps overrides).
+FPS_WARN_BELOW = 30.0
+# Gate warns above this share of ram_limit_bytes: the stack and heap live in what is left.
+RAM_WARN_SHARE = 0.85
+
+@dataclass
+class FirmwareCostEstimate:
+    arch: str
+    cpu_hz: int
+    math_mode: str
+    ram_bytes: int
+    flash_bytes: int
+    frame_us: float
+    predicted_fps: float
+    ram_breakdown: Dict[str, int]
+    flash_breakdown: Dict[str, int]
+    frame_breakdown_us: Dict[str, float]
+    notes: List[str]
+    rules_mode: str = "unrolled"
+
+    def describe(self) -> str:
+        parts = ", ".join(f"{k} {v / 1000.0:.1f} ms" for k, v in self.frame_breakdown_us.items() if v >= 50.0)
+        return (f"Predicted ~{self.predicted_fps:.0f} fps on {self.arch or 'unknown arch'} @ {self.cpu_hz / 1e6:.0f} MHz "
+                f"(frame {self.frame_us / 1000.0:.1f} ms: {parts or 'negligible'}); "
+                f"RAM ~{self.ram_bytes} bytes, flash ~{self.flash_bytes} bytes.")
+
+def target_cpu_hz(target_meta: Optional[Dict[str, Any]]) -> int:
+    v = (target_meta or {}).get("cpu_hz")
+    if isinstance(v, int) and v > 0:
+        return v
+    arch = str((target_meta or {}).get("arch") or "").strip().lower()
+    return DEFAULT_CPU_HZ.get(arch, DEFAULT_CPU_HZ["avr"])
+
+def _export_cfg(project: Dict[str, Any]) -> Dict[str, Any]:
+    exp = (project or {}).get("export")
+    return exp if isinstance(exp, dict) else {}
+
+def _led_output_us(project: Dict[str, Any], target_meta: Dict[str, Any], leds: int) -> float:
+    backends = [str(b).strip().lower() for b in (target_meta.get("led_backends") or [])]
+    if backends and all(b == "hub75" for b in backends):
+        return 0.0  # I2S DMA refreshes the panel in the background
+    led_type = str(_export_cfg(project).get("led_type") or target_meta.get("default_led_type")
+                   or (target_meta.get("led_types") or ["WS2812B"])[0]).strip().upper()
+    if led_type in SPI_LED_TYPES:
+        return leds * SPI_US_PER_LED
+    return leds * CLOCKLESS_US_PER_LED + CLOCKLESS_LATCH_US
+
+def _audio_us(project: Dict[str, Any], target_meta: Dict[str, Any], arch: str) -> float:
+    caps = target_meta.get("capabilities") if isinstance(target_meta.get("capabilities"), dict) else {}
+    defaults = caps.get("defaults") if isinstance(caps.get("defaults"), dict) else {}
+    backend = str(_export_cfg(project).get("audio_backend") or target_meta.get("default_audio_backend")
+                  or defaults.get("audio_backend") or "none").strip().lower()
+    if backend != "msgeq7":
+        return 0.0
+    return 7 * (30.0 + 2 * ADC_READ_US.get(arch, ADC_READ_US_DEFAULT)) + 2.0
+
+def _uses_postfx(project: Dict[str, Any]) -> tuple[bool, bool, int]:
+    pf = (project or {}).get("postfx") or {}
+    try:
+        trail = float(pf.get("trail_amount", 0.0) or 0.0) > 0.0
+        bleed = float(pf.get("bleed_amount", 0.0) or 0.0) > 0.0
+        radius = min(2, max(1, int(pf.get("bleed_radius", 1) or 1)))
+    except Exception:
+        return True, True, 2
+    return trail, bleed, radius
+
+def _rules_v6_rows(project: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rules the Rules V6 emitters encode (enabled, with an id)."""
+    return [r for r in ((project or {}).get("rules_v6") or [])
+            if isinstance(r, dict) and str(r.get("id", "") or "") and bool(r.get("enabled", True))]
+
+def plan_rules_mode(project: Dict[str, Any], target_meta: Optional[Dict[str, Any]]) -> str:
+    """Choose "unrolled" or "table" emission for Rules V6 (export/arduino_exporter.py).
+
+    Unrolled code is fastest per rule but costs ~RULE_FLASH_BYTES each; the table
+    costs RULE_TABLE_ROW_BYTES per rule plus a fixed interpreter. Auto picks the
+    table above RULES_UNROLLED_MAX rules, or when unrolled rules would take more
+    than RULES_FLASH_SHARE of the target's flash left after SKETCH_FLASH_ESTIMATE.
+    project.export.rules_mode may force "unrolled" or "table"; default "auto".
+
+    The per-rule costs are model figures for AVR soft-float code, not measurements:
+    with no avr-gcc here, "100+ rules fit a Mega in table mode" is a prediction of
+    this model only. On the host harness (x86 g++ -Os) both modes grow by about
+    35 B/rule, so the flash saving there is not observable and remains unverified
+    until checked against a real AVR build.
+    """
+    mode = str(_export_cfg(project).get("rules_mode") or "auto").strip().lower()
+    if mode in ("unrolled", "table"):
+        return mode
+    n = len(_rules_v6_rows(project))
+    if n > RULES_UNROLLED_MAX:
+        return "table"
+    if target_meta is not None and n:
+        budget = max(0, target_flash_limit(target_meta) - SKETCH_FLASH_ESTIMATE) * RULES_FLASH_SHARE
+        if n * RULE_FLASH_BYTES > budget:
+            return "table"
+    return "unrolled"
+
+
+def estimate_firmware_cost(project: Dict[str, Any], target_meta: Optional[Dict[str, Any]]) -> FirmwareCostEstimate:
+    """Predict RAM, flash and frame time of the layer-stack sketch on a target.
+
+    Sums the declared kernel costs (export.arduino_exporter.LAYERSTACK_KERNEL_COSTS) with
+    the runtime's per-layer, modulator, operator, PostFX and rules costs, scales cycles
+    by the target's arch and clock, and adds LED output and MSGEQ7 read time. A model
+    for gating and UI hints, not a measurement (tools/host_harness.py measures).
+    """
+    from export.arduino_exporter import (LAYERSTACK_BEH_IDS, LAYERSTACK_FALLBACK_BEH_ID,
+                                         LAYERSTACK_KERNEL_COSTS, _export_gamma_values,
+                                         _layer_export_operators)
+    from export.fixed_math import normalize_math_mode, resolve_math_mode
+
+    meta = target_meta or {}
+    arch = str(meta.get("arch") or "").strip().lower()
+    cpu_hz = target_cpu_hz(meta)
+    factor = ARCH_CYCLE_FACTOR.get(arch, 1.0)
+    mode = normalize_math_mode(_export_cfg(project).get("math_mode")) or resolve_math_mode(project, meta)
+    leds = _infer_led_count(project)
+    layout = (project or {}).get("layout") or {}
+    is_cells = str(layout.get("kind") or layout.get("shape") or "").strip().lower() in ("matrix", "cells")
+    notes: List[str] = []
+
+    layers = [L for L in ((project or {}).get("layers") or [])
+              if isinstance(L, dict) and bool(L.get("enabled", True))
+              and (L.get("behavior") or L.get("effect")) != "audio_meter"]
+    lut = plan_lookup_tables(project, target_meta, matrix_cells=leds if is_cells else 0,
+                             gamma_values=_export_gamma_values(project)) if target_meta else None
+
+    pixel_cycles = PIXEL_OUT_CYCLES
+    frame_cycles = 0
+    for L in layers:
+        beh = str(L.get("behavior", "solid")).lower().strip()
+        k = LAYERSTACK_KERNEL_COSTS[LAYERSTACK_BEH_IDS.get(beh, LAYERSTACK_FALLBACK_BEH_ID)]
+        pixel_cycles += LAYER_PIXEL_CYCLES.get(mode, LAYER_PIXEL_CYCLES["float"]) + k.cycles_per_pixel
+        frame_cycles += k.cycles_per_frame
+        mods = [m for m in (L.get("modulotors") or []) if isinstance(m, dict) and bool(m.get("enabled", False))][:2]
+        for m in mods:
+            lfo = str(m.get("kind", "audio")).lower().strip() == "lfo" or str(m.get("source", "")).strip() == "lfo_sine"
+            if mode == "fixed":
+                frame_cycles += MOD_FRAME_CYCLES
+            else:
+                pixel_cycles += MOD_PIXEL_CYCLES["lfo" if lfo else "audio"]
+        try:
+            ops = _layer_export_operators(L)
+        except Exception:
+            ops = []
+        for kid, p0 in ops:
+            if kid == 2 and lut is not None and p0 in lut.gamma:
+                pixel_cycles += GAMMA_LUT_PIXEL_CYCLES
+            else:
+                pixel_cycles += OP_PIXEL_CYCLES.get(kid, 0)
+
+    trail, bleed, radius = _uses_postfx(project)
+    ram = meta.get("ram_limit_bytes")
+    uno_class = arch == "avr" and isinstance(ram, int) and ram <= UNO_RAM
+    postfx_on = (trail or bleed) and leds <= (120 if uno_class else 300)  # MODULA_POSTFX_ENABLED
+    if (trail or bleed) and not postfx_on:
+        notes.append("PostFX auto-disables at this LED count (firmware skips trail/bleed).")
+    postfx_cycles = 0
+    if postfx_on:
+        postfx_cycles += POSTFX_TRAIL_CYCLES
+    if postfx_on and bleed:
+        taps = (4 if is_cells else 2) * radius
+        xy = POSTFX_XY_CYCLES if (is_cells and not (lut and lut.xy_map)) else 0
+        postfx_cycles += taps * (POSTFX_BLEED_TAP_CYCLES + xy)
+
+    rules = _rules_v6_rows(project)
+    variables = (project or {}).get("variables") if isinstance((project or {}).get("variables"), dict) else {}
+    n_vars = sum(len(v) for v in variables.values() if isinstance(v, dict))
+    rules_mode = plan_rules_mode(project, target_meta)
+    if rules_mode == "table" and rules:
+        conds = [c for r in rules for c in (r.get("conditions") if isinstance(r.get("conditions"), list) else [])
+                 if isinstance(c, dict)]
+        signals = {c.get("signal") for c in conds}
+        for r in rules:
+            when = r.get("when") if isinstance(r.get("when"), dict) else {}
+            act = r.get("action") if isinstance(r.get("action"), dict) else {}
+            expr = act.get("expr") if isinstance(act.get("expr"), dict) else {}
+            signals.update([when.get("signal"), expr.get("signal")])
+        signals.discard(None)
+        signals.discard("")
+        frame_cycles += len(rules) * RULE_TABLE_FRAME_CYCLES
+        rules_ram = len(rules) * RULE_TABLE_RAM_BYTES
+        rules_flash = (RULE_TABLE_RUNTIME_FLASH_BYTES + len(rules) * RULE_TABLE_ROW_BYTES
+                       + len(conds) * RULE_TABLE_COND_BYTES + len(signals) * RULE_TABLE_SIGNAL_FLASH_BYTES)
+        notes.append(f"Rules V6: {len(rules)} rules emitted as a table (~{rules_flash} bytes flash).")
+    else:
+        frame_cycles += len(rules) * RULE_FRAME_CYCLES
+        rules_ram = len(rules) * RULE_RAM_BYTES
+        rules_flash = len(rules) * RULE_FLASH_BYTES
+
+    us_per_cycle = 1e6 / float(cpu_hz)
+    frame_breakdown = {
+        "pixels": leds * pixel_cycles * factor * us_per_cycle,
+        "updates": frame_cycles * factor * us_per_cycle,
+        "postfx": leds * postfx_cycles * factor * us_per_cycle,
+        "LED output": _led_output_us(project, meta, leds),
+        "audio": _audio_us(project, meta, arch),
+    }
+    frame_us = sum(frame_breakdown.values())
+    fps = 1e6 / frame_us if frame_us > 0 else 0.0
+
+    # Kernels are dispatched at runtime, so every kernel's statics and code are linked.
+    tables_in_ram = arch in PROGMEM_ARCHES
+    ram_breakdown = {
+        "framebuffer": leds * 3,
+        "kernels": sum(k.ram_bytes + k.ram_per_led * leds for k in LAYERSTACK_KERNEL_COSTS.values()),
+        "layers": len(layers) * (LAYER_STATE_BYTES + (LAYER_TABLE_BYTES if tables_in_ram else 0)),
+        "postfx": leds * 3 if postfx_on else 0,
+        "rules": rules_ram + n_vars * VAR_RAM_BYTES,
+        "runtime": RUNTIME_RAM_BYTES,
+    }
+    flash_breakdown = {
+        "runtime": RUNTIME_FLASH_BYTES,
+        "kernels": sum(k.flash_bytes for k in LAYERSTACK_KERNEL_COSTS.values()),
+        "layers": 0 if tables_in_ram else len(layers) * LAYER_TABLE_BYTES,
+        "rules": rules_flash,
+        "lookup tables": lut.table_bytes if lut else 0,
+    }
+    return FirmwareCostEstimate(arch=arch, cpu_hz=cpu_hz, math_mode=mode,
+                                ram_bytes=sum(ram_breakdown.values()), flash_bytes=sum(flash_breakdown.values()),
+                                frame_us=frame_us, predicted_fps=fps, ram_breakdown=ram_breakdown,
+                                flash_breakdown=flash_breakdown, frame_breakdown_us=frame_breakdown, notes=notes,
+                                rules_mode=rules_mode)
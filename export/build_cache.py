@@ -0,0 +1,314 @@
+from __future__ import annotations
+"""Content-addressed result cache + process-pool job runner for the export tools.
+
+Used by tools/parity_sweep.py, tools/golden_exports.py and tools/compile_sanity.py so
+release gating only recomputes the cells of the (project x target) matrix whose
+inputs changed. A cell key is a hash over:
+
+  - the normalized project JSON (sort_keys, compact separators)
+  - the target pack directory contents (target.json + emitter files)
+  - the exporter source tree (export/, behaviors/, params/, models/, runtime/, app/,
+    third_party/)
+
+Entries live in one JSON index per tool under out/build_cache/ (override with
+$MODULO_BUILD_CACHE). Deleting the directory is always safe.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = REPO_ROOT / "out" / "build_cache"
+CACHE_VERSION = 1
+# run_jobs rewrites the index at most this often (seconds / stored results), plus once at the end.
+FLUSH_INTERVAL_S = 5.0
+FLUSH_EVERY_RESULTS = 256
+
+# Source trees whose contents can change exporter/gating output.
+# third_party/ holds vendored assets (fonts, sprite sheets) that behaviors bake into exports.
+EXPORTER_SOURCE_DIRS = ("export", "behaviors", "params", "models", "runtime", "app", "third_party")
+_SOURCE_SUFFIXES = (".py", ".json", ".tpl", ".h", ".hpp", ".c", ".cpp", ".ino")
+
+_source_hash_memo: Optional[str] = None
+
+
+def hash_json(obj: Any) -> str:
+    """Stable sha256 of a JSON-able object (key order and whitespace do not matter)."""
+    blob = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def hash_tree(root: Path, *, suffixes: Sequence[str] = _SOURCE_SUFFIXES,
+              skip: Callable[[Path], bool] = lambda p: False) -> str:
+    """sha256 over (relative path, contents) of every matching file below `root`."""
+    root = Path(root)
+    h = hashlib.sha256()
+    if root.is_file():
+        h.update(root.read_bytes())
+        return h.hexdigest()
+    files = []
+    for p in root.rglob("*"):
+        if not p.is_file() or "__pycache__" in p.parts:
+            continue
+        if suffixes and p.suffix.lower() not in suffixes:
+            continue
+        if skip(p):
+            continue
+        files.append(p)
+    for p in sorted(files):
+        h.update(p.relative_to(root).as_posix().encode("utf-8"))
+        h.update(b"\0")
+        try:
+            h.update(p.read_bytes())
+        except OSError:
+            h.update(b"<unreadable>")
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _is_target_pack_file(p: Path) -> bool:
+    # Target packs (export/targets/<id>/...) are hashed separately per target.
+    try:
+        rel = p.relative_to(REPO_ROOT / "export" / "targets")
+    except ValueError:
+        return False
+    return len(rel.parts) > 1
+
+
+def exporter_source_hash() -> str:
+    """Hash of the exporter/gating source trees (memoized per process)."""
+    global _source_hash_memo
+    if _source_hash_memo is None:
+        h = hashlib.sha256()
+        h.update(f"build_cache:{CACHE_VERSION}".encode("ascii"))
+        for d in EXPORTER_SOURCE_DIRS:
+            h.update(d.encode("ascii"))
+            h.update(hash_tree(REPO_ROOT / d, skip=_is_target_pack_file).encode("ascii"))
+        _source_hash_memo = h.hexdigest()
+    return _source_hash_memo
+
+
+def target_pack_hash(target: Any) -> str:
+    """Hash of a target pack. Accepts a pack dir, a target meta dict, or a target id."""
+    if isinstance(target, dict):
+        src = target.get("source_dir")
+        if not src:
+            return hash_json(target)
+        pack_dir = Path(src)
+    elif isinstance(target, Path):
+        pack_dir = target
+    else:
+        from export.targets.registry import load_target
+        src = load_target(str(target)).meta.get("source_dir")
+        if not src:
+            return hash_json({"target": str(target)})
+        pack_dir = Path(src)
+    if not pack_dir.exists():
+        return hash_json({"missing_pack": str(pack_dir)})
+    return hash_tree(pack_dir, suffixes=())
+
+
+def cell_key(namespace: str, project: Any, target_hash: str, **extra: Any) -> str:
+    """Cache key for one (project, target) cell; `target_hash` comes from target_pack_hash()."""
+    return hash_json({
+        "ns": namespace,
+        "project": hash_json(project),
+        "target": str(target_hash),
+        "exporter": exporter_source_hash(),
+        "extra": extra,
+    })
+
+
+class ResultCache:
+    """JSON result store for one namespace: <root>/<namespace>.json.
+
+    The index is read once on first use and written back atomically by flush(), so a
+    cached sweep costs one file read instead of one per cell. Only the parent process
+    touches the index; pool workers just return values.
+    """
+
+    def __init__(self, namespace: str, root: Optional[Path] = None, *, enabled: bool = True):
+        if root is None:
+            env = os.environ.get("MODULO_BUILD_CACHE")
+            root = Path(env) if env else DEFAULT_CACHE_DIR
+        self.path = Path(root) / f"{namespace}.json"
+        self.enabled = bool(enabled)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Optional[Dict[str, Any]] = None
+        self._used: set = set()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if isinstance(data, dict) and data.get("v") == CACHE_VERSION and isinstance(data.get("entries"), dict):
+                    self._entries = data["entries"]
+            except (OSError, ValueError):
+                pass
+        return self._entries
+
+    def get(self, key: Optional[str]) -> Optional[Any]:
+        if not self.enabled or not key:
+            return None
+        v = self._load().get(key)
+        if v is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used.add(key)
+        return v
+
+    def put(self, key: Optional[str], value: Any) -> None:
+        if not self.enabled or not key or value is None:
+            return
+        self._load()[key] = value
+        self._used.add(key)
+        self._dirty = True
+
+    def flush(self, *, prune: bool = False) -> None:
+        """Write the index back. prune=True drops entries this run did not touch
+        (use after a full sweep so stale source/target hashes do not pile up)."""
+        if not self.enabled or self._entries is None:
+            return
+        if prune and set(self._entries) != self._used:
+            self._entries = {k: v for k, v in self._entries.items() if k in self._used}
+            self._dirty = True
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"v": CACHE_VERSION, "entries": self._entries}, separators=(",", ":")),
+                           encoding="utf-8")
+            os.replace(tmp, self.path)  # atomic: an interrupted run never leaves a torn index
+            self._dirty = False
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        self._entries = {}
+        self._used = set()
+        self._dirty = False
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+@dataclass
+class JobResult:
+    key: Optional[str]
+    value: Any = None
+    cached: bool = False
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def default_workers() -> int:
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+def _run_chunk(fn: Callable[[Any], Any], args: List[Any]) -> List[Tuple[Any, str]]:
+    out: List[Tuple[Any, str]] = []
+    for a in args:
+        try:
+            out.append((fn(a), ""))
+        except Exception as e:
+            out.append((None, f"{type(e).__name__}: {e}"))
+    return out
+
+
+def run_jobs(fn: Callable[[Any], Any], jobs: Iterable[Tuple[Optional[str], Any]], *,
+             cache: Optional[ResultCache] = None, workers: Optional[int] = None,
+             chunksize: int = 1, initializer: Optional[Callable[[], None]] = None,
+             should_cache: Optional[Callable[[Any], bool]] = None) -> Iterator[JobResult]:
+    """Run fn(arg) for each (key, arg) job, yielding JobResults in job order.
+
+    - Jobs whose key is in `cache` are not run (JobResult.cached=True).
+    - Misses run on a spawn process pool in chunks of `chunksize` (workers=1 or a pool
+      that cannot start runs serially in-process); successful results are stored and
+      the index is flushed every FLUSH_INTERVAL_S seconds or FLUSH_EVERY_RESULTS stored
+      results (whichever comes first) and once more on exit. `should_cache(value)` can veto
+      storing results that may be transient (e.g. a toolchain failure).
+    - Results stream as soon as every earlier job is done, so callers can write
+      reports incrementally while keeping a deterministic row order.
+
+    `fn` must be picklable (module-level) when workers > 1.
+    """
+    jobs = list(jobs)
+    hits: Dict[int, Any] = {}
+    misses: List[int] = []
+    for i, (key, _arg) in enumerate(jobs):
+        v = cache.get(key) if (cache is not None and key) else None
+        if v is not None:
+            hits[i] = v
+        else:
+            misses.append(i)
+
+    chunksize = max(1, int(chunksize))
+    chunks = [misses[j:j + chunksize] for j in range(0, len(misses), chunksize)]
+    n_workers = default_workers() if workers is None else max(1, int(workers))
+    ex = None
+    if n_workers > 1 and len(chunks) > 1:
+        try:
+            ex = ProcessPoolExecutor(max_workers=min(n_workers, len(chunks)),
+                                     mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=initializer)
+        except (OSError, ValueError, NotImplementedError):
+            ex = None
+    if ex is None and initializer is not None and chunks:
+        initializer()
+
+    chunk_of: Dict[int, int] = {i: c for c, idxs in enumerate(chunks) for i in idxs}
+    unflushed = 0
+    last_flush = time.monotonic()
+    futs: Dict[int, Any] = {}
+    done: Dict[int, List[Tuple[Any, str]]] = {}
+    try:
+        if ex is not None:
+            futs = {c: ex.submit(_run_chunk, fn, [jobs[i][1] for i in idxs]) for c, idxs in enumerate(chunks)}
+        for i, (key, arg) in enumerate(jobs):
+            if i in hits:
+                yield JobResult(key, hits[i], cached=True)
+                continue
+            c = chunk_of[i]
+            if c not in done:
+                if ex is None:
+                    done[c] = _run_chunk(fn, [jobs[j][1] for j in chunks[c]])
+                else:
+                    try:
+                        done[c] = futs[c].result()
+                    except Exception as e:  # includes BrokenProcessPool
+                        done[c] = [(None, f"{type(e).__name__}: {e}")] * len(chunks[c])
+            value, err = done[c][chunks[c].index(i)]
+            if not err and cache is not None and key and (should_cache is None or should_cache(value)):
+                cache.put(key, value)
+                unflushed += 1
+            if i == chunks[c][-1]:
+                done.pop(c, None)
+                # Periodic persistence: an interrupted run keeps most finished cells without
+                # rewriting the whole index after every chunk.
+                if unflushed and (unflushed >= FLUSH_EVERY_RESULTS
+                                  or time.monotonic() - last_flush >= FLUSH_INTERVAL_S):
+                    cache.flush()
+                    unflushed = 0
+                    last_flush = time.monotonic()
+            yield JobResult(key, value, cached=False, error=err)
+    finally:
+        if ex is not None:
+            ex.shutdown(wait=False, cancel_futures=True)
+        if cache is not None:
+            cache.flush()
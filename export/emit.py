@@ -101,6 +101,7 @@ from export.targets.registry import (
     resolve_requested_hw,
     resolve_requested_audio_hw,
 )
+from export.fixed_math import resolve_math_mode
 
 
 @dataclass
@@ -120,6 +121,7 @@ def emit_project(*, project: Dict[str, Any], out_path: Path, target_id: str, out
     selection = resolve_requested_backends(project or {}, meta)
     hw = resolve_requested_hw(project or {}, meta)
     aud = resolve_requested_audio_hw(project or {}, meta, selection.get("audio_backend"))
+    math_mode = resolve_math_mode(project or {}, meta)
 
     # Validate msg eq7 audio hw required (already also in parity gates in some builds, but keep fail-closed)
     if (selection.get("audio_backend") or "").lower() == "msgeq7":
@@ -143,6 +145,8 @@ def emit_project(*, project: Dict[str, Any], out_path: Path, target_id: str, out
         selection=selection,
         hw=hw,
         audio_hw=aud,
+        math_mode=math_mode,
+        target_meta=meta,
     )
     written_p = Path(written)
     rep = str(rep or "")
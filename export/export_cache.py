@@ -0,0 +1,98 @@
+from __future__ import annotations
+"""In-process, content-addressed memo for Arduino sketch sections.
+
+make_layerstack_sketch() is assembled from independent sections (PostFX, Rules V6,
+layer tables / CA module blocks). Each section is keyed on the normalized subset of
+the project it actually reads, so re-exporting an unchanged project - or changing
+only wiring (data pin, brightness, target) - reuses every section instead of
+re-running emission and validation.
+
+Sections that raise (ExportValidationError etc.) are never cached, so a broken
+project fails the same way on every export. Set MODULO_EXPORT_CACHE=0 to disable.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, TypeVar
+import hashlib
+import json
+import os
+import threading
+
+T = TypeVar("T")
+
+# Keys the exporter injects into live project dicts (params["_project"], resolved rule
+# operator slots); they are derived from other inputs, not inputs themselves.
+_SKIP_KEYS = frozenset({"_project", "_op_gain_slot", "_op_gamma_slot"})
+
+
+def normalize_inputs(obj: Any, _seen: Optional[set] = None) -> Any:
+    """JSON-able, order-independent view of section inputs (cycle-safe)."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if _seen is None:
+        _seen = set()
+    oid = id(obj)
+    if oid in _seen:
+        return "<cycle>"
+    if isinstance(obj, dict):
+        _seen.add(oid)
+        out = {str(k): normalize_inputs(v, _seen) for k, v in obj.items() if str(k) not in _SKIP_KEYS}
+        _seen.discard(oid)
+        return out
+    if isinstance(obj, (list, tuple)):
+        _seen.add(oid)
+        out_l = [normalize_inputs(v, _seen) for v in obj]
+        _seen.discard(oid)
+        return out_l
+    if isinstance(obj, (set, frozenset)):
+        return sorted(repr(v) for v in obj)
+    return repr(obj)
+
+
+def section_key(section: str, inputs: Any) -> str:
+    blob = json.dumps([section, normalize_inputs(inputs)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SectionCache:
+    """Bounded LRU of section outputs. Values must be immutable (str / tuples of str)."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = int(max_entries)
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return str(os.environ.get("MODULO_EXPORT_CACHE", "1")).strip().lower() not in ("0", "false", "off", "no")
+
+    def _count(self, section: str, what: str) -> None:
+        st = self.stats.setdefault(section, {"hits": 0, "misses": 0})
+        st[what] += 1
+
+    def memo(self, section: str, inputs: Any, build: Callable[[], T]) -> T:
+        """Return build() for these inputs, reusing a previous result when inputs match."""
+        if not self.enabled:
+            return build()
+        key = section_key(section, inputs)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._count(section, "hits")
+                return self._data[key]
+        value = build()
+        with self._lock:
+            self._count(section, "misses")
+            self._data[key] = value
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.stats.clear()
+
+
+SECTION_CACHE = SectionCache()
@@ -0,0 +1,224 @@
+"""Fixed-point math codegen for layer-stack exports (AVR / ESP8266).
+
+The float layer-stack sketch evaluates computeLayerParams() per pixel per layer:
+sinf LFOs, curve shaping and one-pole smoothing all run NUM_LEDS times a frame in
+soft-float on boards without an FPU. In "fixed" math mode the exporter instead:
+
+- evaluates modulators once per layer per frame in Q16.16 (signals, curves,
+  smoothing, target clamps) and caches the resulting layer params,
+- samples LFOs from a quarter-wave sin16 table (PROGMEM on AVR) with integer
+  millisecond phase, so phase stays exact however long the board has been up,
+- leaves behavior evaluators on float inputs (they read the cached params).
+
+Smoothing runs once per frame (as in preview) instead of once per pixel, and is
+seeded with the first sample like params.modulators.sample().
+
+Selection: project.export.math_mode ("float" | "fixed") wins over the target
+pack's target.json "math_mode"; anything else means "float". The float path is
+emitted byte-for-byte as before. No shipped pack defaults to "fixed": it is opt-in
+per project or per pack (selftest/test_host_harness.py checks it against preview).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional, Tuple
+
+MATH_MODES = ("float", "fixed")
+
+# LFO rates are clamped so rate_q16 * 999 ms fits in int32 (see mfx_lfo_q16).
+MAX_LFO_HZ = 32.0
+
+SIN_QUARTER_STEPS = 64
+
+
+def normalize_math_mode(v: Any) -> Optional[str]:
+    s = str(v or "").strip().lower()
+    return s if s in MATH_MODES else None
+
+
+def resolve_math_mode(project: Dict[str, Any] | None, target_meta: Dict[str, Any] | None = None) -> str:
+    """Math mode for an export: project.export.math_mode, then target.json, then float."""
+    exp = (project or {}).get("export")
+    if isinstance(exp, dict):
+        m = normalize_math_mode(exp.get("math_mode"))
+        if m:
+            return m
+    return normalize_math_mode((target_meta or {}).get("math_mode")) or "float"
+
+
+def sin_quarter_table() -> list[int]:
+    """Q1.15 sine over [0, pi/2] in SIN_QUARTER_STEPS steps (inclusive endpoint)."""
+    n = SIN_QUARTER_STEPS
+    return [int(round(32767.0 * math.sin(i * (math.pi / 2.0) / n))) for i in range(n + 1)]
+
+
+def _table_rows(vals: list[int], per_row: int = 12) -> str:
+    rows = [", ".join(str(v) for v in vals[i:i + per_row]) for i in range(0, len(vals), per_row)]
+    return ",\n  ".join(rows)
+
+
+FIXED_MATH_HELPERS = """// --- Fixed-point helpers (Q16.16 values, Q1.15 sine table) ---
+#if defined(__AVR__)
+#include <avr/pgmspace.h>
+#define MFX_PROGMEM PROGMEM
+#define MFX_SIN_Q(i) ((int16_t)pgm_read_word(&MFX_SIN_QUARTER[(i)]))
+#else
+#define MFX_PROGMEM
+#define MFX_SIN_Q(i) (MFX_SIN_QUARTER[(i)])
+#endif
+
+typedef int32_t q16_t;  // Q16.16
+#define MFX_ONE ((q16_t)65536)
+#define MFX_MAX_LFO_HZ @@MAX_LFO_HZ@@f
+
+static const int16_t MFX_SIN_QUARTER[@@SIN_N@@] MFX_PROGMEM = {
+  @@SIN_TABLE@@
+};
+
+static inline q16_t mfx_q16(float x) {
+  return (q16_t)(x * 65536.0f + (x >= 0.0f ? 0.5f : -0.5f));
+}
+static inline float mfx_float(q16_t q) { return (float)q * (1.0f / 65536.0f); }
+static inline q16_t mfx_mul(q16_t a, q16_t b) { return (q16_t)(((int64_t)a * (int64_t)b) >> 16); }
+static inline q16_t mfx_clamp01(q16_t v) { return v < 0 ? 0 : (v > MFX_ONE ? MFX_ONE : v); }
+
+// theta: one turn = 65536. Returns Q1.15 (linear interpolation between table steps).
+static inline int16_t mfx_sin16(uint16_t theta) {
+  uint8_t quad = (uint8_t)(theta >> 14);
+  uint16_t x = theta & 0x3FFF;
+  if (quad & 1) x = 0x4000 - x;
+  uint8_t i = (uint8_t)(x >> 8);
+  int32_t a = MFX_SIN_Q(i);
+  int32_t b = (i < @@SIN_STEPS@@) ? MFX_SIN_Q(i + 1) : a;
+  int16_t v = (int16_t)(a + (((b - a) * (int32_t)(x & 0xFF)) >> 8));
+  return (quad & 2) ? (int16_t)-v : v;
+}
+
+// sin(2*pi*(rate*t + phase)) with t = now_ms / 1000, as Q16.16 in [-1..1].
+static inline q16_t mfx_lfo_q16(float rate_hz, uint16_t phase16, uint32_t now_ms) {
+  if (rate_hz > MFX_MAX_LFO_HZ) rate_hz = MFX_MAX_LFO_HZ;
+  if (rate_hz < -MFX_MAX_LFO_HZ) rate_hz = -MFX_MAX_LFO_HZ;
+  int32_t rate_q16 = mfx_q16(rate_hz);
+  uint32_t s = now_ms / 1000u;
+  int32_t ms = (int32_t)(now_ms - s * 1000u);
+  // Whole seconds wrap modulo one turn; the sub-second part stays in int32 range.
+  uint16_t turn = (uint16_t)((uint32_t)rate_q16 * s + (uint32_t)((rate_q16 * ms) / 1000));
+  return (q16_t)mfx_sin16((uint16_t)(turn + phase16)) * 2;
+}
+
+// Curve shaping on a [-1..1] Q16.16 signal (0 linear,1 invert,2 abs,3 pow2,4 pow3).
+static inline q16_t mfx_curve(q16_t sig, uint8_t cv) {
+  if (cv == 0) return sig;
+  q16_t v = (sig + MFX_ONE) >> 1;
+  if (cv == 1) v = MFX_ONE - v;
+  else if (cv == 2) v = sig < 0 ? -sig : sig;
+  else if (cv == 3) v = mfx_mul(v, v);
+  else if (cv == 4) v = mfx_mul(mfx_mul(v, v), v);
+  return (v << 1) - MFX_ONE;
+}
+
+// One-pole smoothing: last = a*last + (1-a)*sig, a in Q16.16 (0..0.999).
+static inline q16_t mfx_smooth(q16_t last, q16_t sig, q16_t a) {
+  return mfx_mul(a, last) + mfx_mul(MFX_ONE - a, sig);
+}
+"""
+
+
+def fixed_math_helpers() -> str:
+    """Plain C++ helper block (no template escaping); compiles standalone with <stdint.h>."""
+    tab = sin_quarter_table()
+    return (FIXED_MATH_HELPERS
+            .replace("@@SIN_N@@", str(len(tab)))
+            .replace("@@SIN_STEPS@@", str(SIN_QUARTER_STEPS))
+            .replace("@@SIN_TABLE@@", _table_rows(tab))
+            .replace("@@MAX_LFO_HZ@@", f"{MAX_LFO_HZ:.1f}"))
+
+
+FIXED_LAYER_PARAMS = """
+// --- MODULO_MATH_FIXED: layer params evaluated once per frame (Q16.16) ---
+#define MODULO_MATH_FIXED 1
+
+struct MfxLayerParams { float br, sp, wd, so, dn, dir, pf0, pf1, pf2, pf3, pi0, pi1, pi2, pi3; };
+static MfxLayerParams LP[LAYERS];
+static q16_t M_LAST_Q[LAYERS*MODS_PER_LAYER];
+static uint8_t M_SEEDED[LAYERS*MODS_PER_LAYER];
+
+static inline float mfx_source_float(uint8_t src) {
+  if (src == 10) return (clamp01(g_energy) - 0.5f) * 2.0f;
+  if (src >= 11 && src <= 17) return (clamp01(g_mono[src-11]) - 0.5f) * 2.0f;
+  if (src >= 21 && src <= 27) return (clamp01((float)g_left[src-21] / 1023.0f) - 0.5f) * 2.0f;
+  if (src >= 31 && src <= 37) return (clamp01((float)g_right[src-31] / 1023.0f) - 0.5f) * 2.0f;
+  if (src == 50) return (clamp01(purpose_f0) - 0.5f) * 2.0f;
+  if (src == 51) return (clamp01(purpose_f1) - 0.5f) * 2.0f;
+  if (src == 52) return (clamp01(purpose_f2) - 0.5f) * 2.0f;
+  if (src == 53) return (clamp01(purpose_f3) - 0.5f) * 2.0f;
+  if (src == 54) return (clamp01((float)purpose_i0 * 0.001f) - 0.5f) * 2.0f;
+  if (src == 55) return (clamp01((float)purpose_i1 * 0.001f) - 0.5f) * 2.0f;
+  if (src == 56) return (clamp01((float)purpose_i2 * 0.001f) - 0.5f) * 2.0f;
+  if (src == 57) return (clamp01((float)purpose_i3 * 0.001f) - 0.5f) * 2.0f;
+  return 0.0f;
+}
+
+static void computeLayerParamsFixed(int li, uint32_t now_ms) {
+  MfxLayerParams &P = LP[li];
+  q16_t br = mfx_q16(L_BR_RT[li]), sp = mfx_q16(L_SP[li]), wd = mfx_q16(L_WD[li]);
+  q16_t so = mfx_q16(L_SO[li]), dn = mfx_q16(L_DN[li]);
+  float dir = L_DIR[li];
+  P.pf0 = L_PF0[li]; P.pf1 = L_PF1[li]; P.pf2 = L_PF2[li]; P.pf3 = L_PF3[li];
+  P.pi0 = clamp01(((float)L_PI0[li] + 1000.0f) / 2000.0f);
+  P.pi1 = clamp01(((float)L_PI1[li] + 1000.0f) / 2000.0f);
+  P.pi2 = clamp01(((float)L_PI2[li] + 1000.0f) / 2000.0f);
+  P.pi3 = clamp01(((float)L_PI3[li] + 1000.0f) / 2000.0f);
+
+  for (int mi=0; mi<MODS_PER_LAYER; mi++) {
+    int idx = li*MODS_PER_LAYER + mi;
+    uint8_t src = M_SRC[idx];
+    q16_t sig = 0;
+    if (src == 1) sig = mfx_lfo_q16(M_RATE[idx], (uint16_t)mfx_q16(M_PHASE[idx]), now_ms);
+    else if (src >= 10) sig = mfx_q16(mfx_source_float(src));
+    sig = mfx_curve(sig, M_CURVE[idx]);
+
+    float smooth = M_SMOOTH[idx];
+    if (smooth > 0.0f) {
+      if (!M_SEEDED[idx]) { M_LAST_Q[idx] = sig; M_SEEDED[idx] = 1; }
+      else M_LAST_Q[idx] = mfx_smooth(M_LAST_Q[idx], sig, mfx_q16(smooth > 0.999f ? 0.999f : smooth));
+      sig = M_LAST_Q[idx];
+    }
+
+    q16_t amt = mfx_q16(M_AMT[idx]);
+    q16_t delta = mfx_mul(sig, amt) + mfx_q16(M_BIAS[idx]);
+    uint8_t tgt = M_TGT[idx];
+    if (tgt == 0) br = mfx_clamp01(br + delta);
+    else if (tgt == 1) sp = sp + delta;
+    else if (tgt == 2) wd = mfx_clamp01(wd + delta);
+    else if (tgt == 3) so = mfx_clamp01(so + delta);
+    else if (tgt == 4) dn = mfx_clamp01(dn + delta);
+    else if (tgt == 5) dir = applyMode(dir, mfx_float(sig), M_MODE[idx], M_AMT[idx]);
+  }
+  P.br = mfx_float(br); P.sp = mfx_float(sp); P.wd = mfx_float(wd);
+  P.so = mfx_float(so); P.dn = mfx_float(dn); P.dir = dir;
+}
+"""
+
+FIXED_FRAME_PASS = """  // MODULO_MATH_FIXED: modulators once per layer per frame (not per pixel)
+  // Phase from the sketch's sim clock (same time base as t), rounded to whole ms.
+  for (int li=0; li<LAYERS; li++) computeLayerParamsFixed(li, (uint32_t)(__sim_t * 1000.0 + 0.5));
+
+"""
+
+FIXED_PIXEL_PARAMS = """      const MfxLayerParams &P = LP[li];
+      float br = P.br, sp = P.sp, wd = P.wd, so = P.so, dn = P.dn, dir = P.dir;
+      float pf0 = P.pf0, pf1 = P.pf1, pf2 = P.pf2, pf3 = P.pf3;
+      float pi0 = P.pi0, pi1 = P.pi1, pi2 = P.pi2, pi3 = P.pi3;
+"""
+
+
+def emit_math_blocks(math_mode: str, float_pixel_params: str) -> Tuple[str, str, str]:
+    """(decls, per-frame pass, per-pixel param fetch) for the layer-stack sketch.
+
+    Float mode returns ("", "", float_pixel_params) so the float sketch is unchanged.
+    """
+    if normalize_math_mode(math_mode) != "fixed":
+        return "", "", float_pixel_params
+    return fixed_math_helpers() + FIXED_LAYER_PARAMS, FIXED_FRAME_PASS, FIXED_PIXEL_PARAMS
@@ -12,7 +12,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List
 from export.export_eligibility import get_eligibility, ExportStatus
 
-from .budget import estimate_project_budget_for_target
+from .budget import FPS_WARN_BELOW, RAM_WARN_SHARE, estimate_project_budget_for_target, target_flash_limit
 
 
 @dataclass(frozen=True)
@@ -21,6 +21,7 @@ class GateResult:
     warnings: List[str]
     errors: List[str]
     suggestions: List[str]
+    prediction: str = ""  # firmware cost model summary (predicted FPS / RAM / flash), if available
 
 
 def _suggest_from_limits(project: Dict[str, Any], target_meta: Dict[str, Any], errors: List[str], warnings: List[str]) -> List[str]:
@@ -48,10 +49,16 @@ def _suggest_from_limits(project: Dict[str, Any], target_meta: Dict[str, Any], e
         s.append("Use a more memory-efficient LED backend/driver if offered by the target pack.")
         s.append("Disable or simplify memory-heavy features (large palettes, many layers/effects) if your project uses them.")
     # If close to limits, nudge user
+    if any("Predicted frame rate" in w for w in warnings):
+        s.append("Speed up the frame: fewer LEDs or layers, lighter behaviors, fixed math (export.math_mode), "
+                 "or a faster target (e.g., ESP32 variants).")
     if warnings and not errors:
         if ram_limit:
             s.append("If you hit limits later: pick a board with more RAM or reduce LED count.")
     # Generic advice
+    if any("Estimated flash" in e for e in errors):
+        s.append("Reduce flash: fewer Rules V6 rules (or export.rules_mode 'table'), fewer baked lookup tables, "
+                 "or a target with more flash (e.g., Arduino Mega, ESP32).")
     if flash_limit:
         s.append("If flash becomes the blocker: reduce effect variety / code size, or choose a target with more flash.")
 
@@ -77,6 +84,33 @@ def gate_project_for_target(project: Dict[str, Any], target_meta: Dict[str, Any]
         else:
             warnings.append(n)
 
+    # Predicted frame rate (export.budget firmware cost model)
+    fw = est.firmware
+    prediction = fw.describe() if fw is not None else ""
+    if fw is not None:
+        try:
+            min_fps = float(((project or {}).get("export") or {}).get("min_fps") or FPS_WARN_BELOW)
+        except Exception:
+            min_fps = FPS_WARN_BELOW
+        if fw.predicted_fps < min_fps:
+            slowest = max(fw.frame_breakdown_us.items(), key=lambda kv: kv[1])[0]
+            warnings.append(f"Predicted frame rate ~{int(fw.predicted_fps)} fps on this target is below {min_fps:.0f} fps "
+                            f"(frame {fw.frame_us / 1000.0:.1f} ms, mostly {slowest}).")
+
+        # Predicted RAM / flash (same model) against the target pack's limits.
+        ram_limit = (target_meta or {}).get("ram_limit_bytes")
+        if isinstance(ram_limit, int) and ram_limit > 0:
+            biggest = max(fw.ram_breakdown.items(), key=lambda kv: kv[1])[0]
+            if fw.ram_bytes > ram_limit:
+                errors.append(f"Estimated RAM {fw.ram_bytes} bytes > limit {ram_limit} bytes (mostly {biggest}). "
+                              "Reduce LEDs/layers or choose a higher-RAM target.")
+            elif fw.ram_bytes > ram_limit * RAM_WARN_SHARE:
+                warnings.append(f"Estimated RAM {fw.ram_bytes} bytes is over {int(RAM_WARN_SHARE * 100)}% of the "
+                                f"{ram_limit} byte limit; little is left for the stack.")
+        flash_limit = target_flash_limit(target_meta or {})
+        if fw.flash_bytes > flash_limit:
+            biggest = max(fw.flash_breakdown.items(), key=lambda kv: kv[1])[0]
+            errors.append(f"Estimated flash {fw.flash_bytes} bytes > limit {flash_limit} bytes (mostly {biggest}).")
 
     # PostFX runtime gating (preview/export parity)
     pf = (project or {}).get("postfx") or {}
@@ -133,7 +167,7 @@ def gate_project_for_target(project: Dict[str, Any], target_meta: Dict[str, Any]
 
     suggestions = _suggest_from_limits(project or {}, target_meta or {}, errors, warnings)
 
-    return GateResult(ok=(not errors), warnings=warnings, errors=errors, suggestions=suggestions)
+    return GateResult(ok=(not errors), warnings=warnings, errors=errors, suggestions=suggestions, prediction=prediction)
 
 # --- Step 1: Export Truth Enforcement ---
 
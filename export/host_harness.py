@@ -0,0 +1,760 @@
+"""Host-native firmware harness: run an exported sketch on the build machine.
+
+Compiles a generated .ino with the local C++ compiler against a minimal
+Arduino/FastLED shim, drives setup()/loop() with a scripted clock and scripted
+MSGEQ7 band readings, and captures every FastLED.show(). Per frame it reports:
+
+- cpu_us: thread CPU time spent in loop() (clock_gettime(CLOCK_THREAD_CPUTIME_ID))
+- stack_bytes: stack high-water mark of loop(), measured by painting the stack
+  below main() before each frame and scanning for the deepest overwritten byte
+- heap_bytes: malloc'd bytes in use after the frame (glibc mallinfo; -1 elsewhere)
+
+Numbers are host numbers (x86-64/aarch64 ABI, host FPU): use them as a
+regression signal between exports, not as AVR cycle counts.
+
+Captured frames can be diffed against PreviewEngine.render_frame() fed with
+the same timestamps and the same (ADC-quantized) audio, which gives a
+firmware/preview parity gate next to the timing gate. The shim covers what the
+Modulo templates use; sketches relying on Arduino prototype generation or on
+platform libraries (WiFi, NeoPixelBus, HUB75) fail at the compile stage, and
+that failure is reported as such.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+RGB = Tuple[int, int, int]
+
+ADC_MAX = 1023
+DEFAULT_STACK_PAINT = 64 * 1024
+
+HOST_SHIM_H = r"""// Modulo host shim: Arduino/FastLED stand-ins for running sketches on the build machine.
+#pragma once
+#include <stdint.h>
+#include <stddef.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <math.h>
+#include <string>
+
+#define MODULO_HOST_HARNESS 1
+#define PROGMEM
+#define F(s) (s)
+#define pgm_read_byte(p) (*(const uint8_t *)(p))
+#define pgm_read_word(p) (*(const uint16_t *)(p))
+#define pgm_read_dword(p) (*(const uint32_t *)(p))
+#define pgm_read_float(p) (*(const float *)(p))
+#define memcpy_P(d, s, n) memcpy((d), (s), (n))
+#define LOW 0
+#define HIGH 1
+#define INPUT 0
+#define OUTPUT 1
+#define INPUT_PULLUP 2
+#define A0 54
+#define A1 55
+#define A2 56
+#define A3 57
+#define A4 58
+#define A5 59
+#define A6 60
+#define A7 61
+#ifndef PI
+#define PI 3.14159265358979323846
+#endif
+#define constrain(x, lo, hi) ((x) < (lo) ? (lo) : ((x) > (hi) ? (hi) : (x)))
+typedef bool boolean;
+typedef uint8_t byte;
+
+template <class A, class B> static inline auto min(A a, B b) -> decltype(a < b ? a : b) { return a < b ? a : b; }
+template <class A, class B> static inline auto max(A a, B b) -> decltype(a < b ? a : b) { return a < b ? b : a; }
+
+uint32_t millis();
+uint32_t micros();
+void delay(uint32_t ms);
+void delayMicroseconds(uint32_t us);
+void pinMode(int pin, int mode);
+void digitalWrite(int pin, int value);
+int digitalRead(int pin);
+int analogRead(int pin);
+void analogWrite(int pin, int value);
+long random(long hi);
+long random(long lo, long hi);
+void randomSeed(unsigned long seed);
+
+class String {
+ public:
+  String() {}
+  String(const char *s) : s_(s ? s : "") {}
+  String(const std::string &s) : s_(s) {}
+  String(int v) : s_(std::to_string(v)) {}
+  String(unsigned v) : s_(std::to_string(v)) {}
+  String(long v) : s_(std::to_string(v)) {}
+  String(unsigned long v) : s_(std::to_string(v)) {}
+  String(float v) : s_(std::to_string(v)) {}
+  String(double v) : s_(std::to_string(v)) {}
+  unsigned length() const { return (unsigned)s_.size(); }
+  const char *c_str() const { return s_.c_str(); }
+  String operator+(const String &o) const { return String(s_ + o.s_); }
+  String &operator+=(const String &o) { s_ += o.s_; return *this; }
+  bool operator==(const String &o) const { return s_ == o.s_; }
+  bool operator!=(const String &o) const { return s_ != o.s_; }
+ private:
+  std::string s_;
+};
+
+class HostSerial {
+ public:
+  void begin(unsigned long) {}
+  int available() { return 0; }
+  int read() { return -1; }
+  void flush() { fflush(stderr); }
+  size_t write(uint8_t c) { fputc(c, stderr); return 1; }
+  size_t write(const uint8_t *buf, size_t n) { return fwrite(buf, 1, n, stderr); }
+  size_t print(const char *s) { return (size_t)fprintf(stderr, "%s", s); }
+  size_t print(const String &s) { return print(s.c_str()); }
+  size_t print(char c) { return (size_t)fprintf(stderr, "%c", c); }
+  size_t print(int v) { return (size_t)fprintf(stderr, "%d", v); }
+  size_t print(unsigned v) { return (size_t)fprintf(stderr, "%u", v); }
+  size_t print(long v) { return (size_t)fprintf(stderr, "%ld", v); }
+  size_t print(unsigned long v) { return (size_t)fprintf(stderr, "%lu", v); }
+  size_t print(double v, int digits = 2) { return (size_t)fprintf(stderr, "%.*f", digits, v); }
+  size_t println() { return print("\n"); }
+  template <class T> size_t println(const T &v) { size_t n = print(v); return n + println(); }
+  operator bool() const { return true; }
+};
+extern HostSerial Serial;
+
+// --- FastLED subset ---
+static inline uint8_t scale8(uint8_t i, uint8_t s) { return (uint8_t)(((uint16_t)i * (uint16_t)(s + 1)) >> 8); }
+static inline uint8_t qadd8(uint8_t a, uint8_t b) { unsigned t = (unsigned)a + b; return (uint8_t)(t > 255 ? 255 : t); }
+static inline uint8_t qsub8(uint8_t a, uint8_t b) { return (uint8_t)(a > b ? a - b : 0); }
+static inline uint8_t random8() { return (uint8_t)random(256); }
+static inline uint8_t random8(uint8_t hi) { return (uint8_t)random(hi); }
+static inline uint8_t random8(uint8_t lo, uint8_t hi) { return (uint8_t)random(lo, hi); }
+static inline uint16_t random16() { return (uint16_t)random(65536); }
+static inline uint16_t random16(uint16_t hi) { return (uint16_t)random(hi); }
+static inline uint8_t sin8(uint8_t theta) { return (uint8_t)lrintf(127.5f + 127.5f * sinf(theta * (float)(2.0 * PI / 256.0))); }
+static inline uint8_t cos8(uint8_t theta) { return sin8((uint8_t)(theta + 64)); }
+
+struct CHSV {
+  uint8_t h, s, v;
+  CHSV() : h(0), s(0), v(0) {}
+  CHSV(uint8_t H, uint8_t S, uint8_t V) : h(H), s(S), v(V) {}
+};
+
+struct CRGB {
+  union {
+    struct { uint8_t r, g, b; };
+    uint8_t raw[3];
+  };
+  CRGB() : r(0), g(0), b(0) {}
+  CRGB(uint8_t R, uint8_t G, uint8_t B) : r(R), g(G), b(B) {}
+  CRGB(uint32_t code) : r((uint8_t)(code >> 16)), g((uint8_t)(code >> 8)), b((uint8_t)code) {}
+  CRGB(const CHSV &hsv);
+  uint8_t &operator[](uint8_t i) { return raw[i]; }
+  const uint8_t &operator[](uint8_t i) const { return raw[i]; }
+  bool operator==(const CRGB &o) const { return r == o.r && g == o.g && b == o.b; }
+  bool operator!=(const CRGB &o) const { return !(*this == o); }
+  CRGB &operator+=(const CRGB &o) { r = qadd8(r, o.r); g = qadd8(g, o.g); b = qadd8(b, o.b); return *this; }
+  CRGB &operator-=(const CRGB &o) { r = qsub8(r, o.r); g = qsub8(g, o.g); b = qsub8(b, o.b); return *this; }
+  CRGB &nscale8(uint8_t s) { r = scale8(r, s); g = scale8(g, s); b = scale8(b, s); return *this; }
+  CRGB &fadeToBlackBy(uint8_t f) { return nscale8((uint8_t)(255 - f)); }
+  enum { Black = 0x000000, White = 0xFFFFFF, Red = 0xFF0000, Green = 0x008000, Blue = 0x0000FF };
+};
+
+static inline void hsv2rgb_rainbow(const CHSV &hsv, CRGB &out) {
+  float h = hsv.h * (6.0f / 256.0f), s = hsv.s / 255.0f, v = hsv.v / 255.0f;
+  int k = (int)h;
+  float f = h - (float)k, p = v * (1.0f - s), q = v * (1.0f - s * f), t = v * (1.0f - s * (1.0f - f));
+  float rgb[6][3] = {{v, t, p}, {q, v, p}, {p, v, t}, {p, q, v}, {t, p, v}, {v, p, q}};
+  out = CRGB((uint8_t)lrintf(rgb[k % 6][0] * 255.0f), (uint8_t)lrintf(rgb[k % 6][1] * 255.0f), (uint8_t)lrintf(rgb[k % 6][2] * 255.0f));
+}
+inline CRGB::CRGB(const CHSV &hsv) { hsv2rgb_rainbow(hsv, *this); }
+
+static inline void fill_solid(CRGB *leds, int n, const CRGB &c) { for (int i = 0; i < n; i++) leds[i] = c; }
+static inline void fadeToBlackBy(CRGB *leds, uint16_t n, uint8_t f) { for (uint16_t i = 0; i < n; i++) leds[i].fadeToBlackBy(f); }
+
+enum EOrder { RGB = 0012, RBG = 0021, GRB = 0102, GBR = 0120, BRG = 0201, BGR = 0210 };
+template <uint8_t PIN, EOrder ORDER = RGB> class WS2812B {};
+template <uint8_t PIN, EOrder ORDER = RGB> class WS2812 {};
+template <uint8_t PIN, EOrder ORDER = RGB> class WS2811 {};
+template <uint8_t PIN, EOrder ORDER = RGB> class SK6812 {};
+#define TypicalLEDStrip 0xFFB0F0
+#define UncorrectedColor 0xFFFFFF
+
+class CLEDController {
+ public:
+  CLEDController &setCorrection(uint32_t) { return *this; }
+  CLEDController &setTemperature(uint32_t) { return *this; }
+  CLEDController &setDither(uint8_t = 0) { return *this; }
+};
+
+void __host_register_leds(CRGB *leds, int n);
+void __host_capture_show(uint8_t brightness);
+
+class CFastLED {
+ public:
+  template <template <uint8_t, EOrder> class CHIPSET, uint8_t PIN, EOrder ORDER>
+  CLEDController &addLeds(CRGB *leds, int n, int offset = 0) { __host_register_leds(leds + offset, n); return ctl_; }
+  void setBrightness(uint8_t b) { brightness_ = b; }
+  uint8_t getBrightness() const { return brightness_; }
+  void setMaxPowerInVoltsAndMilliamps(uint8_t, uint32_t) {}
+  void setCorrection(uint32_t) {}
+  void setDither(uint8_t = 0) {}
+  void show() { __host_capture_show(brightness_); }
+  void show(uint8_t b) { __host_capture_show(b); }
+  void clear(bool write_data = false);
+  void delay(uint32_t ms) { show(); ::delay(ms); }
+ private:
+  CLEDController ctl_;
+  uint8_t brightness_ = 255;
+};
+extern CFastLED FastLED;
+"""
+
+HOST_MAIN_CPP = r"""// Modulo host harness driver: scripted clock/audio, show() capture, per-frame CPU/stack/heap.
+#include "modulo_host_shim.h"
+#include <time.h>
+#if defined(__GLIBC__)
+#include <malloc.h>
+#endif
+
+void setup();
+void loop();
+extern const int __host_msgeq7_pins[4];  // reset, strobe, left, right (-1 when not wired)
+
+HostSerial Serial;
+CFastLED FastLED;
+
+static uint64_t g_us = 0;
+static uint16_t g_bands[2][7];
+static int g_band = -1, g_reads_in_band = 0;
+static int g_pin_level[128];
+static CRGB *g_leds = nullptr;
+static int g_num_leds = 0;
+static CRGB *g_shown = nullptr;
+static int g_shows = 0;
+static uint8_t g_shown_brightness = 255;
+static uint64_t g_rand = 0x9E3779B97F4A7C15ull;
+
+uint32_t millis() { return (uint32_t)(g_us / 1000u); }
+uint32_t micros() { return (uint32_t)g_us; }
+void delay(uint32_t ms) { g_us += (uint64_t)ms * 1000u; }
+void delayMicroseconds(uint32_t us) { g_us += us; }
+void pinMode(int, int) {}
+int digitalRead(int pin) { return (pin >= 0 && pin < 128) ? g_pin_level[pin] : 0; }
+void analogWrite(int, int) {}
+
+void digitalWrite(int pin, int value) {
+  int prev = digitalRead(pin);
+  if (pin >= 0 && pin < 128) g_pin_level[pin] = value ? 1 : 0;
+  if (pin == __host_msgeq7_pins[0] && value) g_band = -1;
+  if (pin == __host_msgeq7_pins[1] && prev && !value) {  // strobe falling edge: next band
+    g_band = g_band < 6 ? g_band + 1 : 6;
+    g_reads_in_band = 0;
+  }
+}
+
+int analogRead(int pin) {
+  int band = g_band < 0 ? 0 : g_band;
+  int side;
+  if (pin == __host_msgeq7_pins[2]) side = 0;
+  else if (pin == __host_msgeq7_pins[3]) side = 1;
+  else side = g_reads_in_band & 1;
+  g_reads_in_band++;
+  return g_bands[side][band];
+}
+
+void randomSeed(unsigned long seed) { g_rand = seed ? seed : 1; }
+long random(long hi) {
+  if (hi <= 0) return 0;
+  g_rand ^= g_rand << 13; g_rand ^= g_rand >> 7; g_rand ^= g_rand << 17;
+  return (long)(g_rand % (uint64_t)hi);
+}
+long random(long lo, long hi) { return hi > lo ? lo + random(hi - lo) : lo; }
+
+void __host_register_leds(CRGB *leds, int n) {
+  g_leds = leds;
+  g_num_leds = n;
+  delete[] g_shown;
+  g_shown = new CRGB[n > 0 ? n : 1];
+}
+
+void __host_capture_show(uint8_t brightness) {
+  if (g_leds) memcpy((void *)g_shown, (const void *)g_leds, sizeof(CRGB) * (size_t)g_num_leds);
+  g_shown_brightness = brightness;
+  g_shows++;
+}
+
+void CFastLED::clear(bool write_data) {
+  if (g_leds) memset((void *)g_leds, 0, sizeof(CRGB) * (size_t)g_num_leds);
+  if (write_data) show();
+}
+
+static uint64_t cpu_ns() {
+  struct timespec ts;
+  clock_gettime(CLOCK_THREAD_CPUTIME_ID, &ts);
+  return (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+}
+
+static long heap_in_use() {
+#if defined(__GLIBC__) && (__GLIBC__ > 2 || (__GLIBC__ == 2 && __GLIBC_MINOR__ >= 33))
+  return (long)mallinfo2().uordblks;
+#elif defined(__GLIBC__)
+  return (long)mallinfo().uordblks;
+#else
+  return -1;
+#endif
+}
+
+static size_t g_paint = 0;
+static const uint8_t PAINT = 0xA5;
+
+__attribute__((noinline)) static uintptr_t paint_stack() {
+  volatile uint8_t region[MODULO_HOST_STACK_PAINT];
+  for (size_t i = 0; i < sizeof(region); i++) region[i] = PAINT;
+  return (uintptr_t)&region[0];
+}
+
+__attribute__((noinline)) static size_t stack_used(uintptr_t lo) {
+  const volatile uint8_t *p = (const volatile uint8_t *)lo;
+  size_t i = 0;
+  while (i < g_paint && p[i] == PAINT) i++;
+  return g_paint - i;
+}
+
+static size_t g_stack0 = 0;  // harness overhead inside the painted region (clock reads)
+
+template <class F> static void measured(F fn, uint64_t &cpu, size_t &stack, long &heap, long heap0) {
+  uintptr_t lo = paint_stack();
+  uint64_t c0 = cpu_ns();
+  fn();
+  cpu = cpu_ns() - c0;
+  stack = stack_used(lo);
+  stack = stack > g_stack0 ? stack - g_stack0 : 0;
+  long h = heap_in_use();
+  heap = (h >= 0 && heap0 >= 0) ? h - heap0 : -1;
+}
+
+static void emit_frame(char tag, int idx, uint64_t ms, uint64_t cpu, size_t stack, long heap) {
+  printf("%c %d %llu %d %llu %zu %ld %u ", tag, idx, (unsigned long long)ms, g_shows,
+         (unsigned long long)cpu, stack, heap, (unsigned)g_shown_brightness);
+  for (int i = 0; i < g_num_leds; i++) printf("%02x%02x%02x", g_shown[i].r, g_shown[i].g, g_shown[i].b);
+  printf("\n");
+}
+
+int main(int argc, char **argv) {
+  if (argc < 2) { fprintf(stderr, "usage: %s SCRIPT\n", argv[0]); return 2; }
+  FILE *script = fopen(argv[1], "r");
+  if (!script) { perror(argv[1]); return 2; }
+  static char outbuf[1 << 16], inbuf[1 << 16];  // stdio buffers off the measured heap
+  setvbuf(stdout, outbuf, _IOFBF, sizeof(outbuf));
+  setvbuf(script, inbuf, _IOFBF, sizeof(inbuf));
+  g_paint = MODULO_HOST_STACK_PAINT;
+  long heap0 = heap_in_use();
+  uint64_t cpu; size_t stack; long heap;
+  measured([] {}, cpu, g_stack0, heap, heap0);
+  measured([] { setup(); }, cpu, stack, heap, heap0);
+  emit_frame('S', -1, 0, cpu, stack, heap);
+  unsigned long long ms;
+  int idx = 0;
+  while (fscanf(script, "%llu", &ms) == 1) {
+    for (int s = 0; s < 2; s++)
+      for (int k = 0; k < 7; k++) {
+        unsigned v = 0;
+        if (fscanf(script, "%u", &v) != 1) { fprintf(stderr, "bad script line %d\n", idx); return 2; }
+        g_bands[s][k] = (uint16_t)v;
+      }
+    if (ms * 1000u > g_us) g_us = ms * 1000u;  // delay() inside loop() may have run ahead
+    g_shows = 0;
+    measured([] { loop(); }, cpu, stack, heap, heap0);
+    emit_frame('F', idx++, ms, cpu, stack, heap);
+  }
+  fclose(script);
+  return 0;
+}
+"""
+
+HOST_SKETCH_WRAPPER = r"""// Modulo host harness: sketch translation unit.
+#include "sketch.ino.cpp"
+#if defined(MSGEQ7_RESET_PIN) && defined(MSGEQ7_STROBE_PIN) && defined(MSGEQ7_LEFT_PIN) && defined(MSGEQ7_RIGHT_PIN)
+extern const int __host_msgeq7_pins[4] = {MSGEQ7_RESET_PIN, MSGEQ7_STROBE_PIN, MSGEQ7_LEFT_PIN, MSGEQ7_RIGHT_PIN};
+#else
+extern const int __host_msgeq7_pins[4] = {-1, -1, -1, -1};
+#endif
+"""
+
+
+@dataclass
+class HostFrame:
+    index: int
+    t_ms: int
+    shows: int
+    cpu_us: float
+    stack_bytes: int
+    heap_bytes: int
+    brightness: int
+    pixels: List[RGB] = field(default_factory=list)
+
+
+@dataclass
+class HostHarnessResult:
+    ok: bool
+    stage: str  # "export" | "compile" | "run" | "done"
+    log: str = ""
+    setup: Optional[HostFrame] = None
+    frames: List[HostFrame] = field(default_factory=list)
+    parity: Optional[Dict[str, Any]] = None
+    serial_tail: List[str] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        cpu = sorted(f.cpu_us for f in self.frames)
+        out: Dict[str, Any] = {"ok": bool(self.ok), "stage": self.stage, "frames": len(self.frames)}
+        if cpu:
+            out.update({
+                "cpu_us_mean": sum(cpu) / len(cpu),
+                "cpu_us_p95": cpu[min(len(cpu) - 1, int(0.95 * len(cpu)))],
+                "cpu_us_max": cpu[-1],
+                "peak_stack_bytes": max(f.stack_bytes for f in self.frames),
+                "peak_heap_bytes": max(f.heap_bytes for f in self.frames),
+                "frames_without_show": sum(1 for f in self.frames if f.shows == 0),
+            })
+        if self.setup is not None:
+            out["setup_stack_bytes"] = self.setup.stack_bytes
+            out["setup_heap_bytes"] = self.setup.heap_bytes
+        if self.parity is not None:
+            out["parity"] = {k: v for k, v in self.parity.items() if k != "per_frame"}
+        if not self.ok:
+            out["log"] = self.log[:4000]
+        return out
+
+
+def find_cxx() -> Optional[str]:
+    return shutil.which("g++") or shutil.which("clang++") or shutil.which("c++")
+
+
+def compile_host_sketch(sketch_text: str, work_dir: Path, *, cxx: Optional[str] = None, opt: str = "-O2",
+                        stack_paint: int = DEFAULT_STACK_PAINT,
+                        extra_flags: Sequence[str] = ()) -> Tuple[bool, str, Optional[Path]]:
+    """Build work_dir/modulo_host from the sketch text; returns (ok, compiler log, binary)."""
+    cxx = cxx or find_cxx()
+    if not cxx:
+        return False, "No host C++ compiler found (g++/clang++/c++)", None
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    (work_dir / "modulo_host_shim.h").write_text(HOST_SHIM_H, encoding="utf-8")
+    (work_dir / "modulo_host_main.cpp").write_text(HOST_MAIN_CPP, encoding="utf-8")
+    (work_dir / "sketch.ino.cpp").write_text(sketch_text, encoding="utf-8")
+    (work_dir / "modulo_host_sketch.cpp").write_text(HOST_SKETCH_WRAPPER, encoding="utf-8")
+    # <FastLED.h> resolves to the shim so the sketch text is compiled unmodified.
+    (work_dir / "FastLED.h").write_text('#include "modulo_host_shim.h"\n', encoding="utf-8")
+    binary = work_dir / "modulo_host"
+    cmd = [cxx, "-std=gnu++14", opt, "-g0", "-fno-omit-frame-pointer", f"-DMODULO_HOST_STACK_PAINT={int(stack_paint)}",
+           "-I", str(work_dir), "-include", str(work_dir / "modulo_host_shim.h"), *extra_flags,
+           "-Wl,-z,now",  # no lazy PLT binding inside measured frames
+           "-o", str(binary), str(work_dir / "modulo_host_main.cpp"), str(work_dir / "modulo_host_sketch.cpp")]
+    try:
+        p = subprocess.run(cmd, capture_output=True, text=True)
+    except Exception as e:
+        return False, f"Failed to run {cxx}: {e}", None
+    log = ((p.stdout or "") + (p.stderr or "")).strip()
+    if p.returncode != 0:
+        return False, log, None
+    return True, log, binary
+
+
+def audio_script(frames: int, fps: float, audio: Any = None) -> List[Tuple[int, List[int], List[int]]]:
+    """(t_ms, left ADC[7], right ADC[7]) per frame; bands come from audio.step(t)/audio.state.
+
+    audio defaults to preview.audio.AudioSim (deterministic). Timestamps are whole
+    milliseconds because that is the resolution of millis() in the firmware.
+    """
+    if audio is None:
+        from preview.audio import AudioSim
+        audio = AudioSim()
+    out = []
+    for i in range(int(frames)):
+        ms = int(round(i * 1000.0 / max(1e-6, float(fps))))
+        st: Dict[str, Any] = {}
+        try:
+            audio.step(ms / 1000.0)
+            st = dict(getattr(audio, "state", {}) or {})
+        except Exception:
+            st = {}
+        adc = lambda v: max(0, min(ADC_MAX, int(round(float(v or 0.0) * ADC_MAX))))
+        out.append((ms, [adc(st.get(f"l{k}")) for k in range(7)], [adc(st.get(f"r{k}")) for k in range(7)]))
+    return out
+
+
+def audio_state_for(left: Sequence[int], right: Sequence[int]) -> Dict[str, float]:
+    """Preview audio state equivalent to what msgeq7_read() derives from the ADC values."""
+    st: Dict[str, float] = {}
+    mono = []
+    for k in range(7):
+        lf, rf = float(left[k]) / ADC_MAX, float(right[k]) / ADC_MAX
+        st[f"l{k}"], st[f"r{k}"] = lf, rf
+        mono.append(0.5 * (lf + rf))
+        st[f"mono{k}"] = mono[-1]
+    st["energy"] = sum(mono) / 7.0
+    return st
+
+
+class ScriptedAudio:
+    """Audio source for PreviewEngine replaying a harness script (latest frame at or before t)."""
+
+    def __init__(self, script: Sequence[Tuple[int, Sequence[int], Sequence[int]]]):
+        self.mode = "scripted"
+        self.backend = "host_harness"
+        self.status = "OK"
+        self._script = list(script)
+        self.state: Dict[str, float] = audio_state_for(*self._script[0][1:]) if self._script else {}
+
+    def step(self, t: float):
+        ms = float(t) * 1000.0 + 1e-6
+        cur = None
+        for row in self._script:
+            if row[0] > ms:
+                break
+            cur = row
+        if cur is not None:
+            self.state = audio_state_for(cur[1], cur[2])
+
+
+def run_host_binary(binary: Path, script: Sequence[Tuple[int, Sequence[int], Sequence[int]]], *,
+                    timeout: float = 120.0) -> Tuple[bool, str, Optional[HostFrame], List[HostFrame], List[str]]:
+    """Run a harness binary over the script; returns (ok, log, setup, frames, serial lines)."""
+    binary = Path(binary)
+    script_path = binary.parent / "script.txt"
+    script_path.write_text("".join(f"{ms} {' '.join(map(str, l))} {' '.join(map(str, r))}\n" for ms, l, r in script),
+                           encoding="utf-8")
+    try:
+        p = subprocess.run([str(binary), str(script_path)], capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return False, f"Harness timed out after {timeout:.0f}s", None, [], []
+    except Exception as e:
+        return False, f"Failed to run harness: {e}", None, [], []
+    serial = (p.stderr or "").splitlines()
+    setup: Optional[HostFrame] = None
+    frames: List[HostFrame] = []
+    for line in (p.stdout or "").splitlines():
+        parts = line.split()
+        if len(parts) < 8 or parts[0] not in ("S", "F"):
+            continue
+        hx = parts[8] if len(parts) > 8 else ""
+        fr = HostFrame(index=int(parts[1]), t_ms=int(parts[2]), shows=int(parts[3]), cpu_us=int(parts[4]) / 1000.0,
+                       stack_bytes=int(parts[5]), heap_bytes=int(parts[6]), brightness=int(parts[7]),
+                       pixels=[(int(hx[i:i + 2], 16), int(hx[i + 2:i + 4], 16), int(hx[i + 4:i + 6], 16))
+                               for i in range(0, len(hx), 6)])
+        if parts[0] == "S":
+            setup = fr
+        else:
+            frames.append(fr)
+    if p.returncode != 0:
+        return False, f"Harness exited with {p.returncode}\n" + "\n".join(serial[-40:]), setup, frames, serial
+    return True, "", setup, frames, serial
+
+
+def preview_frames(project: Dict[str, Any], script: Sequence[Tuple[int, Sequence[int], Sequence[int]]], *,
+                   fixed_dt: float = 1.0 / 60.0) -> List[List[RGB]]:
+    """PreviewEngine.render_frame() at the script timestamps, fed the same ADC-quantized audio.
+
+    Rules V6 (runtime.rules_v6) are evaluated before every frame, as the exported loop()
+    does: set_layer_param overrides last for that frame only, variables persist. Rules see
+    no signals here, so only signal-free triggers/expressions are comparable.
+    """
+    from models.io import project_from_dict
+    from preview.preview_engine import PreviewEngine
+    from runtime.rules_v6 import evaluate_rules_v6
+
+    eng = PreviewEngine(project_from_dict(project), ScriptedAudio(script), fixed_dt=fixed_dt)
+    layers = list(eng.project.layers or [])
+    base = [dict(L.params or {}) for L in layers]
+    rules = project.get("rules_v6") if isinstance(project.get("rules_v6"), list) else []
+    v0 = project.get("variables") if isinstance(project.get("variables"), dict) else {}
+    vstate: Dict[str, Any] = {"number": dict(v0.get("number") or {}), "toggle": dict(v0.get("toggle") or {})}
+    prev: Dict[str, Any] = {}
+    out = []
+    for ms, _l, _r in script:
+        if rules:
+            for L, params in zip(layers, base):
+                L.params = dict(params)
+            res = evaluate_rules_v6(project=project, signals={}, variables_state=vstate, prev_state=prev)
+            vstate = res.variables_state
+            for li, param, val in (res.project_mutations or {}).get("layer_param", []):
+                if 0 <= int(li) < len(layers):
+                    layers[int(li)].params[str(param)] = val
+        out.append([tuple(int(c) for c in px) for px in eng.render_frame(ms / 1000.0)])
+    return out
+
+
+def diff_frames(host: Sequence[Sequence[RGB]], preview: Sequence[Sequence[RGB]], *,
+                tolerance: int = 0) -> Dict[str, Any]:
+    """Per-channel comparison; a pixel mismatches when any channel differs by more than tolerance."""
+    per_frame = []
+    worst = 0
+    bad_frames = 0
+    first = None
+    for fi, (a, b) in enumerate(zip(host, preview)):
+        n = max(len(a), len(b))
+        mism = 0
+        fmax = 0
+        for pi in range(n):
+            pa = a[pi] if pi < len(a) else (0, 0, 0)
+            pb = b[pi] if pi < len(b) else (0, 0, 0)
+            d = max(abs(int(pa[c]) - int(pb[c])) for c in range(3))
+            fmax = max(fmax, d)
+            if d > tolerance:
+                mism += 1
+                if first is None:
+                    first = {"frame": fi, "pixel": pi, "host": list(pa), "preview": list(pb)}
+        worst = max(worst, fmax)
+        bad_frames += 1 if mism else 0
+        per_frame.append({"frame": fi, "max_delta": fmax, "mismatched_pixels": mism})
+    return {
+        "ok": bad_frames == 0 and len(host) == len(preview),
+        "frames_compared": min(len(host), len(preview)),
+        "frame_count_host": len(host),
+        "frame_count_preview": len(preview),
+        "tolerance": int(tolerance),
+        "max_delta": worst,
+        "mismatched_frames": bad_frames,
+        "first_mismatch": first,
+        "per_frame": per_frame,
+    }
+
+
+def calibrate_kernel_costs(kernel_ids: Optional[Sequence[int]] = None, *, num_leds: int = 2048,
+                           frames: int = 120, repeats: int = 3, anchor: int = 0, opt: str = "-O2",
+                           cxx: Optional[str] = None) -> Dict[int, Dict[str, Any]]:
+    """Suggest LAYERSTACK_KERNEL_COSTS cycles_per_pixel from host loop() timings.
+
+    Each kernel is exported as a one-layer float strip of num_leds (its first behavior
+    key in LAYERSTACK_BEH_IDS) and timed by its fastest loop() over repeats runs,
+    interleaved with runs of the anchor kernel. Host time does not map to AVR cycles,
+    so suggestions are ratios to the anchor: the anchor's declared cycles_per_pixel
+    plus the overhead the estimator adds per pixel (LAYER_PIXEL_CYCLES["float"] +
+    PIXEL_OUT_CYCLES) is what its fastest frame costs per pixel. Host FPU and cache
+    behavior differ from soft-float AVR, so treat the result as a cross-check of the
+    table, not a replacement for on-device telemetry (tools/firmware_telemetry.py);
+    per-frame cycles are below the host timer noise and are not suggested.
+    """
+    from export.arduino_exporter import LAYERSTACK_BEH_IDS, LAYERSTACK_KERNEL_COSTS
+    from export.budget import LAYER_PIXEL_CYCLES, PIXEL_OUT_CYCLES
+
+    keys: Dict[int, str] = {}
+    for key, kid in LAYERSTACK_BEH_IDS.items():
+        keys.setdefault(kid, key)
+    ids = sorted(keys) if kernel_ids is None else [int(k) for k in kernel_ids]
+    script = audio_script(frames, 60.0)
+    root = Path(tempfile.mkdtemp(prefix="modulo_kcal_"))
+    try:
+        def build(kid: int) -> Tuple[Optional[Path], str]:
+            key = keys.get(kid)
+            if key is None:
+                return None, "no behavior maps to this kernel"
+            proj = {"layout": {"kind": "strip", "num_leds": int(num_leds)},
+                    "layers": [{"name": key, "enabled": True, "behavior": key, "effect": key, "params": {}}]}
+            wd = root / f"k{kid}"
+            wd.mkdir(parents=True, exist_ok=True)
+            try:
+                sketch = export_host_sketch(proj, wd / "export.ino", math_mode="float").read_text(encoding="utf-8")
+            except Exception as e:
+                return None, f"export: {type(e).__name__}: {e}"
+            ok, log, binary = compile_host_sketch(sketch, wd, cxx=cxx, opt=opt)
+            return (binary, "") if ok and binary is not None else (None, f"compile: {log[:200]}")
+
+        def fastest_frame(binary: Path) -> Optional[float]:
+            ok, _log, _setup, host, _serial = run_host_binary(binary, script)
+            return min(f.cpu_us for f in host[1:]) if ok and len(host) > 1 else None  # frame 0 runs no sim step
+
+        anchor_bin, err = build(anchor)
+        if anchor_bin is None:
+            raise RuntimeError(f"Anchor kernel {anchor} could not be built: {err}")
+        anchor_us: List[float] = []
+        out: Dict[int, Dict[str, Any]] = {}
+        for kid in ids:
+            binary, err = build(kid)
+            row: Dict[str, Any] = {"behavior": keys.get(kid)}
+            if binary is None:
+                row["error"] = err
+            else:
+                times = []
+                for _ in range(max(1, int(repeats))):
+                    anchor_us += [t for t in (fastest_frame(anchor_bin),) if t is not None]
+                    times += [t for t in (fastest_frame(binary),) if t is not None]
+                if times:
+                    row["host_us_per_pixel"] = min(times) / float(num_leds)
+                else:
+                    row["error"] = "run: harness produced no frames"
+            out[kid] = row
+        if not anchor_us:
+            raise RuntimeError(f"Anchor kernel {anchor} produced no frames")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    overhead = LAYER_PIXEL_CYCLES["float"] + PIXEL_OUT_CYCLES
+    scale = (LAYERSTACK_KERNEL_COSTS[anchor].cycles_per_pixel + overhead) / (min(anchor_us) / float(num_leds))
+    for kid, row in out.items():
+        if kid in LAYERSTACK_KERNEL_COSTS:
+            row["declared_cycles_per_pixel"] = LAYERSTACK_KERNEL_COSTS[kid].cycles_per_pixel
+        if "error" not in row:
+            row["cycles_per_pixel"] = max(1, int(round(row["host_us_per_pixel"] * scale - overhead)))
+    return out
+
+
+def export_host_sketch(project: Dict[str, Any], out_path: Path, *, target_meta: Optional[dict] = None,
+                       math_mode: Optional[str] = None) -> Path:
+    """Export the project with the default FastLED template (the sketch the harness runs)."""
+    import copy
+    from export.arduino_exporter import export_project_validated
+
+    return export_project_validated(copy.deepcopy(project), Path(out_path), math_mode=math_mode,
+                                    target_meta=target_meta)
+
+
+def run_host_harness(project: Optional[Dict[str, Any]] = None, *, sketch_text: Optional[str] = None,
+                     frames: int = 120, fps: float = 60.0, audio: Any = None, compare: bool = True,
+                     tolerance: int = 0, target_meta: Optional[dict] = None, math_mode: Optional[str] = None,
+                     work_dir: Optional[Path] = None, cxx: Optional[str] = None, opt: str = "-O2",
+                     timeout: float = 120.0) -> HostHarnessResult:
+    """Export (unless sketch_text is given), compile, run N scripted frames and diff against preview.
+
+    compare needs a project: the preview side renders it with the same timestamps and audio.
+    work_dir keeps the generated sources/binary for inspection; default is a temp dir.
+    """
+    own = work_dir is None
+    wd = Path(tempfile.mkdtemp(prefix="modulo_host_")) if own else Path(work_dir)
+    wd.mkdir(parents=True, exist_ok=True)
+    try:
+        if sketch_text is None:
+            if project is None:
+                return HostHarnessResult(ok=False, stage="export", log="No project or sketch given")
+            try:
+                sketch_text = export_host_sketch(project, wd / "export.ino", target_meta=target_meta,
+                                                 math_mode=math_mode).read_text(encoding="utf-8")
+            except Exception as e:
+                return HostHarnessResult(ok=False, stage="export", log=f"{type(e).__name__}: {e}")
+        ok, log, binary = compile_host_sketch(sketch_text, wd, cxx=cxx, opt=opt)
+        if not ok or binary is None:
+            return HostHarnessResult(ok=False, stage="compile", log=log)
+        script = audio_script(frames, fps, audio)
+        ok, log, setup, host, serial = run_host_binary(binary, script, timeout=timeout)
+        res = HostHarnessResult(ok=ok, stage="done" if ok else "run", log=log, setup=setup, frames=host,
+                                serial_tail=serial[-40:])
+        if ok and compare and project is not None:
+            try:
+                res.parity = diff_frames([f.pixels for f in host], preview_frames(project, script),
+                                         tolerance=tolerance)
+            except Exception as e:
+                res.parity = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return res
+    finally:
+        if own:
+            shutil.rmtree(wd, ignore_errors=True)
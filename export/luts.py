@@ -0,0 +1,138 @@
+"""Export-time lookup tables for generated firmware (XY index map, gamma).
+
+Exported sketches used to recompute matrix mapping (origin/rotate/flip/serpentine
+branches) on every XY() call, including the PostFX bleed loops, and the gamma
+operator called powf three times per pixel per layer. These tables are baked at
+export time instead:
+
+- XY map: uint16 physical index per logical (x, y), row-major. XY(x, y) and
+  modulo_map_index() read it; without a table XY() falls back to modulo_xy().
+- Gamma: one 256-entry uint8 curve per distinct gamma operator value. The
+  operator interpolates between entries; values only known at runtime (Rules V6
+  op_gamma overrides) keep using powf.
+
+Storage follows the plan from export.budget.plan_lookup_tables: "progmem" keeps
+tables in flash on AVR/ESP8266 (read via pgm_read_*), "const" lets the compiler
+place them (flash-mapped rodata on ESP32/RP2040/ARM).
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence
+
+LUT_STORAGE_PRELUDE = """#ifndef MODULO_LUT_PROGMEM
+#define MODULO_LUT_PROGMEM @@PROGMEM@@
+#endif
+#ifndef MODULO_LUT_STORAGE
+#define MODULO_LUT_STORAGE 1
+#if MODULO_LUT_PROGMEM
+#if defined(__AVR__)
+#include <avr/pgmspace.h>
+#endif
+#define MODULO_LUT_ATTR PROGMEM
+#define MODULO_LUT_U8(tab, i) pgm_read_byte(&(tab)[(i)])
+#define MODULO_LUT_U16(tab, i) pgm_read_word(&(tab)[(i)])
+#else
+#define MODULO_LUT_ATTR
+#define MODULO_LUT_U8(tab, i) ((tab)[(i)])
+#define MODULO_LUT_U16(tab, i) ((tab)[(i)])
+#endif
+#endif
+"""
+
+
+def lut_storage_prelude(storage: str) -> str:
+    return LUT_STORAGE_PRELUDE.replace("@@PROGMEM@@", "1" if storage == "progmem" else "0")
+
+
+def _rows(vals: Sequence[int], per_row: int) -> str:
+    return ",\n  ".join(", ".join(str(v) for v in vals[i:i + per_row]) for i in range(0, len(vals), per_row))
+
+
+def matrix_xy_table(w: int, h: int, *, serpentine: bool = False, origin: str = "top_left",
+                    rotate: int = 0, flip_x: bool = False, flip_y: bool = False) -> List[int]:
+    """Physical index for each logical (x, y), row-major; mirrors MATRIX_IMPL modulo_xy()."""
+    w = max(1, int(w))
+    h = max(1, int(h))
+    out: List[int] = []
+    m = 0xFFFF
+    for y0 in range(h):
+        for x0 in range(w):
+            x, y = x0, y0
+            if origin in ("top_right", "TR"):
+                x = ((w - 1) - x) & m
+            elif origin in ("bottom_left", "BL"):
+                y = ((h - 1) - y) & m
+            elif origin in ("bottom_right", "BR"):
+                x = ((w - 1) - x) & m
+                y = ((h - 1) - y) & m
+            if rotate == 90:
+                x, y = ((h - 1) - y) & m, x
+            elif rotate == 180:
+                x = ((w - 1) - x) & m
+                y = ((h - 1) - y) & m
+            elif rotate == 270:
+                x, y = y, ((w - 1) - x) & m
+            if flip_x:
+                x = ((w - 1) - x) & m
+            if flip_y:
+                y = ((h - 1) - y) & m
+            if x >= w:
+                x = w - 1
+            if y >= h:
+                y = h - 1
+            if serpentine and (y & 1):
+                out.append((y * w + (w - 1 - x)) & m)
+            else:
+                out.append((y * w + x) & m)
+    return out
+
+
+def emit_xy_impl(table: Sequence[int] | None, storage: str = "const") -> str:
+    """XY()/MATRIX_W/MATRIX_H helpers for MATRIX_IMPL: table-backed or computed."""
+    head = ("#ifndef MATRIX_W\n#define MATRIX_W MATRIX_WIDTH\n#endif\n"
+            "#ifndef MATRIX_H\n#define MATRIX_H MATRIX_HEIGHT\n#endif\n")
+    if not table:
+        return head + "// XY(x,y): computed mapping (no lookup table in this build)\n" \
+                      "#define XY(x, y) modulo_xy((uint16_t)(x), (uint16_t)(y))\n"
+    return (head + lut_storage_prelude(storage)
+            + "// XY(x,y): physical index baked at export time (row-major logical order)\n"
+            + "#define MODULO_XY_LUT 1\n"
+            + f"static const uint16_t MODULO_XY_MAP[{len(table)}] MODULO_LUT_ATTR = {{\n  {_rows(table, 16)}\n}};\n"
+            + "#define XY(x, y) ((uint16_t)MODULO_LUT_U16(MODULO_XY_MAP, (uint16_t)(y) * MATRIX_WIDTH + (uint16_t)(x)))\n")
+
+
+def gamma_table(gamma: float) -> List[int]:
+    """uint8 curve of the gamma operator: round(255 * (i/255) ** (1/gamma))."""
+    inv = 1.0 / max(0.001, float(gamma))
+    return [min(255, max(0, int(round(255.0 * (i / 255.0) ** inv)))) for i in range(256)]
+
+
+def emit_gamma_luts(values: Iterable[float], storage: str = "const") -> tuple[str, str]:
+    """(decls, operator branch) for baked gamma curves; ("", "") when none."""
+    vals = list(values)
+    if not vals:
+        return "", ""
+    rows = ",\n".join("  {\n    " + _rows(gamma_table(g), 16).replace("\n  ", "\n    ") + "\n  }" for g in vals)
+    decls = (lut_storage_prelude(storage)
+             + "// Gamma operator curves baked at export time (interpolated; other values use powf)\n"
+             + f"#define MODULO_GAMMA_LUTS {len(vals)}\n"
+             + f"static const float GAMMA_LUT_G[MODULO_GAMMA_LUTS] = {{{', '.join(str(float(g)) for g in vals)}}};\n"
+             + f"static const uint8_t GAMMA_LUT[MODULO_GAMMA_LUTS][256] MODULO_LUT_ATTR = {{\n{rows}\n}};\n"
+             + "static inline int8_t gamma_lut_slot(float g) {\n"
+             + "  for (int8_t k=0; k<MODULO_GAMMA_LUTS; k++) if (GAMMA_LUT_G[k] == g) return k;\n"
+             + "  return -1;\n"
+             + "}\n"
+             + "static inline float gamma_lut_apply(int8_t k, float v) {\n"
+             + "  v = (v <= 0.0f) ? 0.0f : ((v >= 255.0f) ? 255.0f : v);\n"
+             + "  uint8_t i = (uint8_t)v;\n"
+             + "  float a = (float)MODULO_LUT_U8(GAMMA_LUT[k], i);\n"
+             + "  if (i == 255) return a;\n"
+             + "  return a + ((float)MODULO_LUT_U8(GAMMA_LUT[k], i + 1) - a) * (v - (float)i);\n"
+             + "}\n")
+    branch = ("    int8_t gl = gamma_lut_slot(p0);\n"
+              "    if (gl >= 0) {\n"
+              "      r = gamma_lut_apply(gl, r); g = gamma_lut_apply(gl, g); b = gamma_lut_apply(gl, b);\n"
+              "      return;\n"
+              "    }\n")
+    return decls, branch
@@ -7,7 +7,7 @@ Purpose:
 Notes:
 - This module is *not* yet used by all behavior emitters; it is a building block.
 - Audio variables expected to exist when MODULA_USE_SPECTRUM_SHIELD is enabled:
-    g_energy (0..1023*7 clamped), g_peak
+    g_energy (0..1023*7 clamped)
     g_mono[7], g_left[7], g_right[7]
 """
 
@@ -23,11 +23,9 @@ def arduino_expr_for_signal(key: str) -> Optional[str]:
 
     k = key.strip()
 
-    # Energy/peak
+    # Energy
     if k == "audio_energy":
         return "g_energy"
-    if k == "audio_peak":
-        return "g_peak"
 
     # Bands
     # mono
@@ -6,6 +6,7 @@ import json
 
 from ...ir import ShowIR
 from ...arduino_exporter import export_project_validated, FASTLED_LED_IMPL
+from ...fixed_math import resolve_math_mode
 from ..registry import resolve_requested_backends, resolve_requested_hw, resolve_requested_audio_hw
 
 MSGEQ7_BLOCK = r'''// --- Spectrum Shield / MSGEQ7 audio (optional) ---
@@ -85,6 +86,7 @@ def emit(*, ir: ShowIR, out_path: Path, **_kwargs) -> Tuple[Path, str]:
     sel = _kwargs.get("selection") or resolve_requested_backends(ir.project, meta)
     hw = _kwargs.get("hw") or resolve_requested_hw(ir.project, meta)
     aud = _kwargs.get("audio_hw") or resolve_requested_audio_hw(ir.project, meta, sel.get("audio_backend"))
+    math_mode = _kwargs.get("math_mode") or resolve_math_mode(ir.project, meta)
 
     use_msgeq7 = 1 if str(sel.get('audio_backend') or '').strip().lower() == 'msgeq7' else 0
 
@@ -92,6 +94,8 @@ def emit(*, ir: ShowIR, out_path: Path, **_kwargs) -> Tuple[Path, str]:
         ir.project,
         out_path,
         template_path=tpl,
+        target_meta=_kwargs.get("target_meta") or meta,
+        math_mode=math_mode,
         replacements={
             "LED_IMPL": FASTLED_LED_IMPL,
             "DATA_PIN": str(hw.get("data_pin")),
@@ -109,6 +113,7 @@ def emit(*, ir: ShowIR, out_path: Path, **_kwargs) -> Tuple[Path, str]:
         "Target: arduino_avr_fastled_msgeq7\n"
         f"LED backend: {sel.get('led_backend')}\n"
         f"Audio backend: {sel.get('audio_backend')} (USE_MSGEQ7={use_msgeq7})\n"
+        f"Math mode: {math_mode}\n"
         f"MSGEQ7 pins: reset={aud.get('msgeq7_reset_pin')} strobe={aud.get('msgeq7_strobe_pin')} left={aud.get('msgeq7_left_pin')} right={aud.get('msgeq7_right_pin')}\n"
         f"Written: {p}\n"
     )
@@ -33,6 +33,7 @@ def emit(*, ir: ShowIR, out_path: Path, **_kwargs) -> Tuple[Path, str]:
         ir.project,
         out_path,
         template_path=tpl,
+        target_meta=_kwargs.get("target_meta") or meta,
         replacements={
             "USE_MSGEQ7": str(use_msgeq7),
             "LED_IMPL": led_impl,
@@ -95,6 +95,7 @@ def emit(*, ir: ShowIR, out_path: Path, **_kwargs) -> Tuple[Path, str]:
         ir.project,
         out_path,
         template_path=tpl,
+        target_meta=_kwargs.get("target_meta") or meta,
         replacements=replacements,
     )
 
@@ -87,6 +87,7 @@ def emit(*, ir: ShowIR, out_path: Path, **_kwargs) -> Tuple[Path, str]:
         ir.project,
         out_path,
         template_path=tpl,
+        target_meta=_kwargs.get("target_meta") or meta,
         replacements={
             "USE_MSGEQ7": "0",
             "LED_IMPL": HUB75_LED_IMPL_ESP32,
@@ -5,6 +5,7 @@ from typing import Tuple
 
 from ...ir import ShowIR
 from ...arduino_exporter import export_project_validated
+from ...fixed_math import resolve_math_mode
 from ..registry import resolve_requested_backends, resolve_requested_hw, resolve_requested_audio_hw
 import json
 
@@ -19,11 +20,14 @@ def emit(*, ir: ShowIR, out_path: Path, **_kwargs) -> Tuple[Path, str]:
     sel = resolve_requested_backends(ir.project, meta)
     hw = resolve_requested_hw(ir.project, meta)
     aud = resolve_requested_audio_hw(ir.project, meta, sel.get('audio_backend'))
+    math_mode = _kwargs.get("math_mode") or resolve_math_mode(ir.project, meta)
 
     p = export_project_validated(
         ir.project,
         out_path,
         template_path=tpl,
+        target_meta=_kwargs.get("target_meta") or meta,
+        math_mode=math_mode,
         replacements={
             "USE_MSGEQ7": "0",
             "DATA_PIN": str(hw.get("data_pin")),
@@ -40,6 +44,7 @@ def emit(*, ir: ShowIR, out_path: Path, **_kwargs) -> Tuple[Path, str]:
         "Target: esp8266_fastled_noneaudio\n"
         f"LED backend: {sel.get('led_backend')}\n"
         f"Audio backend: {sel.get('audio_backend')} (forced none)\n"
+        f"Math mode: {math_mode}\n"
         f"Written: {p}\n"
     )
     return Path(p), report
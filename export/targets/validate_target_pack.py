@@ -39,4 +39,14 @@ def validate_target_pack(meta: Any) -> Tuple[bool, List[str]]:
     if pio is not None and not isinstance(pio, dict):
         errors.append("platformio must be dict if present")
 
+    # Optional: math_mode selects the exporter's float or fixed-point codegen
+    mm = meta.get("math_mode")
+    if mm is not None and str(mm).strip().lower() not in ("float", "fixed"):
+        errors.append("math_mode must be 'float' or 'fixed' if present")
+
+    # Optional: cpu_hz overrides the arch default clock used by the firmware cost model
+    hz = meta.get("cpu_hz")
+    if hz is not None and (not isinstance(hz, int) or isinstance(hz, bool) or hz <= 0):
+        errors.append("cpu_hz must be a positive int if present")
+
     return (len(errors) == 0), errors
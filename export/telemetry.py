@@ -0,0 +1,163 @@
+"""Frame timing telemetry for exported layer-stack sketches.
+
+With project.export.telemetry enabled the generated loop() is instrumented with
+micros() marks around each stage and the firmware prints one summary record per
+telemetry_interval_ms (default 1000) on the debug serial port:
+
+    MT1,<seq>,<frames>,<window_ms>,<frame_avg_us>,<frame_max_us>,<input>,<rules>,<pixels>,<postfx>,<show>,<L0>,...,<Ln-1>
+
+Stage values are mean microseconds per frame over the window:
+
+- input:  WiFi tick + msgeq7_read()
+- rules:  per-frame override reset + Rules V6
+- pixels: pixel loop time outside the layer kernels (per-pixel setup, per-layer
+          params prelude, output write)
+- postfx: trail/bleed pass
+- show:   modulo_led_show() (FastLED.show() / backend flush)
+- L<k>:   layer k (kernel, operators, blend; the target check when the layer
+          skips a pixel) summed over all pixels
+
+Records are plain CSV lines so they share the port with debug_purpose_serial
+prints and the line-based serial readers in preview/. Marks cost two micros()
+calls per layer per pixel; leave telemetry off in release exports.
+preview/firmware_telemetry.py collects and aggregates the records.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+RECORD_TAG = "MT1"
+STAGES = ("input", "rules", "pixels", "postfx", "show")
+DEFAULT_INTERVAL_MS = 1000
+
+# Placeholders in the make_layerstack_sketch template (all "" when telemetry is off).
+PLACEHOLDERS = ("{TELEMETRY_DECLS}", "{TM_SETUP}", "{TM_FRAME_BEGIN}", "{TM_INPUT}", "{TM_RULES}",
+                "{TM_PIXEL_BEGIN}", "{TM_LAYER_SKIP}", "{TM_LAYER_PARAMS}", "{TM_LAYER}", "{TM_PIXELS}",
+                "{TM_POSTFX}", "{TM_SHOW}")
+
+TELEMETRY_DECLS = """// --- Frame timing telemetry (export/telemetry.py): one MT1 CSV record per window ---
+#define MODULO_TELEMETRY 1
+#define MT_INTERVAL_MS @@INTERVAL_MS@@u
+#define MT_INPUT 0
+#define MT_RULES 1
+#define MT_PIXELS 2
+#define MT_POSTFX 3
+#define MT_SHOW 4
+#define MT_STAGES 5
+static uint32_t MT_ACC[MT_STAGES];
+static uint32_t MT_LAYER_ACC[LAYERS];
+static uint32_t MT_MARK = 0;
+static uint32_t MT_FRAME0 = 0;
+static uint32_t MT_FRAME_ACC = 0;
+static uint32_t MT_FRAME_MAX = 0;
+static uint32_t MT_WINDOW0 = 0;
+static uint32_t MT_SEQ = 0;
+static uint32_t MT_FRAMES = 0;
+static inline void mt_frame_begin() { MT_FRAME0 = micros(); MT_MARK = MT_FRAME0; }
+static inline void mt_stage(uint8_t s) { uint32_t n = micros(); MT_ACC[s] += n - MT_MARK; MT_MARK = n; }
+static inline void mt_layer(int li) { uint32_t n = micros(); MT_LAYER_ACC[li] += n - MT_MARK; MT_MARK = n; }
+static void mt_frame_end() {
+  uint32_t f = micros() - MT_FRAME0;
+  MT_FRAME_ACC += f;
+  if (f > MT_FRAME_MAX) MT_FRAME_MAX = f;
+  MT_FRAMES++;
+  uint32_t ms = millis();
+  if ((uint32_t)(ms - MT_WINDOW0) < MT_INTERVAL_MS) return;
+  uint32_t n = MT_FRAMES;
+  Serial.print("MT1,"); Serial.print((unsigned long)MT_SEQ++);
+  Serial.print(','); Serial.print((unsigned long)n);
+  Serial.print(','); Serial.print((unsigned long)(ms - MT_WINDOW0));
+  Serial.print(','); Serial.print((unsigned long)(MT_FRAME_ACC / n));
+  Serial.print(','); Serial.print((unsigned long)MT_FRAME_MAX);
+  for (uint8_t s=0; s<MT_STAGES; s++) { Serial.print(','); Serial.print((unsigned long)(MT_ACC[s] / n)); MT_ACC[s] = 0; }
+  for (int li=0; li<LAYERS; li++) { Serial.print(','); Serial.print((unsigned long)(MT_LAYER_ACC[li] / n)); MT_LAYER_ACC[li] = 0; }
+  Serial.println();
+  MT_FRAMES = 0; MT_FRAME_ACC = 0; MT_FRAME_MAX = 0; MT_WINDOW0 = ms;
+}
+
+"""
+
+
+def telemetry_config(project: Dict[str, Any] | None) -> Optional[int]:
+    """Record interval in ms when project.export.telemetry is on, else None."""
+    exp = (project or {}).get("export")
+    if not isinstance(exp, dict) or not bool(exp.get("telemetry", False)):
+        return None
+    try:
+        ms = int(exp.get("telemetry_interval_ms", DEFAULT_INTERVAL_MS) or DEFAULT_INTERVAL_MS)
+    except Exception:
+        ms = DEFAULT_INTERVAL_MS
+    return min(60000, max(100, ms))
+
+
+def telemetry_layer_names(project: Dict[str, Any] | None) -> List[str]:
+    """Labels for the L<k> columns: the layers the layer-stack exporter emits, in order."""
+    out: List[str] = []
+    for L in (project or {}).get("layers") or []:
+        if not isinstance(L, dict) or not bool(L.get("enabled", True)):
+            continue
+        if (L.get("behavior") or L.get("effect")) == "audio_meter":
+            continue
+        out.append(str(L.get("name") or L.get("behavior") or L.get("effect") or ""))
+    return out
+
+
+def emit_telemetry_blocks(interval_ms: Optional[int]) -> Dict[str, str]:
+    """Placeholder -> code for the layer-stack template; every value is "" when interval_ms is None."""
+    if interval_ms is None:
+        return {k: "" for k in PLACEHOLDERS}
+    return {
+        "{TELEMETRY_DECLS}": TELEMETRY_DECLS.replace("@@INTERVAL_MS@@", str(int(interval_ms))),
+        "{TM_SETUP}": "  if (!DBG_PURPOSE_SERIAL) Serial.begin(DBG_SERIAL_BAUD);\n",
+        "{TM_FRAME_BEGIN}": "  mt_frame_begin();\n",
+        "{TM_INPUT}": "  mt_stage(MT_INPUT);\n",
+        "{TM_RULES}": "  mt_stage(MT_RULES);\n",
+        "{TM_PIXEL_BEGIN}": "    mt_stage(MT_PIXELS);\n",
+        "{TM_LAYER_SKIP}": "        mt_layer(li);\n",
+        "{TM_LAYER_PARAMS}": "      mt_stage(MT_PIXELS);\n",
+        "{TM_LAYER}": "      mt_layer(li);\n",
+        "{TM_PIXELS}": "    mt_stage(MT_PIXELS);\n",
+        "{TM_POSTFX}": "  mt_stage(MT_POSTFX);\n",
+        "{TM_SHOW}": "  mt_stage(MT_SHOW);\n  mt_frame_end();\n",
+    }
+
+
+@dataclass
+class TelemetryRecord:
+    seq: int
+    frames: int
+    window_ms: int
+    frame_avg_us: int
+    frame_max_us: int
+    stages_us: Dict[str, int]
+    layers_us: List[int] = field(default_factory=list)
+
+    @property
+    def fps(self) -> float:
+        return 1000.0 * self.frames / self.window_ms if self.window_ms > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "frames": self.frames, "window_ms": self.window_ms,
+                "frame_avg_us": self.frame_avg_us, "frame_max_us": self.frame_max_us,
+                "stages_us": dict(self.stages_us), "layers_us": list(self.layers_us), "fps": self.fps}
+
+
+def parse_record(line: str) -> Optional[TelemetryRecord]:
+    """Parse one MT1 line; None for anything else (other serial output, truncated records)."""
+    s = (line or "").strip()
+    if not s.startswith(RECORD_TAG + ","):
+        return None
+    parts = s.split(",")[1:]
+    if len(parts) < 5 + len(STAGES):
+        return None
+    try:
+        vals = [int(p) for p in parts]
+    except ValueError:
+        return None
+    if vals[1] <= 0:
+        return None
+    head, stages, layers = vals[:5], vals[5:5 + len(STAGES)], vals[5 + len(STAGES):]
+    return TelemetryRecord(seq=head[0], frames=head[1], window_ms=head[2], frame_avg_us=head[3],
+                           frame_max_us=head[4], stages_us=dict(zip(STAGES, stages)), layers_us=layers)
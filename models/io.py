@@ -490,6 +490,14 @@ def migrate_to_current(data: Dict[str, Any]) -> Dict[str, Any]:
 
 def load_project(path: Path) -> Project:
     raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    return project_from_dict(raw)
+
+def project_from_dict(raw: Dict[str, Any]) -> Project:
+    """Build a Project model from a project dict (same migrations as load_project).
+
+    Callers that already hold the dict (headless runners, worker processes) can skip the
+    temp-file round-trip. The input dict may be mutated by migrations; pass a copy if needed.
+    """
     raw = migrate_to_current(raw)
 
     layout = _mk_layout(raw.get("layout", {}))
@@ -26,19 +26,29 @@ def _write_crash_log(exc: BaseException) -> None:
 
 def main() -> None:
     # Qt-only app entrypoint
+    # Startup tracer: phase spans + import timing until the first preview frame
+    # (report in the Diagnostics hub; out/startup_profile_latest.json).
+    from app.startup_profile import STARTUP
+    STARTUP.start(import_hook=os.environ.get("MODULO_STARTUP_PROFILE", "1").strip() != "0")
+
     # Ensure core extension registries are initialized before UI loads.
     # (Mods may register additional hooks during startup.)
-    import runtime.ca_modules_v1  # noqa: F401
-    import runtime.long_memory_health  # noqa: F401
-    import app.mods_loader  # noqa: F401
-    import export.targets.targets_health  # noqa: F401
-    from qt.core_bridge import CoreBridge
-    from qt.qt_app import run_qt, BUILD_ID
+    with STARTUP.span("imports.core_registries"):
+        import runtime.ca_modules_v1  # noqa: F401
+        import runtime.long_memory_health  # noqa: F401
+    with STARTUP.span("mods"):
+        import app.mods_loader  # noqa: F401
+    with STARTUP.span("targets.health_probe"):
+        import export.targets.targets_health  # noqa: F401
+    with STARTUP.span("imports.qt"):
+        from qt.core_bridge import CoreBridge
+        from qt.qt_app import run_qt, BUILD_ID
 
     here = os.path.dirname(os.path.abspath(__file__))
     print(f"=== MODULO STARTUP ===\nrun_root: {here}\nbuild_id: {BUILD_ID}\n=== END STARTUP ===")
 
-    core = CoreBridge()
+    with STARTUP.span("core_bridge"):
+        core = CoreBridge()
     run_qt(core)
 
 
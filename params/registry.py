@@ -71,7 +71,7 @@ PARAMS: dict[str, dict] = {
     "max_substeps": {"type": "int", "default": 5, "min": 1, "max": 50, "widget": "spin"},
     "pp_mode":     {"type": "enum",  "default": "off", "choices": ["off", "collision", "near", "both"]},
     "pp_radius":   {"type": "float", "default": 1.25, "min": 0.25, "max": 20.0, "step": 0.05},
-    "pp_max_pairs":{"type": "int",   "default": 2000, "min": 0, "max": 200000, "widget": "spin"},
+    "pp_max_pairs":{"type": "int",   "default": 0, "min": 0, "max": 200000, "widget": "spin"},
 
     "purpose_f0":  {"type":"float","default":0.0,"min":0.0,"max":1.0},  # purpose float channel 0
     "purpose_f1":  {"type":"float","default":0.0,"min":0.0,"max":1.0},
@@ -19,79 +19,21 @@ class ExternalAudioStatus:
     last_update_ts: float = 0.0
     last_line: str = ""
 
-class AudioInput:
-    """Audio source abstraction for preview.
-
-    Modes:
-      - sim: internal AudioSim
-      - external: serial feed (line-based protocol)
-      - playback: AudioRecorder playback
+class SerialLineSource:
+    """Line-based serial reader: open a port (pyserial) or attach a stream, feed each line to _apply_line.
 
-    Protocols supported for external/inject:
-      1) key=value pairs separated by spaces/commas/semicolons
-         energy=0.5 mono0=0.1 ... l0=0.2 r0=0.3
-      2) JSON object per line:
-         {"energy":0.5,"mono0":0.1,"l0":0.2,"r0":0.3}
+    Shared by AudioInput (external audio feed) and FirmwareTelemetryCollector
+    (preview/firmware_telemetry.py). Subclasses implement _apply_line(s).
     """
 
     def __init__(self):
-        self.sim = AudioSim()
-        self.recorder = AudioRecorder()
-
-        self.mode: str = "sim"
-        self.gain: float = 1.0
-        self.smoothing: float = 0.20  # 0..1
-
-        self.state: Dict[str, float] = dict(self.sim.state)
         self.status = ExternalAudioStatus()
-
         self._stop_evt = threading.Event()
         self._thr: Optional[threading.Thread] = None
         self._serial = None
         self._port: str = ""
         self._baud: int = 115200
 
-    def available_sources(self):
-        return sorted(list(self.state.keys())) if self.state else ["energy"]
-
-    # --- primary tick ---
-    def step(self, t: float):
-        if self.mode == "playback":
-            st = self.recorder.sample()
-            if isinstance(st, dict):
-                self.state = self._apply_gain_smooth(st)
-            return
-
-        if self.mode == "sim":
-            self.sim.step(t)
-            self.state = self._apply_gain_smooth(dict(self.sim.state))
-            try:
-                self.recorder.add_frame(self.state)
-            except Exception:
-                pass
-            return
-
-        # external mode: reader thread updates state asynchronously
-        return
-
-    # --- gain/smoothing ---
-    def _apply_gain_smooth(self, new_state: Dict[str, float]) -> Dict[str, float]:
-        g = float(self.gain or 1.0)
-        a = float(self.smoothing or 0.0)
-        if a < 0.0: a = 0.0
-        if a > 0.95: a = 0.95
-        out = dict(self.state or {})
-        for k, v in (new_state or {}).items():
-            try:
-                fv = float(v) * g
-            except Exception:
-                continue
-            fv = _clamp01(fv)
-            prev = float(out.get(k, 0.0) or 0.0)
-            out[k] = (prev * a) + (fv * (1.0 - a))
-        return out
-
-    # --- external serial ---
     def connect(self, port: str, baud: int = 115200) -> bool:
         self.disconnect()
         self._port = str(port).strip()
@@ -105,11 +47,16 @@ class AudioInput:
             self.status = ExternalAudioStatus(False, "pyserial not installed: " + str(e))
             return False
         try:
-            self._serial = serial.Serial(self._port, self._baud, timeout=0.2)
+            stream = serial.Serial(self._port, self._baud, timeout=0.2)
         except Exception as e:
             self.status = ExternalAudioStatus(False, "Open failed: " + str(e))
             return False
+        return self.attach(stream)
 
+    def attach(self, stream) -> bool:
+        """Read lines from an already-open stream (anything with readline()/close(), e.g. a pty)."""
+        self.disconnect()
+        self._serial = stream
         self._stop_evt.clear()
         self._thr = threading.Thread(target=self._reader_loop, daemon=True)
         self._thr.start()
@@ -133,9 +80,11 @@ class AudioInput:
         self._serial = None
         self.status.connected = False
 
+    def _reader_start(self):
+        pass
+
     def _reader_loop(self):
-        if not self.state:
-            self.state = dict(self.sim.state)
+        self._reader_start()
         while not self._stop_evt.is_set():
             try:
                 line = self._serial.readline() if self._serial else b""
@@ -151,6 +100,8 @@ class AudioInput:
                 self._apply_line(s)
                 self.status.last_update_ts = time.time()
             except Exception as e:
+                if self._stop_evt.is_set():
+                    break
                 self.status.last_error = str(e)
                 time.sleep(0.1)
 
@@ -163,6 +114,81 @@ class AudioInput:
         except Exception as e:
             self.status.last_error = str(e)
 
+    def _apply_line(self, s: str):
+        raise NotImplementedError
+
+class AudioInput(SerialLineSource):
+    """Audio source abstraction for preview.
+
+    Modes:
+      - sim: internal AudioSim
+      - external: serial feed (line-based protocol)
+      - playback: AudioRecorder playback (JSONL or binary .mlar), driven by step(t)
+
+    Protocols supported for external/inject:
+      1) key=value pairs separated by spaces/commas/semicolons
+         energy=0.5 mono0=0.1 ... l0=0.2 r0=0.3
+      2) JSON object per line:
+         {"energy":0.5,"mono0":0.1,"l0":0.2,"r0":0.3}
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sim = AudioSim()
+        self.recorder = AudioRecorder()
+
+        self.mode: str = "sim"
+        self.gain: float = 1.0
+        self.smoothing: float = 0.20  # 0..1
+
+        self.state: Dict[str, float] = dict(self.sim.state)
+
+    def available_sources(self):
+        return sorted(list(self.state.keys())) if self.state else ["energy"]
+
+    # --- primary tick ---
+    def step(self, t: float):
+        if self.mode == "playback":
+            # Simulation-time playback: deterministic and free to run faster than real time.
+            st = self.recorder.sample_sim(t)
+            if isinstance(st, dict):
+                self.state = self._apply_gain_smooth(st)
+            return
+
+        if self.mode == "sim":
+            self.sim.step(t)
+            self.state = self._apply_gain_smooth(dict(self.sim.state))
+            try:
+                self.recorder.add_frame(self.state)
+            except Exception:
+                pass
+            return
+
+        # external mode: reader thread updates state asynchronously
+        return
+
+    # --- gain/smoothing ---
+    def _apply_gain_smooth(self, new_state: Dict[str, float]) -> Dict[str, float]:
+        g = float(self.gain or 1.0)
+        a = float(self.smoothing or 0.0)
+        if a < 0.0: a = 0.0
+        if a > 0.95: a = 0.95
+        out = dict(self.state or {})
+        for k, v in (new_state or {}).items():
+            try:
+                fv = float(v) * g
+            except Exception:
+                continue
+            fv = _clamp01(fv)
+            prev = float(out.get(k, 0.0) or 0.0)
+            out[k] = (prev * a) + (fv * (1.0 - a))
+        return out
+
+    # --- external serial (SerialLineSource) ---
+    def _reader_start(self):
+        if not self.state:
+            self.state = dict(self.sim.state)
+
     def _apply_line(self, s: str):
         s2 = (s or "").strip()
         if not s2:
@@ -1,8 +1,13 @@
 from __future__ import annotations
+from bisect import bisect_right
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import json
+import math
+import mmap
+import struct
+import sys
 import time
 
 @dataclass
@@ -10,11 +15,138 @@ class RecordedFrame:
     t: float
     state: Dict[str, float]
 
+
+# Binary recording (.mlar), little-endian, fixed stride per column:
+#   header  <4sHHII  magic b"MLAR", version, n_cols (incl. "t"), n_frames, names_len
+#   names   ascii    comma-separated column names, first is "t"; zero-padded to 4 bytes
+#   data    float32  n_cols blocks of n_frames values (column-major); NaN = key absent
+BINARY_MAGIC = b"MLAR"
+BINARY_VERSION = 1
+BINARY_SUFFIX = ".mlar"
+_BIN_HEADER = struct.Struct("<4sHHII")
+
+
+class BinaryRecording:
+    """Columnar, seekable view over a recording (memory-mapped when loaded from disk)."""
+
+    def __init__(self, columns: Sequence[str], cols: Sequence[Sequence[float]], *, _mm=None, _fh=None):
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self._cols = list(cols)
+        self._mm = _mm
+        self._fh = _fh
+        self.times = self._cols[0]
+        self.n_frames = len(self.times)
+
+    # --- construction ---
+    @classmethod
+    def from_frames(cls, frames: Sequence[RecordedFrame]) -> "BinaryRecording":
+        keys = sorted({k for f in frames for k in f.state.keys()})
+        nan = float("nan")
+        cols = [[float(f.t) for f in frames]]
+        for k in keys:
+            cols.append([float(f.state.get(k, nan)) for f in frames])
+        # Round-trip through float32 so in-memory and on-disk playback agree exactly.
+        blob = b"".join(struct.pack(f"<{len(c)}f", *c) for c in cols)
+        return cls.from_bytes(cls._pack_header(["t"] + keys, len(frames)) + blob)
+
+    @staticmethod
+    def _pack_header(columns: Sequence[str], n_frames: int) -> bytes:
+        names = ",".join(columns).encode("ascii")
+        names += b"\0" * (-(_BIN_HEADER.size + len(names)) % 4)
+        return _BIN_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(columns), int(n_frames), len(names)) + names
+
+    @classmethod
+    def from_bytes(cls, buf, *, _mm=None, _fh=None) -> "BinaryRecording":
+        mv = memoryview(buf)
+        if len(mv) < _BIN_HEADER.size:
+            raise ValueError("recording too short")
+        magic, ver, n_cols, n_frames, names_len = _BIN_HEADER.unpack_from(mv, 0)
+        if magic != BINARY_MAGIC:
+            raise ValueError("not a binary audio recording (bad magic)")
+        if ver != BINARY_VERSION:
+            raise ValueError(f"unsupported recording version {ver}")
+        off = _BIN_HEADER.size
+        columns = bytes(mv[off:off + names_len]).rstrip(b"\0").decode("ascii").split(",")
+        off += names_len
+        if len(columns) != n_cols or columns[0] != "t":
+            raise ValueError("malformed recording column table")
+        if len(mv) < off + n_cols * n_frames * 4:
+            raise ValueError("recording truncated")
+        cols = []
+        for c in range(n_cols):
+            chunk = mv[off + c * n_frames * 4: off + (c + 1) * n_frames * 4]
+            if sys.byteorder == "little":
+                cols.append(chunk.cast("f"))
+            else:
+                cols.append(list(struct.unpack(f"<{n_frames}f", chunk)))
+        return cls(columns, cols, _mm=_mm, _fh=_fh)
+
+    @classmethod
+    def open(cls, path: Path) -> "BinaryRecording":
+        fh = open(path, "rb")
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            fh.close()
+            raise ValueError("recording is empty")
+        try:
+            return cls.from_bytes(mm, _mm=mm, _fh=fh)
+        except Exception:
+            mm.close()
+            fh.close()
+            raise
+
+    def to_bytes(self) -> bytes:
+        blob = b"".join(struct.pack(f"<{self.n_frames}f", *c) for c in self._cols)
+        return self._pack_header(self.columns, self.n_frames) + blob
+
+    def close(self) -> None:
+        self._cols = []
+        self.times = []
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # a caller still holds a view; the map is released with it
+            self._mm = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    # --- access ---
+    @property
+    def duration(self) -> float:
+        return float(self.times[-1]) if self.n_frames else 0.0
+
+    def index_at(self, t: float) -> int:
+        """Index of the last frame with time <= t (clamped to the first frame)."""
+        return max(0, bisect_right(self.times, float(t)) - 1)
+
+    def state_at(self, idx: int) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for name, col in zip(self.columns[1:], self._cols[1:]):
+            v = col[idx]
+            if not math.isnan(v):
+                out[name] = float(v)
+        return out
+
+    def frame(self, idx: int) -> RecordedFrame:
+        return RecordedFrame(t=float(self.times[idx]), state=self.state_at(idx))
+
+
 class AudioRecorder:
     """Record and playback audio states (energy/mono/l/r) for deterministic preview.
 
-    Storage format: JSON Lines (.jsonl)
-      {"t":0.000,"state":{"energy":0.1,"mono0":...}}
+    Storage formats:
+      - JSON Lines (.jsonl), one frame per line:
+          {"t":0.000,"state":{"energy":0.1,"mono0":...}}
+      - Binary (.mlar): fixed-stride float32 columns, memory-mapped on load.
+
+    Playback is served from a columnar BinaryRecording either way, so seeking is a
+    bisect over the time column. `sample_at(t)` is clock-free (scrub / fast-forward);
+    `sample_sim(t)` follows the caller's simulation time; `sample()` keeps the legacy
+    wall-clock behavior.
     """
 
     def __init__(self):
@@ -25,10 +157,13 @@ class AudioRecorder:
         self.playing: bool = False
         self._play_start_wall: float = 0.0
         self._play_start_t: float = 0.0
+        self._play_anchor_t: Optional[float] = None
         self._play_idx: int = 0
+        self._bin: Optional[BinaryRecording] = None
 
     def start_record(self):
         self.frames.clear()
+        self._set_binary(None)
         self.recording = True
         self._t0 = time.time()
 
@@ -43,55 +178,124 @@ class AudioRecorder:
 
     def save(self, path: Path):
         path = Path(path)
+        if path.suffix.lower() == BINARY_SUFFIX:
+            frames = self.frames
+            rec = BinaryRecording.from_frames(frames) if frames or self._bin is None else self._bin
+            path.write_bytes(rec.to_bytes())
+            return
+        frames = self.frames
+        if not frames and self._bin is not None:
+            frames = [self._bin.frame(i) for i in range(self._bin.n_frames)]
         lines = []
-        for f in self.frames:
+        for f in frames:
             lines.append(json.dumps({"t": float(f.t), "state": dict(f.state)}, separators=(",",":")))
         path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
 
     def load(self, path: Path):
         path = Path(path)
         self.frames.clear()
+        self._set_binary(None)
         if not path.exists():
             return
-        for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-                t = float(obj.get("t", 0.0))
-                st = obj.get("state", {})
-                if isinstance(st, dict):
-                    self.frames.append(RecordedFrame(t=t, state={str(k): float(v) for k,v in st.items() if _is_number(v)}))
-            except Exception:
-                continue
-        # ensure sorted by t
-        self.frames.sort(key=lambda f: f.t)
+        if _is_binary_recording(path):
+            # Memory-mapped: frames stay on disk, `frames` is left empty.
+            self._set_binary(BinaryRecording.open(path))
+            return
+        self.frames.extend(_read_jsonl_frames(path))
+        self._set_binary(BinaryRecording.from_frames(self.frames) if self.frames else None)
+
+    @property
+    def frame_count(self) -> int:
+        return self._bin.n_frames if self._bin is not None else len(self.frames)
+
+    @property
+    def duration(self) -> float:
+        return self._bin.duration if self._bin is not None else 0.0
 
     def start_play(self, start_t: float = 0.0):
+        if self._bin is None and self.frames:
+            self._set_binary(BinaryRecording.from_frames(self.frames))
         self.playing = True
         self._play_start_wall = time.time()
         self._play_start_t = float(start_t)
-        self._play_idx = 0
-        # advance to start_t
-        while self._play_idx < len(self.frames) and self.frames[self._play_idx].t < self._play_start_t:
-            self._play_idx += 1
+        self._play_anchor_t = None
+        self._play_idx = self._bin.index_at(self._play_start_t) if self._bin is not None else 0
 
     def stop_play(self):
         self.playing = False
 
+    def seek(self, t: float):
+        """Jump playback to recording time `t` (O(log n))."""
+        self.start_play(t)
+
+    def sample_at(self, t: float) -> Optional[Dict[str, float]]:
+        """Return the recorded state at recording time `t`, independent of any clock."""
+        rec = self._bin
+        if rec is None or rec.n_frames == 0:
+            return None
+        self._play_idx = rec.index_at(t)
+        return rec.state_at(self._play_idx)
+
+    def sample_sim(self, t: float) -> Optional[Dict[str, float]]:
+        """Playback driven by simulation time: the first call after start_play anchors `t`."""
+        if not self.playing:
+            return None
+        if self._play_anchor_t is None:
+            self._play_anchor_t = float(t)
+        return self.sample_at(self._play_start_t + (float(t) - self._play_anchor_t))
+
     def sample(self) -> Optional[Dict[str, float]]:
-        """Return the state for current playback time, or None if not playing/finished."""
-        if not self.playing or not self.frames:
+        """Return the state for current wall-clock playback time, or None if not playing."""
+        if not self.playing:
             return None
         t_now = (time.time() - self._play_start_wall) + self._play_start_t
-        # move forward until next frame time
-        while self._play_idx + 1 < len(self.frames) and self.frames[self._play_idx + 1].t <= t_now:
-            self._play_idx += 1
-        if self._play_idx >= len(self.frames):
-            self.playing = False
-            return None
-        return dict(self.frames[self._play_idx].state)
+        return self.sample_at(t_now)
+
+    def close(self):
+        """Release the loaded recording (unmaps binary files)."""
+        self.playing = False
+        self._set_binary(None)
+
+    def _set_binary(self, rec: Optional[BinaryRecording]):
+        if self._bin is not None and self._bin is not rec:
+            self._bin.close()
+        self._bin = rec
+
+
+def convert_jsonl_to_binary(src: Path, dst: Optional[Path] = None) -> Path:
+    """Convert a JSONL recording fixture to the binary format (default: same stem, .mlar)."""
+    src = Path(src)
+    dst = Path(dst) if dst is not None else src.with_suffix(BINARY_SUFFIX)
+    frames = _read_jsonl_frames(src)
+    dst.write_bytes(BinaryRecording.from_frames(frames).to_bytes())
+    return dst
+
+
+def _read_jsonl_frames(path: Path) -> List[RecordedFrame]:
+    frames: List[RecordedFrame] = []
+    for line in Path(path).read_text(encoding="utf-8", errors="ignore").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+            t = float(obj.get("t", 0.0))
+            st = obj.get("state", {})
+            if isinstance(st, dict):
+                frames.append(RecordedFrame(t=t, state={str(k): float(v) for k,v in st.items() if _is_number(v)}))
+        except Exception:
+            continue
+    # ensure sorted by t
+    frames.sort(key=lambda f: f.t)
+    return frames
+
+
+def _is_binary_recording(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) == BINARY_MAGIC
+    except OSError:
+        return False
 
 def _is_number(x) -> bool:
     try:
@@ -0,0 +1,244 @@
+from __future__ import annotations
+"""Headless Effect Audit runner.
+
+Audits every registered behavior on an isolated single-layer project, each rendered
+by its own PreviewEngine with a deterministic AudioSim. Behaviors are fanned out
+across a process pool and results are yielded as they complete, so the Qt panel can
+stream them instead of blocking the UI thread (and never touches the live project).
+
+Usage:
+  python3 -m preview.effect_audit [--audio] [--workers N] [--matrix WxH]
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import multiprocessing
+import os
+
+AUDIT_FRAMES = 12
+AUDIT_FRAME_STEP_S = 0.10
+
+LEGEND = ('Legend: OK=emits pixels, BLANK=no lit pixels, SKIP(audio)=skipped (audio required), '
+          'UNSUPPORTED(*)=not supported on current layout, errors show exception')
+
+
+@dataclass
+class AuditResult:
+    key: str
+    status: str
+    meta: str = ""
+    err: str = ""
+
+    def line(self) -> str:
+        if self.err:
+            return f"- {self.key} — {self.status} — {self.meta} — ERR: {self.err}"
+        return f"- {self.key} — {self.status} — {self.meta}"
+
+
+def default_workers() -> int:
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+def _registry():
+    import behaviors  # noqa: F401  (registers built-in effects)
+    try:
+        from behaviors import auto_load
+        if hasattr(auto_load, 'register_all'):
+            auto_load.register_all()
+    except Exception:
+        pass
+    from behaviors.registry import REGISTRY
+    return REGISTRY
+
+
+def _precheck(key: str, defn, layout: Dict[str, Any], include_audio: bool) -> Optional[AuditResult]:
+    """Capability-driven classification that needs no rendering."""
+    caps = dict(getattr(defn, 'capabilities', {}) or {})
+    if (not include_audio) and bool(caps.get('requires_audio', False)):
+        return AuditResult(key, 'SKIP(audio)')
+    shape = str((layout or {}).get('shape', 'strip'))
+    # Project layouts use 'cells' for matrix-style worlds.
+    if shape == 'cells':
+        shape = 'matrix'
+    if shape == 'strip' and caps.get('supports_strip', True) is False:
+        return AuditResult(key, 'UNSUPPORTED(strip)')
+    if shape == 'matrix' and caps.get('supports_matrix', True) is False:
+        return AuditResult(key, 'UNSUPPORTED(matrix)')
+    return None
+
+
+def audit_project_for(key: str, defn, layout: Dict[str, Any]) -> Dict[str, Any]:
+    """Isolated single-layer project used to audit one behavior.
+
+    Does NOT inherit the user's rules/audio/variables: rules can legitimately drive
+    params to 0.0 and make unrelated effects look BLANK. Operators are disabled so the
+    audit validates the effect renderer itself.
+    """
+    from params.ensure import defaults_for
+
+    params = defaults_for(list(getattr(defn, 'uses', []) or []))
+    # Make bursty effects deterministic/visible (renderer check, not luck of the bucket).
+    if key in ('lightning',):
+        params['density'] = 1.0
+    # Purpose-driven showcase effects need non-zero purpose_* inputs to be active.
+    if key.startswith('purpose_'):
+        params.setdefault('purpose_i0', 42)
+        params.setdefault('purpose_i1', 7)
+        params.setdefault('purpose_f0', 0.75)
+        params.setdefault('purpose_f1', 0.35)
+        params.setdefault('purpose_f2', 0.15)
+    layer = {
+        'effect': key,
+        'behavior': key,
+        'opacity': 1.0,
+        'blend': 'over',
+        'params': params,
+        'operators': [],
+    }
+    return {
+        'name': f"AUDIT:{key}",
+        'layout': dict(layout or {}),
+        'layers': [layer],
+        'active_layer': 0,
+        'zones': [],
+        'masks': {},
+        'groups': [],
+        'rules': [],
+        'rules_v6': [],
+        'variables': {},
+        'audio': {},
+        'export': {},
+        'ui': {'era_complete': True, 'era_id': 'era_now'},
+    }
+
+
+def audit_behavior(key: str, layout: Dict[str, Any], frames: int = AUDIT_FRAMES) -> AuditResult:
+    """Render `frames` frames of one behavior on a fresh engine and classify the output."""
+    from models.io import project_from_dict
+    from preview.audio import AudioSim
+    from preview.preview_engine import PreviewEngine
+
+    defn = _registry().get(key)
+    if defn is None:
+        return AuditResult(key, 'NO_BEHAVIOR')
+    try:
+        model = project_from_dict(audit_project_for(key, defn, layout))
+        eng = PreviewEngine(model, AudioSim(), fixed_dt=1.0 / 60.0)
+    except Exception as e:
+        return AuditResult(key, 'NO_ENGINE', '', f"{type(e).__name__}: {e}")
+
+    out: List[list] = []
+    errs = ''
+    for i in range(int(frames)):
+        try:
+            out.append(list(eng.render_frame(i * AUDIT_FRAME_STEP_S)))
+        except Exception as e:
+            errs = f"{type(e).__name__}: {e}"
+    if getattr(eng, 'last_error', None):
+        errs = str(getattr(eng, 'last_error', ''))
+    if not out:
+        return AuditResult(key, 'NO_FRAMES', '', errs)
+
+    def _lit(frame):
+        return sum(1 for (r, g, b) in frame if (int(r) | int(g) | int(b)) != 0)
+
+    # Bursty effects may be dark on some frames: any lit pixel in any frame counts.
+    lit = [_lit(fr) for fr in out]
+    animated = 'YES' if any(fr != out[0] for fr in out[1:]) else 'NO'
+    try:
+        uniq = len({(int(r) & 255, int(g) & 255, int(b) & 255) for (r, g, b) in out[-1]})
+    except Exception:
+        uniq = 0
+    status = 'OK' if max(lit) > 0 else 'BLANK'
+    return AuditResult(key, status, f"lit {lit[0]}->{lit[-1]}, uniq {uniq}, anim {animated}", errs)
+
+
+def _worker_init() -> None:
+    # Register behaviors once per worker process instead of once per task.
+    try:
+        _registry()
+    except Exception:
+        pass
+
+
+def iter_effect_audit(layout: Dict[str, Any], *, include_audio: bool = False, keys: Optional[Iterable[str]] = None,
+                      workers: Optional[int] = None, frames: int = AUDIT_FRAMES) -> Iterator[AuditResult]:
+    """Yield AuditResults as they complete (pre-classified skips first).
+
+    workers=1 (or a pool that cannot start) runs serially in-process.
+    """
+    reg = _registry()
+    layout = dict(layout or {}) or {'shape': 'strip', 'num_leds': 575}
+    todo: List[str] = []
+    for k in sorted(str(k) for k in (keys if keys is not None else reg.keys())):
+        defn = reg.get(k)
+        if defn is None:
+            yield AuditResult(k, 'NO_BEHAVIOR')
+            continue
+        pre = _precheck(k, defn, layout, include_audio)
+        if pre is not None:
+            yield pre
+        else:
+            todo.append(k)
+
+    n_workers = default_workers() if workers is None else max(1, int(workers))
+    ex = None
+    if n_workers > 1 and len(todo) > 1:
+        try:
+            # spawn: never fork a process that owns a Qt event loop / audio threads.
+            ex = ProcessPoolExecutor(max_workers=min(n_workers, len(todo)),
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_worker_init)
+        except (OSError, ValueError, NotImplementedError):
+            ex = None
+    if ex is None:
+        for k in todo:
+            try:
+                yield audit_behavior(k, layout, frames)
+            except Exception as e:
+                yield AuditResult(k, 'ERROR', '', f"{type(e).__name__}: {e}")
+        return
+
+    try:
+        futs = {ex.submit(audit_behavior, k, layout, frames): k for k in todo}
+        for fut in as_completed(futs):
+            k = futs[fut]
+            try:
+                yield fut.result()
+            except Exception as e:  # includes BrokenProcessPool
+                yield AuditResult(k, 'ERROR', '', f"{type(e).__name__}: {e}")
+    finally:
+        # Early close (panel cancelled): drop queued work, don't wait for it.
+        ex.shutdown(wait=False, cancel_futures=True)
+
+
+def format_audit_report(results: Iterable[AuditResult]) -> str:
+    lines = ['=== EFFECT AUDIT REPORT ===', LEGEND, '']
+    for r in sorted(results, key=lambda r: r.key):
+        lines.append(r.line())
+    return "\n".join(lines)
+
+
+def run_effect_audit(layout: Dict[str, Any], *, include_audio: bool = False, workers: Optional[int] = None) -> str:
+    """Blocking convenience wrapper: run the full audit and return the report text."""
+    return format_audit_report(list(iter_effect_audit(layout, include_audio=include_audio, workers=workers)))
+
+
+def main(argv=None) -> int:
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--audio', action='store_true', help='Include audio-reactive behaviors')
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--matrix', default='', help='Audit on a WxH matrix instead of a 575-LED strip')
+    args = ap.parse_args(argv)
+    layout: Dict[str, Any] = {'shape': 'strip', 'num_leds': 575}
+    if args.matrix:
+        w, h = (int(v) for v in args.matrix.lower().split('x', 1))
+        layout = {'shape': 'cells', 'matrix_w': w, 'matrix_h': h, 'mw': w, 'mh': h, 'num_leds': w * h}
+    print(run_effect_audit(layout, include_audio=args.audio, workers=args.workers))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
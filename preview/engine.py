@@ -45,15 +45,18 @@ def build_cells_geom(mw: int, mh: int, cell: int, *, serpentine: bool=False, fli
     mh = max(1, int(mh))
     cell = max(4, int(cell))
 
-    mapping = MatrixMapping(w=mw, h=mh, serpentine=bool(serpentine), flip_x=bool(flip_x), flip_y=bool(flip_y), rotate=int(rotate or 0))
-    lw, lh = logical_dims(mapping)  # dimensions after rotate for visual grid
+    # Wiring table (xy_index for every logical cell) is cached per layout signature.
+    from runtime.layout_geometry_v1 import geometry_for_layout
+    geom = geometry_for_layout({'shape': 'cells', 'mw': mw, 'mh': mh, 'serpentine': bool(serpentine),
+                                'flip_x': bool(flip_x), 'flip_y': bool(flip_y), 'rotate': int(rotate or 0)})
+    lw, lh = geom.logical_dims  # dimensions after rotate for visual grid
     n = lw * lh
 
     coords = [None] * n  # by LED index
-    # For each visual cell (x,y in logical space), compute LED index using mapping
+    # For each visual cell (x,y in logical space), look up its LED index
     for y in range(lh):
         for x in range(lw):
-            idx = xy_index(mapping, x, y)
+            idx = geom.led_of_xy(x, y)
             x0 = x * cell
             y0 = y * cell
             x1 = x0 + cell
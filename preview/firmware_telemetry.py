@@ -0,0 +1,116 @@
+from __future__ import annotations
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+from export.telemetry import STAGES, TelemetryRecord, parse_record
+
+from .audio_input import SerialLineSource
+
+
+class FirmwareTelemetryCollector(SerialLineSource):
+    """Host-side collector for MT1 frame timing records (export/telemetry.py).
+
+    Connect to the board's serial port (or attach any line stream, e.g. a pty
+    replaying a capture); non-telemetry lines (debug prints) are kept separately.
+    summary() aggregates the session frame-weighted, report_text() formats it for
+    the Diagnostics hub.
+    """
+
+    def __init__(self, max_records: int = 3600):
+        super().__init__()
+        self._lock = threading.Lock()
+        self.records: deque = deque(maxlen=int(max_records))
+        self.other_lines: deque = deque(maxlen=40)
+        self.lines_seen = 0
+        self.missed_records = 0
+        self._last_seq: Optional[int] = None
+
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self.other_lines.clear()
+            self.lines_seen = 0
+            self.missed_records = 0
+            self._last_seq = None
+
+    def _apply_line(self, s: str):
+        rec = parse_record(s)
+        with self._lock:
+            self.lines_seen += 1
+            if rec is None:
+                self.other_lines.append(s[:200])
+                return
+            # seq restarts at 0 after a board reset; count gaps otherwise
+            if self._last_seq is not None and rec.seq > self._last_seq + 1:
+                self.missed_records += rec.seq - self._last_seq - 1
+            self._last_seq = rec.seq
+            self.records.append(rec)
+
+    def replay(self, lines: Sequence[str]) -> int:
+        """Feed captured lines (e.g. a saved serial log); returns records parsed."""
+        before = len(self.records)
+        for ln in lines:
+            s = str(ln).strip()
+            if s:
+                self.inject_line(s)
+        return len(self.records) - before
+
+    def snapshot(self) -> List[TelemetryRecord]:
+        with self._lock:
+            return list(self.records)
+
+    def summary(self) -> Dict[str, Any]:
+        recs = self.snapshot()
+        frames = sum(r.frames for r in recs)
+        window_ms = sum(r.window_ms for r in recs)
+        out: Dict[str, Any] = {
+            "records": len(recs),
+            "frames": frames,
+            "missed_records": self.missed_records,
+            "lines_seen": self.lines_seen,
+            "connected": bool(self.status.connected),
+            "port": self._port,
+        }
+        if not recs or frames <= 0:
+            return out
+
+        def _wavg(vals: List[int]) -> float:
+            return sum(v * r.frames for v, r in zip(vals, recs)) / float(frames)
+
+        n_layers = max(len(r.layers_us) for r in recs)
+        out.update({
+            "fps": 1000.0 * frames / window_ms if window_ms > 0 else 0.0,
+            "frame_avg_us": _wavg([r.frame_avg_us for r in recs]),
+            "frame_max_us": max(r.frame_max_us for r in recs),
+            "stages_us": {k: _wavg([r.stages_us.get(k, 0) for r in recs]) for k in STAGES},
+            "layers_us": [_wavg([r.layers_us[i] if i < len(r.layers_us) else 0 for r in recs]) for i in range(n_layers)],
+            "last": recs[-1].to_dict(),
+        })
+        return out
+
+    def report_text(self, layer_names: Optional[Sequence[str]] = None) -> str:
+        s = self.summary()
+        lines = ["== FIRMWARE TELEMETRY =="]
+        src = s["port"] or "replay/injected"
+        lines.append(f"source={src} connected={s['connected']} records={s['records']} frames={s['frames']} "
+                     f"missed_records={s['missed_records']}")
+        if self.status.last_error:
+            lines.append(f"last_error={self.status.last_error}")
+        if "fps" not in s:
+            lines.append("No MT1 records yet (export with export.telemetry = true and open the board's serial port).")
+            return "\n".join(lines)
+        frame = s["frame_avg_us"]
+        lines.append(f"fps={s['fps']:.1f} frame_avg={frame:.0f}us frame_max={s['frame_max_us']}us")
+
+        def _row(name: str, us: float) -> str:
+            pct = (100.0 * us / frame) if frame > 0 else 0.0
+            return f"  {name:<24} {us:10.0f} us  {pct:5.1f}%"
+
+        for k in STAGES:
+            lines.append(_row(k, s["stages_us"][k]))
+        names = list(layer_names or [])
+        for i, us in enumerate(s["layers_us"]):
+            label = f"layer {i}" + (f" ({names[i]})" if i < len(names) and names[i] else "")
+            lines.append(_row(label, us))
+        return "\n".join(lines)
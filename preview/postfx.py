@@ -54,39 +54,9 @@ def build_matrix_neighbors(layout: Dict[str, Any], radius: int = 1) -> Optional[
     coords = layout.get("coords")
     if not isinstance(coords, list) or not coords:
         return None
-    r = int(radius or 1)
-    if r < 1:
-        r = 1
-    # map position to index
-    pos_to_idx: Dict[Tuple[int,int], int] = {}
-    for i, xy in enumerate(coords):
-        try:
-            x, y = int(xy[0]), int(xy[1])
-        except Exception:
-            continue
-        pos_to_idx[(x,y)] = i
-
-    neighbors: List[List[int]] = []
-    for i, xy in enumerate(coords):
-        try:
-            x, y = int(xy[0]), int(xy[1])
-        except Exception:
-            neighbors.append([i])
-            continue
-        inds = [i]
-        # radius 1 only for now (Phase 7E). If r>1, include manhattan shell up to r.
-        for dx in range(-r, r+1):
-            for dy in range(-r, r+1):
-                if dx == 0 and dy == 0:
-                    continue
-                # Use manhattan distance to avoid huge blur cost.
-                if abs(dx) + abs(dy) > r:
-                    continue
-                j = pos_to_idx.get((x+dx, y+dy))
-                if j is not None:
-                    inds.append(j)
-        neighbors.append(inds)
-    return neighbors
+    # Built once per coords signature and radius (runtime.layout_geometry_v1).
+    from runtime.layout_geometry_v1 import geometry_for_coords
+    return geometry_for_coords(coords).neighbors(int(radius or 1))
 
 def apply_matrix_bleed(frame: List[RGB], amount: float, neighbors: Optional[List[List[int]]]) -> List[RGB]:
     a = _clamp01(amount)
@@ -1182,6 +1182,19 @@ class PreviewEngine:
                 else:
                     setattr(obj, key, value)
 
+            # Shared geometry index for the logical render grid (built once per layout signature).
+            try:
+                from runtime.layout_geometry_v1 import geometry_for_layout
+                _layout_geom = geometry_for_layout({
+                    'shape': shape, 'mw': int(_layout_mw), 'mh': int(_layout_mh), 'num_leds': int(n),
+                    'serpentine': bool(_lg(layout, 'serpentine', False)),
+                    'flip_x': bool(_lg(layout, 'flip_x', False)),
+                    'flip_y': bool(_lg(layout, 'flip_y', False)),
+                    'rotate': int(_lg(layout, 'rotate', 0) or 0),
+                })
+            except Exception:
+                _layout_geom = None
+
             # Provide a consistent layout dict for behaviors that expect mapping-style layout hints.
             _layout_info = {
                 'shape': shape,
@@ -1853,7 +1866,8 @@ class PreviewEngine:
                         params=params,
                         t=float(sim_t),
                         state=_lg(L, "_state", {}),
-                        layout={"shape": shape, "mw": int(_layout_mw), "mh": int(_layout_mh), "count": int(n)},
+                        layout={"shape": shape, "mw": int(_layout_mw), "mh": int(_layout_mh), "count": int(n),
+                                "geometry": _layout_geom},
                         dt=float(_dt),
                         audio=dict(audio_dict or {}),
                     )
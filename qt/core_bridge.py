@@ -22,8 +22,12 @@ from app.eras.era_state import (
 )
 from app.eras.era_enforce import enforce_project_against_era, EraViolation
 from app.eras.era_history import get_era
-from app.project_normalize import normalize_project_zones_masks_groups
+from app.project_normalize import (
+    NormalizePipeline, NormalizeStep, ZONES_MASKS_GROUPS_STEPS, normalize_project_zones_masks_groups,
+)
 from app.project_validation import validate_project
+from app.validation_engine import ValidationEngine
+from app.startup_profile import STARTUP
 from runtime.signal_bus import SignalBus
 from runtime.audio_service import AudioService
 from runtime.variables import get_variables_state, ensure_variables
@@ -105,9 +109,11 @@ def _ensure_default_strip60_in_project(p: dict) -> tuple[dict, bool]:
 
 class CoreBridge:
     def __init__(self):
+        _sp = STARTUP.begin("core.project_load")
         self.pm = ProjectManager()
         self._project = {}  # backing store for project property
         self._project_rev = 0  # increments on every project set (UI sync guard)
+        self._validation = ValidationEngine()  # per-section cached checks + change events
         # Initialize backing project from ProjectManager if available
         try:
             if hasattr(self, 'pm') and self.pm is not None and hasattr(self.pm, 'get'):
@@ -180,6 +186,7 @@ class CoreBridge:
 
         except Exception:
             pass
+        STARTUP.end(_sp)
 
         self._selection_indices: list[int] = []
         self._full_preview_engine = None
@@ -192,7 +199,8 @@ class CoreBridge:
         # Phase 6.1: Signal Bus (time/audio) for inspection + future Rules.
         self.signal_bus = SignalBus()
         # Release R1: engine-owned always-on audio service
-        self.audio_service = AudioService()
+        with STARTUP.span("core.audio_service"):
+            self.audio_service = AudioService()
         # Back-compat: PreviewEngine expects an object with .step()/.state; we pass the backend.
         self._full_preview_audio = getattr(self.audio_service, "backend", None)
         self.preview_audio = self._full_preview_audio
@@ -215,7 +223,13 @@ class CoreBridge:
         # Ensure preview engine/geometry are ready on startup so the UI can render immediately.
         # (Some UI paths lazily rebuild, but blank startup makes diagnosis harder.)
         try:
-            self._rebuild_full_preview_engine()
+            with STARTUP.span("core.preview_engine"):
+                self._rebuild_full_preview_engine()
+        except Exception:
+            pass
+        # Startup normalization is not user history.
+        try:
+            self.pm.history.clear()
         except Exception:
             pass
 
@@ -593,6 +607,56 @@ class CoreBridge:
         except Exception:
             return {'ok': True, 'errors': [], 'warnings': []}
 
+    def _validation_engine(self):
+        eng = getattr(self, '_validation', None)
+        if eng is None:
+            try:
+                eng = self._validation = ValidationEngine()
+            except Exception:
+                return None
+        return eng
+
+    def _normalizer(self):
+        pipe = getattr(self, '_normalize_pipeline', None)
+        if pipe is None:
+            def _safe(fn):
+                def step(p):
+                    try:
+                        out = fn(p)
+                    except Exception:
+                        return p
+                    return out[0] if isinstance(out, tuple) else out
+                return step
+            pipe = self._normalize_pipeline = NormalizePipeline(
+                [NormalizeStep(st.name, st.reads, _safe(st.fn)) for st in ZONES_MASKS_GROUPS_STEPS] + [
+                    NormalizeStep("variables", ("variables",), _safe(ensure_variables)),
+                    NormalizeStep("rules_v6", ("rules_v6",), _safe(ensure_rules_v6)),
+                    NormalizeStep("era", ("ui",), _safe(ensure_era_in_project)),
+                ])
+        return pipe
+
+    def subscribe_validation(self, fn):
+        """Call fn(snapshot) whenever the validation snapshot changes. Returns an unsubscribe callable."""
+        return self._validation_engine().subscribe(fn)
+
+    def revalidate(self) -> dict:
+        """Re-check the current project (e.g. after an in-place edit) and refresh last_validation."""
+        snap = self._validation_engine().update(self.project)
+        self._last_validation = snap
+        return snap
+
+    def diagnostics(self) -> dict:
+        """diagnose_project() for the current project, cached per section revision."""
+        return self._validation_engine().diagnose(self.project)
+
+    def parity_summary(self, target_id=None) -> dict:
+        """build_parity_summary() for the current project, cached until any section changes."""
+        from export.parity_summary import build_parity_summary
+        from app.validation_engine import ALL_SECTIONS
+        tid = str(target_id or '')
+        return self._validation_engine().cached(("parity", tid), (ALL_SECTIONS,), self.project,
+                                                lambda p: build_parity_summary(p, target_id=tid or None))
+
     def project_revision(self) -> int:
         """Monotonic revision counter for UI panels to avoid redundant refresh."""
         try:
@@ -604,27 +668,14 @@ class CoreBridge:
     @project.setter
     def project(self, value):
         # Phase A1 lock: normalize + validate on every project set
-        p = value if isinstance(value, dict) else {}
+        # Phase 6 (variables + rules schema) and the era id ride the same pipeline; steps
+        # re-run only for sections changed since the last normalized project.
+        p = dict(value) if isinstance(value, dict) else {}
         try:
-            p, _changes = normalize_project_zones_masks_groups(p)
+            p = self._normalizer().run(p)
+            fps = dict(self._normalizer().fingerprints)
         except Exception:
-            _changes = []
-
-        # Phase 6: ensure variables + rules schema exist (idempotent)
-        try:
-            p, _vchg = ensure_variables(p)
-        except Exception:
-            _vchg = False
-        try:
-            p, _rchg = ensure_rules_v6(p)
-        except Exception:
-            _rchg = False
-
-        # Era system: ensure era_id exists (idempotent)
-        try:
-            p = ensure_era_in_project(p)
-        except Exception:
-            pass
+            fps = None
 
         # Keep runtime variables state in sync with project writes (UI edits).
         try:
@@ -634,14 +685,24 @@ class CoreBridge:
         except Exception:
             pass
         # Era system hard-fail: project must not exceed historical gates.
+        # Era gates and validation checks re-run only for sections whose content changed.
+        eng = self._validation_engine()
         try:
-            enforce_project_against_era(p)
+            if eng is None:
+                enforce_project_against_era(p)
+            else:
+                eng.sections.update(p, fingerprints=fps)
+                era_errs = eng.era_errors(p, refresh=False)
+                if era_errs:
+                    raise EraViolation("\n".join(era_errs))
         except EraViolation as ev:
             self._last_validation = {'ok': False, 'errors': [str(ev)], 'warnings': []}
+            if eng is not None:
+                eng.set_failed([str(ev)])
             raise
 
         try:
-            snap = validate_project(p)
+            snap = eng.update(p, refresh=False, notify=False) if eng is not None else validate_project(p)
             if not isinstance(snap, dict):
                 snap = {'ok': True, 'errors': [], 'warnings': []}
         except Exception as e:
@@ -656,7 +717,7 @@ class CoreBridge:
         # Persist if possible (guard against recursion)
         try:
             if hasattr(self, 'pm') and self.pm is not None and hasattr(self.pm, 'set'):
-                self.pm.set(p)
+                self.pm.set(p, fingerprints=fps)
         except Exception:
             pass
         # Keep preview and UI in sync with the updated project.
@@ -666,6 +727,42 @@ class CoreBridge:
         except Exception:
             # Never crash on UI-side rebuilds; diagnostics will surface wiring issues.
             pass
+        # Validation-changed listeners run once the new project is in place.
+        if eng is not None:
+            eng.publish()
+
+    def reload_behaviors(self):
+        """Hot-reload behavior modules whose source changed (behaviors.reload.BehaviorWatcher).
+
+        Live preview state of affected layers is kept, migrated or reset per the
+        behavior's state_version. Returns the ReloadReport.
+        """
+        from behaviors.reload import BehaviorWatcher
+        w = getattr(self, '_behavior_watcher', None)
+        if w is None:
+            w = self._behavior_watcher = BehaviorWatcher()
+        rep = w.reload_changed(engine=getattr(self, '_full_preview_engine', None))
+        if rep.modules:
+            self._preview_dirty = True
+        return rep
+
+    def undo(self) -> bool:
+        """Undo the last project edit (ProjectManager history) and re-sync preview/UI."""
+        return self._history_step(self.pm.undo)
+
+    def redo(self) -> bool:
+        return self._history_step(self.pm.redo)
+
+    def _history_step(self, step) -> bool:
+        try:
+            if not step():
+                return False
+            # Re-run the setter (normalize/validate/rebuild) without journaling it again.
+            with self.pm.history.suspend():
+                self.project = self.pm.get()
+            return True
+        except Exception:
+            return False
 
     @property
     def target_mask(self) -> str | None:
@@ -754,7 +851,7 @@ class CoreBridge:
     def _rebuild_full_preview_engine(self):
         """Rebuild full preview renderer from current project (no Tk)."""
         try:
-            from models.io import load_project
+            from models.io import project_from_dict
             from preview.preview_engine import PreviewEngine
             from preview.engine import build_strip_geom, build_cells_geom
 
@@ -774,11 +871,21 @@ class CoreBridge:
             clean_proj, sanitize_issues = sanitize_for_json(proj_dict)
             self._full_preview_sanitize_issues = sanitize_issues
 
-            tmp = Path(self.pm.root_dir) / "out" / "_tmp_full_preview_project.json"
-            tmp.parent.mkdir(exist_ok=True)
-            tmp.write_text(json.dumps(clean_proj, indent=2), encoding="utf-8")
-
-            project_model = load_project(tmp)
+            # In-memory JSON round-trip (same normalization as the old temp-file load, without
+            # the pretty-printed write + read on every rebuild).
+            project_model = project_from_dict(json.loads(json.dumps(clean_proj, separators=(",", ":"))))
+            # Offline WAV analysis: project.audio = {"mode": "wav", "wav_path": ..., "loop": bool}
+            # switches the engine-owned service to the cached feature track backend.
+            try:
+                audio_cfg0 = (clean_proj.get('audio') or {}) if isinstance(clean_proj, dict) else {}
+                svc0 = getattr(self, "audio_service", None)
+                if svc0 is not None and isinstance(audio_cfg0, dict):
+                    if str(audio_cfg0.get('mode') or '').lower() == 'wav' and audio_cfg0.get('wav_path'):
+                        svc0.use_wav(str(audio_cfg0.get('wav_path')), loop=bool(audio_cfg0.get('loop', False)))
+                    elif getattr(svc0, "mode", "sim") == 'wav':
+                        svc0.set_backend(None)
+            except Exception:
+                pass
             # Release R1: reuse engine-owned audio backend (always-on)
             try:
                 self._full_preview_audio = getattr(getattr(self, "audio_service", None), "backend", None)
@@ -904,18 +1011,10 @@ class CoreBridge:
         if not getattr(self, "project", None):
             return
         try:
-            import json, os, tempfile
-            from models.io import load_project
-            # Write to a temp file to reuse the canonical loader (migrations + schema handling).
-            fd, tmp = tempfile.mkstemp(prefix="modulo_pd_", suffix=".json")
-            os.close(fd)
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(self.project, f, indent=2)
-            proj_obj = load_project(tmp)
-            try:
-                os.remove(tmp)
-            except Exception:
-                pass
+            import json
+            from models.io import project_from_dict
+            # JSON round-trip in memory, then the canonical loader (migrations + schema handling).
+            proj_obj = project_from_dict(json.loads(json.dumps(self.project, separators=(",", ":"))))
             # Swap the project object used by the renderer.
             eng.project = proj_obj
             # Optional: keep a reference for diagnostics.
@@ -39,6 +39,7 @@ def _install_global_excepthook(app_name: str = "Modulo"):
 
     sys.excepthook = _hook
 
+import os
 import sys
 import time
 import uuid
@@ -92,7 +93,8 @@ except Exception:  # pragma: no cover
 # : Parameter Registry MVP (Qt auto-controls)
 from params.registry import PARAMS
 from params.ensure import ensure_params, defaults_for
-from behaviors.registry import get_effect, load_capabilities_catalog
+from behaviors.registry import describe_effect, get_effect, load_capabilities_catalog
+from app.startup_profile import STARTUP
 
 from preview.viewport import Viewport
 from preview.mapping import MatrixMapping, xy_index, logical_dims
@@ -104,7 +106,8 @@ from qt.era_onboarding import EraOnboardingWindow
 import json
 import time
 
-from app.autosave import write_autosave
+import app.autosave as _autosave
+from app.autosave import AutosaveEngine
 from pathlib import Path
 from app.build_id import get_build_id as _get_build_id
 BUILD_ID = _get_build_id(Path(__file__).resolve().parents[1])
@@ -190,6 +193,23 @@ def _normalize_project(p: dict) -> dict:
     return p3
 
 
+def _subscribe_validation(widget, app_core, callback) -> bool:
+    """Subscribe `callback(snapshot)` to app_core validation-changed events for the
+    lifetime of `widget`. Returns False when the core has no event source (caller polls)."""
+    sub = getattr(app_core, "subscribe_validation", None)
+    if not callable(sub):
+        return False
+    try:
+        unsubscribe = sub(callback)
+    except Exception:
+        return False
+    try:
+        widget.destroyed.connect(lambda *_a: unsubscribe())
+    except Exception:
+        pass
+    return True
+
+
 def _hline() -> QtWidgets.QFrame:
     """Return a thin horizontal separator line."""
     f = QtWidgets.QFrame()
@@ -613,6 +633,7 @@ class PreviewWidget(QtWidgets.QWidget):
             pass
         tnow = time.time()
         leds = eng.render_frame(tnow)
+        STARTUP.first_frame()
         # Phase 6.1: update signal bus from stepped preview audio
         try:
             if hasattr(self.app_core, '_update_signals_from_preview'):
@@ -765,6 +786,7 @@ class PreviewWidget(QtWidgets.QWidget):
             pass
         tnow = time.time()
         leds = eng.render_frame(tnow)
+        STARTUP.first_frame()
         # --- diagnostics: paint telemetry ---
         try:
             _nz = 0
@@ -1365,14 +1387,14 @@ class MatrixPreviewWidget(QtWidgets.QWidget):
                 r, c = cache[i]
                 found = True
             else:
-                for yy in range(int(lh)):
-                    for xx in range(int(lw)):
-                        if int(xy_index(m, xx, yy)) == i:
-                            r, c = int(yy), int(xx)
-                            found = True
-                            break
-                    if found:
-                        break
+                from runtime.layout_geometry_v1 import geometry_for_layout
+                geom = geometry_for_layout({'shape': 'cells', 'mw': int(m.w), 'mh': int(m.h),
+                                            'serpentine': bool(m.serpentine), 'flip_x': bool(m.flip_x),
+                                            'flip_y': bool(m.flip_y), 'rotate': int(m.rotate or 0)})
+                xy = geom.xy_of_led(i)
+                if xy is not None:
+                    c, r = int(xy[0]), int(xy[1])
+                    found = True
         except Exception:
             pass
 
@@ -3292,7 +3314,13 @@ class ZonesMasksPanel(QtWidgets.QWidget):
                 except Exception:
                     _diagnostics_text = None
                 if _diagnostics_text is not None:
-                    txt = str(_diagnostics_text(p) or "")
+                    diag = None
+                    try:
+                        if p is getattr(self.app_core, 'project', None) and hasattr(self.app_core, 'diagnostics'):
+                            diag = self.app_core.diagnostics()  # cached per section revision
+                    except Exception:
+                        diag = None
+                    txt = str(_diagnostics_text(p, diagnosis=diag) or "")
                     # Don't fight user selection/cursor; just replace whole text.
                     try:
                         dt.blockSignals(True)
@@ -6055,15 +6083,18 @@ class ExportPanel(QtWidgets.QWidget):
             self.btn_repair_zmg = None
 
         # () Keep Export tab status/gate in sync when validation changes elsewhere.
-        # We poll app_core.last_validation cheaply and update the status box + export button gating.
-        try:
-            self._last_validation_sig = None
-            self._validation_poll_timer = QtCore.QTimer(self)
-            self._validation_poll_timer.setInterval(250)
-            self._validation_poll_timer.timeout.connect(self._poll_validation)
-            self._validation_poll_timer.start()
-        except Exception:
-            self._validation_poll_timer = None
+        # app_core publishes validation-changed events (app.validation_engine); the 250 ms
+        # poll of app_core.last_validation is only a fallback for cores without them.
+        self._last_validation_sig = None
+        self._validation_poll_timer = None
+        if not _subscribe_validation(self, self.app_core, self._on_validation_changed):
+            try:
+                self._validation_poll_timer = QtCore.QTimer(self)
+                self._validation_poll_timer.setInterval(250)
+                self._validation_poll_timer.timeout.connect(self._poll_validation)
+                self._validation_poll_timer.start()
+            except Exception:
+                self._validation_poll_timer = None
 
         outer.addWidget(aud_box)
 
@@ -6343,9 +6374,12 @@ class ExportPanel(QtWidgets.QWidget):
                             p_now = getattr(self.app_core, 'project', None) or {}
                             if not isinstance(p_now, dict):
                                 p_now = {}
-                            from app.project_validation import validate_project
-                            snap = validate_project(p_now)
-                            setattr(self.app_core, 'last_validation', snap)
+                            if hasattr(self.app_core, 'revalidate'):
+                                self.app_core.revalidate()
+                            else:
+                                from app.project_validation import validate_project
+                                snap = validate_project(p_now)
+                                setattr(self.app_core, 'last_validation', snap)
                         except Exception:
                             pass
 # () After repair/normalize, immediately refresh export status UI so
@@ -6600,6 +6634,13 @@ class ExportPanel(QtWidgets.QWidget):
             pass
 
 
+    def _on_validation_changed(self, _snap=None):
+        try:
+            self._last_validation_sig = None
+            self._poll_validation()
+        except Exception:
+            pass
+
     def _poll_validation(self):
         """Cheap poller to keep export status/gate in sync with latest validation snapshot.
 
@@ -6635,7 +6676,8 @@ class ExportPanel(QtWidgets.QWidget):
         self.target_combo.clear()
         try:
             from export.targets.registry import list_targets
-            metas = list_targets()
+            with STARTUP.span("targets.discovery"):
+                metas = list_targets()
         except Exception as e:
             metas = []
             self.report.setPlainText(f"Failed to list targets: {e}")
@@ -6998,7 +7040,10 @@ class ExportPanel(QtWidgets.QWidget):
             p = getattr(self.app_core, 'project', None) or {}
             if not isinstance(p, dict):
                 p = {}
-            snap = validate_project(p)
+            if hasattr(self.app_core, 'revalidate'):
+                snap = self.app_core.revalidate()
+            else:
+                snap = validate_project(p)
             if isinstance(snap, dict) and (not snap.get('ok', True)):
                 errs = snap.get('errors') or []
                 msg = 'Project validation failed. Fix these before export:\n\n' + '\n'.join(f'- {e}' for e in errs[:30])
@@ -7021,7 +7066,10 @@ class ExportPanel(QtWidgets.QWidget):
         try:
             from export.parity_summary import build_parity_summary, summarize_layers, format_export_report_line
             project = self.app_core.project or {}
-            ps = build_parity_summary(project, target_id=tid)
+            if hasattr(self.app_core, 'parity_summary'):
+                ps = self.app_core.parity_summary(tid)
+            else:
+                ps = build_parity_summary(project, target_id=tid)
             summary = summarize_layers(ps)
             self.report.setPlainText(format_export_report_line(summary))
         except Exception:
@@ -7030,7 +7078,10 @@ class ExportPanel(QtWidgets.QWidget):
         try:
             from export.parity_summary import build_parity_summary, format_export_block_message
             project = self.app_core.project or {}
-            ps = build_parity_summary(project, target_id=tid)
+            if hasattr(self.app_core, 'parity_summary'):
+                ps = self.app_core.parity_summary(tid)  # same revision as step 2: cached
+            else:
+                ps = build_parity_summary(project, target_id=tid)
             msg = format_export_block_message(ps, target_id=tid)
             if msg:
                 # Block and show reasons (single source of truth)
@@ -8424,9 +8475,10 @@ class LayerStackPanel(QtWidgets.QWidget):
 
             title = key
             try:
-                d = get_effect(key)
+                # Manifest title: listing effects must not import every module.
+                d = describe_effect(key)
                 if d is not None:
-                    title = getattr(d, 'title', None) or title
+                    title = d.get('title') or title
             except Exception:
                 pass
             self.effect.addItem(str(tag) + str(title), key)
@@ -10744,6 +10796,9 @@ class EffectAuditPanel(QtWidgets.QWidget):
     renders a few frames, and reports whether the effect produces any non-black
     pixels, whether it is animated, and whether it threw an exception.
 
+    Rendering happens in headless worker processes (preview.effect_audit); results
+    stream into the panel as they complete.
+
     Audio-dependent effects are skipped by default.
     """
 
@@ -10784,18 +10839,81 @@ class EffectAuditPanel(QtWidgets.QWidget):
         except Exception:
             pass
 
+    def _audit_layout(self) -> dict:
+        p0 = self.app_core.project or {}
+        layout = dict((p0.get('layout') or {}) if isinstance(p0.get('layout'), dict) else {})
+        return layout or {'shape': 'strip', 'num_leds': 575}
+
     def _run(self):
+        """Run the audit on a process pool and stream results into the panel."""
+        import queue
+        import threading
+        from preview.effect_audit import iter_effect_audit
+
+        if getattr(self, '_audit_thread', None) is not None and self._audit_thread.is_alive():
+            return
         self.run_btn.setEnabled(False)
+        include_audio = bool(getattr(self.include_audio, 'isChecked', lambda: False)())
+        layout = self._audit_layout()
+        self._audit_results = []
+        self._audit_queue = queue.Queue()
         try:
             self.out.setPlainText("Running audit…\n")
         except Exception:
             pass
 
+        q = self._audit_queue
+
+        def _worker():
+            try:
+                for res in iter_effect_audit(layout, include_audio=include_audio):
+                    q.put(res)
+            except Exception as e:
+                q.put(f"Effect audit failed: {type(e).__name__}: {e}")
+            q.put(None)
+
+        self._audit_thread = threading.Thread(target=_worker, daemon=True)
+        self._audit_thread.start()
+        if getattr(self, '_audit_timer', None) is None:
+            self._audit_timer = QtCore.QTimer(self)
+            self._audit_timer.setInterval(100)
+            self._audit_timer.timeout.connect(self._drain_audit_queue)
+        self._audit_timer.start()
+
+    def _drain_audit_queue(self):
+        import queue
+        from preview.effect_audit import format_audit_report
+
+        done = False
+        failure = None
+        while True:
+            try:
+                item = self._audit_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                done = True
+                break
+            if isinstance(item, str):
+                failure = item
+                continue
+            self._audit_results.append(item)
+            try:
+                self.out.appendPlainText(item.line())
+            except Exception:
+                pass
+        if not done:
+            return
+        self._audit_timer.stop()
+        report = failure or format_audit_report(self._audit_results)
+        self._persist(report)
         try:
-            report = self._run_audit(include_audio=bool(getattr(self.include_audio,'isChecked',lambda:False)()))
-        except Exception as e:
-            report = f"Effect audit failed: {type(e).__name__}: {e}"
+            self.out.setPlainText(report)
+        except Exception:
+            pass
+        self.run_btn.setEnabled(True)
 
+    def _persist(self, report: str):
         try:
             # persist to out/ for easy sharing
             from pathlib import Path
@@ -10806,222 +10924,14 @@ class EffectAuditPanel(QtWidgets.QWidget):
         except Exception:
             pass
 
-        try:
-            self.out.setPlainText(report)
-        except Exception:
-            pass
-        self.run_btn.setEnabled(True)
-
     def _run_audit(self, *, include_audio: bool=False) -> str:
-        # Ensure effects are registered
-        try:
-            from behaviors import auto_load
-            if hasattr(auto_load, 'register_all'):
-                auto_load.register_all()
-        except Exception:
-            pass
-
-        from behaviors.registry import REGISTRY
-        from params.ensure import defaults_for
-
-        # Snapshot current project so we can restore at end
-        p0 = dict(self.app_core.project or {})
-
-        # Build a clean single-layer project
-        layout = dict((p0.get('layout') or {}) if isinstance(p0.get('layout'), dict) else {})
-        if not layout:
-            layout = {'shape': 'strip', 'num_leds': 575}
-
-        keys = sorted(list(REGISTRY.keys()))
+        """Blocking audit (used by the Diagnostics hub health check).
 
-        # capability-driven classification for audio/support
-
-        results = []
-        try:
-            for k in keys:
-                kk = str(k)
-                defn = REGISTRY.get(kk)
-                caps = dict(getattr(defn, 'capabilities', {}) or {})
-                # classify by capabilities
-                if (not include_audio) and bool(caps.get('requires_audio', False)):
-                    results.append((kk, 'SKIP(audio)', '', ''))
-                    continue
-                shape = str((layout or {}).get('shape','strip'))
-                # Project layouts use 'cells' for matrix-style worlds. For audit capability
-                # classification, treat 'cells' as matrix.
-                if shape == 'cells':
-                    shape = 'matrix'
-                if shape == 'strip' and caps.get('supports_strip', True) is False:
-                    results.append((kk, 'UNSUPPORTED(strip)', '', ''))
-                    continue
-                if shape == 'matrix' and caps.get('supports_matrix', True) is False:
-                    results.append((kk, 'UNSUPPORTED(matrix)', '', ''))
-                    continue
-
-                uses = list(getattr(defn, 'uses', []) or [])
-                params = defaults_for(uses)
-                # Diagnostics overrides: make certain bursty effects deterministic/visible
-                # so the audit reflects whether the renderer works (not whether a random
-                # bucket happened to be dark).
-                if kk in ('lightning',):
-                    try:
-                        params['density'] = 1.0
-                    except Exception:
-                        pass
-
-                # NOTE: Engine schema uses 'effect' as the primary behavior key.
-                # Keep 'behavior' too for backwards-compat snapshots.
-                layer = {
-                    'effect': kk,
-                    'behavior': kk,
-                    'opacity': 1.0,
-                    'blend': 'over',
-                    'params': params,
-                    # no operators/postfx for audit (must validate effect renderer itself)
-                    'operators': [],
-                }
-
-                # Seed deterministic non-zero "purpose_*" params so purpose-driven showcase effects
-                # are visibly active during effect audit (audit project has no rules/variables).
-                if isinstance(kk, str) and kk.startswith('purpose_') and isinstance(params, dict):
-                    params.setdefault('purpose_i0', 42)
-                    params.setdefault('purpose_i1', 7)
-                    params.setdefault('purpose_f0', 0.75)
-                    params.setdefault('purpose_f1', 0.35)
-                    params.setdefault('purpose_f2', 0.15)
-                # Build an isolated project for audit.
-                #
-                # IMPORTANT: do NOT inherit the user's current project rules/audio/variables
-                # into the audit project. Rules can legitimately drive parameters to 0.0
-                # (e.g. brightness) based on audio.* signals, which would make unrelated
-                # effects appear BLANK during audit. The audit must validate the renderer
-                # itself under deterministic defaults.
-                p = {
-                    'name': f"AUDIT:{kk}",
-                    'schema_version': p0.get('schema_version', 0),
-                    'layout': layout,
-                    'layers': [layer],
-                    'active_layer': 0,
-                    # keep empty containers so engine code that expects keys stays happy
-                    'zones': [],
-                    'masks': {},
-                    'groups': [],
-                    'rules': [],
-                    'rules_v6': [],
-                    'variables': {},
-                    'audio': {},
-                    'export': {},
-                    'ui': {},
-                }
-
-                # Apply project and rebuild preview engine
-                # Force full capabilities during audit (do not let era gating block preview rebuilds)
-                try:
-                    ui = p.get('ui') if isinstance(p.get('ui'), dict) else {}
-                    ui['era_complete'] = True
-                    ui['era_id'] = 'era_now'
-                    p['ui'] = ui
-                except Exception:
-                    pass
-
-                self.app_core.project = p
-                try:
-                    if hasattr(self.app_core, '_rebuild_full_preview_engine'):
-                        self.app_core._rebuild_full_preview_engine()
-                except Exception:
-                    pass
-
-                eng = getattr(self.app_core, '_full_preview_engine', None)
-                if eng is None:
-                    _pe_err = getattr(self.app_core, '_full_preview_last_error', None)
-                    _pe_trace = getattr(self.app_core, '_full_preview_last_trace', None)
-                    if _pe_err:
-                        return f"SKIP(full_preview_engine): {_pe_err}"
-                    if _pe_trace:
-                        return "SKIP(full_preview_engine): trace present"
-                    return "SKIP(full_preview_engine): unavailable"
-                    results.append((kk, 'NO_ENGINE', '', ''))
-                    continue
-
-                # Render a few frames
-                frames = []
-                errs = ''
-                try:
-                    # Sample across multiple "buckets" to correctly validate
-                    # bursty/stochastic effects (e.g. lightning/confetti).
-                    t0 = time.time()
-                    for i in range(12):
-                        tt = t0 + i * 0.10
-                        try:
-                            if include_audio:
-                                # R3: audit uses engine-owned always-on audio (no audit-only injection).
-                                try:
-                                    svc = getattr(self.app_core, "audio_service", None)
-                                    if svc is not None:
-                                        # Ensure the preview engine reads from the canonical backend.
-                                        if hasattr(svc, "backend"):
-                                            eng.audio = svc.backend
-                                        if hasattr(svc, "step"):
-                                            svc.step(tt)
-                                except Exception:
-                                    pass
-                            frames.append(list(eng.render_frame(tt)))
-                        except Exception:
-                            pass
-                except Exception as e:
-                    errs = f"{type(e).__name__}: {e}"
-
-                if getattr(eng, 'last_error', None):
-                    errs = str(getattr(eng, 'last_error', ''))
-
-                if not frames:
-                    results.append((kk, 'NO_FRAMES', '', errs))
-                    continue
-
-                def _lit(frame):
-                    return sum(1 for (r,g,b) in frame if (int(r)|int(g)|int(b)) != 0)
-
-                # NOTE: Some effects are intentionally "bursty" (e.g. lightning/confetti)
-                # and may be fully dark on some frames. For diagnostics, treat an effect as
-                # working if it lights *any* pixel in *any* sampled frame.
-                lit_per_frame = [_lit(fr) for fr in frames]
-                lit0 = lit_per_frame[0]
-                litN = lit_per_frame[-1]
-                lit_max = max(lit_per_frame) if lit_per_frame else 0
-
-                # Animated if any frame differs from the first.
-                animated = 'YES' if any(fr != frames[0] for fr in frames[1:]) else 'NO'
-
-                # unique colors (rough)
-                try:
-                    uniq = len({(int(r)&255, int(g)&255, int(b)&255) for (r,g,b) in frames[-1]})
-                except Exception:
-                    uniq = 0
-
-                status = 'OK' if lit_max > 0 else 'BLANK'
-                results.append((kk, status, f"lit {lit0}->{litN}, uniq {uniq}, anim {animated}", errs))
-        finally:
-            # Restore original project
-            try:
-                self.app_core.project = p0
-            except Exception:
-                pass
-            try:
-                if hasattr(self.app_core, '_rebuild_full_preview_engine'):
-                    self.app_core._rebuild_full_preview_engine()
-            except Exception:
-                pass
-
-        lines = []
-        lines.append('=== EFFECT AUDIT REPORT ===')
-        lines.append('Legend: OK=emits pixels, BLANK=no lit pixels, SKIP(audio)=skipped (audio required), UNSUPPORTED(*)=not supported on current layout, errors show exception')
-        lines.append('')
-        for (name, status, meta, err) in results:
-            if err:
-                lines.append(f"- {name} — {status} — {meta} — ERR: {err}")
-            else:
-                lines.append(f"- {name} — {status} — {meta}")
-        return "\n".join(lines)
+        Each behavior renders on its own headless PreviewEngine in a worker process,
+        so the live project and preview engine are never touched.
+        """
+        from preview.effect_audit import run_effect_audit
+        return run_effect_audit(self._audit_layout(), include_audio=include_audio)
 
 
 class DiagnosticsHubPanel(QtWidgets.QWidget):
@@ -11169,9 +11079,26 @@ class DiagnosticsHubPanel(QtWidgets.QWidget):
         self.include_audio.setChecked(False)
         row.addWidget(self.include_audio)
 
+        self.startup_btn = QtWidgets.QPushButton("Startup Profile")
+        self.startup_btn.setToolTip("Launch phases and import costs up to the first preview frame")
+        row.addWidget(self.startup_btn)
+
         row.addStretch(1)
         outer.addLayout(row)
 
+        # Firmware frame timing (boards exported with export.telemetry; see export/telemetry.py)
+        trow = QtWidgets.QHBoxLayout()
+        self.telemetry_port = QtWidgets.QLineEdit()
+        self.telemetry_port.setPlaceholderText("Telemetry serial port (e.g. /dev/ttyUSB0, COM3)")
+        trow.addWidget(self.telemetry_port, 1)
+        self.telemetry_connect_btn = QtWidgets.QPushButton("Connect Telemetry")
+        self.telemetry_connect_btn.setToolTip("Read MT1 frame timing records from a board exported with telemetry enabled")
+        trow.addWidget(self.telemetry_connect_btn)
+        self.telemetry_report_btn = QtWidgets.QPushButton("Firmware Telemetry")
+        self.telemetry_report_btn.setToolTip("Per-stage and per-layer frame time measured on the board")
+        trow.addWidget(self.telemetry_report_btn)
+        outer.addLayout(trow)
+
         self.out = QtWidgets.QPlainTextEdit()
         self.out.setReadOnly(True)
         self.out.setPlaceholderText("Run a health check to generate a report…")
@@ -11180,6 +11107,9 @@ class DiagnosticsHubPanel(QtWidgets.QWidget):
         btnrow = QtWidgets.QHBoxLayout()
         self.copy_btn = QtWidgets.QPushButton("Copy report")
         btnrow.addWidget(self.copy_btn)
+        self.export_startup_btn = QtWidgets.QPushButton("Export startup JSON")
+        self.export_startup_btn.setToolTip("Write the startup profile to out/startup_profile_<timestamp>.json")
+        btnrow.addWidget(self.export_startup_btn)
         btnrow.addStretch(1)
         outer.addLayout(btnrow)
 
@@ -11189,6 +11119,83 @@ class DiagnosticsHubPanel(QtWidgets.QWidget):
         self.copy_btn.clicked.connect(self._copy)
         self.run_full_btn.clicked.connect(self._run_full)
         self.run_audit_btn.clicked.connect(self._run_audit_detail)
+        self.startup_btn.clicked.connect(self._show_startup_profile)
+        self.export_startup_btn.clicked.connect(self._export_startup_profile)
+        self.telemetry_connect_btn.clicked.connect(self._toggle_telemetry)
+        self.telemetry_report_btn.clicked.connect(self._show_telemetry)
+
+    def _telemetry_collector(self):
+        col = getattr(self.app_core, "firmware_telemetry", None)
+        if col is None:
+            from preview.firmware_telemetry import FirmwareTelemetryCollector
+            col = FirmwareTelemetryCollector()
+            try:
+                setattr(self.app_core, "firmware_telemetry", col)
+            except Exception:
+                pass
+        return col
+
+    def _toggle_telemetry(self):
+        try:
+            col = self._telemetry_collector()
+            if col.status.connected:
+                col.disconnect()
+                self.telemetry_connect_btn.setText("Connect Telemetry")
+                self.out.appendPlainText("\nTelemetry disconnected.")
+                return
+            baud = 115200
+            try:
+                baud = int(((self._get_project_dict().get("export") or {}).get("debug_serial_baud")) or 115200)
+            except Exception:
+                pass
+            col.reset()
+            if col.connect(self.telemetry_port.text(), baud):
+                self.telemetry_connect_btn.setText("Disconnect Telemetry")
+                self.out.appendPlainText(f"\nTelemetry connected: {self.telemetry_port.text()} @ {baud}")
+            else:
+                self.out.appendPlainText(f"\nTelemetry connect failed: {col.status.last_error}")
+        except Exception as e:
+            self.out.appendPlainText(f"\nTelemetry unavailable: {e}")
+
+    def _show_telemetry(self):
+        try:
+            from export.telemetry import telemetry_layer_names
+            names = telemetry_layer_names(self._get_project_dict())
+            self.out.setPlainText(self._telemetry_collector().report_text(names))
+        except Exception as e:
+            self.out.setPlainText(f"Firmware telemetry unavailable: {e}")
+
+    def _show_startup_profile(self):
+        try:
+            from app.startup_profile import STARTUP, diff_reports, load_report, out_dir, report_text
+            rep = STARTUP.report()
+            text = report_text(rep)
+            # Regression check against a profile exported from an earlier build.
+            base = load_report(out_dir() / "startup_profile_baseline.json")
+            if base:
+                lines = diff_reports(base, rep)
+                text += "\n\nVs baseline (" + str(base.get("build_id", "?")) + "):\n"
+                text += "\n".join("  " + ln for ln in lines) if lines else "  no change above 5 ms"
+            else:
+                text += "\n\n(Copy an export to out/startup_profile_baseline.json to compare builds.)"
+            self.out.setPlainText(text)
+        except Exception as e:
+            self.out.setPlainText(f"Startup profile unavailable: {e}")
+
+    def _export_startup_profile(self):
+        try:
+            from app.startup_profile import STARTUP, export_report
+            path = export_report(STARTUP.report())
+            self.out.appendPlainText(f"\nStartup profile written: {path}")
+        except Exception as e:
+            self.out.appendPlainText(f"\nStartup profile export failed: {e}")
+
+    def append_event(self, source: str, text: str):
+        """Timestamped line in the report pane (background events such as hot reload)."""
+        try:
+            self.out.appendPlainText(f"[{time.strftime('%H:%M:%S')}] {source}: {text}")
+        except Exception:
+            pass
 
     def _copy(self):
         try:
@@ -13353,6 +13360,7 @@ class DiagnosticsHubPanel(QtWidgets.QWidget):
                     ("runtime.integrators_v1", "euler_step_entities"),
                     ("runtime.constraints_v1", "apply_constraints"),
                     ("runtime.particle_pairs_v1", "count_pairs_within_radius_v1"),
+                    ("runtime.broadphase_v1", "BroadphaseV1"),
                     ("runtime.force_particles_core_v1", "integrate_point_forces_v1"),
                     ("runtime.system_scheduler_v1", "SystemSchedulerV1"),
                     ("runtime.extensions_v1", "register_system"),
@@ -13983,8 +13991,12 @@ class ControlsPanel(QtWidgets.QWidget):
                 pass
         self._refresh_validation_badge = _do_refresh_validation_badge
 
-        self._validation_badge_timer.timeout.connect(self._refresh_validation_badge)
-        self._validation_badge_timer.start()
+        # Badge follows validation-changed events; poll only if the core cannot publish them.
+        if _subscribe_validation(self, self.app_core, lambda _snap: self._refresh_validation_badge()):
+            self._refresh_validation_badge()
+        else:
+            self._validation_badge_timer.timeout.connect(self._refresh_validation_badge)
+            self._validation_badge_timer.start()
 
         self._sync_timer.timeout.connect(self._sync_from_project)
         self._sync_timer.start(500)
@@ -14706,9 +14718,39 @@ class QtMainWindow(QtWidgets.QMainWindow):
         # : Qt autosave
         # Hard-disabled for release stability: autosave/restore previously caused
         # confusing startup states (e.g., stale layers from prior demos).
-        self._autosave_last_rev = -1
-        self._autosave_last_t = 0.0
+        self._autosave_engine = None
         self._autosave_timer = None
+        if _autosave.AUTOSAVE_ENABLED:
+            try:
+                self._autosave_timer = QtCore.QTimer(self)
+                self._autosave_timer.setInterval(2000)
+                self._autosave_timer.timeout.connect(self._autosave_tick)
+                self._autosave_timer.start()
+            except Exception:
+                self._autosave_timer = None
+
+        # Effect authoring: MODULO_HOT_RELOAD=1 polls behavior sources and reloads only
+        # the modules that changed (behaviors.reload.BehaviorWatcher).
+        self._hot_reload_timer = None
+        if os.environ.get("MODULO_HOT_RELOAD", "").strip() not in ("", "0"):
+            try:
+                self.app_core.reload_behaviors()  # start tracking what is loaded now
+                self._hot_reload_timer = QtCore.QTimer(self)
+                self._hot_reload_timer.setInterval(1000)
+                self._hot_reload_timer.timeout.connect(self._hot_reload_tick)
+                self._hot_reload_timer.start()
+            except Exception:
+                self._hot_reload_timer = None
+
+    def _hot_reload_tick(self):
+        try:
+            rep = self.app_core.reload_behaviors()
+            if rep.modules or rep.errors:
+                panel = getattr(self, 'diagnostics_panel', None)
+                if panel is not None:
+                    panel.append_event("Hot reload", rep.summary())
+        except Exception:
+            return
 
     # : ensure changes are visible immediately on launch (no manual refresh clicks).
     def post_startup_init(self):
@@ -14719,6 +14761,19 @@ class QtMainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
 
+        # 0) Undo/redo shortcuts (ProjectManager history via CoreBridge).
+        try:
+            self._undo_shortcuts = []
+            for seq, fn_name in ((QtGui.QKeySequence.StandardKey.Undo, 'undo'),
+                                 (QtGui.QKeySequence.StandardKey.Redo, 'redo')):
+                fn = getattr(self.app_core, fn_name, None)
+                if callable(fn):
+                    sc = QtGui.QShortcut(QtGui.QKeySequence(seq), self)
+                    sc.activated.connect(lambda fn=fn: (fn(), self._after_history_step()))
+                    self._undo_shortcuts.append(sc)
+        except Exception:
+            pass
+
         # 1) Ensure preview engine exists (geometry + engine) so the preview paints immediately.
         try:
             fn = getattr(self.app_core, '_rebuild_full_preview_engine', None)
@@ -14800,29 +14855,32 @@ class QtMainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
 
+    def _after_history_step(self):
+        """Repaint after undo/redo; panels follow the project revision on their own timers."""
+        for name in ('preview', 'matrix_preview'):
+            try:
+                w = getattr(self, name, None)
+                if w is not None:
+                    w.update()
+            except Exception:
+                pass
+
     # : throttled autosave so launch always restores last working state.
     def _autosave_tick(self):
-        # Autosave is hard-disabled for release stability.
-        return
+        # Autosave is hard-disabled for release stability (app.autosave.AUTOSAVE_ENABLED).
+        if not _autosave.AUTOSAVE_ENABLED:
+            return
         try:
             core = getattr(self, 'app_core', None)
             if core is None or not hasattr(core, 'project'):
                 return
-            rev = 0
-            try:
-                rev = int(core.project_revision())
-            except Exception:
-                rev = 0
-            if rev <= int(getattr(self, '_autosave_last_rev', -1)):
-                return
-            now = time.time()
-            last_t = float(getattr(self, '_autosave_last_t', 0.0) or 0.0)
-            # throttle actual disk writes
-            if (now - last_t) < 2.0:
-                return
-            write_autosave(core.project)
-            self._autosave_last_rev = rev
-            self._autosave_last_t = now
+            eng = getattr(self, '_autosave_engine', None)
+            if eng is None:
+                # Revision-gated: unchanged ticks cost one int compare; serialization and
+                # disk writes (checkpoint + journal) run on the engine's worker thread.
+                eng = AutosaveEngine(lambda: core.project, core.project_revision)
+                self._autosave_engine = eng
+            eng.tick()
         except Exception:
             return
 
@@ -14859,7 +14917,13 @@ class QtMainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
 
-        # Autosave disabled; proceed with normal close.
+        # Drain pending autosave writes (no-op while autosave is disabled).
+        try:
+            eng = getattr(self, '_autosave_engine', None)
+            if eng is not None:
+                eng.close(timeout=3.0)
+        except Exception:
+            pass
         try:
             return super().closeEvent(event)
         except Exception:
@@ -14993,8 +15057,11 @@ def run_qt(app_core) -> None:
         era_done = False
 
     if not era_done:
-        era_win = EraOnboardingWindow(app_core)
+        with STARTUP.span("qt.era_window"):
+            era_win = EraOnboardingWindow(app_core)
         era_win.showMaximized()
+        # Era mode has no preview: its first paint ends the startup trace.
+        QtCore.QTimer.singleShot(0, STARTUP.first_frame)
 
         def _enter_full_modulo():
             try:
@@ -15032,7 +15099,8 @@ def run_qt(app_core) -> None:
         return
 
     # Era already completed -> normal app boot
-    win = QtMainWindow(app_core)
+    with STARTUP.span("qt.main_window"):
+        win = QtMainWindow(app_core)
     # Ensure the window is resizable / maximizable under Linux WMs (XFCE/KDE/GNOME).
     try:
         win.setMinimumSize(900, 520)
@@ -15052,6 +15120,7 @@ def run_qt(app_core) -> None:
     if not has_geo:
         win.resize(1180, 640)
     win.show()
+    STARTUP.mark("window_shown")
     # : one-shot post-startup sync (after show so sizes are valid).
     try:
         QtCore.QTimer.singleShot(0, getattr(win, 'post_startup_init'))
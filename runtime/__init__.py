@@ -13,6 +13,7 @@ from .vector_fields_v1 import (
     CurlNoiseFieldConfig,
 )
 from .noise_v2 import Noise2D, Noise2DConfig, CurlNoise2D, CurlNoiseConfig
+from .field_bake_v1 import FieldGridConfigV1, BakedFieldV1, bake_for_layout, bake_for_bounds, sample_field_many
 
 from .buffers_v1 import BufferConfig, ScalarBufferV1, VectorBufferV1
 from .buffer_advection_v1 import AdvectionConfigV1, advect_scalar_buffer_v1, advect_vector_buffer_v1
@@ -36,7 +37,7 @@ from .buffer_render_v1 import (
     render_vector_buffer_to_leds_v1,
 )
 
-from .influence_maps_v1 import DepositConfigV1, SenseConfigV1, deposit_points_scalar_v1, sense_gradient_scalar_v1, steer_follow_gradient_v1
+from .influence_maps_v1 import DepositConfigV1, SenseConfigV1, deposit_points_scalar_v1, decay_scalar_v1, sense_gradient_scalar_v1, sense_gradients_scalar_v1, steer_follow_gradient_v1
 
 from .integrators_v1 import IntegratorConfigV1, euler_step_entities, apply_drag, clamp_speed
 
@@ -44,12 +45,14 @@ from runtime.system_scheduler_v1 import SystemSchedulerV1
 
 from .particle_pairs_v1 import count_pairs_within_radius_v1
 
-from .constraints_v1 import apply_constraints, BoundsConfigV1, CircleObstacleV1, SegmentObstacleV1, TileMaskObstacleV1
+from .broadphase_v1 import BroadphaseV1, StaticObstacleIndexV1
+
+from .constraints_v1 import apply_constraints, build_obstacle_index, BoundsConfigV1, CircleObstacleV1, SegmentObstacleV1, TileMaskObstacleV1
 
 # FSM primitive
 from .fsm_v1 import FSMV1, StateV1, TransitionV1, step_fsm_v1, make_phase_fsm_v1
 
 
 # Long-memory primitives
-from .long_memory_v1 import LongMemory2DConfig, LongMemory2D, EventLogV1, EventRecordV1
+from .long_memory_v1 import LongMemory2DConfig, LongMemory2D, EventLogV1, EventRecordV1, half_life_factor
 
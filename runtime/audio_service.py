@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional, Any
 
 # Reuse existing deterministic simulator for now.
@@ -14,7 +15,8 @@ class AudioService:
     Contract:
       - `step(t)` advances the backend to simulation time `t` (seconds).
       - `.state` is always a dict with canonical keys after at least one step.
-      - Backend is pluggable later (serial/MSGEQ7/etc), but service ownership is stable.
+      - Backend is pluggable (sim, offline WAV feature track via `use_wav`, ...),
+        but service ownership is stable.
 
     This deliberately wraps the existing `AudioSim` so we can rewire ownership without
     rewriting effects or preview code.
@@ -56,23 +58,35 @@ class AudioService:
 
     @property
     def last_error(self) -> str:
-        return str(getattr(self.backend, "last_error", "") or "")
+        return str(getattr(self, "_last_error", "") or getattr(self.backend, "last_error", "") or "")
 
-
-    @property
-    def mode(self) -> str:
-        return "sim"
-
-    @property
-    def backend_name(self) -> str:
+    def set_backend(self, backend: Any) -> None:
+        """Swap the backend (ownership stays with the service) and prime it at t=0."""
+        self.backend = backend if backend is not None else AudioSim()
+        self._last_t = None
         try:
-            return type(self.backend).__name__
+            self.step(0.0)
         except Exception:
-            return "unknown"
+            pass
 
-    @property
-    def status(self) -> str:
-        return "OK"
+    def use_wav(self, path: str | Path, *, loop: bool = False) -> bool:
+        """Switch to an offline WAV feature track (analyzed once, then served from cache).
+
+        Returns False (and keeps the current backend) if the file cannot be analyzed.
+        """
+        from audio.wav_features import FeatureTrackError, WavFeatureBackend
+
+        cur = self.backend
+        if isinstance(cur, WavFeatureBackend) and cur.source == str(path) and cur.loop == bool(loop):
+            return True
+        try:
+            backend = WavFeatureBackend.from_wav(Path(path), loop=loop)
+        except (OSError, FeatureTrackError) as e:
+            self._last_error = f"wav: {e}"
+            return False
+        self._last_error = ""
+        self.set_backend(backend)
+        return True
 
     def get_audio_state_dict(self) -> dict:
         """Return backend audio state in canonical AudioSim keys.
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+"""Broadphase collision v1 (engine primitive).
+
+Shared uniform-grid broadphase for entity/particle/obstacle collision queries. Call
+sites used to test every pair (state_runtime.find_collisions, entities.collide
+loops) or every obstacle per entity (constraints_v1); this module replaces those
+scans with a grid rebuilt once per tick over array-backed positions:
+
+- BroadphaseV1.rebuild(xs, ys, rs, tags, alive) buckets parallel arrays into cells.
+  Positions are read once; queries never touch the caller's dicts/objects again.
+  Entries with a NaN/inf position are treated as not alive (they never collide).
+- overlapping_pairs(tag_a, tag_b) / pairs_within(radius) return exact (i, j) pairs,
+  i < j, in the same order a brute-force i<j scan would produce them. Tag filters
+  follow state_runtime.find_collisions.
+- count_within(radius) counts pairs exactly (no max-pairs budget).
+- query_circle(x, y, r) returns indices overlapping a circle, ascending.
+- wrap=True with bounds=(w, h) uses toroidal cells and the same single-image
+  distance as runtime.entities.collide.
+
+StaticObstacleIndexV1 buckets circle/segment obstacles once (they do not move) and
+answers per-point candidate lists for constraints_v1.apply_constraints.
+
+Pure Python, deterministic, no Qt/numpy dependency.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+
+Cell = Tuple[int, int]
+
+# Matches constraints_v1._collide_segment's fixed thickness.
+SEGMENT_THICKNESS = 0.5
+
+
+def tags_match(ta: str, tb: str, tag_a: str = "", tag_b: str = "") -> bool:
+    """Pair tag filter (state_runtime.find_collisions semantics)."""
+    if tag_a and ta != tag_a and tb != tag_a:
+        return False
+    if tag_b:
+        if not ((ta == tag_a and tb == tag_b) or (ta == tag_b and tb == tag_a)):
+            return False
+    return True
+
+
+def arrays_from_dicts(items: Sequence[Dict[str, Any]], *, r_default: float = 0.5, tag_key: str = "tag"):
+    """(xs, ys, rs, tags, alive) parallel arrays from entity dicts (x/y/r/tag/alive)."""
+    xs: List[float] = []
+    ys: List[float] = []
+    rs: List[float] = []
+    tags: List[str] = []
+    alive: List[bool] = []
+    for e in items:
+        try:
+            xs.append(float(e.get("x", 0.0) or 0.0))
+            ys.append(float(e.get("y", 0.0) or 0.0))
+        except Exception:
+            xs.append(0.0)
+            ys.append(0.0)
+        try:
+            rs.append(float(e.get("r", r_default)))
+        except Exception:
+            rs.append(float(r_default))
+        tags.append(str(e.get(tag_key, "")))
+        alive.append(bool(e.get("alive", True)))
+    return xs, ys, rs, tags, alive
+
+
+def arrays_from_objects(items: Sequence[Any], *, tag_attr: str = "kind"):
+    """(xs, ys, rs, tags, alive) parallel arrays from objects with x/y/r attributes."""
+    xs = [float(e.x) for e in items]
+    ys = [float(e.y) for e in items]
+    rs = [float(getattr(e, "r", 0.0)) for e in items]
+    tags = [str(getattr(e, tag_attr, "")) for e in items]
+    alive = [bool(getattr(e, "alive", True)) for e in items]
+    return xs, ys, rs, tags, alive
+
+
+class BroadphaseV1:
+    """Uniform grid over parallel position arrays, rebuilt per tick."""
+
+    def __init__(self, cell: Optional[float] = None, *, bounds: Optional[Tuple[float, float]] = None, wrap: bool = False):
+        self.cell = float(cell) if cell else 0.0   # 0 -> derived from radii on rebuild
+        self.bounds = (float(bounds[0]), float(bounds[1])) if bounds else None
+        self.wrap = bool(wrap) and self.bounds is not None
+        self.xs: List[float] = []
+        self.ys: List[float] = []
+        self.rs: List[float] = []
+        self.tags: List[str] = []
+        self.alive: List[bool] = []
+        self.grid: Dict[Cell, List[int]] = {}
+        self.pair_tests = 0
+        self._cw = 1.0
+        self._ch = 1.0
+        self._ncx = 0
+        self._ncy = 0
+        self._rmax = 0.0
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    # --- build -------------------------------------------------------------------
+
+    def rebuild(self, xs: Sequence[float], ys: Sequence[float], rs: Optional[Sequence[float]] = None,
+                tags: Optional[Sequence[str]] = None, alive: Optional[Sequence[bool]] = None) -> "BroadphaseV1":
+        n = len(xs)
+        self.xs = [float(v) for v in xs]
+        self.ys = [float(v) for v in ys]
+        self.rs = [float(v) for v in rs] if rs is not None else [0.0] * n
+        self.tags = [str(v) for v in tags] if tags is not None else [""] * n
+        self.alive = [bool(v) for v in alive] if alive is not None else [True] * n
+        # Non-finite positions never collide (every distance test against them is false),
+        # so they stay out of the grid; floor() cannot bucket them anyway.
+        isfinite = math.isfinite
+        xs_, ys_, alive_ = self.xs, self.ys, self.alive
+        for i in range(n):
+            if alive_[i] and not (isfinite(xs_[i]) and isfinite(ys_[i])):
+                alive_[i] = False
+        self._rmax = max((r for r, a in zip(self.rs, alive_) if a and isfinite(r)), default=0.0)
+        # Slightly over the largest diameter so default overlap reaches stay one cell.
+        cell = self.cell or 2.0 * self._rmax * 1.000001 or 1.0
+        if self.wrap:
+            w, h = self.bounds
+            self._ncx = max(1, int(w // cell)) if w > 0 else 1
+            self._ncy = max(1, int(h // cell)) if h > 0 else 1
+            self._cw = (w / self._ncx) if w > 0 else cell
+            self._ch = (h / self._ncy) if h > 0 else cell
+        else:
+            self._cw = self._ch = cell
+        grid: Dict[Cell, List[int]] = {}
+        for i in range(n):
+            if self.alive[i]:
+                grid.setdefault(self._cell(self.xs[i], self.ys[i]), []).append(i)
+        self.grid = grid
+        self.pair_tests = 0
+        return self
+
+    def rebuild_dicts(self, items: Sequence[Dict[str, Any]], **kw) -> "BroadphaseV1":
+        return self.rebuild(*arrays_from_dicts(items, **kw))
+
+    def _cell(self, x: float, y: float) -> Cell:
+        cx = int(math.floor(x / self._cw))
+        cy = int(math.floor(y / self._ch))
+        if self.wrap:
+            return cx % self._ncx, cy % self._ncy
+        return cx, cy
+
+    def _cells_around(self, x: float, y: float, d: float) -> Iterable[Cell]:
+        cx, cy = self._cell(x, y)
+        return self._cells_near(cx, cy, d)
+
+    def _cells_near(self, cx: int, cy: int, d: float) -> List[Cell]:
+        # +1e-9: a reach that is (within rounding) a whole number of cells gets one
+        # extra ring, so floor() rounding at cell edges can never drop a pair.
+        kx = int(math.ceil(d / self._cw + 1e-9)) if d > 0 else 0
+        ky = int(math.ceil(d / self._ch + 1e-9)) if d > 0 else 0
+        if not self.wrap:
+            return [(gx, gy) for gx in range(cx - kx, cx + kx + 1) for gy in range(cy - ky, cy + ky + 1)]
+        gxs = sorted({g % self._ncx for g in range(cx - kx, cx + kx + 1)})
+        gys = sorted({g % self._ncy for g in range(cy - ky, cy + ky + 1)})
+        return [(gx, gy) for gx in gxs for gy in gys]
+
+    def _delta(self, i: int, x: float, y: float) -> Tuple[float, float]:
+        dx = self.xs[i] - x
+        dy = self.ys[i] - y
+        if self.wrap:
+            w, h = self.bounds
+            if dx > w / 2: dx -= w
+            if dx < -w / 2: dx += w
+            if dy > h / 2: dy -= h
+            if dy < -h / 2: dy += h
+        return dx, dy
+
+    def _candidates(self, x: float, y: float, d: float) -> List[int]:
+        grid = self.grid
+        out: List[int] = []
+        for c in self._cells_around(x, y, d):
+            ids = grid.get(c)
+            if ids:
+                out.extend(ids)
+        return out
+
+    # --- queries -----------------------------------------------------------------
+
+    def query_circle(self, x: float, y: float, r: float = 0.0, *, tag: str = "") -> List[int]:
+        """Ascending indices whose circle overlaps the circle (x, y, r)."""
+        out: List[int] = []
+        if not (math.isfinite(x) and math.isfinite(y)):
+            return out
+        rs, tags = self.rs, self.tags
+        for j in self._candidates(x, y, float(r) + self._rmax):
+            if tag and tags[j] != tag:
+                continue
+            dx, dy = self._delta(j, x, y)
+            rr = r + rs[j]
+            if dx * dx + dy * dy <= rr * rr:
+                out.append(j)
+        out.sort()
+        return out
+
+    def _pairs(self, radius: Optional[float], tag_a: str, tag_b: str, count_only: bool):
+        xs, ys, rs, tags, grid = self.xs, self.ys, self.rs, self.tags, self.grid
+        filtered = bool(tag_a or tag_b)
+        sides = {tag_a, tag_b} if tag_b else None
+        fixed = radius is not None
+        lim2 = float(radius) * float(radius) if fixed else 0.0
+        reach = float(radius) if fixed else 2.0 * self._rmax
+        wrap = self.wrap
+        pairs: List[Tuple[int, int]] = []
+        count = 0
+        tests = 0
+        for key, members in grid.items():
+            # Neighbour candidates are gathered once per occupied cell.
+            cand: List[int] = []
+            for c in self._cells_near(key[0], key[1], reach):
+                ids = grid.get(c)
+                if ids:
+                    cand.extend(ids)
+            for i in members:
+                ti = tags[i]
+                if sides is not None and ti not in sides:
+                    continue  # with tag_b set, each side must carry tag_a or tag_b
+                xi, yi, ri = xs[i], ys[i], rs[i]
+                for j in cand:
+                    if j <= i:
+                        continue
+                    if filtered and not tags_match(ti, tags[j], tag_a, tag_b):
+                        continue
+                    tests += 1
+                    if wrap:
+                        dx, dy = self._delta(i, xs[j], ys[j])
+                    else:
+                        dx = xi - xs[j]
+                        dy = yi - ys[j]
+                    if fixed:
+                        ok = dx * dx + dy * dy <= lim2
+                    else:
+                        lim = ri + rs[j]
+                        ok = dx * dx + dy * dy <= lim * lim
+                    if ok:
+                        if count_only:
+                            count += 1
+                        else:
+                            pairs.append((i, j))
+        self.pair_tests += tests
+        if count_only:
+            return count
+        pairs.sort()
+        return pairs
+
+    def overlapping_pairs(self, tag_a: str = "", tag_b: str = "") -> List[Tuple[int, int]]:
+        """Pairs (i, j), i < j, whose circles overlap (d <= ri + rj), in brute-force order."""
+        return self._pairs(None, tag_a, tag_b, False)
+
+    def pairs_within(self, radius: float, tag_a: str = "", tag_b: str = "") -> List[Tuple[int, int]]:
+        """Pairs (i, j), i < j, whose centers are within `radius`, in brute-force order."""
+        return self._pairs(float(radius), tag_a, tag_b, False)
+
+    def count_within(self, radius: float, tag_a: str = "", tag_b: str = "") -> int:
+        """Exact number of center pairs within `radius`."""
+        if radius is None or float(radius) < 0.0:
+            return 0
+        return self._pairs(float(radius), tag_a, tag_b, True)
+
+
+class StaticObstacleIndexV1:
+    """Grid of circle/segment obstacle bounding boxes, built once for static scenes.
+
+    candidates(x, y) returns (circle indices, segment indices), ascending, for every
+    obstacle whose collision region can contain the point; obstacles outside the
+    returned lists cannot affect an entity at (x, y).
+    """
+
+    # Obstacles spanning more cells than this are checked everywhere instead.
+    MAX_CELLS_PER_OBSTACLE = 1024
+
+    def __init__(self, circles: Optional[Sequence[Any]] = None, segments: Optional[Sequence[Any]] = None,
+                 *, cell: Optional[float] = None):
+        self.circles = list(circles or ())
+        self.segments = list(segments or ())
+        boxes: List[Tuple[str, int, float, float, float, float]] = []
+        for k, c in enumerate(self.circles):
+            r = abs(float(c.r))
+            boxes.append(("c", k, c.x - r, c.y - r, c.x + r, c.y + r))
+        t = SEGMENT_THICKNESS
+        for k, s in enumerate(self.segments):
+            boxes.append(("s", k, min(s.x0, s.x1) - t, min(s.y0, s.y1) - t, max(s.x0, s.x1) + t, max(s.y0, s.y1) + t))
+        if cell:
+            self.cell = float(cell)
+        elif boxes:
+            sizes = sorted(max(b[4] - b[2], b[5] - b[3]) for b in boxes)
+            self.cell = max(sizes[len(sizes) // 2], 1e-3)
+        else:
+            self.cell = 1.0
+        self._c: Dict[Cell, List[int]] = {}
+        self._s: Dict[Cell, List[int]] = {}
+        self._big_c: List[int] = []
+        self._big_s: List[int] = []
+        cs = self.cell
+        for kind, k, x0, y0, x1, y1 in boxes:
+            dst = self._c if kind == "c" else self._s
+            pad = 1e-9 * (1.0 + max(abs(x0), abs(y0), abs(x1), abs(y1)))
+            try:
+                gx0, gx1 = int(math.floor((x0 - pad) / cs)), int(math.floor((x1 + pad) / cs))
+                gy0, gy1 = int(math.floor((y0 - pad) / cs)), int(math.floor((y1 + pad) / cs))
+            except (ValueError, OverflowError):
+                gx0, gx1, gy0, gy1 = 0, self.MAX_CELLS_PER_OBSTACLE, 0, self.MAX_CELLS_PER_OBSTACLE
+            if (gx1 - gx0 + 1) * (gy1 - gy0 + 1) > self.MAX_CELLS_PER_OBSTACLE:
+                (self._big_c if kind == "c" else self._big_s).append(k)
+                continue
+            for gx in range(gx0, gx1 + 1):
+                for gy in range(gy0, gy1 + 1):
+                    dst.setdefault((gx, gy), []).append(k)
+
+    def candidates(self, x: float, y: float) -> Tuple[List[int], List[int]]:
+        try:
+            key = (int(math.floor(x / self.cell)), int(math.floor(y / self.cell)))
+        except (ValueError, OverflowError):
+            return list(range(len(self.circles))), list(range(len(self.segments)))
+        cs, ss = self._c.get(key, []), self._s.get(key, [])
+        if self._big_c:
+            cs = sorted(cs + self._big_c)
+        if self._big_s:
+            ss = sorted(ss + self._big_s)
+        return cs, ss
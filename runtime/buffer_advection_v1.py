@@ -50,21 +50,36 @@ def _sample_scalar_bilinear(buf: ScalarBufferV1, fx: float, fy: float, wrap: boo
     return a * (1.0 - ty) + b * ty
 
 
+def _cell_center_velocities(field: VectorField, w: int, h: int) -> Tuple[list, list]:
+    """Field at every cell center (x + 0.5, y + 0.5), t=0, as (vx rows, vy rows).
+
+    The field is time-invariant within a call, so this runs once (not once per step),
+    through the field's batched sample_grid() when it has one (baked / curl-noise fields).
+    """
+    xs = [x + 0.5 for x in range(w)]
+    ys = [y + 0.5 for y in range(h)]
+    fn = getattr(field, "sample_grid", None)
+    if callable(fn):
+        return fn(xs, ys, 0.0)
+    return VectorField.sample_grid(field, xs, ys, 0.0)
+
+
 def advect_scalar_buffer_v1(buf: ScalarBufferV1, field: VectorField, cfg: AdvectionConfigV1) -> None:
     """Advect a scalar buffer through a vector field using semi-Lagrangian backtracing."""
 
     steps = max(1, int(cfg.steps))
     dt = float(cfg.dt) / steps
 
+    gvx, gvy = _cell_center_velocities(field, buf.w, buf.h)
     for _ in range(steps):
         src = buf.data
         dst = [0.0] * (buf.w * buf.h)
         for y in range(buf.h):
             for x in range(buf.w):
-                # sample field at cell center
+                # field at cell center
                 fx = x + 0.5
                 fy = y + 0.5
-                vx, vy = field.sample(fx, fy, 0.0)
+                vx, vy = gvx[y][x], gvy[y][x]
 
                 # backtrace
                 bx = fx - vx * dt
@@ -114,6 +129,7 @@ def advect_vector_buffer_v1(buf: VectorBufferV1, field: VectorField, cfg: Advect
         return (ax * (1.0 - ty) + bx * ty,
                 ay * (1.0 - ty) + byy * ty)
 
+    gvx, gvy = _cell_center_velocities(field, buf.w, buf.h)
     for _ in range(steps):
         dstx = [0.0] * (buf.w * buf.h)
         dsty = [0.0] * (buf.w * buf.h)
@@ -121,7 +137,7 @@ def advect_vector_buffer_v1(buf: VectorBufferV1, field: VectorField, cfg: Advect
             for x in range(buf.w):
                 fx = x + 0.5
                 fy = y + 0.5
-                vx, vy = field.sample(fx, fy, 0.0)
+                vx, vy = gvx[y][x], gvy[y][x]
                 bx = fx - vx * dt
                 by = fy - vy * dt
                 svx, svy = sample_vec_bilinear(bx - 0.5, by - 0.5)
@@ -17,6 +17,8 @@ from dataclasses import dataclass
 from typing import Iterable, List, Optional, Sequence, Tuple, Protocol, Any
 import math
 
+from .broadphase_v1 import StaticObstacleIndexV1
+
 
 @dataclass
 class BoundsConfigV1:
@@ -184,6 +186,33 @@ def _collide_tilemask(ent: _Entity, tile: TileMaskObstacleV1) -> None:
     ent.vy *= -tile.bounce
 
 
+def _collide_indexed(ent: _Entity, items: Sequence[Any], index: StaticObstacleIndexV1, fn, which: int) -> None:
+    # Same obstacle order as the full scan; candidates are re-queried whenever a
+    # push moves the entity, so skipped obstacles are exactly the no-op ones.
+    pos = (ent.x, ent.y)
+    cand = index.candidates(ent.x, ent.y)[which]
+    i = 0
+    while i < len(cand):
+        k = cand[i]
+        fn(ent, items[k])
+        if (ent.x, ent.y) != pos:
+            pos = (ent.x, ent.y)
+            cand = [j for j in index.candidates(ent.x, ent.y)[which] if j > k]
+            i = 0
+        else:
+            i += 1
+
+
+def build_obstacle_index(
+    circles: Optional[Sequence[CircleObstacleV1]] = None,
+    segments: Optional[Sequence[SegmentObstacleV1]] = None,
+    *,
+    cell: Optional[float] = None,
+) -> StaticObstacleIndexV1:
+    """Index static circle/segment obstacles once; pass as apply_constraints(index=...)."""
+    return StaticObstacleIndexV1(circles, segments, cell=cell)
+
+
 def apply_constraints(
     entities: Iterable[_Entity],
     *,
@@ -193,10 +222,15 @@ def apply_constraints(
     circles: Optional[Sequence[CircleObstacleV1]] = None,
     segments: Optional[Sequence[SegmentObstacleV1]] = None,
     tilemask: Optional[TileMaskObstacleV1] = None,
+    index: Optional[StaticObstacleIndexV1] = None,
 ) -> None:
     """Apply constraints in-place to entities.
 
     This is intentionally order-stable and deterministic.
+
+    index: a build_obstacle_index() result for static scenes; its circles/segments
+    replace the `circles`/`segments` arguments and each entity is only tested
+    against obstacles near it (same results as the full scan).
     """
     bcfg = bounds or BoundsConfigV1(mode="none")
     circles = circles or ()
@@ -204,9 +238,15 @@ def apply_constraints(
 
     for ent in entities:
         _apply_bounds(ent, width, height, bcfg)
-        for c in circles:
-            _collide_circle(ent, c)
-        for s in segments:
-            _collide_segment(ent, s)
+        if index is not None:
+            if index.circles:
+                _collide_indexed(ent, index.circles, index, _collide_circle, 0)
+            if index.segments:
+                _collide_indexed(ent, index.segments, index, _collide_segment, 1)
+        else:
+            for c in circles:
+                _collide_circle(ent, c)
+            for s in segments:
+                _collide_segment(ent, s)
         if tilemask is not None:
             _collide_tilemask(ent, tilemask)
@@ -4,6 +4,8 @@ from typing import List, Tuple
 import math
 import random
 
+from .broadphase_v1 import BroadphaseV1, arrays_from_objects
+
 @dataclass
 class Entity:
     kind: str
@@ -49,6 +51,15 @@ def collide(a: Entity, b: Entity, bounds: Tuple[float,float]=(1.0,1.0), wrap: bo
     rr = a.r + b.r
     return (dx*dx + dy*dy) <= rr*rr
 
+def collide_pairs(ents: List[Entity], bounds: Tuple[float,float]=(1.0,1.0), wrap: bool=True,
+                  kind_a: str="", kind_b: str="") -> List[Tuple[int,int]]:
+    """All (i, j), i < j, with collide(ents[i], ents[j]) true, via a grid broadphase.
+
+    kind_a/kind_b filter pairs like state_runtime.find_collisions tags.
+    """
+    bp = BroadphaseV1(bounds=bounds, wrap=wrap).rebuild(*arrays_from_objects(ents))
+    return bp.overlapping_pairs(kind_a, kind_b)
+
 def prune(ents: List[Entity]) -> List[Entity]:
     return [e for e in ents if e.alive]
 
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+"""Baked vector fields v1 (engine primitive).
+
+Particles, advected buffers and agents used to call VectorField.sample() once per
+query, so field cost grew with particle/cell count (curl noise: four fbm passes per
+query). BakedFieldV1 rasterizes one or more fields onto a node grid in layout space
+and answers queries by bilinear interpolation over the baked grid:
+
+- bake(t) rasterizes via each field's sample_grid() (CurlNoiseField: one analytic
+  curl_grid pass), summing the fields. Composition is just a list of fields.
+- A bake is reused while no field is time dependent (or t is unchanged) and every
+  field's config is unchanged, so static fields bake once. With cfg.bake_hz > 0,
+  animated fields bake at t quantized to 1/bake_hz instead of every query time.
+- bake_for_layout() covers a w×h layout; bake_for_bounds() covers arbitrary
+  (x0, y0, x1, y1) bounds with a node-count cap.
+- sample_many(xs, ys, t) returns (vxs, vys) for whole coordinate arrays; sample()
+  keeps the VectorField interface. Queries outside the grid clamp to the edge.
+
+Interpolation is an approximation of the analytic field between nodes (exact at the
+nodes); pick the node spacing (`cell`) at layout resolution or finer. Singular fields
+(radial/vortex centers) are smoothed to the node spacing.
+"""
+
+import math
+from dataclasses import astuple, dataclass, is_dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .vector_fields_v1 import VectorField
+
+
+@dataclass
+class FieldGridConfigV1:
+    w: int = 16          # nodes along x
+    h: int = 16          # nodes along y
+    x0: float = 0.0      # layout-space position of node (0, 0)
+    y0: float = 0.0
+    cell: float = 1.0    # node spacing in layout units
+    bake_hz: float = 0.0  # >0: time-dependent fields bake at t quantized to 1/bake_hz
+
+
+def _field_signature(f: Any) -> Any:
+    cfg = getattr(f, "cfg", None)
+    if is_dataclass(cfg):
+        try:
+            return (type(f).__name__, astuple(cfg))
+        except Exception:
+            pass
+    return (type(f).__name__, id(f))
+
+
+class BakedFieldV1(VectorField):
+    """Sum of `fields` baked onto a FieldGridConfigV1 grid."""
+
+    def __init__(self, fields: Sequence[VectorField] | VectorField, cfg: FieldGridConfigV1 | None = None):
+        self.fields: List[VectorField] = list(fields) if isinstance(fields, (list, tuple)) else [fields]
+        self.cfg = cfg or FieldGridConfigV1()
+        self.vx: List[float] = []
+        self.vy: List[float] = []
+        self.bakes = 0
+        self._key: Optional[Tuple[Any, ...]] = None
+
+    @property
+    def time_dependent(self) -> bool:
+        return any(getattr(f, "time_dependent", True) for f in self.fields)
+
+    def _bake_time(self, t: float) -> float:
+        hz = self.cfg.bake_hz
+        return math.floor(float(t) * hz) / hz if hz > 0.0 else float(t)
+
+    def _bake_key(self, t: float) -> Tuple[Any, ...]:
+        c = self.cfg
+        tk = self._bake_time(t) if self.time_dependent else None
+        return (tk, c.w, c.h, c.x0, c.y0, c.cell, c.bake_hz, tuple(_field_signature(f) for f in self.fields))
+
+    def node_coords(self) -> Tuple[List[float], List[float]]:
+        c = self.cfg
+        xs = [c.x0 + i * c.cell for i in range(max(1, int(c.w)))]
+        ys = [c.y0 + j * c.cell for j in range(max(1, int(c.h)))]
+        return xs, ys
+
+    def bake(self, t: float = 0.0) -> "BakedFieldV1":
+        """Rasterize the summed fields at time t (no-op when the last bake still applies)."""
+        key = self._bake_key(t)
+        if key == self._key:
+            return self
+        t = self._bake_time(t)
+        xs, ys = self.node_coords()
+        n = len(xs) * len(ys)
+        vx = [0.0] * n
+        vy = [0.0] * n
+        for f in self.fields:
+            gx, gy = _sample_grid(f, xs, ys, t)
+            k = 0
+            for rx, ry in zip(gx, gy):
+                for a, b in zip(rx, ry):
+                    vx[k] += a
+                    vy[k] += b
+                    k += 1
+        self.vx, self.vy = vx, vy
+        self._key = key
+        self.bakes += 1
+        return self
+
+    def invalidate(self) -> None:
+        """Force the next query to re-bake (for fields reading state outside their cfg)."""
+        self._key = None
+
+    def sample_many(self, xs: Sequence[float], ys: Sequence[float], t: float = 0.0) -> Tuple[List[float], List[float]]:
+        """Bilinear field values at the points (xs[i], ys[i])."""
+        self.bake(t)
+        c = self.cfg
+        w = max(1, int(c.w))
+        h = max(1, int(c.h))
+        inv = 1.0 / c.cell if c.cell else 0.0
+        gvx, gvy = self.vx, self.vy
+        out_x: List[float] = []
+        out_y: List[float] = []
+        wmax = float(w - 1)
+        hmax = float(h - 1)
+        for x, y in zip(xs, ys):
+            fx = (x - c.x0) * inv
+            fy = (y - c.y0) * inv
+            fx = 0.0 if fx < 0.0 else (wmax if fx > wmax else fx)
+            fy = 0.0 if fy < 0.0 else (hmax if fy > hmax else fy)
+            ix = int(fx)
+            iy = int(fy)
+            tx = fx - ix
+            ty = fy - iy
+            ix1 = ix + 1 if ix + 1 < w else ix
+            iy1 = iy + 1 if iy + 1 < h else iy
+            i00 = iy * w + ix
+            i10 = iy * w + ix1
+            i01 = iy1 * w + ix
+            i11 = iy1 * w + ix1
+            ax = gvx[i00] + (gvx[i10] - gvx[i00]) * tx
+            bx = gvx[i01] + (gvx[i11] - gvx[i01]) * tx
+            ay = gvy[i00] + (gvy[i10] - gvy[i00]) * tx
+            by = gvy[i01] + (gvy[i11] - gvy[i01]) * tx
+            out_x.append(ax + (bx - ax) * ty)
+            out_y.append(ay + (by - ay) * ty)
+        return out_x, out_y
+
+    def sample(self, x: float, y: float, t: float = 0.0) -> tuple[float, float]:
+        vx, vy = self.sample_many((x,), (y,), t)
+        return vx[0], vy[0]
+
+    def sample_grid(self, xs: Sequence[float], ys: Sequence[float], t: float = 0.0):
+        rows_x: List[List[float]] = []
+        rows_y: List[List[float]] = []
+        for y in ys:
+            vx, vy = self.sample_many(xs, [y] * len(xs), t)
+            rows_x.append(vx)
+            rows_y.append(vy)
+        return rows_x, rows_y
+
+
+def _sample_grid(f: Any, xs: Sequence[float], ys: Sequence[float], t: float):
+    fn = getattr(f, "sample_grid", None)
+    if callable(fn):
+        return fn(xs, ys, t)
+    return VectorField.sample_grid(f, xs, ys, t)
+
+
+def sample_field_many(field: Any, xs: Sequence[float], ys: Sequence[float], t: float = 0.0) -> Tuple[List[float], List[float]]:
+    """Field values at points: batched for baked fields, per point for any other
+    sample(x, y, t) object."""
+    fn = getattr(field, "sample_many", None)
+    if callable(fn):
+        return fn(xs, ys, t)
+    out_x: List[float] = []
+    out_y: List[float] = []
+    for x, y in zip(xs, ys):
+        vx, vy = field.sample(x, y, t)
+        out_x.append(vx)
+        out_y.append(vy)
+    return out_x, out_y
+
+
+def bake_for_layout(fields: Sequence[VectorField] | VectorField, w: int, h: int, *, oversample: int = 1) -> BakedFieldV1:
+    """BakedFieldV1 covering a w×h layout (cell centers at i + 0.5), `oversample`
+    nodes per layout cell."""
+    k = max(1, int(oversample))
+    cell = 1.0 / k
+    return BakedFieldV1(fields, FieldGridConfigV1(w=max(1, int(w)) * k + 1, h=max(1, int(h)) * k + 1,
+                                                  x0=0.0, y0=0.0, cell=cell))
+
+
+def bake_for_bounds(fields: Sequence[VectorField] | VectorField, bounds: Sequence[float], *, cell: float = 1.0,
+                    max_nodes: int = 4096, bake_hz: float = 0.0) -> BakedFieldV1:
+    """BakedFieldV1 covering bounds (x0, y0, x1, y1) at node spacing `cell`, widened as
+    needed to keep the grid within `max_nodes`."""
+    x0, y0, x1, y1 = (float(v) for v in bounds)
+    sx = max(0.0, x1 - x0)
+    sy = max(0.0, y1 - y0)
+    cell = float(cell) if cell and cell > 0.0 else 1.0
+    cap = max(4, int(max_nodes))
+    while True:
+        w = int(math.ceil(sx / cell)) + 1
+        h = int(math.ceil(sy / cell)) + 1
+        if w * h <= cap:
+            break
+        cell *= max(1.01, math.sqrt(w * h / cap))
+    return BakedFieldV1(fields, FieldGridConfigV1(w=w, h=h, x0=x0, y0=y0, cell=cell, bake_hz=float(bake_hz)))
+
@@ -8,10 +8,11 @@ This is NOT an effect.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 import math
 
 from .buffers_v1 import ScalarBufferV1
+from .long_memory_v1 import half_life_factor
 
 
 @dataclass
@@ -34,6 +35,47 @@ def _weight(dist: float, radius: float, falloff: str) -> float:
     return math.exp(- (dist * dist) / (2.0 * sigma * sigma))
 
 
+# Deposit stamps keyed on (radius, falloff, sub-cell offset); lattice points share one.
+_STAMPS: Dict[Tuple[float, str, float, float], List[Tuple[int, int, float]]] = {}
+_STAMPS_MAX = 4096
+
+
+def _deposit_stamp(r: float, falloff: str, fx: float, fy: float) -> List[Tuple[int, int, float]]:
+    """[(ox, oy, weight)] for a point at sub-cell offset (fx, fy) from its rounded cell.
+
+    ox - fx equals px - (cx + ox) exactly (fx = px - cx is exact), so weights match
+    the per-point evaluation bit for bit.
+    """
+    key = (r, falloff, fx, fy)
+    st = _STAMPS.get(key)
+    if st is not None:
+        return st
+    o0 = int(math.floor(-r))
+    o1 = int(math.ceil(r))
+    st = []
+    for oy in range(o0, o1 + 1):
+        for ox in range(o0, o1 + 1):
+            wt = _weight(math.hypot(fx - ox, fy - oy), r, falloff)
+            if wt > 0.0:
+                st.append((ox, oy, wt))
+    if len(_STAMPS) >= _STAMPS_MAX:
+        _STAMPS.clear()
+    _STAMPS[key] = st
+    return st
+
+
+def _clamp_data(data: List[float], mn: Optional[float], mx: Optional[float]) -> None:
+    if mn is None and mx is None:
+        return
+    if mn is None:
+        mn = -1e9
+    if mx is None:
+        mx = 1e9
+    mn = float(mn)
+    mx = float(mx)
+    data[:] = [mn if v < mn else mx if v > mx else v for v in data]
+
+
 def deposit_points_scalar_v1(buf: ScalarBufferV1,
                              points_xy: Iterable[Tuple[float, float]],
                              cfg: Optional[DepositConfigV1] = None) -> None:
@@ -41,6 +83,9 @@ def deposit_points_scalar_v1(buf: ScalarBufferV1,
     Deposit scalar influence into a ScalarBufferV1 from point samples.
 
     points_xy are in buffer grid coords: x in [0,w), y in [0,h)
+
+    All points go through cached falloff stamps straight into buf.data, then the
+    buffer is clamped in one pass.
     """
     if cfg is None:
         cfg = DepositConfigV1()
@@ -50,42 +95,30 @@ def deposit_points_scalar_v1(buf: ScalarBufferV1,
         return
 
     w, h = buf.w, buf.h
-    ox0 = int(math.floor(-r))
-    ox1 = int(math.ceil(r))
+    data = buf.data
+    amount = cfg.amount
+    falloff = cfg.falloff
 
     for (px, py) in points_xy:
         cx = int(round(px))
         cy = int(round(py))
-        for oy in range(ox0, ox1 + 1):
+        for ox, oy, wt in _deposit_stamp(r, falloff, px - cx, py - cy):
             yy = cy + oy
-            if yy < 0 or yy >= h:
+            xx = cx + ox
+            if yy < 0 or yy >= h or xx < 0 or xx >= w:
                 continue
-            for ox in range(ox0, ox1 + 1):
-                xx = cx + ox
-                if xx < 0 or xx >= w:
-                    continue
-                d = math.hypot((px - xx), (py - yy))
-                wt = _weight(d, r, cfg.falloff)
-                if wt <= 0.0:
-                    continue
-                buf.set(xx, yy, buf.get(xx, yy) + cfg.amount * wt)
-
-    # clamp (in-place)
-    mn = cfg.clamp_min
-    mx = cfg.clamp_max
-    if mn is None and mx is None:
+            i = yy * w + xx
+            data[i] = float(data[i] + amount * wt)
+
+    _clamp_data(data, cfg.clamp_min, cfg.clamp_max)
+
+
+def decay_scalar_v1(buf: ScalarBufferV1, dt: float, half_life_s: float) -> None:
+    """Exponential decay by half-life, one multiply over the whole buffer."""
+    if dt <= 0 or half_life_s <= 0:
         return
-    if mn is None:
-        mn = -1e9
-    if mx is None:
-        mx = 1e9
-    for y in range(h):
-        for x in range(w):
-            v = buf.get(x, y)
-            if v < mn:
-                buf.set(x, y, mn)
-            elif v > mx:
-                buf.set(x, y, mx)
+    f = half_life_factor(dt, half_life_s)
+    buf.data[:] = [v * f for v in buf.data]
 
 
 @dataclass
@@ -94,6 +127,48 @@ class SenseConfigV1:
     eps: float = 1e-6
 
 
+def _bilinear(data: List[float], w: int, h: int, fx: float, fy: float) -> float:
+    # Same as ScalarBufferV1 bilinear sampling: out-of-bounds taps read 0.0.
+    x0 = int(math.floor(fx))
+    y0 = int(math.floor(fy))
+    sx = fx - x0
+    sy = fy - y0
+    in_x0 = 0 <= x0 < w
+    in_x1 = 0 <= x0 + 1 < w
+    v00 = v10 = v01 = v11 = 0.0
+    if 0 <= y0 < h:
+        row = y0 * w
+        if in_x0: v00 = data[row + x0]
+        if in_x1: v10 = data[row + x0 + 1]
+    if 0 <= y0 + 1 < h:
+        row = (y0 + 1) * w
+        if in_x0: v01 = data[row + x0]
+        if in_x1: v11 = data[row + x0 + 1]
+    vx0 = v00 * (1.0 - sx) + v10 * sx
+    vx1 = v01 * (1.0 - sx) + v11 * sx
+    return vx0 * (1.0 - sy) + vx1 * sy
+
+
+def sense_gradients_scalar_v1(buf: ScalarBufferV1,
+                              xs: Sequence[float],
+                              ys: Sequence[float],
+                              cfg: Optional[SenseConfigV1] = None) -> Tuple[List[float], List[float]]:
+    """
+    Central-difference gradients for many points at once: ([dx...], [dy...]).
+    """
+    if cfg is None:
+        cfg = SenseConfigV1()
+    r = max(cfg.eps, float(cfg.sample_radius))
+    inv = 2.0 * r
+    data, w, h = buf.data, buf.w, buf.h
+    gx: List[float] = []
+    gy: List[float] = []
+    for x, y in zip(xs, ys):
+        gx.append((_bilinear(data, w, h, x + r, y) - _bilinear(data, w, h, x - r, y)) / inv)
+        gy.append((_bilinear(data, w, h, x, y + r) - _bilinear(data, w, h, x, y - r)) / inv)
+    return gx, gy
+
+
 def sense_gradient_scalar_v1(buf: ScalarBufferV1,
                              x: float,
                              y: float,
@@ -101,16 +176,8 @@ def sense_gradient_scalar_v1(buf: ScalarBufferV1,
     """
     Approx gradient via central differences using bilinear sampling.
     """
-    if cfg is None:
-        cfg = SenseConfigV1()
-    r = max(cfg.eps, float(cfg.sample_radius))
-    vxp = buf.sample_bilinear(x + r, y)
-    vxm = buf.sample_bilinear(x - r, y)
-    vyp = buf.sample_bilinear(x, y + r)
-    vym = buf.sample_bilinear(x, y - r)
-    dx = (vxp - vxm) / (2.0 * r)
-    dy = (vyp - vym) / (2.0 * r)
-    return dx, dy
+    gx, gy = sense_gradients_scalar_v1(buf, (x,), (y,), cfg)
+    return gx[0], gy[0]
 
 
 def steer_follow_gradient_v1(vx: float,
@@ -0,0 +1,367 @@
+from __future__ import annotations
+"""Per-layout geometry index (v1).
+
+A LayoutGeometry is built once per layout signature and shared by everything that
+needs LED positions:
+
+  - xs / ys: layout-space coordinates per LED index (coords, matrix cells, or strip x=i)
+  - nx / ny: the same normalized to 0..1 over the layout bounds
+  - wiring tables for matrix mapping (serpentine / flip / rotate, preview.mapping.xy_index):
+    led_of_xy[y*lw+x] -> LED index and xy_of_led[i] -> (x, y)
+  - neighbors(radius): postfx bleed neighbor lists (manhattan shell, cached per radius)
+  - nearest(x, y) / within_radius(x, y, r): uniform-grid spatial index, O(1) average
+    for free-form coordinate layouts instead of a scan over every LED
+
+Results are identical to the linear scans they replace (lowest index wins on ties).
+PreviewEngine passes the geometry to behaviors as layout["geometry"].
+"""
+
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import copy
+import hashlib
+import math
+import threading
+
+
+def _lg(obj: Any, key: str, default: Any = None) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(key, default)
+    return getattr(obj, key, default)
+
+
+def _xy_or_none(c: Any) -> Optional[Tuple[float, float]]:
+    try:
+        x, y = float(c[0]), float(c[1])
+    except Exception:
+        return None
+    # Non-finite points can never win a nearest-distance comparison; keep them out of the index.
+    return (x, y) if math.isfinite(x) and math.isfinite(y) else None
+
+
+class LayoutGeometry:
+    """Immutable geometry for one layout signature (see geometry_for_layout)."""
+
+    def __init__(self, *, shape: str, points: Sequence[Optional[Tuple[float, float]]],
+                 mw: int = 0, mh: int = 0, int_coords: Optional[Sequence[Any]] = None,
+                 mapping: Optional[Tuple[bool, bool, bool, int]] = None, signature: Any = None):
+        self.shape = str(shape or "strip")
+        self.signature = signature
+        self.n = len(points)
+        self.mw = int(mw)
+        self.mh = int(mh)
+        self.valid: List[bool] = [p is not None for p in points]
+        self.n_valid = sum(self.valid)
+        # Parseable-but-NaN coords: a linear `d2 > r2` scan never rejects them (see within_radius).
+        self._nan_idx: List[int] = []
+        if int_coords is not None:
+            for i, p in enumerate(points):
+                if p is None:
+                    try:
+                        if math.isnan(float(int_coords[i][0])) or math.isnan(float(int_coords[i][1])):
+                            self._nan_idx.append(i)
+                    except Exception:
+                        pass
+        self.xs: List[float] = [p[0] if p is not None else 0.0 for p in points]
+        self.ys: List[float] = [p[1] if p is not None else 0.0 for p in points]
+
+        vx = [x for x, ok in zip(self.xs, self.valid) if ok]
+        vy = [y for y, ok in zip(self.ys, self.valid) if ok]
+        if vx:
+            self.bounds = (min(vx), min(vy), max(vx), max(vy))
+        else:
+            self.bounds = (0.0, 0.0, 0.0, 0.0)
+        x0, y0, x1, y1 = self.bounds
+        sx = (x1 - x0) or 1.0
+        sy = (y1 - y0) or 1.0
+        self.nx: List[float] = [(x - x0) / sx for x in self.xs]
+        self.ny: List[float] = [(y - y0) / sy for y in self.ys]
+
+        self._int_coords = int_coords
+        self._mapping = mapping
+        self._wiring: Optional[Tuple[List[int], List[Tuple[int, int]], int, int]] = None
+        self._neighbors: Dict[int, List[List[int]]] = {}
+        self._grid: Optional[Tuple[float, int, int, Dict[int, List[int]]]] = None
+        self._lock = threading.Lock()
+
+    # ---- index <-> xy (matrix wiring) -----------------------------------------------
+    def _wiring_tables(self):
+        if self._wiring is None:
+            from preview.mapping import MatrixMapping, logical_dims, xy_index
+            serp, fx, fy, rot = self._mapping or (False, False, False, 0)
+            m = MatrixMapping(w=max(1, self.mw), h=max(1, self.mh), serpentine=serp, flip_x=fx, flip_y=fy, rotate=rot)
+            lw, lh = logical_dims(m)
+            led_of_xy = [0] * (lw * lh)
+            xy_of_led: List[Tuple[int, int]] = [(-1, -1)] * (lw * lh)
+            for y in range(lh):
+                for x in range(lw):
+                    idx = xy_index(m, x, y)
+                    led_of_xy[y * lw + x] = idx
+                    if 0 <= idx < len(xy_of_led) and xy_of_led[idx] == (-1, -1):
+                        xy_of_led[idx] = (x, y)
+            self._wiring = (led_of_xy, xy_of_led, lw, lh)
+        return self._wiring
+
+    @property
+    def logical_dims(self) -> Tuple[int, int]:
+        w = self._wiring_tables()
+        return w[2], w[3]
+
+    def led_of_xy(self, x: int, y: int) -> int:
+        """Wired LED index for logical (x, y); same result as preview.mapping.xy_index."""
+        led_of_xy, _, lw, lh = self._wiring_tables()
+        x, y = int(x), int(y)
+        if 0 <= x < lw and 0 <= y < lh:
+            return led_of_xy[y * lw + x]
+        from preview.mapping import MatrixMapping, xy_index
+        serp, fx, fy, rot = self._mapping or (False, False, False, 0)
+        return xy_index(MatrixMapping(w=max(1, self.mw), h=max(1, self.mh), serpentine=serp,
+                                      flip_x=fx, flip_y=fy, rotate=rot), x, y)
+
+    def xy_of_led(self, i: int) -> Optional[Tuple[int, int]]:
+        """Logical (x, y) of wired LED index i, or None when no cell maps to it."""
+        _, xy_of_led, _, _ = self._wiring_tables()
+        if 0 <= int(i) < len(xy_of_led) and xy_of_led[int(i)] != (-1, -1):
+            return xy_of_led[int(i)]
+        return None
+
+    # ---- neighbors ------------------------------------------------------------------
+    def neighbors(self, radius: int = 1) -> List[List[int]]:
+        """neighbors[i]: i itself then the cells within manhattan `radius` (postfx bleed order).
+
+        The returned lists are shared; treat them as read-only.
+        """
+        r = max(1, int(radius or 1))
+        got = self._neighbors.get(r)
+        if got is not None:
+            return got
+        ints: List[Optional[Tuple[int, int]]] = []
+        src = self._int_coords
+        for i in range(self.n):
+            try:
+                c = src[i] if src is not None else (self.xs[i], self.ys[i])
+                ints.append((int(c[0]), int(c[1])))
+            except Exception:
+                ints.append(None)
+        pos_to_idx: Dict[Tuple[int, int], int] = {}
+        for i, p in enumerate(ints):
+            if p is not None:
+                pos_to_idx[p] = i
+        offsets = [(dx, dy) for dx in range(-r, r + 1) for dy in range(-r, r + 1)
+                   if not (dx == 0 and dy == 0) and abs(dx) + abs(dy) <= r]
+        out: List[List[int]] = []
+        for i, p in enumerate(ints):
+            inds = [i]
+            if p is not None:
+                x, y = p
+                for dx, dy in offsets:
+                    j = pos_to_idx.get((x + dx, y + dy))
+                    if j is not None:
+                        inds.append(j)
+            out.append(inds)
+        self._neighbors[r] = out
+        return out
+
+    # ---- uniform grid spatial index -------------------------------------------------
+    def _spatial_grid(self):
+        if self._grid is None:
+            with self._lock:
+                if self._grid is None:
+                    x0, y0, x1, y1 = self.bounds
+                    wx, wy = x1 - x0, y1 - y0
+                    n = max(1, self.n_valid)
+                    # ~1-2 points per cell; degenerate (line / point) layouts fall back to span / n.
+                    s = max(math.sqrt(wx * wy / n), max(wx, wy) / n)
+                    if not (s > 0.0):
+                        s = 1.0
+                    gw = int(wx / s) + 1
+                    gh = int(wy / s) + 1
+                    cells: Dict[int, List[int]] = {}
+                    for i in range(self.n):
+                        if not self.valid[i]:
+                            continue
+                        cx = min(gw - 1, int((self.xs[i] - x0) / s))
+                        cy = min(gh - 1, int((self.ys[i] - y0) / s))
+                        cells.setdefault(cy * gw + cx, []).append(i)
+                    self._grid = (s, gw, gh, cells)
+        return self._grid
+
+    def nearest(self, x: float, y: float) -> int:
+        """Index of the LED closest to (x, y); lowest index on ties, 0 when there are no points."""
+        if not self.n_valid:
+            return 0
+        x = float(x)
+        y = float(y)
+        if not (math.isfinite(x) and math.isfinite(y)):
+            return 0  # no finite distance compares below the scan's initial bound
+        s, gw, gh, cells = self._spatial_grid()
+        x0, y0 = self.bounds[0], self.bounds[1]
+        fx = (x - x0) / s
+        fy = (y - y0) / s
+        cx = min(gw - 1, max(0, int(math.floor(fx))))
+        cy = min(gh - 1, max(0, int(math.floor(fy))))
+        xs, ys = self.xs, self.ys
+        best_i = -1
+        best_d2 = 0.0
+        r = 0
+        max_r = max(gw, gh)
+        while r <= max_r:
+            for gy in range(cy - r, cy + r + 1):
+                if gy < 0 or gy >= gh:
+                    continue
+                edge_row = gy == cy - r or gy == cy + r
+                step = 1 if edge_row else 2 * r
+                for gx in range(cx - r, cx + r + 1, max(1, step)):
+                    if gx < 0 or gx >= gw:
+                        continue
+                    for i in cells.get(gy * gw + gx, ()):
+                        dx = xs[i] - x
+                        dy = ys[i] - y
+                        d2 = dx * dx + dy * dy
+                        if best_i < 0 or d2 < best_d2 or (d2 == best_d2 and i < best_i):
+                            best_i, best_d2 = i, d2
+            if best_i >= 0:
+                # Distance from (x, y) to the outside of the explored (2r+1)^2 block of cells.
+                margin = min(fx - (cx - r), (cx + r + 1) - fx, fy - (cy - r), (cy + r + 1) - fy) * s
+                if margin > 0.0 and best_d2 < margin * margin:
+                    break
+            r += 1
+        return best_i
+
+    def within_radius(self, x: float, y: float, radius: float) -> List[int]:
+        """Ascending indices of LEDs with squared distance <= radius^2 from (x, y)."""
+        r2 = float(radius) * float(radius)
+        r = abs(float(radius))
+        x = float(x)
+        y = float(y)
+        if not (math.isfinite(x) and math.isfinite(y)):
+            # NaN distances never fail a `d2 > r2` test; infinite ones always do.
+            if math.isnan(x) or math.isnan(y):
+                return sorted([i for i in range(self.n) if self.valid[i]] + self._nan_idx)
+            return list(self._nan_idx)
+        if not self.n_valid:
+            return list(self._nan_idx)
+        s, gw, gh, cells = self._spatial_grid()
+        x0, y0 = self.bounds[0], self.bounds[1]
+        gx0 = max(0, int(math.floor((x - r - x0) / s)))
+        gx1 = min(gw - 1, int(math.floor((x + r - x0) / s)))
+        gy0 = max(0, int(math.floor((y - r - y0) / s)))
+        gy1 = min(gh - 1, int(math.floor((y + r - y0) / s)))
+        xs, ys = self.xs, self.ys
+        out: List[int] = []
+        for gy in range(gy0, gy1 + 1):
+            for gx in range(gx0, gx1 + 1):
+                for i in cells.get(gy * gw + gx, ()):
+                    dx = xs[i] - x
+                    dy = ys[i] - y
+                    if dx * dx + dy * dy <= r2:
+                        out.append(i)
+        out.extend(self._nan_idx)
+        out.sort()
+        return out
+
+
+# ---- construction + cache -------------------------------------------------------------
+
+_CACHE: "OrderedDict[Any, LayoutGeometry]" = OrderedDict()
+_CACHE_MAX = 8
+_CACHE_LOCK = threading.Lock()
+# id(coords) -> (coords, content signature); dropped by mark_coords_dirty()
+_COORDS_SIG: Dict[int, Tuple[Any, Any]] = {}
+
+
+def mark_coords_dirty(coords: list) -> None:
+    """Tell the geometry cache that coords was edited in place.
+
+    Signatures are memoized per list object so a query costs O(1); an editor that mutates a
+    coordinate of an existing list (rather than assigning a new list) must call this so the
+    next lookup re-signs it and builds fresh geometry."""
+    with _CACHE_LOCK:
+        _COORDS_SIG.pop(id(coords), None)
+
+
+def _coords_signature(coords: list) -> Any:
+    """Content signature of a coords list: sha256 of the packed float coordinates (hash() of
+    tuples can collide, and a collision would hand back another layout's geometry).
+
+    The digest is memoized per list object (the memo holds a reference, so the id cannot be
+    reused) until mark_coords_dirty() is called; a length change is also treated as an edit."""
+    got = _COORDS_SIG.get(id(coords))
+    if got is not None and got[0] is coords and got[1][0] == len(coords):
+        return got[1]
+    try:
+        h = hashlib.sha256(array("d", [v for c in coords for v in c]).tobytes())
+        h.update(array("I", [len(c) for c in coords]).tobytes())
+    except (TypeError, ValueError, OverflowError):
+        h = hashlib.sha256(b"repr:" + repr(coords).encode("utf-8"))
+    sig = (len(coords), h.digest())
+    with _CACHE_LOCK:
+        if len(_COORDS_SIG) > 64:
+            _COORDS_SIG.clear()
+        _COORDS_SIG[id(coords)] = (coords, sig)
+    return sig
+
+
+def _cached(sig: Any, build) -> LayoutGeometry:
+    with _CACHE_LOCK:
+        g = _CACHE.get(sig)
+        if g is not None:
+            _CACHE.move_to_end(sig)
+            return g
+    g = build()
+    with _CACHE_LOCK:
+        _CACHE[sig] = g
+        while len(_CACHE) > _CACHE_MAX:
+            _CACHE.popitem(last=False)
+    return g
+
+
+def geometry_for_coords(coords: list, *, shape: str = "cells") -> LayoutGeometry:
+    """Geometry over a free-form coords list (malformed entries are excluded from queries)."""
+    sig = ("coords", str(shape), _coords_signature(coords))
+    # Cached geometry keeps its own copy: later in-place edits of coords must not reach it.
+    return _cached(sig, lambda: LayoutGeometry(shape=shape, points=[_xy_or_none(c) for c in coords],
+                                               int_coords=copy.deepcopy(coords), signature=sig))
+
+
+def geometry_for_layout(layout: Any) -> LayoutGeometry:
+    """Geometry for a layout dict / Layout object, built once per layout signature.
+
+    coords (when present) define LED positions; otherwise cells/matrix layouts use the
+    row-major logical grid (x = i % mw, y = i // mw) and strips use x = i, y = 0.
+    """
+    shape = str(_lg(layout, "shape", "strip") or "strip").lower().strip()
+    coords = _lg(layout, "coords")
+    mw = int(_lg(layout, "mw") or _lg(layout, "matrix_w") or 0)
+    mh = int(_lg(layout, "mh") or _lg(layout, "matrix_h") or 0)
+    n = int(_lg(layout, "num_leds") or _lg(layout, "count") or _lg(layout, "led_count") or 0)
+    mapping = (bool(_lg(layout, "serpentine", False)), bool(_lg(layout, "flip_x", False)),
+               bool(_lg(layout, "flip_y", False)), int(_lg(layout, "rotate", 0) or 0))
+
+    if isinstance(coords, list) and coords:
+        csig = _coords_signature(coords)
+        sig = ("layout", shape, mw, mh, mapping, csig)
+
+        def build():
+            return LayoutGeometry(shape=shape, points=[_xy_or_none(c) for c in coords], mw=mw, mh=mh,
+                                  int_coords=copy.deepcopy(coords), mapping=mapping, signature=sig)
+        return _cached(sig, build)
+
+    if shape in ("cells", "matrix") and mw > 0 and mh > 0:
+        n = mw * mh
+        sig = ("layout", shape, mw, mh, mapping, None)
+        return _cached(sig, lambda: LayoutGeometry(
+            shape=shape, points=[(float(i % mw), float(i // mw)) for i in range(n)],
+            mw=mw, mh=mh, mapping=mapping, signature=sig))
+
+    n = max(0, n or (mw if mh in (0, 1) else 0))
+    sig = ("layout", "strip", n, mapping)
+    return _cached(sig, lambda: LayoutGeometry(shape="strip", points=[(float(i), 0.0) for i in range(n)],
+                                               mw=n, mh=1, mapping=mapping, signature=sig))
+
+
+def clear_geometry_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _COORDS_SIG.clear()
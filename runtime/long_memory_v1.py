@@ -12,7 +12,7 @@ Persistence is Phase 2 (Data & Memory Systems).
 
 from dataclasses import dataclass
 import math
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 
 @dataclass
@@ -23,13 +23,53 @@ class LongMemory2DConfig:
     clamp01: bool = True
 
 
+def half_life_factor(dt: float, half_life_s: float) -> float:
+    """Exact decay multiplier for dt seconds: 2^(-dt/half_life) = exp(-ln2*dt/half_life)."""
+    return math.exp(-math.log(2.0) * (float(dt) / float(half_life_s)))
+
+
+# Falloff stamps keyed on (radius, sub-cell offset of the point). Points on the
+# integer lattice (the common case) all share one stamp per radius.
+_STAMP_CACHE: Dict[Tuple[float, float, float], List[Tuple[int, int, float]]] = {}
+_STAMP_CACHE_MAX = 4096
+
+
+def _falloff_stamp(r: float, fx: float, fy: float) -> List[Tuple[int, int, float]]:
+    """[(ox, oy, w)] cell offsets within r of a point at sub-cell offset (fx, fy).
+
+    dx = ox - fx is bit-identical to (icx + ox) - cx because fx = cx - icx is exact.
+    """
+    key = (r, fx, fy)
+    st = _STAMP_CACHE.get(key)
+    if st is not None:
+        return st
+    rr = r * r
+    k = int(math.ceil(r))
+    st = []
+    for oy in range(-k, k + 1):
+        for ox in range(-k, k + 1):
+            dx = ox - fx
+            dy = oy - fy
+            d2 = dx * dx + dy * dy
+            if d2 > rr:
+                continue
+            # Smooth falloff; not true gaussian but good enough.
+            st.append((ox, oy, 1.0 - (d2 / rr) if rr > 0 else 1.0))
+    if len(_STAMP_CACHE) >= _STAMP_CACHE_MAX:
+        _STAMP_CACHE.clear()
+    _STAMP_CACHE[key] = st
+    return st
+
+
 class LongMemory2D:
     """A scalar memory buffer over a 2D grid in [0,1], with exponential decay.
 
-    - step(dt) applies decay.
-    - reinforce_points() deposits energy at points (optionally with radius falloff).
+    - step(dt) applies decay (one exact half-life factor over the whole buffer).
+    - reinforce_points() deposits energy at points (optionally with radius falloff),
+      all points in one pass through cached falloff stamps.
 
-    Designed to be used by behaviors that run across many frames.
+    Designed to be used by behaviors that run across many frames. `buf` keeps its
+    identity for the lifetime of the memory (callers alias it).
     """
 
     def __init__(self, cfg: LongMemory2DConfig):
@@ -43,8 +83,7 @@ class LongMemory2D:
         self.buf: List[float] = [0.0] * (self.w * self.h)
 
     def clear(self):
-        for i in range(len(self.buf)):
-            self.buf[i] = 0.0
+        self.buf[:] = [0.0] * len(self.buf)
 
     def _idx(self, x: int, y: int) -> int:
         return (y % self.h) * self.w + (x % self.w)
@@ -54,11 +93,9 @@ class LongMemory2D:
         if dt <= 0:
             return
         # decay factor so value halves every half_life_s
-        # factor = 2^(-dt/half_life)
-        factor = math.exp(-math.log(2.0) * (dt / float(self.cfg.half_life_s)))
+        factor = half_life_factor(dt, self.cfg.half_life_s)
         b = self.buf
-        for i in range(len(b)):
-            b[i] *= factor
+        b[:] = [v * factor for v in b]
 
     def reinforce_points(
         self,
@@ -71,57 +108,52 @@ class LongMemory2D:
 
         points: (x,y) in grid coordinates (float ok)
         radius: if >0, applies a gaussian-ish falloff within radius.
+
+        With clamp01 the deposited cells are clamped to [0,1]; the rest of the
+        buffer already is (decay only scales it down).
         """
         if amount == 0:
             return
+        w, h = self.w, self.h
+        b = self.buf
+        touched: List[int] = []
         r = float(radius)
         if r <= 0.0:
             for (x, y) in points:
                 xi = int(round(x))
                 yi = int(round(y))
                 if wrap:
-                    idx = self._idx(xi, yi)
-                    self.buf[idx] += amount
+                    idx = (yi % h) * w + (xi % w)
+                elif 0 <= xi < w and 0 <= yi < h:
+                    idx = yi * w + xi
                 else:
-                    if 0 <= xi < self.w and 0 <= yi < self.h:
-                        self.buf[yi * self.w + xi] += amount
+                    continue
+                b[idx] += amount
+                touched.append(idx)
         else:
-            # bounded kernel; keep deterministic and cheap
-            rr = r * r
-            x0 = -int(math.ceil(r))
-            x1 = int(math.ceil(r))
-            y0 = -int(math.ceil(r))
-            y1 = int(math.ceil(r))
             for (x, y) in points:
                 cx = float(x)
                 cy = float(y)
                 icx = int(round(cx))
                 icy = int(round(cy))
-                for oy in range(y0, y1 + 1):
-                    for ox in range(x0, x1 + 1):
-                        dx = (icx + ox) - cx
-                        dy = (icy + oy) - cy
-                        d2 = dx * dx + dy * dy
-                        if d2 > rr:
-                            continue
-                        # Smooth falloff; not true gaussian but good enough.
-                        w = 1.0 - (d2 / rr) if rr > 0 else 1.0
-                        dep = amount * max(0.0, w)
-                        xi = icx + ox
-                        yi = icy + oy
-                        if wrap:
-                            idx = self._idx(xi, yi)
-                            self.buf[idx] += dep
-                        else:
-                            if 0 <= xi < self.w and 0 <= yi < self.h:
-                                self.buf[yi * self.w + xi] += dep
+                for ox, oy, wt in _falloff_stamp(r, cx - icx, cy - icy):
+                    xi = icx + ox
+                    yi = icy + oy
+                    if wrap:
+                        idx = (yi % h) * w + (xi % w)
+                    elif 0 <= xi < w and 0 <= yi < h:
+                        idx = yi * w + xi
+                    else:
+                        continue
+                    b[idx] += amount * max(0.0, wt)
+                    touched.append(idx)
 
         if self.cfg.clamp01:
-            b = self.buf
-            for i in range(len(b)):
-                if b[i] < 0.0:
+            for i in touched:
+                v = b[i]
+                if v < 0.0:
                     b[i] = 0.0
-                elif b[i] > 1.0:
+                elif v > 1.0:
                     b[i] = 1.0
 
     def sample(self, x: int, y: int) -> float:
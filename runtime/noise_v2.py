@@ -6,12 +6,21 @@ v2 consolidates noise functionality into a single, stable API used by fields/par
 - Small, fast, and portable to embedded targets if needed
 
 This is *not* an effect: it is a reusable math primitive.
+
+Batched evaluation: fbm_grid()/curl_grid() evaluate a whole xs × ys grid per call.
+Per octave, the lattice values a grid touches are looked up once (not four times per
+point) from a per-instance cache keyed by lattice cell, so scrolling fields re-hash
+only the cells that came into view. Grid values are bit-identical to the scalar
+fbm(); curl_grid() differentiates the potential analytically (one fbm pass instead of
+four finite-difference passes), so it matches CurlNoise2D.sample() to ~eps², not
+bit-for-bit.
 """
 
 from __future__ import annotations
 
 import math
 from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
 
 
 def _hash_u32(x: int) -> int:
@@ -52,13 +61,110 @@ class Noise2DConfig:
 class Noise2D:
     """Seeded deterministic 2D value-noise + helpers."""
 
+    # Lattice cache bound (cells); cleared wholesale when exceeded.
+    LATTICE_CACHE_MAX = 1 << 16
+
     def __init__(self, cfg: Noise2DConfig | None = None):
         self.cfg = cfg or Noise2DConfig()
+        self._lattice: Dict[Tuple[int, int], float] = {}
+        self._col_hash: Dict[int, int] = {}
 
     def _cell_rand(self, ix: int, iy: int) -> float:
         h = _mix_u32(_mix_u32(self.cfg.seed & 0xFFFFFFFF, ix & 0xFFFFFFFF), iy & 0xFFFFFFFF)
         return _u32_to_unit(h)
 
+    def _lattice_table(self, ixs: Sequence[int], iys: Sequence[int]) -> Dict[Tuple[int, int], float]:
+        """_cell_rand() for every (ix, iy) in ixs × iys, served from the lattice cache."""
+        lat = self._lattice
+        if len(lat) > self.LATTICE_CACHE_MAX:
+            lat.clear()
+            self._col_hash.clear()
+        cols = self._col_hash
+        seed = self.cfg.seed & 0xFFFFFFFF
+        for ix in ixs:
+            hx = cols.get(ix)
+            if hx is None:
+                hx = cols[ix] = _mix_u32(seed, ix & 0xFFFFFFFF)
+            for iy in iys:
+                if (ix, iy) not in lat:
+                    lat[(ix, iy)] = _u32_to_unit(_mix_u32(hx, iy & 0xFFFFFFFF))
+        return lat
+
+    @staticmethod
+    def _axis(cs: Sequence[float], freq: float) -> Tuple[List[int], List[float], List[float]]:
+        """Per-coordinate lattice cell, smoothstep weight and its derivative at `freq`."""
+        cells: List[int] = []
+        w: List[float] = []
+        dw: List[float] = []
+        for c in cs:
+            p = c * freq
+            c0 = math.floor(p)
+            f = p - c0
+            cells.append(int(c0))
+            w.append(_smoothstep(f))
+            dw.append(6.0 * f * (1.0 - f))
+        return cells, w, dw
+
+    def _fbm_grid(self, xs: Sequence[float], ys: Sequence[float], octaves: int | None, lacunarity: float | None,
+                  gain: float | None, want_grad: bool):
+        o = octaves if octaves is not None else self.cfg.octaves
+        lac = lacunarity if lacunarity is not None else self.cfg.lacunarity
+        g = gain if gain is not None else self.cfg.gain
+        nx, ny = len(xs), len(ys)
+        acc = [[0.0] * nx for _ in range(ny)]
+        gx = [[0.0] * nx for _ in range(ny)] if want_grad else None
+        gy = [[0.0] * nx for _ in range(ny)] if want_grad else None
+        amp = 1.0
+        freq = 1.0
+        norm = 0.0
+        for _ in range(max(1, int(o))):
+            cx, u, du = self._axis(xs, freq)
+            cy, v, dv = self._axis(ys, freq)
+            lat = self._lattice_table(sorted(set(cx) | {c + 1 for c in cx}), sorted(set(cy) | {c + 1 for c in cy}))
+            # d/dp of signed value noise at this octave (chain rule through p * freq).
+            k = amp * 2.0 * freq
+            for j in range(ny):
+                y0 = cy[j]
+                vj = v[j]
+                row = acc[j]
+                for i in range(nx):
+                    x0 = cx[i]
+                    ui = u[i]
+                    r00 = lat[(x0, y0)]
+                    r10 = lat[(x0 + 1, y0)]
+                    r01 = lat[(x0, y0 + 1)]
+                    r11 = lat[(x0 + 1, y0 + 1)]
+                    a = _lerp(r00, r10, ui)
+                    b = _lerp(r01, r11, ui)
+                    row[i] += amp * (_lerp(a, b, vj) * 2.0 - 1.0)
+                    if want_grad:
+                        gx[j][i] += k * ((r10 - r00) + ((r11 - r01) - (r10 - r00)) * vj) * du[i]
+                        gy[j][i] += k * (b - a) * dv[j]
+            norm += amp
+            amp *= g
+            freq *= lac
+        if norm > 0:
+            for row in acc:
+                for i in range(nx):
+                    row[i] /= norm
+            if want_grad:
+                for j in range(ny):
+                    gxr, gyr = gx[j], gy[j]
+                    for i in range(nx):
+                        gxr[i] /= norm
+                        gyr[i] /= norm
+        return acc, gx, gy
+
+    def fbm_grid(self, xs: Sequence[float], ys: Sequence[float], octaves: int | None = None,
+                 lacunarity: float | None = None, gain: float | None = None) -> List[List[float]]:
+        """fbm() over the grid xs × ys: rows[j][i] == fbm(xs[i], ys[j]) (bit-identical)."""
+        return self._fbm_grid(xs, ys, octaves, lacunarity, gain, False)[0]
+
+    def fbm_grad_grid(self, xs: Sequence[float], ys: Sequence[float], octaves: int | None = None,
+                      lacunarity: float | None = None, gain: float | None = None):
+        """(values, d/dx, d/dy) of fbm over xs × ys; derivatives are analytic."""
+        return self._fbm_grid(xs, ys, octaves, lacunarity, gain, True)
+
     def value(self, x: float, y: float) -> float:
         """Smooth value noise in [0,1)."""
         x0 = math.floor(x)
@@ -150,3 +256,20 @@ class CurlNoise2D:
         vx = dpsi_dy * self.cfg.strength
         vy = -dpsi_dx * self.cfg.strength
         return (vx, vy)
+
+    def curl_grid(self, xs: Sequence[float], ys: Sequence[float], t: float = 0.0) -> Tuple[List[List[float]], List[List[float]]]:
+        """Flow over xs × ys as (vx rows, vy rows), same field as sample() with the
+        potential gradient taken analytically (one fbm pass for the whole grid)."""
+        s = self.cfg.scale
+        pxs = [(x + t * 0.15) * s for x in xs]
+        pys = [(y + t * 0.11) * s for y in ys]
+        _val, gx, gy = self._noise.fbm_grad_grid(pxs, pys)
+        k = self.cfg.strength
+        vx = [[d * k for d in row] for row in gy]
+        vy = [[-d * k for d in row] for row in gx]
+        return vx, vy
+
+    def curl(self, x: float, y: float, t: float = 0.0) -> tuple[float, float]:
+        """Single-point curl_grid() (analytic gradient)."""
+        vx, vy = self.curl_grid((x,), (y,), t)
+        return (vx[0][0], vy[0][0])
@@ -7,7 +7,9 @@ Reusable spatial-hash helper for particle/agent proximity/collision style rules.
 This is intentionally small and deterministic:
 - Inputs are plain lists of dicts with x/y floats.
 - Uses grid hashing with cell size = radius.
-- Counts unique unordered pairs within radius, optionally capped by max_pairs checked.
+- Counts unique unordered pairs within radius.
+- max_pairs_checked <= 0 counts exactly via runtime.broadphase_v1; a positive value
+  keeps the legacy behaviour of stopping after that many candidate checks.
 
 Returned counters can be published as events/signals by callers.
 """
@@ -15,6 +17,8 @@ Returned counters can be published as events/signals by callers.
 from typing import List, Dict, Tuple
 import math
 
+from .broadphase_v1 import BroadphaseV1
+
 
 def count_pairs_within_radius_v1(
     parts: List[Dict],
@@ -28,6 +32,7 @@ def count_pairs_within_radius_v1(
       - 'near' counts near only
       - 'collision' counts collision only
       - 'both' counts both (same threshold)
+      - anything else (e.g. 'off') counts nothing
     """
     try:
         r = float(radius)
@@ -37,26 +42,45 @@ def count_pairs_within_radius_v1(
         return 0, 0
 
     mode = str(mode or "both").lower().strip()
-    r2 = r * r
-
-    cell = r
-    if cell <= 0.0:
-        cell = 1.0
+    want_near = mode in ("near", "both")
+    want_coll = mode in ("collision", "both")
+    if not (want_near or want_coll):
+        return 0, 0
 
-    grid: Dict[Tuple[int, int], List[int]] = {}
-    for idx_p, p in enumerate(parts):
+    # Read positions once; the pair loops below never touch the dicts.
+    xs: List[float] = []
+    ys: List[float] = []
+    for p in parts:
         try:
-            x0 = float(p.get("x", 0.0) or 0.0)
-            y0 = float(p.get("y", 0.0) or 0.0)
+            xs.append(float(p.get("x", 0.0) or 0.0))
+            ys.append(float(p.get("y", 0.0) or 0.0))
         except Exception:
-            x0, y0 = 0.0, 0.0
-        cx = int(math.floor(x0 / cell))
-        cy = int(math.floor(y0 / cell))
+            xs.append(0.0)
+            ys.append(0.0)
+
+    try:
+        cap = int(max_pairs_checked)
+    except Exception:
+        cap = 0
+    if cap <= 0:
+        hits = BroadphaseV1(r * 1.000001).rebuild(xs, ys).count_within(r)
+    else:
+        hits = _count_capped(xs, ys, r, cap)
+    return (hits if want_near else 0), (hits if want_coll else 0)
+
+
+def _count_capped(xs: List[float], ys: List[float], r: float, cap: int) -> int:
+    """Legacy budgeted count: same traversal (and so same truncation point) as v1."""
+    r2 = r * r
+    cell = r
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    for idx_p in range(len(xs)):
+        cx = int(math.floor(xs[idx_p] / cell))
+        cy = int(math.floor(ys[idx_p] / cell))
         grid.setdefault((cx, cy), []).append(idx_p)
 
     checked = 0
-    near = 0
-    coll = 0
+    hits = 0
 
     # Compare within cell and neighbor cells
     for (cx, cy), lst in grid.items():
@@ -66,21 +90,16 @@ def count_pairs_within_radius_v1(
                 if not lst2:
                     continue
                 for ai in lst:
-                    ax = float(parts[ai].get("x", 0.0) or 0.0)
-                    ay = float(parts[ai].get("y", 0.0) or 0.0)
+                    ax = xs[ai]
+                    ay = ys[ai]
                     for bi in lst2:
                         if bi <= ai:
                             continue
                         checked += 1
-                        if max_pairs_checked > 0 and checked > max_pairs_checked:
-                            return near, coll
-                        bx = float(parts[bi].get("x", 0.0) or 0.0)
-                        by = float(parts[bi].get("y", 0.0) or 0.0)
-                        dx = ax - bx
-                        dy = ay - by
+                        if checked > cap:
+                            return hits
+                        dx = ax - xs[bi]
+                        dy = ay - ys[bi]
                         if (dx * dx + dy * dy) <= r2:
-                            if mode in ("near", "both"):
-                                near += 1
-                            if mode in ("collision", "both"):
-                                coll += 1
-    return near, coll
+                            hits += 1
+    return hits
@@ -14,6 +14,7 @@ Design goals:
 """
 
 from .integrators_v1 import IntegratorConfigV1, euler_step_entities
+from .field_bake_v1 import sample_field_many
 from dataclasses import dataclass, asdict
 from typing import Callable, Dict, List, Optional, Tuple, Any
 import math
@@ -248,11 +249,18 @@ def module_radial_attractor(x: float, y: float, strength: float = 20.0, repel: b
 
 
 def module_field_advection(field, strength: float = 1.0) -> ParticleModule:
-    """Advect particles by a VectorField-like object (has sample(x,y,t)->(vx,vy))."""
+    """Advect particles by a VectorField-like object (has sample(x,y,t)->(vx,vy)).
 
-    def _mod(sys: ParticleSystemV1, dt: float, t: float) -> None:
-        for pt in sys.particles:
-            vx, vy = field.sample(pt.x, pt.y, t)
+    Fields with sample_many() (runtime.field_bake_v1.BakedFieldV1) are queried once
+    per tick for all particles.
+    """
+
+    def _mod(sys: ParticleSystemV1, dt: float, t: float, signals: Optional[Dict[str, float]] = None) -> None:
+        parts = sys.particles
+        if not parts:
+            return
+        vxs, vys = sample_field_many(field, [pt.x for pt in parts], [pt.y for pt in parts], t)
+        for pt, vx, vy in zip(parts, vxs, vys):
             pt.vx += vx * strength * dt
             pt.vy += vy * strength * dt
 
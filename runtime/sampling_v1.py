@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import List, Tuple, Dict, Any, Optional
 import math
 
+from .layout_geometry_v1 import geometry_for_coords
+
 def nearest_led_index(layout: Dict[str, Any], x: float, y: float) -> int:
     """Return nearest LED index to (x,y) in layout-space.
 
@@ -10,20 +12,8 @@ def nearest_led_index(layout: Dict[str, Any], x: float, y: float) -> int:
     """
     coords = layout.get("coords")
     if isinstance(coords, list) and coords:
-        best_i = 0
-        best_d2 = 1e18
-        for i, c in enumerate(coords):
-            try:
-                cx, cy = float(c[0]), float(c[1])
-            except Exception:
-                continue
-            dx = cx - x
-            dy = cy - y
-            d2 = dx*dx + dy*dy
-            if d2 < best_d2:
-                best_d2 = d2
-                best_i = i
-        return int(best_i)
+        # Uniform-grid index built once per coords list (same result as a linear scan).
+        return int(geometry_for_coords(coords).nearest(x, y))
     # fallback: strip
     n = int(layout.get("led_count") or layout.get("n_leds") or 0)
     if n <= 0:
@@ -35,18 +25,11 @@ def splat_scalar_to_leds(layout: Dict[str, Any], led_out: List[float], x: float,
     """Deposit scalar value into led_out with soft falloff."""
     coords = layout.get("coords")
     if isinstance(coords, list) and coords:
-        r2 = float(radius) * float(radius)
-        for i, c in enumerate(coords):
-            try:
-                cx, cy = float(c[0]), float(c[1])
-            except Exception:
-                continue
-            dx = cx - x
-            dy = cy - y
-            d2 = dx*dx + dy*dy
-            if d2 > r2:
-                continue
-            w = 1.0 - math.sqrt(d2) / float(radius)
+        for i in geometry_for_coords(coords).within_radius(x, y, radius):
+            c = coords[i]
+            dx = float(c[0]) - x
+            dy = float(c[1]) - y
+            w = 1.0 - math.sqrt(dx*dx + dy*dy) / float(radius)
             led_out[i] += v * w
         return
     # strip fallback
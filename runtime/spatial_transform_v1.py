@@ -139,27 +139,16 @@ def world_to_layout(x: float, y: float, spatial_cfg: Optional[Dict[str, Any]] =
 def world_to_led_index(x: float, y: float, layout: Dict[str, Any], spatial_cfg: Optional[Dict[str, Any]] = None) -> int:
     """Find the nearest LED index for a world XY position.
 
-    Uses coords when present; otherwise falls back to strip mapping.
-    This is O(n) and intended for authoring/preview tools, not hot loops.
+    Uses coords when present (via the cached LayoutGeometry grid index); otherwise
+    falls back to strip mapping.
     """
     lx, ly = world_to_layout(x, y, spatial_cfg)
 
     n = _layout_n(layout)
     coords = layout.get("coords")
     if isinstance(coords, list) and n > 0 and len(coords) == n:
-        best_i = 0
-        best_d2 = None
-        for i in range(n):
-            c = coords[i]
-            if not (isinstance(c, (list, tuple)) and len(c) >= 2):
-                continue
-            dx = float(c[0]) - lx
-            dy = float(c[1]) - ly
-            d2 = dx * dx + dy * dy
-            if best_d2 is None or d2 < best_d2:
-                best_d2 = d2
-                best_i = i
-        return int(best_i)
+        from runtime.layout_geometry_v1 import geometry_for_coords
+        return int(geometry_for_coords(coords).nearest(lx, ly))
 
     # Strip fallback: clamp to index
     ii = int(round(lx))
@@ -23,9 +23,12 @@ Integration:
 from typing import Any, Dict, Optional, Tuple
 import json as _json
 import hashlib as _hashlib
+import math
 
 from runtime.extensions_v1 import register_signal_provider, register_rule_action
+from runtime.field_bake_v1 import BakedFieldV1, bake_for_bounds
 from runtime.particles_v1 import ParticleSystemV1, PointEmitter, LineEmitter, AreaEmitter
+from runtime.vector_fields_v1 import CurlNoiseField, CurlNoiseFieldConfig
 
 # Cache of live systems to avoid rebuilding objects every frame.
 # Keyed by (id(project), system_name)
@@ -50,6 +53,43 @@ def _ensure_project_map(project: Dict[str, Any]) -> Dict[str, Any]:
     return m
 
 
+# Baked fields for "field" modules, keyed by (module config hash, bounds). Systems are
+# rebuilt whenever their state changes, so the bake must outlive them to be reused.
+_FIELD_CACHE: Dict[Tuple[str, Tuple[float, ...]], BakedFieldV1] = {}
+_FIELD_CACHE_MAX = 32
+_FIELD_MAX_NODES = 4096
+
+
+def _baked_field(m: Dict[str, Any], bounds: Tuple[float, float, float, float]) -> Optional[BakedFieldV1]:
+    """BakedFieldV1 for a {"type": "field", "field": "curl", ...} module over the system bounds.
+
+    Particles query the baked grid once per tick instead of evaluating curl noise per particle.
+    The grid spans bounds (x0, y0, x1, y1) with at most _FIELD_MAX_NODES nodes; animated
+    fields (time_scale != 0) re-bake at most bake_hz times per second.
+    """
+    kind = str(m.get("field") or "curl").strip().lower()
+    if kind != "curl":
+        return None
+    b = tuple(float(v) for v in bounds)
+    if not all(math.isfinite(v) for v in b):
+        return None
+    key = (_stable_hash(m), b)
+    baked = _FIELD_CACHE.get(key)
+    if baked is None:
+        cfg = CurlNoiseFieldConfig(
+            seed=int(m.get("seed", 1337)),
+            scale=float(m.get("scale", 0.05)),
+            strength=float(m.get("field_strength", 1.0)),
+            time_scale=float(m.get("time_scale", 0.0)),
+        )
+        baked = bake_for_bounds(CurlNoiseField(cfg), b, cell=1.0 / max(1, int(m.get("oversample", 1))),
+                                max_nodes=_FIELD_MAX_NODES, bake_hz=float(m.get("bake_hz", 15.0)))
+        if len(_FIELD_CACHE) >= _FIELD_CACHE_MAX:
+            _FIELD_CACHE.clear()
+        _FIELD_CACHE[key] = baked
+    return baked
+
+
 def _get_or_build_system(project: Dict[str, Any], name: str, layout: Dict[str, Any]) -> Optional[ParticleSystemV1]:
     if not isinstance(project, dict) or not isinstance(name, str) or not name:
         return None
@@ -120,10 +160,10 @@ def _get_or_build_system(project: Dict[str, Any], name: str, layout: Dict[str, A
                 from runtime.particles_v1 import module_radial_attractor
                 ps.add_module(module_radial_attractor(x, y, strength=strength, repel=repel))
             elif t == "field":
-                # Field advection expects a VectorField instance in cache.
-                # Users can create it via their own code/plugins; we keep this as a hook.
-                # No-op if missing.
-                pass
+                field = _baked_field(m, ps.bounds)
+                if field is not None:
+                    from runtime.particles_v1 import module_field_advection
+                    ps.add_module(module_field_advection(field, strength=float(m.get("strength", 1.0))))
         except Exception:
             continue
 
@@ -137,7 +177,12 @@ def _save_back(project: Dict[str, Any], name: str, ps: ParticleSystemV1) -> None
         cfg = systems.get(name) or {}
         if not isinstance(cfg, dict):
             cfg = {}
-        cfg["state"] = ps.to_dict()
+        prev = cfg.get("state")
+        state = ps.to_dict()
+        # Module config is not part of the system's serialized state; keep it.
+        if isinstance(prev, dict) and "modules" in prev:
+            state["modules"] = prev["modules"]
+        cfg["state"] = state
         systems[name] = cfg
     except Exception:
         return
@@ -17,9 +17,27 @@ from .noise_v2 import CurlNoise2D, CurlNoiseConfig
 class VectorField:
     """Base field interface."""
 
+    # False when sample() ignores t (lets BakedFieldV1 keep a bake across ticks).
+    time_dependent = True
+
     def sample(self, x: float, y: float, t: float = 0.0) -> tuple[float, float]:
         raise NotImplementedError
 
+    def sample_grid(self, xs, ys, t: float = 0.0) -> tuple[list, list]:
+        """(vx rows, vy rows) over xs × ys; rows[j][i] is the field at (xs[i], ys[j])."""
+        rows_x = []
+        rows_y = []
+        for y in ys:
+            rx = []
+            ry = []
+            for x in xs:
+                vx, vy = self.sample(x, y, t)
+                rx.append(vx)
+                ry.append(vy)
+            rows_x.append(rx)
+            rows_y.append(ry)
+        return rows_x, rows_y
+
 
 @dataclass
 class ConstantFieldConfig:
@@ -28,6 +46,8 @@ class ConstantFieldConfig:
 
 
 class ConstantField(VectorField):
+    time_dependent = False
+
     def __init__(self, cfg: ConstantFieldConfig | None = None):
         self.cfg = cfg or ConstantFieldConfig()
 
@@ -45,6 +65,8 @@ class RadialFieldConfig:
 
 
 class RadialField(VectorField):
+    time_dependent = False
+
     def __init__(self, cfg: RadialFieldConfig | None = None):
         self.cfg = cfg or RadialFieldConfig()
 
@@ -72,6 +94,8 @@ class VortexFieldConfig:
 
 
 class VortexField(VectorField):
+    time_dependent = False
+
     def __init__(self, cfg: VortexFieldConfig | None = None):
         self.cfg = cfg or VortexFieldConfig()
 
@@ -112,8 +136,19 @@ class CurlNoiseField(VectorField):
             )
         )
 
+    @property
+    def time_dependent(self) -> bool:
+        return bool(self.cfg.time_scale)
+
     def sample(self, x: float, y: float, t: float = 0.0) -> tuple[float, float]:
         if self.cfg.time_scale and self.cfg.time_scale != 0.0:
             tt = t * self.cfg.time_scale
             return self._curl.curl(x + tt, y - tt)
         return self._curl.curl(x, y)
+
+    def sample_grid(self, xs, ys, t: float = 0.0) -> tuple[list, list]:
+        # One analytic curl pass for the whole grid (same values as sample()).
+        if self.cfg.time_scale and self.cfg.time_scale != 0.0:
+            tt = t * self.cfg.time_scale
+            return self._curl.curl_grid([x + tt for x in xs], [y - tt for y in ys])
+        return self._curl.curl_grid(xs, ys)
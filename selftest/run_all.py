@@ -12,6 +12,32 @@ TEST_MODULES = [
     'selftest.test_signal_expr_map',
     'selftest.test_codemap_no_holes',
     'selftest.test_preview_smoke',
+    'selftest.test_wav_features',
+    'selftest.test_audio_recording_binary',
+    'selftest.test_effect_audit_runner',
+    'selftest.test_build_cache',
+    'selftest.test_export_section_cache',
+    'selftest.test_sprite_atlas',
+    'selftest.test_text_raster',
+    'selftest.test_layout_geometry',
+    'selftest.test_behavior_manifest',
+    'selftest.test_startup_profile',
+    'selftest.test_project_history',
+    'selftest.test_autosave_journal',
+    'selftest.test_project_normalize_cache',
+    'selftest.test_validation_engine',
+    'selftest.test_behavior_hot_reload',
+    'selftest.test_noise_grid',
+    'selftest.test_field_bake',
+    'selftest.test_broadphase',
+    'selftest.test_memory_kernels',
+    'selftest.test_fixed_math',
+    'selftest.test_export_luts',
+    'selftest.test_host_harness',
+    'selftest.test_firmware_cost',
+    'selftest.test_firmware_telemetry',
+    'selftest.test_rules_table',
+    'selftest.test_layerstack_rules_placeholders',
 ]
 
 
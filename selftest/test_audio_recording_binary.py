@@ -0,0 +1,84 @@
+"""Selftest for the binary, seekable audio recording format (preview.audio_recorder)."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+
+def _write_jsonl(path: Path, n: int, dt: float) -> None:
+    lines = []
+    for i in range(n):
+        st = {"energy": (i % 100) / 100.0, "mono0": 0.25}
+        if i % 2 == 0:
+            st["kick"] = 1.0  # sparse key: absent on odd frames
+        lines.append(json.dumps({"t": i * dt, "state": st}))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_binary_recording_convert_seek_and_fast_playback():
+    from preview.audio_recorder import AudioRecorder, BinaryRecording, convert_jsonl_to_binary
+    from preview.audio_input import AudioInput
+
+    with tempfile.TemporaryDirectory() as td:
+        src = Path(td) / "rec.jsonl"
+        _write_jsonl(src, n=3600 * 10, dt=0.1)  # one hour at 10 Hz
+        dst = convert_jsonl_to_binary(src)
+        assert dst.suffix == ".mlar" and dst.exists()
+
+        rec = BinaryRecording.open(dst)
+        try:
+            assert rec.n_frames == 36000
+            assert abs(rec.duration - 3599.9) < 1e-2
+            assert rec.index_at(-5.0) == 0
+            assert rec.index_at(1234.56) == 12345
+            st = rec.state_at(12345)
+            assert abs(st["energy"] - 0.45) < 1e-6
+            assert "kick" not in st
+            assert rec.state_at(12344)["kick"] == 1.0
+        finally:
+            rec.close()
+
+        # JSONL and binary playback agree.
+        a = AudioRecorder(); a.load(src)
+        b = AudioRecorder(); b.load(dst)
+        assert a.frame_count == b.frame_count == 36000
+        for t in (0.0, 17.33, 1800.0, 3599.95, 99999.0):
+            assert a.sample_at(t) == b.sample_at(t)
+
+        # Save round-trip from a memory-mapped recording.
+        again = Path(td) / "again.mlar"
+        b.save(again)
+        assert again.read_bytes() == dst.read_bytes()
+        b.close()
+
+        # Simulation-time playback runs far faster than real time.
+        audio = AudioInput()
+        audio.recorder.load(dst)
+        audio.recorder.start_play(0.0)
+        audio.mode = "playback"
+        audio.gain = 1.0
+        audio.smoothing = 0.0
+        t0 = time.perf_counter()
+        t = 0.0
+        while t < 3600.0:
+            audio.step(t)
+            t += 1.0
+        assert time.perf_counter() - t0 < 5.0
+        assert abs(audio.state["energy"] - 0.90) < 1e-6  # t=3599 -> frame 35990
+
+        audio.recorder.seek(60.0)
+        audio.step(5000.0)  # first step after seek anchors sim time
+        assert abs(audio.state["energy"] - 0.0) < 1e-6  # frame 600
+        audio.recorder.close()
+
+
+def main():
+    test_binary_recording_convert_seek_and_fast_playback()
+    print("OK: audio recording binary selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Selftest for app.autosave.AutosaveEngine (checkpoint + journal, worker-thread writes)."""
+
+from __future__ import annotations
+
+import copy
+import json
+import tempfile
+from pathlib import Path
+
+
+def _project():
+    return {
+        "schema_version": 1,
+        "layout": {"shape": "strip", "num_leds": 60, "xy_map": list(range(240))},
+        "layers": [
+            {"uid": "L1", "behavior": "solid", "params": {"brightness": 0.5, "color": [255, 0, 0]}},
+            {"uid": "L2", "behavior": "rainbow", "params": {"speed": 1.0}},
+        ],
+    }
+
+
+def test_revision_skips_and_journal_recovery():
+    from app.autosave import AutosaveEngine, CHECKPOINT_NAME, JOURNAL_NAME, recover_autosave
+
+    with tempfile.TemporaryDirectory() as td:
+        state = {"p": _project(), "rev": 1}
+        eng = AutosaveEngine(lambda: state["p"], lambda: state["rev"], directory=Path(td),
+                             checkpoint_every=3, enabled=True)
+        assert eng.tick()
+        assert not eng.tick() and not eng.tick()  # unchanged revision: no snapshot
+        assert eng.flush()
+        assert eng.stats["checkpoints"] == 1 and eng.stats["skipped"] == 2
+        ck_size = (Path(td) / CHECKPOINT_NAME).stat().st_size
+
+        edits = [
+            lambda p: p["layers"][0]["params"].__setitem__("brightness", 0.75),
+            lambda p: p["layers"].append({"uid": "L3", "behavior": "noise", "params": {}}),
+            lambda p: p["layout"].pop("shape"),
+        ]
+        for fn in edits:
+            fn(state["p"])
+            state["rev"] += 1
+            assert eng.tick()
+            assert eng.flush()
+        assert eng.stats["journal"] == 3 and eng.stats["checkpoints"] == 1
+        assert (Path(td) / CHECKPOINT_NAME).stat().st_size == ck_size  # checkpoint untouched
+        lines = (Path(td) / JOURNAL_NAME).read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 3 and all(len(ln) < ck_size // 2 for ln in lines)
+
+        rec = recover_autosave(Path(td))
+        assert rec["journal_entries"] == 3 and rec["rev"] == state["rev"]
+        assert rec["project"] == state["p"]
+
+        # A crash mid-append leaves a torn tail: it is ignored, earlier entries replay.
+        with open(Path(td) / JOURNAL_NAME, "a", encoding="utf-8") as f:
+            f.write('{"gen":')
+        rec = recover_autosave(Path(td))
+        assert rec["journal_entries"] == 3 and rec["project"] == state["p"]
+
+        # After checkpoint_every entries the next save is a fresh checkpoint.
+        state["p"]["layers"][1]["params"]["speed"] = 2.0
+        state["rev"] += 1
+        eng.tick()
+        eng.close()
+        assert eng.stats["checkpoints"] == 2
+        assert (Path(td) / JOURNAL_NAME).read_text(encoding="utf-8") == ""
+        assert recover_autosave(Path(td))["project"] == state["p"]
+
+
+def test_without_revision_unchanged_saves_are_skipped():
+    from app.autosave import AutosaveEngine, recover_autosave
+
+    with tempfile.TemporaryDirectory() as td:
+        proj = _project()
+        eng = AutosaveEngine(lambda: proj, directory=Path(td), enabled=True)
+        for _ in range(3):
+            eng.tick()
+            eng.flush()
+        assert eng.stats["checkpoints"] == 1 and eng.stats["unchanged"] == 2
+        before = copy.deepcopy(proj)
+        proj["layers"][0]["params"]["color"][1] = 128  # snapshot taken at tick: later edits are not seen
+        eng.tick()
+        proj["layers"][0]["params"]["color"][2] = 64
+        eng.close()
+        got = recover_autosave(Path(td))["project"]
+        assert got != before and got["layers"][0]["params"]["color"] == [255, 128, 0]
+        assert json.loads(json.dumps(got)) == got
+
+        off = AutosaveEngine(lambda: proj, directory=Path(td) / "off", enabled=False)
+        assert not off.tick() and not (Path(td) / "off").exists()
+
+
+def test_snapshot_shares_unchanged_sections_off_the_ui_thread():
+    import threading
+    import app.autosave as autosave
+
+    calls = []
+    orig = autosave.sanitize_for_json
+
+    def _spy(obj, **kw):
+        calls.append(threading.current_thread() is threading.main_thread())
+        return orig(obj, **kw)
+
+    with tempfile.TemporaryDirectory() as td:
+        state = {"p": _project(), "rev": 1}
+        eng = autosave.AutosaveEngine(lambda: state["p"], lambda: state["rev"], directory=Path(td), enabled=True)
+        autosave.sanitize_for_json = _spy
+        try:
+            assert eng.tick() and eng.flush()
+            layout = eng._saved["layout"]
+            calls.clear()
+            state["p"]["layers"][0]["params"]["brightness"] = 0.25
+            state["rev"] += 1
+            assert eng.tick() and eng.flush()
+        finally:
+            autosave.sanitize_for_json = orig
+            eng.close()
+        assert calls and not any(calls), calls  # only the changed section, on the worker
+        assert eng._saved["layout"] is layout and eng.stats["journal"] == 1
+        assert autosave.recover_autosave(Path(td))["project"] == state["p"]
+
+
+def main():
+    test_revision_skips_and_journal_recovery()
+    test_without_revision_unchanged_saves_are_skipped()
+    test_snapshot_shares_unchanged_sections_off_the_ui_thread()
+    print("OK: autosave journal selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Selftest for behaviors.reload.BehaviorWatcher (changed-module reload, live state migration)."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+_PKG = "hr_probe_fx"
+
+_EFFECT = '''
+from behaviors.registry import BehaviorDef, register
+from {pkg}._util import LEVEL
+
+def _emit(*, num_leds, params, t, state):
+    return [(LEVEL + {bump}, 0, 0)] * num_leds
+
+def _migrate(state, old_version):
+    return {{"phase": state.get("phase", 0.0), "v": old_version}}
+
+def register_{key}():
+    register(BehaviorDef("{key}", title="{title}", preview_emit=_emit, arduino_emit=lambda **k: "",
+                         capabilities={{"shipped": False}}, state_version={version},
+                         migrate_state=_migrate))
+'''
+
+
+def _write(path: Path, text: str) -> None:
+    path.write_text(textwrap.dedent(text), encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))  # coarse-mtime filesystems
+
+
+class _Engine:
+    def __init__(self, layers):
+        from behaviors.state import EffectState
+
+        self.project = {"layers": layers}
+        self._state_by_uid = {L["uid"]: EffectState(phase=3.0) for L in layers}
+
+
+def test_only_changed_modules_reload_and_state_follows_version():
+    import importlib
+    from behaviors.registry import REGISTRY
+    from behaviors.reload import BehaviorWatcher
+
+    with tempfile.TemporaryDirectory() as td:
+        pkg = Path(td) / _PKG
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("", encoding="utf-8")
+        _write(pkg / "_util.py", "LEVEL = 10\n")
+        _write(pkg / "fx_a.py", _EFFECT.format(pkg=_PKG, key="hr_a", title="A", bump=0, version=1))
+        _write(pkg / "fx_b.py", _EFFECT.format(pkg=_PKG, key="hr_b", title="B", bump=1, version=1))
+        sys.path.insert(0, td)
+        try:
+            for m in ("fx_a", "fx_b"):
+                getattr(importlib.import_module(f"{_PKG}.{m}"), f"register_hr_{m[-1]}")()
+            w = BehaviorWatcher(prefixes=(_PKG + ".",))
+            eng = _Engine([{"uid": "La", "behavior": "hr_a"}, {"uid": "Lb", "behavior": "hr_b"}])
+            def_b = REGISTRY["hr_b"]
+
+            assert w.reload_changed(eng).modules == []
+            os.utime(pkg / "fx_a.py")  # touched, same content: not a change
+            assert w.changed() == []
+
+            # Same state_version: live state kept; only fx_a reloads.
+            _write(pkg / "fx_a.py", _EFFECT.format(pkg=_PKG, key="hr_a", title="A2", bump=5, version=1))
+            rep = w.reload_changed(eng)
+            assert rep.ok and rep.modules == [f"{_PKG}.fx_a"] and rep.keys == ["hr_a"], rep
+            assert REGISTRY["hr_a"].title == "A2" and REGISTRY["hr_b"] is def_b
+            assert REGISTRY["hr_a"].preview_emit(num_leds=1, params={}, t=0.0, state={}) == [(15, 0, 0)]
+            assert (rep.kept, rep.migrated, rep.reset) == (1, 0, 0)
+            assert eng._state_by_uid["La"] == {"phase": 3.0}
+
+            # Bumped state_version with migrate_state: migrated in place.
+            st_a = eng._state_by_uid["La"]
+            _write(pkg / "fx_a.py", _EFFECT.format(pkg=_PKG, key="hr_a", title="A3", bump=5, version=2))
+            rep = w.reload_changed(eng)
+            assert rep.migrated == 1 and eng._state_by_uid["La"] is st_a and st_a == {"phase": 3.0, "v": 1}
+
+            # A helper edit reloads every loaded module importing from it.
+            _write(pkg / "_util.py", "LEVEL = 20\n")
+            rep = w.reload_changed(eng)
+            assert sorted(rep.modules) == [f"{_PKG}._util", f"{_PKG}.fx_a", f"{_PKG}.fx_b"], rep
+            assert REGISTRY["hr_b"].preview_emit(num_leds=1, params={}, t=0.0, state={}) == [(21, 0, 0)]
+
+            # A broken edit keeps the previous definition live and reports the error.
+            _write(pkg / "fx_b.py", "def register_hr_b(:\n")
+            rep = w.reload_changed(eng)
+            assert not rep.ok and f"{_PKG}.fx_b" in rep.errors
+            assert REGISTRY["hr_b"].preview_emit(num_leds=1, params={}, t=0.0, state={}) == [(21, 0, 0)]
+            assert w.reload_changed(eng).modules == []  # not retried until edited again
+
+            # Undeclared version: state reset (re-initialised by the engine next frame).
+            _write(pkg / "fx_b.py", _EFFECT.format(pkg=_PKG, key="hr_b", title="B", bump=1, version=None))
+            rep = w.reload_changed(eng)
+            assert rep.ok and rep.reset == 1 and eng._state_by_uid["Lb"] == {}
+        finally:
+            sys.path.remove(td)
+            for m in [m for m in sys.modules if m == _PKG or m.startswith(_PKG + ".")]:
+                sys.modules.pop(m, None)
+            for k in ("hr_a", "hr_b"):
+                dict.pop(REGISTRY, k, None)
+
+
+def main():
+    test_only_changed_modules_reload_and_state_follows_version()
+    print("OK: behavior hot reload selftest passed")
+
+
+if __name__ == "__main__":
+    main()
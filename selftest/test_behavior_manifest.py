@@ -0,0 +1,103 @@
+"""Selftest for behaviors.manifest (lazy registry from a generated behavior manifest)."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = r'''
+import json, sys
+import behaviors.manifest as man
+import behaviors
+from behaviors.registry import REGISTRY, list_effects, describe_effect
+keys = list_effects()
+before = sorted(m for m in sys.modules if m.startswith("behaviors.effects."))
+d = REGISTRY.get("sweep")
+after = sorted(m for m in sys.modules if m.startswith("behaviors.effects."))
+print(json.dumps({
+    "mode": man.LAST_MODE,
+    "keys": keys,
+    "before": before,
+    "after": after,
+    "sweep": [d.title, d.uses, "scanner" in dict.keys(REGISTRY), "solid" in dict.keys(REGISTRY)],
+    "described": describe_effect("solid"),
+    "defs": {k: [REGISTRY[k].title, REGISTRY[k].uses, REGISTRY[k].capabilities] for k in keys},
+}))
+'''
+
+
+def _probe(env):
+    out = subprocess.check_output([sys.executable, "-c", _PROBE], cwd=str(REPO_ROOT), env=env)
+    return json.loads(out.decode("utf-8").strip().splitlines()[-1])
+
+
+def test_lazy_registry_matches_eager_and_imports_on_demand():
+    with tempfile.TemporaryDirectory() as td:
+        env = dict(os.environ, MODULO_BEHAVIOR_MANIFEST=str(Path(td) / "m.json"), PYTHONPATH=str(REPO_ROOT))
+        env.pop("MODULO_EAGER_BEHAVIORS", None)
+        first = _probe(env)       # no manifest yet: eager build + write
+        lazy = _probe(env)        # fresh manifest: nothing imported until first get
+        eager = _probe(dict(env, MODULO_EAGER_BEHAVIORS="1"))
+
+        assert first["mode"] == "rebuilt" and lazy["mode"] == "manifest" and eager["mode"] == "eager"
+        assert Path(td, "m.json").exists()
+        assert lazy["before"] == []
+        assert lazy["after"] == ["behaviors.effects.scanner"]
+        assert lazy["sweep"] == ["Sweep", eager["sweep"][1], False, False]  # only register_sweep() ran
+        assert lazy["described"]["title"] == eager["defs"]["solid"][0]
+        assert lazy["keys"] == eager["keys"] == first["keys"]
+        assert lazy["defs"] == eager["defs"]
+
+
+def test_unwritable_manifest_path_does_not_fail_import():
+    with tempfile.TemporaryDirectory() as td:
+        blocker = Path(td) / "not_a_dir"
+        blocker.write_text("x", encoding="utf-8")
+        env = dict(os.environ, MODULO_BEHAVIOR_MANIFEST=str(blocker / "m.json"), PYTHONPATH=str(REPO_ROOT))
+        env.pop("MODULO_EAGER_BEHAVIORS", None)
+        res = _probe(env)
+        assert res["mode"] == "rebuilt" and "solid" in res["keys"]
+        assert sorted(p.name for p in Path(td).iterdir()) == ["not_a_dir"]
+
+
+def test_manifest_staleness_by_file_stamps():
+    from behaviors import manifest as man
+
+    with tempfile.TemporaryDirectory() as td:
+        p = Path(td) / "m.json"
+        data = {
+            "version": man.MANIFEST_VERSION,
+            "files": {rel: man._stamp(rel) for rel in man._CORE_FILES + ("behaviors/effects/solid.py",)},
+            "behaviors": {"solid": {"module": "behaviors.effects.solid", "register": "register_solid"}},
+        }
+        man.write_manifest(data, p)
+        assert man.load_manifest(p) == data
+
+        stale = json.loads(json.dumps(data))
+        stale["files"]["behaviors/effects/solid.py"][0] -= 1  # module edited since the build
+        man.write_manifest(stale, p)
+        assert man.load_manifest(p) is None
+
+        missing = json.loads(json.dumps(data))
+        missing["files"]["behaviors/effects/gone.py"] = [1, 1]
+        man.write_manifest(missing, p)
+        assert man.load_manifest(p) is None
+
+        assert "register_solid" in man.register_all_calls()
+
+
+def main():
+    test_lazy_registry_matches_eager_and_imports_on_demand()
+    test_unwritable_manifest_path_does_not_fail_import()
+    test_manifest_staleness_by_file_stamps()
+    print("OK: behavior manifest selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Selftest for runtime.broadphase_v1 (grid pairs, tag filters, obstacle index, exact counts)."""
+
+from __future__ import annotations
+
+import copy
+import random
+
+
+def _brute_pairs(xs, ys, rs, tags, tag_a="", tag_b="", wrap=None):
+    from runtime.broadphase_v1 import tags_match
+
+    out = []
+    for i in range(len(xs)):
+        for j in range(i + 1, len(xs)):
+            if not tags_match(tags[i], tags[j], tag_a, tag_b):
+                continue
+            dx, dy = xs[i] - xs[j], ys[i] - ys[j]
+            if wrap:
+                w, h = wrap
+                if dx > w / 2: dx -= w
+                if dx < -w / 2: dx += w
+                if dy > h / 2: dy -= h
+                if dy < -h / 2: dy += h
+            if dx * dx + dy * dy <= (rs[i] + rs[j]) ** 2:
+                out.append((i, j))
+    return out
+
+
+def test_pairs_match_brute_force_with_tags_and_wrap():
+    from behaviors.state_runtime import find_collisions, spawn_entity
+    from runtime.broadphase_v1 import BroadphaseV1
+    from runtime.entities import Entity, collide, collide_pairs
+
+    rnd = random.Random(7)
+    n = 300
+    xs = [rnd.uniform(0, 40) for _ in range(n)]
+    ys = [rnd.uniform(0, 20) for _ in range(n)]
+    rs = [rnd.choice((0.2, 0.5, 1.5)) for _ in range(n)]
+    tags = [rnd.choice(("bullet", "rock", "")) for _ in range(n)]
+    bp = BroadphaseV1().rebuild(xs, ys, rs, tags)
+    for ta, tb in (("", ""), ("rock", ""), ("bullet", "rock"), ("", "rock")):
+        assert bp.overlapping_pairs(ta, tb) == _brute_pairs(xs, ys, rs, tags, ta, tb), (ta, tb)
+    assert bp.pair_tests < n * (n - 1) // 2 // 4
+
+    state = {}
+    for i in range(n):
+        spawn_entity(state, x=xs[i], y=ys[i], r=rs[i], tag=tags[i])
+    state["entities"][3]["alive"] = False
+    alive = [k for k in range(n) if k != 3]
+    ids = lambda pairs: [(alive[i] + 1, alive[j] + 1) for i, j in pairs]
+    ax = [xs[k] for k in alive]; ay = [ys[k] for k in alive]
+    ar = [rs[k] for k in alive]; at = [tags[k] for k in alive]
+    assert find_collisions(state, tag_a="bullet", tag_b="rock") == ids(_brute_pairs(ax, ay, ar, at, "bullet", "rock"))
+
+    ents = [Entity(rnd.choice("ab"), rnd.random(), rnd.random(), 0.0, 0.0, rnd.uniform(0.005, 0.03)) for _ in range(400)]
+    for wrap in (True, False):
+        want = [(i, j) for i in range(len(ents)) for j in range(i + 1, len(ents)) if collide(ents[i], ents[j], wrap=wrap)]
+        assert collide_pairs(ents, wrap=wrap) == want and want
+    assert any(abs(ents[i].x - ents[j].x) > 0.5 for i, j in collide_pairs(ents))  # across the seam
+
+
+def test_projectile_hits_match_full_scan():
+    from behaviors.state_runtime import apply_projectile_hits, circle_collide, spawn_entity
+
+    def reference(state):
+        lst = state["entities"]
+        bullets = [e for e in lst if e["tag"] == "bullet"]
+        targets = [e for e in lst if e["tag"] == "target"]
+        for b in bullets:
+            for t in targets:
+                if b["alive"] and t["alive"] and circle_collide(b, t):
+                    b["alive"] = False
+                    t["hp"] = int(t.get("hp", 1)) - 1
+                    if t["hp"] <= 0:
+                        t["alive"] = False
+                    break
+        state["entities"] = [e for e in lst if e["alive"]]
+
+    rnd = random.Random(3)
+    state = {}
+    for _ in range(200):
+        spawn_entity(state, x=rnd.uniform(0, 30), y=rnd.uniform(0, 30), r=0.4, tag=rnd.choice(("bullet", "target")))
+    for e in state["entities"]:
+        e["hp"] = rnd.randint(1, 2)
+    ref = copy.deepcopy(state)
+    reference(ref)
+    assert apply_projectile_hits(state) > 0
+    assert state == ref
+
+
+def test_obstacle_index_and_exact_pair_counts():
+    from runtime.constraints_v1 import (
+        CircleObstacleV1, SegmentObstacleV1, apply_constraints, build_obstacle_index,
+    )
+    from runtime.particle_pairs_v1 import count_pairs_within_radius_v1
+    from runtime.particles_v1 import Particle
+
+    rnd = random.Random(5)
+    circles = [CircleObstacleV1(rnd.uniform(0, 64), rnd.uniform(0, 32), rnd.uniform(0.5, 3.0)) for _ in range(60)]
+    circles.append(CircleObstacleV1(32.0, 16.0, 200.0))  # huge: checked everywhere
+    segments = [SegmentObstacleV1(*(rnd.uniform(0, 64) for _ in range(4))) for _ in range(30)]
+    index = build_obstacle_index(circles, segments)
+
+    def parts():
+        r = random.Random(9)
+        return [Particle(x=r.uniform(0, 64), y=r.uniform(0, 32), vx=r.uniform(-1, 1), vy=r.uniform(-1, 1), life=1.0)
+                for _ in range(500)]
+    a, b = parts(), parts()
+    for _ in range(3):
+        apply_constraints(a, width=64, height=32, circles=circles, segments=segments)
+        apply_constraints(b, width=64, height=32, index=index)
+    assert [(p.x, p.y, p.vx, p.vy) for p in a] == [(p.x, p.y, p.vx, p.vy) for p in b]
+
+    pts = [{"x": rnd.uniform(0, 20), "y": rnd.uniform(0, 20)} for _ in range(600)]
+    brute = sum(1 for i in range(len(pts)) for j in range(i + 1, len(pts))
+                if (pts[i]["x"] - pts[j]["x"]) ** 2 + (pts[i]["y"] - pts[j]["y"]) ** 2 <= 1.25 ** 2)
+    assert count_pairs_within_radius_v1(pts, 1.25, max_pairs_checked=0) == (brute, brute)
+    assert count_pairs_within_radius_v1(pts, 1.25, max_pairs_checked=0, mode="near") == (brute, 0)
+    capped = count_pairs_within_radius_v1(pts, 1.25, max_pairs_checked=2000)[0]
+    assert capped < brute  # legacy budget still truncates when asked
+    assert count_pairs_within_radius_v1(pts, 1.25, mode="off") == (0, 0)
+
+
+def test_non_finite_positions_never_collide():
+    from behaviors.state_runtime import apply_projectile_hits, find_collisions, spawn_entity
+    from runtime.broadphase_v1 import BroadphaseV1
+    from runtime.entities import Entity, collide_pairs
+
+    nan, inf = float("nan"), float("inf")
+    state = {}
+    for x, y, tag in ((1.0, 1.0, "bullet"), (nan, 1.0, "target"), (1.2, 1.0, "target"),
+                      (inf, -inf, "bullet"), (1.0, nan, "bullet"), (-inf, 0.0, "target")):
+        spawn_entity(state, x=x, y=y, r=0.5, tag=tag)
+    assert find_collisions(state) == [(1, 3)]
+    assert find_collisions(state, tag_a="bullet", tag_b="target") == [(1, 3)]
+    assert apply_projectile_hits(state) == 1
+    assert [e["id"] for e in state["entities"]] == [2, 4, 5, 6]
+
+    bp = BroadphaseV1().rebuild([0.0, nan, 0.5], [0.0, 0.0, inf], [0.5, 0.5, 0.5])
+    assert bp.overlapping_pairs() == [] and bp.count_within(10.0) == 0
+    assert bp.query_circle(0.0, 0.0, 0.1) == [0] and bp.query_circle(nan, 0.0, 1.0) == []
+
+    ents = [Entity("a", 0.5, 0.5, 0.0, 0.0, 0.1), Entity("a", nan, 0.5, 0.0, 0.0, 0.1),
+            Entity("b", 0.55, 0.5, 0.0, 0.0, 0.1), Entity("b", inf, inf, 0.0, 0.0, 0.1)]
+    for wrap in (True, False):
+        assert collide_pairs(ents, wrap=wrap) == [(0, 2)]
+
+
+def main():
+    test_pairs_match_brute_force_with_tags_and_wrap()
+    test_projectile_hits_match_full_scan()
+    test_obstacle_index_and_exact_pair_counts()
+    test_non_finite_positions_never_collide()
+    print("OK: broadphase selftest passed")
+
+
+if __name__ == "__main__":
+    main()
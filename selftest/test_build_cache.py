@@ -0,0 +1,114 @@
+"""Selftest for export.build_cache (cached job runner behind parity sweep / golden exports)."""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _boom_on_3(x):
+    if x == 3:
+        raise ValueError("three")
+    return x * 10
+
+
+def test_run_jobs_order_cache_and_errors():
+    from export.build_cache import ResultCache, cell_key, hash_json, run_jobs
+
+    assert hash_json({"a": 1, "b": [1, 2]}) == hash_json({"b": [1, 2], "a": 1})
+    k1 = cell_key("t", {"layers": [1]}, "pack")
+    assert k1 != cell_key("t", {"layers": [2]}, "pack")
+    assert k1 != cell_key("t", {"layers": [1]}, "pack2")
+    assert k1 != cell_key("t", {"layers": [1]}, "pack", mode="arduino")
+
+    with tempfile.TemporaryDirectory() as td:
+        cache = ResultCache("unit", root=Path(td))
+        jobs = [(f"k{i}", i) for i in range(6)]
+        res = list(run_jobs(_boom_on_3, jobs, cache=cache, workers=1, chunksize=4))
+        assert [r.key for r in res] == [k for k, _ in jobs]
+        assert [r.value for r in res if r.ok] == [0, 10, 20, 40, 50]
+        assert not res[3].ok and "ValueError" in res[3].error
+        assert not any(r.cached for r in res)
+
+        # Fresh cache object: everything but the failed cell comes from disk.
+        cache2 = ResultCache("unit", root=Path(td))
+        res2 = list(run_jobs(_boom_on_3, jobs, cache=cache2, workers=1))
+        assert [r.cached for r in res2] == [True, True, True, False, True, True]
+        assert [r.value for r in res2] == [r.value for r in res]
+
+        # Pruning drops entries the run did not touch.
+        cache3 = ResultCache("unit", root=Path(td))
+        list(run_jobs(_boom_on_3, jobs[:2], cache=cache3, workers=1))
+        cache3.flush(prune=True)
+        cache4 = ResultCache("unit", root=Path(td))
+        assert cache4.get("k1") == 10 and cache4.get("k4") is None
+
+        # Disabled cache never reads or writes.
+        off = ResultCache("off", root=Path(td), enabled=False)
+        list(run_jobs(_boom_on_3, jobs[:1], cache=off, workers=1))
+        assert not (Path(td) / "off.json").exists()
+
+    # Process pool path gives the same ordered results (fn must be importable).
+    jobs = [(None, {"i": i}) for i in range(5)]
+    pooled = [r.value for r in run_jobs(hash_json, jobs, workers=2)]
+    assert pooled == [hash_json({"i": i}) for i in range(5)]
+
+
+def test_run_jobs_flushes_periodically():
+    import export.build_cache as bc
+
+    saved = bc.FLUSH_EVERY_RESULTS
+    bc.FLUSH_EVERY_RESULTS = 2
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            cache = bc.ResultCache("periodic", root=Path(td))
+            jobs = [(f"k{i}", i) for i in range(5)]
+            it = bc.run_jobs(_boom_on_3, jobs, cache=cache, workers=1)
+            next(it)
+            assert not (Path(td) / "periodic.json").exists()  # one result: not yet persisted
+            next(it)
+            assert bc.ResultCache("periodic", root=Path(td)).get("k1") == 10
+            list(it)
+            assert bc.ResultCache("periodic", root=Path(td)).get("k4") == 40
+    finally:
+        bc.FLUSH_EVERY_RESULTS = saved
+
+
+def test_parity_sweep_second_run_is_cached():
+    spec = importlib.util.spec_from_file_location("_parity_sweep_tool", REPO_ROOT / "tools" / "parity_sweep.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+
+    with tempfile.TemporaryDirectory() as td:
+        old = os.environ.get("MODULO_BUILD_CACHE")
+        os.environ["MODULO_BUILD_CACHE"] = str(Path(td) / "cache")
+        try:
+            out1, out2 = Path(td) / "r1", Path(td) / "r2"
+            mod.main(["--out-dir", str(out1), "--workers", "1"])
+            mod.main(["--out-dir", str(out2), "--workers", "1", "--json-summary"])
+        finally:
+            if old is None:
+                os.environ.pop("MODULO_BUILD_CACHE", None)
+            else:
+                os.environ["MODULO_BUILD_CACHE"] = old
+        csv1 = next(out1.glob("*.csv")).read_bytes()
+        csv2 = next(out2.glob("*.csv")).read_bytes()
+        assert csv1 == csv2 and csv1.count(b"\n") > 1
+        import json
+        summary = json.loads(next(out2.glob("*.summary.json")).read_text(encoding="utf-8"))
+        assert summary["cached_cells"] == csv2.count(b"\n") - 1
+
+
+def main():
+    test_run_jobs_order_cache_and_errors()
+    test_run_jobs_flushes_periodically()
+    test_parity_sweep_second_run_is_cached()
+    print("OK: build_cache selftest passed")
+
+
+if __name__ == "__main__":
+    main()
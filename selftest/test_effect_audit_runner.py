@@ -0,0 +1,28 @@
+"""Selftest for preview.effect_audit (headless, process-pool Effect Audit)."""
+
+from __future__ import annotations
+
+
+def test_effect_audit_parallel_matches_serial():
+    from preview.effect_audit import iter_effect_audit, format_audit_report
+
+    layout = {"shape": "strip", "num_leds": 60}
+    keys = ["solid", "rainbow", "sparkle", "wipe", "no_such_behavior"]
+    serial = list(iter_effect_audit(layout, keys=keys, workers=1))
+    parallel = list(iter_effect_audit(layout, keys=keys, workers=2))
+
+    by_key = {r.key: r for r in serial}
+    assert set(by_key) == set(keys)
+    assert by_key["solid"].status == "OK"
+    assert by_key["no_such_behavior"].status == "NO_BEHAVIOR"
+    # Isolated engines + deterministic audio/time: identical reports either way.
+    assert format_audit_report(serial) == format_audit_report(parallel)
+
+
+def main():
+    test_effect_audit_parallel_matches_serial()
+    print("OK: effect audit runner selftest passed")
+
+
+if __name__ == "__main__":
+    main()
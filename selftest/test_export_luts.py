@@ -0,0 +1,123 @@
+"""Selftest for export.luts + export.budget.plan_lookup_tables (baked XY map / gamma curves)."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _meta(tid):
+    return json.loads((ROOT / "export" / "targets" / tid / "target.json").read_text(encoding="utf-8"))
+
+
+def _run_cpp(src: str):
+    cxx = shutil.which("g++") or shutil.which("c++")
+    if not cxx:
+        return None
+    d = Path(tempfile.mkdtemp(prefix="luts_"))
+    try:
+        (d / "h.cpp").write_text(src, encoding="utf-8")
+        r = subprocess.run([cxx, "-std=c++11", "-O1", "-o", str(d / "h"), str(d / "h.cpp")], capture_output=True, text=True)
+        assert r.returncode == 0, r.stderr
+        out = subprocess.run([str(d / "h")], capture_output=True, text=True, check=True).stdout
+        return [float(v) for v in out.split()]
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def test_plan_follows_target_flash_budget():
+    from export.budget import plan_lookup_tables
+
+    uno, esp32 = _meta("arduino_uno_fastled_msgeq7"), _meta("esp32_fastled_msgeq7")
+    plan = plan_lookup_tables({}, uno, matrix_cells=16 * 16, gamma_values=[2.2, 2.2, 1.8])
+    assert (plan.storage, plan.xy_map, plan.gamma, plan.table_bytes) == ("progmem", True, [2.2, 1.8], 1024)
+    big = plan_lookup_tables({}, uno, matrix_cells=64 * 64, gamma_values=[2.2])
+    assert not big.xy_map and big.gamma == [2.2] and big.notes  # 8 KB map does not fit a 32 KB Uno
+    assert plan_lookup_tables({}, _meta("arduino_mega_fastled_msgeq7"), matrix_cells=64 * 64).xy_map
+    assert plan_lookup_tables({}, esp32, matrix_cells=64 * 64).storage == "const"
+    assert plan_lookup_tables({}, None, matrix_cells=64, gamma_values=[2.2]).table_bytes == 0
+    forced = {"export": {"lut_mode": "computed"}}
+    assert not plan_lookup_tables(forced, esp32, matrix_cells=64).xy_map
+
+
+def test_xy_table_matches_generated_modulo_xy():
+    from export.arduino_exporter import MATRIX_IMPL
+    from export.luts import emit_xy_impl, matrix_xy_table
+
+    combos = []
+    for w, h in ((5, 3), (4, 4), (3, 6)):
+        for origin in ("top_left", "TR", "tr", "bottom_left", "BR", "top_right"):
+            for rotate in (0, 90, 180, 270):
+                combos.append((w, h, (w + rotate) % 2 == 1, origin, rotate, rotate == 90, origin == "BR"))
+    undef = "\n".join(f"#undef {m}" for m in ("MATRIX_WIDTH", "MATRIX_HEIGHT", "MATRIX_SERPENTINE", "MATRIX_ORIGIN",
+                                              "MATRIX_ROTATE", "MATRIX_FLIP_X", "MATRIX_FLIP_Y", "MODULA_LED",
+                                              "MATRIX_W", "MATRIX_H", "XY", "MODULO_XY_LUT"))
+    src = ["#include <stdint.h>\n#include <stdio.h>\n#include <string.h>\nstatic void (*RUNS[64])();\nstatic int NRUN = 0;"]
+    for k, (w, h, serp, origin, rot, fx, fy) in enumerate(combos + [combos[-1]]):
+        lut = k == len(combos)  # last block: table-backed XY()/modulo_map_index()
+        table = matrix_xy_table(w, h, serpentine=serp, origin=origin, rotate=rot, flip_x=fx, flip_y=fy)
+        impl = (MATRIX_IMPL.replace("@@MATRIX_WIDTH@@", str(w)).replace("@@MATRIX_HEIGHT@@", str(h))
+                .replace("@@MATRIX_SERPENTINE@@", str(int(serp))).replace("@@MATRIX_ORIGIN@@", origin)
+                .replace("@@MATRIX_ROTATE@@", str(rot)).replace("@@MATRIX_FLIP_X@@", str(int(fx)))
+                .replace("@@MATRIX_FLIP_Y@@", str(int(fy)))
+                .replace("@@MATRIX_XY_IMPL@@", emit_xy_impl(table if lut else None)))
+        src.append(f"{undef}\nnamespace c{k} {{\n{impl}\nstatic void run() {{\n"
+                   f"  for (int y=0;y<{h};y++) for (int x=0;x<{w};x++) printf(\"%d %d \", (int)XY(x,y), (int)modulo_map_index(y*{w}+x));\n}}\n"
+                   f"struct R {{ R() {{ RUNS[NRUN++] = run; }} }} r;\n}}")
+    src.append("int main() { for (int i=0;i<NRUN;i++) RUNS[i](); return 0; }")
+    out = _run_cpp("\n".join(src))
+    if out is None:
+        print("SKIP: no C++ compiler; XY table parity not checked")
+        return
+    k = 0
+    for w, h, serp, origin, rot, fx, fy in combos + [combos[-1]]:
+        table = matrix_xy_table(w, h, serpentine=serp, origin=origin, rotate=rot, flip_x=fx, flip_y=fy)
+        got = [int(v) for v in out[k:k + 2 * w * h]]
+        assert got[0::2] == table and got[1::2] == table, (w, h, origin, rot)
+        k += 2 * w * h
+    assert k == len(out)
+
+
+def test_gamma_curves_in_sketch_and_within_tolerance():
+    from export.arduino_exporter import make_layerstack_sketch
+    from export.budget import plan_lookup_tables
+    from export.luts import emit_gamma_luts
+
+    proj = {"layout": {"kind": "strip", "num_leds": 16},
+            "layers": [{"behavior": "solid", "params": {}, "operators": [{"kind": "gamma", "p0": 2.2}]}]}
+    plain = make_layerstack_sketch(project=proj)
+    baked = make_layerstack_sketch(project=proj, lut_plan=plan_lookup_tables(proj, _meta("arduino_uno_fastled_msgeq7"),
+                                                                            gamma_values=[2.2]))
+    assert "GAMMA_LUT" not in plain and "{GAMMA_LUT" not in plain
+    assert "static const float GAMMA_LUT_G[MODULO_GAMMA_LUTS] = {2.2};" in baked and "gamma_lut_slot(p0)" in baked
+    assert baked.index("gamma_lut_slot(p0)") < baked.index("powf(clamp01(r/255.0f), inv)")
+
+    decls, _branch = emit_gamma_luts([2.2, 0.8])
+    xs = [i * 0.37 for i in range(int(255 / 0.37) + 1)] + [255.0, 300.0, -4.0]
+    body = "\n".join(f"  printf(\"%.6f %.6f\\n\", gamma_lut_apply(0, {x!r}f), gamma_lut_apply(1, {x!r}f));" for x in xs)
+    out = _run_cpp("#include <stdint.h>\n#include <stdio.h>\n" + decls + "int main() {\n" + body + "\n  return 0;\n}\n")
+    if out is None:
+        print("SKIP: no C++ compiler; gamma curve parity not checked")
+        return
+    for k, x in enumerate(xs):
+        v = min(1.0, max(0.0, x / 255.0))
+        for j, g in enumerate((2.2, 0.8)):
+            want = 255.0 * v ** (1.0 / g)
+            tol = 1.0 if x >= 8.0 else 6.0  # steep segment next to black
+            assert abs(out[2 * k + j] - want) <= tol, (g, x, out[2 * k + j], want)
+
+
+def main():
+    test_plan_follows_target_flash_budget()
+    test_xy_table_matches_generated_modulo_xy()
+    test_gamma_curves_in_sketch_and_within_tolerance()
+    print("OK: export LUTs selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Selftest for export.export_cache (per-section memo behind make_layerstack_sketch)."""
+
+from __future__ import annotations
+
+import copy
+import os
+
+
+def _project():
+    return {
+        "layout": {"kind": "strip", "num_leds": 30, "led_pin": 6},
+        "layers": [{"behavior": "chase", "enabled": True, "params": {"speed": 0.5},
+                    "operators": [{"kind": "gain", "p0": 1.2}]}],
+        "variables": {"number": {"level": 0.0}, "toggle": {}},
+        "rules_v6": [{"id": "r1", "name": "bump", "enabled": True, "trigger": "tick",
+                      "action": {"kind": "add_var", "var_kind": "number", "var": "level",
+                                 "expr": {"src": "const", "const": 0.1}}}],
+        "postfx": {"trail_amount": 0.2},
+    }
+
+
+def _misses(stats):
+    return {k: v["misses"] for k, v in stats.items()}
+
+
+def test_sections_reused_and_invalidated_per_input():
+    from export.arduino_exporter import ExportValidationError, make_layerstack_sketch
+    from export.export_cache import SECTION_CACHE
+
+    SECTION_CACHE.clear()
+    proj = _project()
+    first = make_layerstack_sketch(project=proj)
+    assert _misses(SECTION_CACHE.stats) == {"postfx": 1, "rules_v6": 1, "layers": 1}
+
+    # Unchanged project (already mutated in place by the first export): all sections hit.
+    assert make_layerstack_sketch(project=proj) == first
+    # Wiring-only change: still no section re-emitted.
+    proj["layout"]["led_pin"] = 3
+    make_layerstack_sketch(project=proj)
+    assert _misses(SECTION_CACHE.stats) == {"postfx": 1, "rules_v6": 1, "layers": 1}
+
+    # A layer param change only re-runs the layer section.
+    proj["layers"][0]["params"]["speed"] = 0.9
+    make_layerstack_sketch(project=proj)
+    assert _misses(SECTION_CACHE.stats) == {"postfx": 1, "rules_v6": 1, "layers": 2}
+
+    # Output is identical to an uncached build.
+    os.environ["MODULO_EXPORT_CACHE"] = "0"
+    try:
+        assert make_layerstack_sketch(project=_project()) == first
+    finally:
+        os.environ.pop("MODULO_EXPORT_CACHE", None)
+
+    # Failing sections are never cached: the error repeats on every export.
+    bad = copy.deepcopy(_project())
+    bad["rules_v6"][0]["action"]["var"] = "missing"
+    for _ in range(2):
+        try:
+            make_layerstack_sketch(project=bad)
+        except ExportValidationError as e:
+            assert "E_RULE_UNKNOWN_VAR" in str(e)
+        else:
+            raise AssertionError("expected ExportValidationError")
+
+
+def main():
+    test_sections_reused_and_invalidated_per_input()
+    print("OK: export section cache selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Selftest for runtime.field_bake_v1 (baked vector fields, batched sampling)."""
+
+from __future__ import annotations
+
+import random
+
+
+def _fields():
+    from runtime.vector_fields_v1 import (
+        ConstantField, ConstantFieldConfig, VortexField, VortexFieldConfig,
+        CurlNoiseField, CurlNoiseFieldConfig,
+    )
+    return [
+        ConstantField(ConstantFieldConfig(vx=0.5, vy=-0.25)),
+        VortexField(VortexFieldConfig(cx=7.3, cy=4.1, strength=2.0)),
+        CurlNoiseField(CurlNoiseFieldConfig(seed=3, scale=0.2, time_scale=0.5)),
+    ]
+
+
+def test_bake_sums_fields_exactly_at_nodes():
+    from runtime.field_bake_v1 import BakedFieldV1, FieldGridConfigV1
+
+    fields = _fields()
+    baked = BakedFieldV1(fields, FieldGridConfigV1(w=12, h=9, x0=-1.0, y0=0.5, cell=1.5))
+    xs, ys = baked.node_coords()
+    pts = [(x, y) for y in ys for x in xs]
+    vx, vy = baked.sample_many([p[0] for p in pts], [p[1] for p in pts], t=2.0)
+    for (x, y), a, b in zip(pts, vx, vy):
+        ex = sum(f.sample(x, y, 2.0)[0] for f in fields)
+        ey = sum(f.sample(x, y, 2.0)[1] for f in fields)
+        assert abs(a - ex) < 1e-9 and abs(b - ey) < 1e-9
+
+    # Between nodes: bilinear (exact for a linear field), edges clamp.
+    from runtime.vector_fields_v1 import ConstantField, ConstantFieldConfig
+    lin = BakedFieldV1([ConstantField(ConstantFieldConfig(vx=1.0, vy=2.0))], FieldGridConfigV1(w=4, h=4))
+    assert lin.sample(1.25, 2.75) == (1.0, 2.0) and lin.sample(-9.0, 99.0) == (1.0, 2.0)
+
+
+def test_rebake_only_when_time_or_params_change():
+    from runtime.field_bake_v1 import BakedFieldV1, bake_for_layout
+    from runtime.particles_v1 import ParticleSystemV1, Particle, module_field_advection
+
+    static = _fields()[:2]
+    baked = bake_for_layout(static, 16, 8)
+    for k in range(5):
+        baked.sample(3.0, 3.0, t=k * 0.1)
+    assert baked.bakes == 1  # constant + vortex ignore t
+    static[1].cfg.strength = 3.0
+    baked.sample(3.0, 3.0, t=1.0)
+    assert baked.bakes == 2  # config changed
+
+    moving = BakedFieldV1(_fields())
+    moving.sample(1.0, 1.0, t=0.0)
+    moving.sample(2.0, 1.0, t=0.0)
+    moving.sample(1.0, 1.0, t=0.5)
+    assert moving.bakes == 2
+
+    # One bake per tick regardless of particle count; plain fields keep per-point sampling.
+    rnd = random.Random(4)
+    sysA, sysB = ParticleSystemV1(), ParticleSystemV1()
+    for _ in range(500):
+        x, y = rnd.uniform(0, 16), rnd.uniform(0, 8)
+        sysA.particles.append(Particle(x=x, y=y, vx=0.0, vy=0.0, life=1.0))
+        sysB.particles.append(Particle(x=x, y=y, vx=0.0, vy=0.0, life=1.0))
+    grid = bake_for_layout(_fields()[:2], 16, 8)
+    module_field_advection(grid)(sysA, 1.0 / 60.0, 0.0)
+    assert grid.bakes == 1
+    for pa in sysA.particles[:20]:
+        ex, ey = grid.sample(pa.x, pa.y)
+        assert abs(pa.vx - ex / 60.0) < 1e-12 and abs(pa.vy - ey / 60.0) < 1e-12
+    plain = _fields()[1]
+    module_field_advection(plain)(sysB, 1.0 / 60.0, 0.0)
+    pb = sysB.particles[0]
+    assert pb.vx == plain.sample(pb.x, pb.y, 0.0)[0] * 1.0 * (1.0 / 60.0)
+
+
+def test_buffer_advection_samples_cell_centers_once():
+    from runtime.buffer_advection_v1 import _cell_center_velocities
+    from runtime.field_bake_v1 import bake_for_layout
+
+    plain, curl = _fields()[1], _fields()[2]
+    gx, gy = _cell_center_velocities(plain, 8, 4)
+    assert gx[3][5] == plain.sample(5.5, 3.5, 0.0)[0] and gy[0][0] == plain.sample(0.5, 0.5, 0.0)[1]
+    cx, cy = _cell_center_velocities(curl, 8, 4)  # batched curl grid, same values as sample()
+    assert (cx[2][6], cy[2][6]) == curl.sample(6.5, 2.5, 0.0)
+    bx, _by = _cell_center_velocities(bake_for_layout(plain, 8, 4, oversample=2), 8, 4)
+    assert abs(bx[1][1] - gx[1][1]) < 1e-9  # cell centers are bake nodes at oversample=2
+
+
+def test_spawner_field_module_advects_through_baked_curl():
+    from runtime import spawner_v1
+
+    def _project(modules):
+        parts = [{"x": 2.0 + i, "y": 3.0, "vx": 0.0, "vy": 0.0, "life": 5.0} for i in range(6)]
+        state = {"seed": 1, "max_particles": 64, "wrap_edges": True, "friction": 0.0,
+                 "bounds": [0.0, 0.0, 15.0, 7.0], "particles": parts, "modules": modules}
+        return {"particle_systems_v1": {"swirl": {"state": state}}}
+
+    layout = {"matrix_w": 16, "matrix_h": 8}
+    module = {"type": "field", "field": "curl", "seed": 3, "scale": 0.2, "strength": 4.0}
+    spawner_v1._FIELD_CACHE.clear()
+    with_field, without = _project([module]), _project([])
+    for k in range(3):
+        for proj in (with_field, without):
+            spawner_v1._signals_provider({"project": proj, "layout": layout, "dt": 0.1, "t": 0.1 * k})
+
+    state = with_field["particle_systems_v1"]["swirl"]["state"]
+    assert state["modules"] == [module]  # module config survives the per-frame save-back
+    moved = state["particles"]
+    still = without["particle_systems_v1"]["swirl"]["state"]["particles"]
+    assert all(a["vx"] != 0.0 or a["vy"] != 0.0 for a in moved) and all(b["vx"] == 0.0 for b in still)
+    (baked,) = spawner_v1._FIELD_CACHE.values()
+    assert baked.bakes == 1  # static curl field: baked once across rebuilt systems
+    assert (baked.cfg.w, baked.cfg.h, baked.cfg.x0, baked.cfg.y0) == (16, 8, 0.0, 0.0)
+
+
+def test_bake_for_bounds_covers_offset_bounds_with_capped_nodes():
+    from runtime.field_bake_v1 import bake_for_bounds
+    from runtime.vector_fields_v1 import CurlNoiseField, CurlNoiseFieldConfig
+    from runtime import spawner_v1
+
+    curl = CurlNoiseField(CurlNoiseFieldConfig(seed=9, scale=0.15))
+    baked = bake_for_bounds(curl, (-10.0, -10.0, 10.0, 10.0))
+    assert (baked.cfg.x0, baked.cfg.y0, baked.cfg.w, baked.cfg.h) == (-10.0, -10.0, 21, 21)
+    for x, y in ((-8.0, -6.0), (-3.0, -3.0), (4.0, 9.0)):  # nodes: exact, not clamped to a corner
+        bx, by = baked.sample(x, y)
+        ex, ey = curl.sample(x, y)
+        assert abs(bx - ex) < 1e-9 and abs(by - ey) < 1e-9
+    assert baked.sample(-8.0, -6.0) != baked.sample(-10.0, -10.0)
+
+    huge = bake_for_bounds(curl, (0.0, 0.0, 5000.0, 300.0), max_nodes=4096)
+    assert huge.cfg.w * huge.cfg.h <= 4096 and huge.cfg.x0 + (huge.cfg.w - 1) * huge.cfg.cell >= 5000.0
+
+    # Animated fields re-bake at most bake_hz times per second of engine time.
+    moving = bake_for_bounds(CurlNoiseField(CurlNoiseFieldConfig(seed=9, time_scale=0.5)), (0, 0, 8, 8), bake_hz=10.0)
+    for k in range(10):
+        moving.sample(1.0, 1.0, t=k / 100.0)
+    assert moving.bakes == 1
+    moving.sample(1.0, 1.0, t=0.1)
+    assert moving.bakes == 2
+
+    # Layout coords centered on the origin give negative particle bounds.
+    spawner_v1._FIELD_CACHE.clear()
+    field = spawner_v1._baked_field({"type": "field", "field": "curl", "seed": 9, "scale": 0.15}, (-10.0, -10.0, 10.0, 10.0))
+    assert (field.cfg.x0, field.cfg.y0) == (-10.0, -10.0)
+
+
+def main():
+    test_bake_sums_fields_exactly_at_nodes()
+    test_rebake_only_when_time_or_params_change()
+    test_buffer_advection_samples_cell_centers_once()
+    test_spawner_field_module_advects_through_baked_curl()
+    test_bake_for_bounds_covers_offset_bounds_with_capped_nodes()
+    print("OK: field bake selftest passed")
+
+
+if __name__ == "__main__":
+    main()
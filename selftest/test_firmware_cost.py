@@ -0,0 +1,121 @@
+"""Selftest for export.budget.estimate_firmware_cost (declared kernel costs -> predicted FPS) and its gate."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _meta(tid):
+    return json.loads((ROOT / "export" / "targets" / tid / "target.json").read_text(encoding="utf-8"))
+
+
+def _heavy():
+    return {"layout": {"kind": "cells", "width": 16, "height": 16},
+            "layers": [{"behavior": "rainbow", "params": {},
+                        "modulotors": [{"enabled": True, "kind": "lfo", "target": "brightness"}]},
+                       {"behavior": "boids_swarm", "params": {}}]}
+
+
+def test_every_kernel_declares_a_cost():
+    from export.arduino_exporter import LAYERSTACK_BEH_IDS, LAYERSTACK_FALLBACK_BEH_ID, LAYERSTACK_KERNEL_COSTS
+
+    ids = set(LAYERSTACK_BEH_IDS.values()) | {LAYERSTACK_FALLBACK_BEH_ID}
+    assert ids <= set(LAYERSTACK_KERNEL_COSTS), sorted(ids - set(LAYERSTACK_KERNEL_COSTS))
+    assert all(k.cycles_per_pixel > 0 and k.flash_bytes > 0 for k in LAYERSTACK_KERNEL_COSTS.values())
+
+
+def test_uno_is_slow_and_gated_esp32_is_not():
+    from export.budget import estimate_firmware_cost
+    from export.gating import gate_project_for_target
+
+    uno = estimate_firmware_cost(_heavy(), _meta("arduino_uno_fastled_msgeq7"))
+    assert (uno.arch, uno.cpu_hz, uno.math_mode) == ("avr", 16_000_000, "float")
+    assert uno.predicted_fps < 10 and uno.frame_breakdown_us["audio"] > 1000.0
+    assert abs(sum(uno.frame_breakdown_us.values()) - uno.frame_us) < 1e-6
+    assert uno.describe().startswith(f"Predicted ~{uno.predicted_fps:.0f} fps on avr @ 16 MHz")
+
+    gate = gate_project_for_target(_heavy(), _meta("arduino_uno_fastled_msgeq7"))
+    assert gate.prediction == uno.describe()
+    assert any(w.startswith("Predicted frame rate") for w in gate.warnings)
+    assert any("fixed math" in s for s in gate.suggestions)
+
+    fast = gate_project_for_target(_heavy(), _meta("esp32_fastled_msgeq7"))
+    assert not any("Predicted frame rate" in w for w in fast.warnings) and "esp32 @ 240 MHz" in fast.prediction
+    assert gate_project_for_target(_heavy(), {"id": "no_arch"}).prediction == ""
+    lenient = dict(_heavy(), export={"min_fps": 1})
+    assert not any("Predicted frame rate" in w for w in gate_project_for_target(lenient, _meta("arduino_uno_fastled_msgeq7")).warnings)
+
+
+def test_gate_checks_predicted_ram_and_flash():
+    from export.budget import RAM_WARN_SHARE, estimate_firmware_cost, estimate_project_budget_for_target
+    from export.gating import gate_project_for_target
+
+    uno = _meta("arduino_uno_fastled_msgeq7")
+    heavy = estimate_firmware_cost(_heavy(), uno)
+    assert heavy.ram_bytes > uno["ram_limit_bytes"]
+    gate = gate_project_for_target(_heavy(), uno)
+    assert not gate.ok and any(e.startswith(f"Estimated RAM {heavy.ram_bytes} bytes > limit 2048") for e in gate.errors)
+    assert any("Reduce LED count" in s for s in gate.suggestions)
+    # The budget estimate reports the model total instead of the LED-count formula.
+    assert estimate_project_budget_for_target(_heavy(), uno).est_ram_bytes == heavy.ram_bytes
+
+    strip = {"layout": {"kind": "strip", "num_leds": 60}, "layers": [{"behavior": "solid", "params": {}}]}
+    fits = gate_project_for_target(strip, uno)
+    assert fits.ok and not any(w.startswith("Estimated RAM") for w in fits.warnings)
+    tight = estimate_firmware_cost(strip, uno).ram_bytes
+    near = gate_project_for_target(strip, dict(uno, ram_limit_bytes=int(tight / RAM_WARN_SHARE) - 1))
+    assert near.ok and any(w.startswith(f"Estimated RAM {tight} bytes is over") for w in near.warnings)
+
+    small_flash = gate_project_for_target(strip, dict(uno, flash_limit_bytes=16384))
+    assert not small_flash.ok and any(e.startswith("Estimated flash") and "mostly" in e for e in small_flash.errors)
+    assert any(s.startswith("Reduce flash") for s in small_flash.suggestions)
+
+
+def test_clock_override_and_led_output():
+    from export.budget import CLOCKLESS_LATCH_US, CLOCKLESS_US_PER_LED, estimate_firmware_cost
+
+    meta = _meta("esp32_fastled_msgeq7")
+    base = estimate_firmware_cost(_heavy(), meta)
+    slow = estimate_firmware_cost(_heavy(), dict(meta, cpu_hz=80_000_000))
+    assert abs(slow.frame_breakdown_us["pixels"] - 3.0 * base.frame_breakdown_us["pixels"]) < 1e-3
+    assert base.frame_breakdown_us["LED output"] == 256 * CLOCKLESS_US_PER_LED + CLOCKLESS_LATCH_US
+    hub75 = estimate_firmware_cost(_heavy(), _meta("esp32_hub75_i2sdma_msgeq7"))
+    assert hub75.frame_breakdown_us["LED output"] == 0.0 and hub75.predicted_fps > base.predicted_fps
+
+
+def test_features_move_ram_and_cycles():
+    from export.budget import estimate_firmware_cost
+
+    uno = _meta("arduino_uno_fastled_msgeq7")
+    strip = {"layout": {"kind": "strip", "num_leds": 100}, "layers": [{"behavior": "solid", "params": {}}]}
+    base = estimate_firmware_cost(strip, uno)
+    more = estimate_firmware_cost(dict(strip, layers=strip["layers"] * 3), uno)
+    assert more.ram_bytes > base.ram_bytes and more.frame_us > base.frame_us
+    trail = estimate_firmware_cost(dict(strip, postfx={"trail_amount": 0.5}), uno)
+    assert trail.ram_breakdown["postfx"] == 300 and trail.frame_breakdown_us["postfx"] > 0.0
+    big = estimate_firmware_cost(dict(strip, layout={"kind": "strip", "num_leds": 200}, postfx={"trail_amount": 0.5}), uno)
+    assert big.ram_breakdown["postfx"] == 0 and big.notes  # MODULA_POSTFX_ENABLED is 0 above 120 LEDs on a Uno
+
+    gamma = dict(strip, layers=[{"behavior": "solid", "params": {}, "operators": [{"kind": "gamma", "p0": 2.2}]}])
+    with_lut = estimate_firmware_cost(gamma, uno)
+    without = estimate_firmware_cost(dict(gamma, export={"lut_mode": "computed"}), uno)
+    assert with_lut.frame_us < without.frame_us and with_lut.flash_breakdown["lookup tables"] == 256
+    lfo = dict(strip, layers=_heavy()["layers"][:1])
+    assert (estimate_firmware_cost(dict(lfo, export={"math_mode": "fixed"}), uno).frame_us
+            < estimate_firmware_cost(dict(lfo, export={"math_mode": "float"}), uno).frame_us)
+
+
+def main():
+    test_every_kernel_declares_a_cost()
+    test_uno_is_slow_and_gated_esp32_is_not()
+    test_gate_checks_predicted_ram_and_flash()
+    test_clock_override_and_led_output()
+    test_features_move_ram_and_cycles()
+    print("OK: firmware cost model selftest passed")
+
+
+if __name__ == "__main__":
+    main()
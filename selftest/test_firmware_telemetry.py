@@ -0,0 +1,161 @@
+"""Selftest for export.telemetry (MT1 frame timing records) and preview.firmware_telemetry (host collector)."""
+
+from __future__ import annotations
+
+import os
+import time
+
+# Recorded from a 2-layer board (debug print interleaved, one record lost, last line cut by a reset).
+_CAPTURE = [
+    "[Modulo] purpose f0=0.00",
+    "MT1,0,31,1006,32150,35020,1840,412,2100,0,7790,12008,8000",
+    "MT1,1,31,1001,32300,33100,1840,420,2110,0,7790,12100,8040",
+    "MT1,3,32,1010,31000,32000,1840,400,2000,0,7790,11000,7970",
+    "MT1,4,3",
+]
+
+# Loop shaped like the layer-stack sketch, with fixed stage costs on the harness's scripted clock:
+# per pixel 10 us setup and 15 us output write, per layer 2 us target check and 5 us params;
+# layer 1 skips odd pixels.
+_FIXTURE = r"""#include <FastLED.h>
+#define NUM_LEDS 4
+#define LAYERS 2
+#define DBG_PURPOSE_SERIAL 0
+#define DBG_SERIAL_BAUD 115200
+CRGB leds[NUM_LEDS];
+{TELEMETRY_DECLS}void setup() {
+  FastLED.addLeds<WS2812B, 6, GRB>(leds, NUM_LEDS);
+{TM_SETUP}}
+void loop() {
+{TM_FRAME_BEGIN}  delayMicroseconds(300);
+{TM_INPUT}  delayMicroseconds(100);
+{TM_RULES}  for (int i=0; i<NUM_LEDS; i++) {
+    delayMicroseconds(10);
+{TM_PIXEL_BEGIN}    for (int li=0; li<LAYERS; li++) {
+      delayMicroseconds(2);
+      if (li == 1 && (i & 1)) {
+{TM_LAYER_SKIP}        continue;
+      }
+      delayMicroseconds(5);
+{TM_LAYER_PARAMS}      delayMicroseconds(li == 0 ? 50 : 25);
+{TM_LAYER}    }
+    leds[i] = CRGB(i, 0, 0);
+    delayMicroseconds(15);
+{TM_PIXELS}  }
+  delayMicroseconds(40);
+{TM_POSTFX}  FastLED.show();
+  delayMicroseconds(500);
+{TM_SHOW}}
+"""
+
+
+def test_sketch_is_instrumented_only_when_enabled():
+    from export.arduino_exporter import make_layerstack_sketch
+    from export.telemetry import PLACEHOLDERS, telemetry_layer_names
+
+    proj = {"layout": {"kind": "strip", "num_leds": 16},
+            "layers": [{"behavior": "solid", "params": {}}, {"behavior": "audio_meter", "params": {}},
+                       {"name": "sweep", "behavior": "chase", "params": {}}]}
+    plain = make_layerstack_sketch(project=proj)
+    assert "mt_" not in plain and "MODULO_TELEMETRY" not in plain
+    assert not any(k in plain for k in PLACEHOLDERS)
+
+    on = make_layerstack_sketch(project=dict(proj, export={"telemetry": True, "telemetry_interval_ms": 250}))
+    assert "#define MT_INTERVAL_MS 250u" in on and "if (!DBG_PURPOSE_SERIAL) Serial.begin(DBG_SERIAL_BAUD);" in on
+    loop = on.index("void loop()")
+    marks = ["mt_frame_begin();", "mt_stage(MT_INPUT);", "mt_stage(MT_RULES);", "mt_stage(MT_PIXELS);",
+             "mt_layer(li);", "mt_stage(MT_POSTFX);", "mt_stage(MT_SHOW);", "mt_frame_end();"]
+    pos = [on.index(m, loop) for m in marks]
+    assert pos == sorted(pos)
+    assert on.index("msgeq7_read();", loop) < pos[1] < on.index("modulo_led_show();", pos[5]) < pos[6]
+    # Pixel stage marks: before the layer loop, after the params prelude, after the leds[i] write;
+    # a layer that skips the pixel is charged to itself.
+    pixel_loop = on[on.index("for (int i=0; i<NUM_LEDS; i++)", loop):pos[5]]
+    assert pixel_loop.count("mt_stage(MT_PIXELS);") == 3 and pixel_loop.count("mt_layer(li);") == 2
+    skip = pixel_loop.index("if (!targetContains(")
+    assert pixel_loop.index("mt_layer(li);", skip) < pixel_loop.index("continue;", skip)
+    assert pixel_loop.index("leds[i] = CRGB(") < pixel_loop.rindex("mt_stage(MT_PIXELS);")
+    assert telemetry_layer_names(proj) == ["solid", "sweep"]
+
+
+def test_parse_record():
+    from export.telemetry import parse_record
+
+    r = parse_record(_CAPTURE[1])
+    assert (r.seq, r.frames, r.window_ms, r.frame_avg_us, r.frame_max_us) == (0, 31, 1006, 32150, 35020)
+    assert r.stages_us == {"input": 1840, "rules": 412, "pixels": 2100, "postfx": 0, "show": 7790}
+    assert r.layers_us == [12008, 8000] and abs(r.fps - 30.815) < 0.01
+    assert parse_record(_CAPTURE[0]) is None and parse_record(_CAPTURE[-1]) is None
+    assert parse_record("MT1,0,0,1000,0,0,0,0,0,0,0") is None
+
+
+def test_firmware_emits_records_on_host():
+    from export.host_harness import find_cxx, run_host_harness
+    from export.telemetry import emit_telemetry_blocks, parse_record
+
+    if not find_cxx():
+        print("SKIP: no C++ compiler; telemetry firmware not exercised")
+        return
+    sketch = _FIXTURE
+    for k, v in emit_telemetry_blocks(200).items():
+        sketch = sketch.replace(k, v)
+    res = run_host_harness(None, sketch_text=sketch, frames=60, fps=50.0, compare=False)
+    assert res.ok, res.log
+    recs = [parse_record(s) for s in res.serial_tail]
+    assert all(recs) and len(recs) == 5, res.serial_tail
+    # Frames start every 20 ms and take 1.336 ms, so windows close at t=201, 401, ... ms.
+    assert [(r.seq, r.frames, r.window_ms) for r in recs[:2]] == [(0, 11, 201), (1, 10, 200)]
+    for r in recs:
+        assert (r.frame_avg_us, r.frame_max_us) == (1336, 1336)
+        # pixels: 4 x (10 setup + 7 L0 check/params + 15 write) + 2 x 7 L1 check/params
+        assert r.stages_us == {"input": 300, "rules": 100, "pixels": 142, "postfx": 40, "show": 500}
+        assert r.layers_us == [200, 2 * 25 + 2 * 2]
+
+
+def test_collector_reads_pty_replay():
+    from preview.firmware_telemetry import FirmwareTelemetryCollector
+
+    try:
+        import pty
+        import tty
+    except ImportError:
+        print("SKIP: no pty support; serial replay not exercised")
+        return
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    col = FirmwareTelemetryCollector()
+    try:
+        assert col.attach(os.fdopen(slave, "rb", buffering=0))
+        for line in _CAPTURE:
+            os.write(master, (line + "\r\n").encode("ascii"))
+        deadline = time.time() + 5.0
+        while col.lines_seen < len(_CAPTURE) and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        os.close(master)
+        col.disconnect()
+    s = col.summary()
+    assert (s["records"], s["frames"], s["missed_records"], s["lines_seen"]) == (3, 94, 1, 5)
+    assert list(col.other_lines) == [_CAPTURE[0], _CAPTURE[-1]]
+    assert abs(s["frame_avg_us"] - (31 * 32150 + 31 * 32300 + 32 * 31000) / 94.0) < 1e-6
+    assert s["frame_max_us"] == 35020 and abs(s["fps"] - 94000.0 / 3017.0) < 1e-9
+    assert [round(v) for v in s["layers_us"]] == [11695, 8003]
+    text = col.report_text(["rainbow", "sparkle"])
+    assert "records=3 frames=94 missed_records=1" in text and "layer 1 (sparkle)" in text
+    assert "show" in text and "fps=31.2" in text
+
+    again = FirmwareTelemetryCollector()
+    assert again.replay(_CAPTURE) == 3 and again.summary()["frames"] == 94
+    assert "No MT1 records yet" in FirmwareTelemetryCollector().report_text()
+
+
+def main():
+    test_sketch_is_instrumented_only_when_enabled()
+    test_parse_record()
+    test_firmware_emits_records_on_host()
+    test_collector_reads_pty_replay()
+    print("OK: firmware telemetry selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Selftest for export.fixed_math (fixed-point codegen mode for AVR/ESP8266 exports)."""
+
+from __future__ import annotations
+
+import json
+import math
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+
+def _project(math_mode=None):
+    p = {
+        "layout": {"kind": "strip", "num_leds": 30},
+        "layers": [{"behavior": "chase", "effect": "chase", "params": {},
+                    "modulotors": [{"enabled": True, "source": "lfo_sine", "target": "brightness",
+                                    "amount": 0.5, "rate_hz": 1.5, "smooth": 0.4}]}],
+    }
+    if math_mode:
+        p["export"] = {"math_mode": math_mode}
+    return p
+
+
+def test_math_mode_resolution_and_target_packs():
+    from export.fixed_math import resolve_math_mode
+    from export.targets.validate_target_pack import validate_target_pack
+
+    root = Path(__file__).resolve().parents[1] / "export" / "targets"
+    meta = lambda tid: json.loads((root / tid / "target.json").read_text(encoding="utf-8"))
+    for tid in ("arduino_uno_fastled_msgeq7", "arduino_mega_fastled_msgeq7", "esp8266_fastled_noneaudio"):
+        assert resolve_math_mode({}, meta(tid)) == "float", tid  # fixed is opt-in
+        assert validate_target_pack(dict(meta(tid), math_mode="fixed"))[0]
+    assert resolve_math_mode({}, dict(meta("arduino_uno_fastled_msgeq7"), math_mode="fixed")) == "fixed"
+    assert resolve_math_mode({}, meta("esp32_fastled_msgeq7")) == "float"
+    assert resolve_math_mode(_project("float"), meta("arduino_uno_fastled_msgeq7")) == "float"
+    assert resolve_math_mode(_project("FIXED"), {}) == "fixed"
+    assert resolve_math_mode({"export": {"math_mode": "q7"}}, {"math_mode": "bogus"}) == "float"
+    assert not validate_target_pack(dict(meta("esp32_fastled_msgeq7"), math_mode="double"))[0]
+
+
+def test_fixed_sketch_hoists_modulators_out_of_pixel_loop():
+    from export.arduino_exporter import make_layerstack_sketch
+
+    flt = make_layerstack_sketch(project=_project())
+    fx = make_layerstack_sketch(project=_project(), math_mode="fixed")
+    assert make_layerstack_sketch(project=_project("fixed")) == fx
+    assert "MODULO_MATH_FIXED" not in flt and "{MATH_FIXED" not in flt and "{LAYER_PARAMS_PIXEL}" not in flt
+    assert flt.count("computeLayerParams(li, t, br") == 1
+
+    pix = fx.index("for (int i=0; i<NUM_LEDS; i++)")
+    assert "#define MODULO_MATH_FIXED 1" in fx
+    assert fx.index("computeLayerParamsFixed(li, (uint32_t)(__sim_t * 1000.0 + 0.5))") < pix
+    assert "computeLayerParams(li, t, br" not in fx and "sinf" not in fx[pix:fx.index("modulo_led_show();", pix)]
+    assert "const MfxLayerParams &P = LP[li];" in fx[pix:]
+
+
+def _compile_harness(body: str):
+    cxx = shutil.which("g++") or shutil.which("c++")
+    if not cxx:
+        return None
+    from export.fixed_math import fixed_math_helpers
+
+    src = "#include <stdint.h>\n#include <stdio.h>\n" + fixed_math_helpers() + "\nint main() {\n" + body + "\n  return 0;\n}\n"
+    d = Path(tempfile.mkdtemp(prefix="mfx_"))
+    (d / "h.cpp").write_text(src, encoding="utf-8")
+    r = subprocess.run([cxx, "-std=c++11", "-O1", "-Wall", "-Werror", "-o", str(d / "h"), str(d / "h.cpp")],
+                       capture_output=True, text=True)
+    assert r.returncode == 0, r.stderr
+    out = subprocess.run([str(d / "h")], capture_output=True, text=True, check=True).stdout
+    shutil.rmtree(d, ignore_errors=True)
+    return [float(v) for v in out.split()]
+
+
+def test_fixed_helpers_track_preview_within_tolerance():
+    from params.modulators import Modulotor, sample
+
+    rates = (0.25, 0.5, 1.5, 7.0, -2.0, 31.0)
+    times_ms = (0, 1, 250, 999, 1000, 12345, 86_400_000, 4_000_000_000)
+    cases = [(r, ms) for r in rates for ms in times_ms]
+    body = [f"  printf(\"%ld\\n\", (long)mfx_lfo_q16({r!r}f, 0, {ms}UL));" for r, ms in cases]
+    curves = [(s / 8.0, cv) for s in range(-8, 9) for cv in range(5)]
+    body += [f"  printf(\"%ld\\n\", (long)mfx_curve(mfx_q16({s!r}f), {cv}));" for s, cv in curves]
+    # Preview smoothing: lfo_sine, smooth=0.6, 60 fps frames, seeded with the first sample.
+    body.append("  q16_t last = 0; for (int f=0; f<120; f++) { q16_t s = mfx_lfo_q16(0.8f, 0, (uint32_t)(f * 1000 / 60));"
+                " last = f ? mfx_smooth(last, s, mfx_q16(0.6f)) : s; printf(\"%ld\\n\", (long)last); }")
+    out = _compile_harness("\n".join(body))
+    if out is None:
+        print("SKIP: no C++ compiler; fixed-point parity not checked")
+        return
+
+    k = 0
+    for r, ms in cases:
+        want = math.sin(2.0 * math.pi * ((r * (ms // 1000)) % 1.0 + r * (ms % 1000) / 1000.0))
+        assert abs(out[k] / 65536.0 - want) < 3e-4, (r, ms, out[k] / 65536.0, want)
+        k += 1
+    for s, cv in curves:
+        v = 0.5 + 0.5 * s
+        v = [v, 1.0 - v, abs((v - 0.5) * 2.0), v * v, v * v * v][cv]
+        assert abs(out[k] / 65536.0 - (v - 0.5) * 2.0) < 1e-4, (s, cv)
+        k += 1
+    mod = Modulotor(source="lfo_sine", rate_hz=0.8, smooth=0.6)
+    for f in range(120):
+        want = sample(mod, (f * 1000 // 60) / 1000.0)
+        assert abs(out[k] / 65536.0 - want) < 1e-3, (f, out[k] / 65536.0, want)
+        k += 1
+
+
+def main():
+    test_math_mode_resolution_and_target_packs()
+    test_fixed_sketch_hoists_modulators_out_of_pixel_loop()
+    test_fixed_helpers_track_preview_within_tolerance()
+    print("OK: fixed math selftest passed")
+
+
+if __name__ == "__main__":
+    main()
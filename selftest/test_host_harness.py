@@ -0,0 +1,200 @@
+"""Selftest for export.host_harness (host-native sketch runs: timing, capture, preview parity)."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Minimal LED backend so the fixture sketch exercises the real template (MSGEQ7 reader) without WiFi code.
+_LED_IMPL = r"""// Modulo export: MODULO_EXPORT (host harness fixture; no layer state, so no state_reset_layer)
+#include <FastLED.h>
+CRGB leds[NUM_LEDS];
+static void modulo_wifi_init() {}
+static void modulo_led_init() { FastLED.addLeds<WS2812B, 6, GRB>(leds, NUM_LEDS); FastLED.setBrightness(180); }
+static void modulo_led_show() { FastLED.show(); }
+"""
+
+_SOLID = r"""
+void setup() { modulo_led_init(); msgeq7_setup(); modulo_wifi_init(); Serial.println("ready"); }
+void loop() {
+  msgeq7_read();
+  for (int i=0; i<NUM_LEDS; i++) leds[i] = CRGB(255, 40, 0);
+  modulo_led_show();
+}
+"""
+
+_BANDS = r"""
+void setup() { modulo_led_init(); msgeq7_setup(); }
+void loop() {
+  msgeq7_read();
+  for (int i=0; i<7; i++) leds[i] = CRGB(g_left[i] >> 2, g_right[i] >> 2, (uint8_t)(g_energy * 255.0f));
+  leds[7] = CRGB((uint8_t)(millis() & 0xFF), (uint8_t)((millis() >> 8) & 0xFF), 0);
+  float scratch[64];
+  for (int i=0; i<64; i++) scratch[i] = audio_value(10 + (i % 7));
+  leds[8] = CRGB((uint8_t)(scratch[63] * 255.0f), 0, 0);
+  modulo_led_show();
+}
+"""
+
+
+def _sketch(body: str, num_leds: int) -> str:
+    from export.arduino_exporter import export_sketch
+
+    with tempfile.TemporaryDirectory(prefix="hh_fx_") as td:
+        out = Path(td) / "fixture.ino"
+        export_sketch(sketch_code=body, template_path=ROOT / "export" / "arduino_template.ino.tpl", out_path=out,
+                      replacements={"USE_MSGEQ7": "1", "MSGEQ7_RESET_PIN": "5", "MSGEQ7_STROBE_PIN": "4",
+                                    "MSGEQ7_LEFT_PIN": "A0", "MSGEQ7_RIGHT_PIN": "A1",
+                                    "LED_IMPL": f"#define NUM_LEDS {num_leds}\n" + _LED_IMPL, "MATRIX_IMPL": ""})
+        return out.read_text(encoding="utf-8")
+
+
+def test_solid_sketch_matches_preview():
+    from export.host_harness import find_cxx, run_host_harness
+
+    if not find_cxx():
+        print("SKIP: no C++ compiler; host harness not exercised")
+        return
+    proj = {"layout": {"kind": "strip", "num_leds": 12},
+            "layers": [{"behavior": "solid", "effect": "solid", "params": {"color": [255, 40, 0]}}]}
+    res = run_host_harness(proj, sketch_text=_sketch(_SOLID, 12), frames=20, fps=50.0)
+    assert res.ok, res.log
+    s = res.summary()
+    assert s["frames"] == 20 and s["frames_without_show"] == 0
+    assert res.parity["ok"] and res.parity["max_delta"] == 0 and res.parity["frames_compared"] == 20
+    assert res.serial_tail == ["ready"] and res.frames[0].brightness == 180
+    assert [f.t_ms for f in res.frames[:3]] == [0, 20, 40]
+    assert all(f.cpu_us >= 0.0 and f.heap_bytes >= 0 for f in res.frames)
+
+    proj["layers"][0]["params"]["color"] = [250, 40, 0]
+    off = run_host_harness(proj, sketch_text=_sketch(_SOLID, 12), frames=4, tolerance=2)
+    assert off.parity["max_delta"] == 5 and off.parity["first_mismatch"]["pixel"] == 0
+
+
+def _strip_project(behavior: str, params: dict) -> dict:
+    return {"layout": {"kind": "strip", "num_leds": 12, "led_pin": 6},
+            "layers": [{"name": behavior, "enabled": True, "behavior": behavior, "effect": behavior,
+                        "params": dict(params)}]}
+
+
+def _chase_project(**params) -> dict:
+    # Chase steps on the double sim clock like the preview, but the sketch stores speed as float: a speed
+    # that float cannot represent (0.7) may round a step apart from the preview exactly on a pixel
+    # boundary. 0.7 is checked not to hit one within 60 frames; default params are covered separately.
+    return _strip_project("chase", dict({"color": [200, 40, 10], "speed": 0.7, "width": 3.0}, **params))
+
+
+def _rules_project() -> dict:
+    proj = _chase_project()
+    proj["variables"] = {"number": {"level": 0.0}, "toggle": {}}
+    proj["rules_v6"] = [{"id": "r1", "name": "dim", "enabled": True, "trigger": "tick",
+                         "action": {"kind": "set_layer_param", "layer": 0, "param": "brightness",
+                                    "expr": {"src": "const", "const": 0.5}}}]
+    return proj
+
+
+def test_exported_projects_match_preview():
+    from export.host_harness import find_cxx, run_host_harness
+
+    if not find_cxx():
+        print("SKIP: no C++ compiler; host harness not exercised")
+        return
+    projects = (("solid", _strip_project("solid", {"color": [255, 40, 0]}), 5),
+                ("chase", _chase_project(brightness=0.8), 60),
+                ("chase defaults", _strip_project("chase", {}), 240),
+                ("chase width", _strip_project("chase", {"width": 3.0}), 240),
+                ("rules", _rules_project(), 60))
+    for name, proj, frames in projects:
+        res = run_host_harness(proj, frames=frames)
+        assert res.ok, (name, res.stage, res.log[:2000])
+        assert res.parity["ok"] and res.parity["max_delta"] == 0, (name, res.parity)
+        assert res.parity["frames_compared"] == frames
+        if name == "chase defaults":  # registry default width (4 px), as the preview renders it
+            assert sum(px != (0, 0, 0) for px in res.frames[0].pixels) == 4
+    lit = [px for px in res.frames[-1].pixels if px != (0, 0, 0)]
+    assert lit == [(100, 20, 5)] * 3  # rule halves the chase brightness on the device too
+
+
+def test_fixed_math_export_runs_against_preview():
+    from export.host_harness import diff_frames, find_cxx, run_host_harness
+
+    if not find_cxx():
+        print("SKIP: no C++ compiler; host harness not exercised")
+        return
+    for name, proj in (("chase", _chase_project()), ("rules", _rules_project())):
+        with tempfile.TemporaryDirectory(prefix="hh_fixed_") as td:
+            res = run_host_harness(proj, frames=60, math_mode="fixed", work_dir=Path(td))
+            assert "computeLayerParamsFixed" in (Path(td) / "sketch.ino.cpp").read_text(encoding="utf-8")
+        assert res.ok, (name, res.stage, res.log[:2000])
+        assert res.parity["ok"] and res.parity["max_delta"] == 0, (name, res.parity)
+
+    # Preview drops layer modulotors (its normalizer targets another Modulotor schema), so the
+    # fixed-point LFO path is held to the float sketch, which runs the preview's sin LFO per pixel.
+    lfo = _strip_project("solid", {"color": [200, 40, 10]})
+    lfo["layers"][0]["modulotors"] = [{"enabled": True, "source": "lfo_sine", "target": "brightness",
+                                       "mode": "mul", "amount": 0.5, "rate_hz": 0.5}]
+    fixed = run_host_harness(lfo, frames=240, math_mode="fixed", compare=False)
+    flt = run_host_harness(lfo, frames=240, math_mode="float", compare=False)
+    assert fixed.ok and flt.ok, (fixed.log[:2000], flt.log[:2000])
+    assert min(f.pixels[0][0] for f in fixed.frames) < 120  # the LFO really dims the layer
+    assert diff_frames([f.pixels for f in fixed.frames], [f.pixels for f in flt.frames])["max_delta"] <= 1
+
+
+def test_kernel_cost_calibration():
+    from export.arduino_exporter import LAYERSTACK_KERNEL_COSTS
+    from export.host_harness import calibrate_kernel_costs, find_cxx
+
+    if not find_cxx():
+        print("SKIP: no C++ compiler; kernel calibration not exercised")
+        return
+    rows = calibrate_kernel_costs([1, 21], num_leds=128, frames=10, repeats=1)
+    assert set(rows) == {1, 21}
+    assert rows[1]["behavior"] == "chase" and rows[1]["cycles_per_pixel"] >= 1
+    assert rows[1]["declared_cycles_per_pixel"] == LAYERSTACK_KERNEL_COSTS[1].cycles_per_pixel
+    assert "E_BEHAVIOR_NOT_EXPORTABLE" in rows[21]["error"]  # preview-only kernels are reported, not timed
+
+
+def test_scripted_audio_clock_and_stack():
+    from export.host_harness import ADC_MAX, audio_script, find_cxx, run_host_harness
+
+    if not find_cxx():
+        print("SKIP: no C++ compiler; host harness not exercised")
+        return
+    res = run_host_harness(None, sketch_text=_sketch(_BANDS, 9), frames=30, fps=30.0, compare=False)
+    assert res.ok, res.log
+    script = audio_script(30, 30.0)
+    for fr, (ms, left, right) in zip(res.frames, script):
+        mono = [0.5 * (left[k] + right[k]) / ADC_MAX for k in range(7)]
+        for k in range(7):
+            assert fr.pixels[k][:2] == (left[k] >> 2, right[k] >> 2), (fr.index, k)
+            assert abs(fr.pixels[k][2] - int(sum(mono) / 7.0 * 255.0)) <= 1
+        # msgeq7_read() advanced the scripted clock by 7 * 30us + 2us: still the same millisecond.
+        assert fr.pixels[7][:2] == (ms & 0xFF, (ms >> 8) & 0xFF)
+    assert res.summary()["peak_stack_bytes"] >= 64 * 4  # float scratch[64] lives on loop()'s stack
+
+
+def test_compile_failure_is_reported():
+    from export.host_harness import find_cxx, run_host_harness
+
+    if not find_cxx():
+        print("SKIP: no C++ compiler; host harness not exercised")
+        return
+    res = run_host_harness(None, sketch_text="void setup() { not_a_function(); }\nvoid loop() {}\n", frames=2)
+    assert not res.ok and res.stage == "compile" and "not_a_function" in res.log
+    assert res.summary()["log"]
+
+
+def main():
+    test_solid_sketch_matches_preview()
+    test_exported_projects_match_preview()
+    test_fixed_math_export_runs_against_preview()
+    test_kernel_cost_calibration()
+    test_scripted_audio_clock_and_stack()
+    test_compile_failure_is_reported()
+    print("OK: host harness selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Selftest: make_layerstack_sketch expands the Rules V6 placeholders ({rules_decls}, {rules_apply})."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+
+def _project(rules: bool) -> dict:
+    proj = {
+        "layout": {"kind": "strip", "num_leds": 16, "led_pin": 6},
+        "layers": [{"behavior": "chase", "enabled": True, "params": {"speed": 0.5}}],
+        "variables": {"number": {"level": 0.0}, "toggle": {}},
+    }
+    if rules:
+        proj["rules_v6"] = [{"id": "r1", "name": "bump", "enabled": True, "trigger": "tick",
+                             "action": {"kind": "add_var", "var_kind": "number", "var": "level",
+                                        "expr": {"src": "const", "const": 0.1}}}]
+    return proj
+
+
+def test_rules_blocks_land_in_declarations_and_loop():
+    from export.arduino_exporter import make_layerstack_sketch
+
+    sk = make_layerstack_sketch(project=_project(True), rules_mode="unrolled")
+    assert "{rules_decls}" not in sk and "{rules_apply}" not in sk
+    decl = sk.index("#define MODULA_RULES_V6_ENABLED 1")
+    rule = sk.index("// Rule r1")
+    assert decl < sk.index("void setup()") < sk.index("void loop()") < rule
+    assert "VNUM[0]" in sk[rule:]
+
+    off = make_layerstack_sketch(project=_project(False))
+    assert "{rules_decls}" not in off and "{rules_apply}" not in off
+    assert off.count("// Rules V6 disabled") == 2 and "MODULA_RULES_V6_ENABLED" not in off
+
+
+def test_exported_sketch_has_no_rules_placeholders():
+    from export.arduino_exporter import export_project_validated
+
+    with tempfile.TemporaryDirectory() as td:
+        out = export_project_validated(_project(True), Path(td) / "rules.ino")
+        text = Path(out).read_text(encoding="utf-8")
+    assert "{rules_decls}" not in text and "{rules_apply}" not in text
+    assert "// Rule r1" in text
+
+
+def main():
+    test_rules_blocks_land_in_declarations_and_loop()
+    test_exported_sketch_has_no_rules_placeholders()
+    print("OK: layerstack rules placeholders selftest passed")
+
+
+if __name__ == "__main__":
+    main()
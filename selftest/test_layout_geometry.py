@@ -0,0 +1,155 @@
+"""Selftest for runtime.layout_geometry_v1 (per-layout geometry + spatial index)."""
+
+from __future__ import annotations
+
+import math
+import random
+
+
+def _scan_nearest(coords, x, y):
+    best_i, best_d2 = 0, 1e18
+    for i, c in enumerate(coords):
+        try:
+            dx, dy = float(c[0]) - x, float(c[1]) - y
+        except Exception:
+            continue
+        d2 = dx * dx + dy * dy
+        if d2 < best_d2:
+            best_i, best_d2 = i, d2
+    return best_i
+
+
+def test_nearest_and_radius_match_linear_scan():
+    from runtime.layout_geometry_v1 import geometry_for_coords
+    from runtime.sampling_v1 import splat_scalar_to_leds
+
+    rng = random.Random(3)
+    layouts = [
+        [(rng.uniform(-50, 50), rng.uniform(0, 20)) for _ in range(3000)],   # free-form
+        [(float(i % 40), float(i // 40)) for i in range(1200)],              # grid (ties)
+        [(float(i) * 0.5, 0.0) for i in range(300)],                         # line
+        [(2.0, 2.0)] * 5 + [None, "bad", (1.0, float("nan"))],              # degenerate
+    ]
+    for coords in layouts:
+        geom = geometry_for_coords(coords)
+        for _ in range(300):
+            x, y = rng.uniform(-70, 70), rng.uniform(-10, 30)
+            c = coords[rng.randrange(len(coords))]
+            if rng.random() < 0.3 and isinstance(c, tuple):
+                x, y = c  # exact hits / ties
+            assert geom.nearest(x, y) == _scan_nearest(coords, x, y), (len(coords), x, y)
+
+            r = rng.uniform(0.1, 6.0)
+            got = [0.0] * len(coords)
+            splat_scalar_to_leds({"coords": coords}, got, x, y, 1.0, radius=r)
+            ref = [0.0] * len(coords)
+            for i, c in enumerate(coords):
+                try:
+                    dx, dy = float(c[0]) - x, float(c[1]) - y
+                except Exception:
+                    continue
+                d2 = dx * dx + dy * dy
+                if d2 > r * r:
+                    continue
+                ref[i] += 1.0 * (1.0 - math.sqrt(d2) / r)
+            assert repr(got) == repr(ref)  # NaN-safe: bad coords poison the same slots
+
+
+def test_wiring_tables_and_neighbors():
+    from preview.mapping import MatrixMapping, logical_dims, xy_index
+    from preview.postfx import build_matrix_neighbors
+    from runtime.layout_geometry_v1 import geometry_for_layout
+
+    for serp in (False, True):
+        for rot in (0, 90, 180, 270):
+            for fx, fy in ((False, False), (True, False), (False, True)):
+                lay = {"shape": "cells", "mw": 7, "mh": 4, "serpentine": serp, "flip_x": fx, "flip_y": fy, "rotate": rot}
+                geom = geometry_for_layout(lay)
+                assert geometry_for_layout(dict(lay)) is geom  # built once per signature
+                m = MatrixMapping(w=7, h=4, serpentine=serp, flip_x=fx, flip_y=fy, rotate=rot)
+                lw, lh = logical_dims(m)
+                assert geom.logical_dims == (lw, lh)
+                for y in range(-1, lh + 1):
+                    for x in range(-1, lw + 1):
+                        assert geom.led_of_xy(x, y) == xy_index(m, x, y)
+                # Inverse: first logical cell in row-major order wired to each LED.
+                first = {}
+                for y in range(lh):
+                    for x in range(lw):
+                        first.setdefault(xy_index(m, x, y), (x, y))
+                for i in range(lw * lh):
+                    assert geom.xy_of_led(i) == first.get(i)
+
+    coords = [(i % 9, i // 9) for i in range(63)] + [("x", 0)]
+    nb = build_matrix_neighbors({"shape": "cells", "coords": coords}, radius=2)
+    assert nb[64 - 1] == [63]
+    assert nb[10] == [10] + [j for dx in range(-2, 3) for dy in range(-2, 3)
+                             if (dx or dy) and abs(dx) + abs(dy) <= 2
+                             for j in [(1 + dy) * 9 + (1 + dx)] if 0 <= 1 + dx < 9 and 0 <= 1 + dy < 7]
+
+
+def test_coords_signature_is_content_digest():
+    from runtime.layout_geometry_v1 import geometry_for_coords, mark_coords_dirty
+
+    # hash(-1) == hash(-2), so these lists share a tuple hash; the digest must tell them apart.
+    a = [(-1, 0), (5, 5)]
+    b = [(-2, 0), (5, 5)]
+    assert hash(tuple(a)) == hash(tuple(b))
+    ga, gb = geometry_for_coords(a), geometry_for_coords(b)
+    assert ga is not gb and ga.xs[0] == -1.0 and gb.xs[0] == -2.0
+    assert geometry_for_coords([(-1.0, 0.0), (5.0, 5.0)]) is ga  # same values, new list object
+    assert geometry_for_coords([(-1, 0), "bad"]) is not geometry_for_coords([(-1, 0), "bae"])
+
+    # In-place edit of a coordinate that is not first/middle/last, reported by the editor.
+    coords = [[float(i), 0.0] for i in range(9)]
+    g0 = geometry_for_coords(coords)
+    assert geometry_for_coords(coords) is g0
+    coords[2][1] = 7.0
+    mark_coords_dirty(coords)
+    g1 = geometry_for_coords(coords)
+    assert g1 is not g0 and g1.nearest(2.0, 7.0) == 2 and g1.ys[2] == 7.0
+    assert g0.neighbors(1)[2] == [2, 1, 3] and g1.neighbors(1)[2] == [2]  # g0 kept its own coords
+
+    coords.append([9.0, 0.0])  # length changes are picked up without a mark
+    assert geometry_for_coords(coords).xs[9] == 9.0
+
+
+def test_cached_lookup_does_not_walk_coords():
+    from runtime.layout_geometry_v1 import mark_coords_dirty
+    from runtime.sampling_v1 import nearest_led_index
+
+    class CountingList(list):
+        walks = 0
+
+        def __iter__(self):
+            CountingList.walks += 1
+            return super().__iter__()
+
+        def __eq__(self, other):
+            CountingList.walks += 1
+            return super().__eq__(other)
+
+        __hash__ = None
+
+    coords = CountingList([float(i), float(i % 3)] for i in range(500))
+    layout = {"coords": coords}
+    assert nearest_led_index(layout, 10.2, 1.0) == 10
+    CountingList.walks = 0
+    for _ in range(200):
+        assert nearest_led_index(layout, 250.1, 1.0) == 250
+    assert CountingList.walks == 0
+    coords[250][1] = 40.0
+    mark_coords_dirty(coords)
+    assert nearest_led_index(layout, 250.1, 1.0) == 251
+
+
+def main():
+    test_nearest_and_radius_match_linear_scan()
+    test_wiring_tables_and_neighbors()
+    test_coords_signature_is_content_digest()
+    test_cached_lookup_does_not_walk_coords()
+    print("OK: layout geometry selftest passed")
+
+
+if __name__ == "__main__":
+    main()
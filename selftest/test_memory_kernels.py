@@ -0,0 +1,102 @@
+"""Selftest for batched LongMemory2D / influence-map kernels (stamps, decay, sensing)."""
+
+from __future__ import annotations
+
+import math
+import random
+
+
+def _ref_reinforce(buf, w, h, points, amount, radius, wrap):
+    # Per-point radius loop the stamps replace (v1 semantics).
+    r = float(radius)
+    rr = r * r
+    k = int(math.ceil(r))
+    for (x, y) in points:
+        icx, icy = int(round(x)), int(round(y))
+        offs = [(0, 0)] if r <= 0 else [(ox, oy) for oy in range(-k, k + 1) for ox in range(-k, k + 1)]
+        for ox, oy in offs:
+            xi, yi = icx + ox, icy + oy
+            if r > 0:
+                dx, dy = xi - float(x), yi - float(y)
+                d2 = dx * dx + dy * dy
+                if d2 > rr:
+                    continue
+                dep = amount * max(0.0, 1.0 - d2 / rr)
+            else:
+                dep = amount
+            if wrap:
+                buf[(yi % h) * w + (xi % w)] += dep
+            elif 0 <= xi < w and 0 <= yi < h:
+                buf[yi * w + xi] += dep
+    buf[:] = [0.0 if v < 0.0 else 1.0 if v > 1.0 else v for v in buf]
+
+
+def test_long_memory_matches_per_point_kernel():
+    from runtime.long_memory_v1 import LongMemory2D, LongMemory2DConfig, half_life_factor
+
+    rnd = random.Random(8)
+    for wrap in (True, False):
+        mem = LongMemory2D(LongMemory2DConfig(width=24, height=16, half_life_s=0.5))
+        alias = mem.buf
+        ref = [0.0] * (24 * 16)
+        for _ in range(40):
+            dt = rnd.uniform(0.0, 0.05)
+            mem.step(dt)
+            f = math.exp(-math.log(2.0) * (dt / 0.5)) if dt > 0 else 1.0
+            ref = [v * f for v in ref]
+            pts = [(rnd.uniform(-4, 28), rnd.uniform(-4, 20)) for _ in range(5)] + [(3, 4)]
+            amount, radius = rnd.choice((0.2, 0.7, -0.1)), rnd.choice((0.0, 1.0, 2.5))
+            mem.reinforce_points(pts, amount=amount, radius=radius, wrap=wrap)
+            _ref_reinforce(ref, 24, 16, pts, amount, radius, wrap)
+            assert mem.buf == ref
+        assert mem.buf is alias  # memory_heatmap aliases state["heat"] to it
+
+    assert abs(half_life_factor(2.0, 2.0) - 0.5) < 1e-15
+    assert abs(half_life_factor(1.0, 3.0) ** 3 - 0.5) < 1e-12
+
+
+def test_influence_deposit_and_batched_sense():
+    from runtime.buffers_v1 import BufferConfig, ScalarBufferV1
+    from runtime.influence_maps_v1 import (
+        DepositConfigV1, _weight, decay_scalar_v1, deposit_points_scalar_v1,
+        sense_gradient_scalar_v1, sense_gradients_scalar_v1,
+    )
+
+    rnd = random.Random(1)
+    for falloff in ("gaussian", "linear", "flat"):
+        buf = ScalarBufferV1(BufferConfig(width=20, height=12))
+        ref = [0.0] * (20 * 12)
+        cfg = DepositConfigV1(radius=2.5, amount=0.4, falloff=falloff)
+        pts = [(rnd.uniform(-2, 22), rnd.uniform(-2, 14)) for _ in range(30)] + [(6, 6), (6, 6)]
+        deposit_points_scalar_v1(buf, pts, cfg)
+        for px, py in pts:
+            cx, cy = int(round(px)), int(round(py))
+            for yy in range(cy - 3, cy + 4):
+                for xx in range(cx - 3, cx + 4):
+                    if 0 <= xx < 20 and 0 <= yy < 12:
+                        wt = _weight(math.hypot(px - xx, py - yy), 2.5, falloff)
+                        if wt > 0.0:
+                            ref[yy * 20 + xx] += 0.4 * wt
+        ref = [min(1.0, max(0.0, v)) for v in ref]
+        assert buf.data == ref, falloff
+
+    xs = [rnd.uniform(-1, 21) for _ in range(64)]
+    ys = [rnd.uniform(-1, 13) for _ in range(64)]
+    gx, gy = sense_gradients_scalar_v1(buf, xs, ys)
+    assert [sense_gradient_scalar_v1(buf, x, y) for x, y in zip(xs, ys)] == list(zip(gx, gy))
+    assert any(g != 0.0 for g in gx)
+
+    from runtime.long_memory_v1 import half_life_factor
+    before = list(buf.data)
+    decay_scalar_v1(buf, 0.25, 1.0)
+    assert buf.data == [v * half_life_factor(0.25, 1.0) for v in before]
+
+
+def main():
+    test_long_memory_matches_per_point_kernel()
+    test_influence_deposit_and_batched_sense()
+    print("OK: memory kernels selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Selftest for runtime.noise_v2 batched grids (fbm_grid, curl_grid, lattice cache)."""
+
+from __future__ import annotations
+
+import random
+
+
+def test_fbm_grid_is_bit_identical_to_scalar():
+    from runtime.noise_v2 import Noise2D, Noise2DConfig
+
+    rnd = random.Random(11)
+    for cfg in (Noise2DConfig(), Noise2DConfig(seed=7, octaves=6, lacunarity=1.9, gain=0.6)):
+        n = Noise2D(cfg)
+        xs = [rnd.uniform(-40.0, 40.0) for _ in range(19)] + [0.0, 1.0, -1.0, 3.5]
+        ys = [rnd.uniform(-40.0, 40.0) for _ in range(13)] + [0.0, -2.0]
+        for _rep in range(2):  # second pass served from the lattice cache
+            g = n.fbm_grid(xs, ys)
+            for j, y in enumerate(ys):
+                for i, x in enumerate(xs):
+                    assert g[j][i] == n.fbm(x, y), (x, y)
+        assert n.fbm_grid(xs, ys, octaves=2)[3][4] == n.fbm(xs[4], ys[3], octaves=2)
+        assert n.fbm_grid([], ys) == [[] for _ in ys]
+
+
+def test_curl_grid_matches_finite_differences():
+    from runtime.noise_v2 import CurlNoise2D, CurlNoiseConfig
+    from runtime.vector_fields_v1 import CurlNoiseField, CurlNoiseFieldConfig
+
+    c = CurlNoise2D(CurlNoiseConfig(seed=5, scale=0.1, strength=2.0, eps=1e-4))
+    xs = [i * 1.37 for i in range(-6, 9)]
+    ys = [j * 0.91 for j in range(-4, 7)]
+    vx, vy = c.curl_grid(xs, ys, t=2.5)
+    worst = 0.0
+    for j, y in enumerate(ys):
+        for i, x in enumerate(xs):
+            sx, sy = c.sample(x, y, 2.5)
+            worst = max(worst, abs(vx[j][i] - sx), abs(vy[j][i] - sy))
+    assert worst < 1e-2, worst
+    assert c.curl(xs[2], ys[3], 2.5) == (vx[3][2], vy[3][2])
+
+    # CurlNoiseField now samples through the analytic curl.
+    f = CurlNoiseField(CurlNoiseFieldConfig(seed=5, time_scale=0.5))
+    ax, ay = f.sample(3.0, 4.0, t=1.0)
+    assert (ax, ay) == f._curl.curl(3.5, 3.5) and (ax, ay) != (0.0, 0.0)
+
+
+def test_lattice_cache_is_bounded():
+    from runtime.noise_v2 import Noise2D
+
+    n = Noise2D()
+    n.LATTICE_CACHE_MAX = 64
+    for k in range(5):
+        n.fbm_grid([float(i + 10 * k) for i in range(10)], [float(j) for j in range(10)], octaves=1)
+    assert len(n._lattice) <= 64 + 11 * 11
+
+
+def main():
+    test_fbm_grid_is_bit_identical_to_scalar()
+    test_curl_grid_matches_finite_differences()
+    test_lattice_cache_is_bounded()
+    print("OK: noise grid selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Selftest for app.project_history (undo/redo journal on ProjectManager edits)."""
+
+from __future__ import annotations
+
+import json
+
+
+def _snap(p):
+    return json.dumps(p, sort_keys=True, default=str)
+
+
+def _pm():
+    from app.project_manager import ProjectManager
+
+    pm = ProjectManager()
+    clock = [100.0]
+    pm.history.clock = lambda: clock[0]
+    pm.history.clear()
+    return pm, clock
+
+
+def test_guarded_mutators_undo_redo_roundtrip():
+    pm, clock = _pm()
+    states = [_snap(pm.project)]
+    layer = {"uid": "Lx", "name": "New", "behavior": "solid", "effect": "solid", "params": {"brightness": 0.5}}
+    edits = [
+        lambda: pm.guarded_add_layer(layer, idx=0),
+        lambda: pm.guarded_set_layer_effect(0, "rainbow", {"speed": 2.0}),
+        lambda: pm.guarded_toggle_layer_enabled(0),
+        lambda: pm.guarded_move_layer(0, 1),
+        lambda: pm.guarded_fix_visible(1, [True, False, True]),
+        lambda: pm.guarded_remove_layer(0),
+        lambda: pm.apply_audio_preset("does_not_exist.json"),  # failure: no entry
+    ]
+    for fn in edits:
+        clock[0] += 5.0
+        fn()
+        states.append(_snap(pm.project))
+    assert len(pm.history.undo_stack) == 6
+
+    for i in range(6, 0, -1):
+        assert pm.undo()
+        assert _snap(pm.project) == states[i - 1], i
+    assert not pm.undo()
+    for i in range(1, 7):
+        assert pm.redo()
+        assert _snap(pm.project) == states[i], i
+    assert not pm.redo()
+
+
+def test_slider_drag_coalesces_and_entries_stay_small():
+    pm, clock = _pm()
+    before = _snap(pm.project)
+    p0 = dict(pm.project["layers"][0].get("params") or {})
+    for k in range(30):  # 30 drag ticks, 20 ms apart
+        clock[0] += 0.02
+        pm.guarded_set_layer_param(0, "brightness", k / 30.0)
+    assert len(pm.history.undo_stack) == 1
+    entry = pm.history.undo_stack[0]
+    assert entry.merged == 30 and len(entry.ops) == 1
+    path, old, new = entry.ops[0]
+    assert path == ("layers", 0, "params", "brightness") and new == 29 / 30.0
+    assert old == p0.get("brightness", entry.ops[0][1])
+
+    clock[0] += 5.0  # pause: next drag is a new entry
+    pm.guarded_set_layer_param(0, "brightness", 0.1)
+    assert len(pm.history.undo_stack) == 2
+    pm.undo()
+    pm.undo()
+    assert _snap(pm.project) == before
+
+
+def test_project_set_diffs_shallow_copies():
+    pm, clock = _pm()
+    old = pm.project
+    layers0 = old["layers"]
+    # UI copy-on-write edit: only layers[0].params is new; everything else is shared.
+    p2 = dict(old)
+    L0 = dict(layers0[0])
+    L0["params"] = dict(L0.get("params") or {}, speed=9.5)
+    p2["layers"] = [L0] + list(layers0[1:])
+    pm.set(p2)
+    entry = pm.history.undo_stack[-1]
+    assert [op[0] for op in entry.ops] == [("layers", 0, "params", "speed")]
+
+    # Drag through the setter coalesces too (same numeric path).
+    for v in (9.6, 9.7):
+        clock[0] += 0.05
+        p3 = dict(pm.project)
+        L = dict(p3["layers"][0])
+        L["params"] = dict(L["params"], speed=v)
+        p3["layers"] = [L] + list(p3["layers"][1:])
+        pm.set(p3)
+    assert len(pm.history.undo_stack) == 1 and pm.history.undo_stack[0].ops[0][2] == 9.7
+
+    pm.undo()
+    assert pm.project["layers"][0].get("params", {}).get("speed") == (layers0[0].get("params") or {}).get("speed")
+    # A new edit after undo drops the redo branch.
+    clock[0] += 5.0
+    pm.guarded_toggle_layer_enabled(0)
+    assert not pm.history.can_redo()
+
+
+def main():
+    test_guarded_mutators_undo_redo_roundtrip()
+    test_slider_drag_coalesces_and_entries_stay_small()
+    test_project_set_diffs_shallow_copies()
+    print("OK: project history selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Selftest for app.project_normalize index fast paths and the fingerprint memo."""
+
+from __future__ import annotations
+
+import copy
+import random
+
+
+def _reference(raw, n):
+    out = []
+    for v in raw if isinstance(raw, (list, tuple, set)) else []:
+        try:
+            out.append(int(v))
+        except Exception:
+            pass
+    if n is None or n <= 0:
+        return sorted(set(i for i in out if i >= 0))
+    return sorted(set(i for i in out if 0 <= i < n))
+
+
+def test_normalized_indices_match_reference():
+    from app import project_normalize as pn
+
+    rnd = random.Random(7)
+    junk = ["12", 3.9, True, None, "x", float("nan"), -4]
+    for _ in range(200):
+        n = rnd.choice([None, 0, 40, 300])
+        raw = [rnd.choice(junk) if rnd.random() < 0.05 else rnd.randint(-3, 320)
+               for _ in range(rnd.randint(0, 200))]
+        for _rep in range(2):  # second call may come from the memo
+            assert pn._normalized_indices(list(raw), n) == _reference(raw, n)
+    assert pn._normalized_indices(None, 10) == []
+    assert pn._normalized_indices((5, 1, 5), None) == [1, 5]
+
+
+def test_memo_hits_return_fresh_lists_and_no_spurious_changes():
+    from app import project_normalize as pn
+    from app.project_normalize import normalize_project_zones_masks_groups
+
+    w, h = 64, 32
+    proj = {
+        "layout": {"count": w * h},
+        "zones": {"top": {"indices": list(range(w))[::-1] + [w * h + 5]}},
+        "groups": {"diag": {"indices": [i * (w + 1) for i in range(h)] * 3}},
+        "layers": [{"behavior": "solid", "params": {}}],
+        "masks": {},
+    }
+    p1, ch1 = normalize_project_zones_masks_groups(copy.deepcopy(proj))
+    assert "zone 'top' indices normalized" in ch1 and "group 'diag' indices normalized" in ch1
+    memo_len = len(pn._INDEX_MEMO)
+
+    p2, _ = normalize_project_zones_masks_groups(copy.deepcopy(proj))
+    assert len(pn._INDEX_MEMO) == memo_len  # served from the memo
+    assert p2["zones"]["top"]["indices"] == list(range(w))
+    p2["zones"]["top"]["indices"].append(-1)  # callers own the returned lists
+    p3, _ = normalize_project_zones_masks_groups(copy.deepcopy(proj))
+    assert p3["zones"]["top"]["indices"] == p1["zones"]["top"]["indices"] == list(range(w))
+
+    # A normalized project is a fixed point for the index lists.
+    _p4, ch4 = normalize_project_zones_masks_groups(p1)
+    assert not [c for c in ch4 if "indices normalized" in c]
+
+
+def _steps_run(pipe, project):
+    before = pipe.stats["steps_run"]
+    out = pipe.run(project)
+    return out, pipe.stats["steps_run"] - before
+
+
+def test_pipeline_reruns_only_steps_reading_changed_sections():
+    from app import project_manager as pm
+    from app.project_normalize import NormalizePipeline
+
+    pipe = NormalizePipeline(pm._MIGRATE_PIPELINE.steps)
+    proj = copy.deepcopy(pm.DEFAULT_PROJECT)
+    proj["layers"] = [{"behavior": "chase", "params": {}}, {"behavior": "solid", "params": {}}]
+    proj.pop("ui", None)
+
+    def _no_uids(d):
+        d = copy.deepcopy(d)
+        for L in d["layers"]:
+            L.pop("uid"), L.pop("__uid")
+        return d
+
+    eager = copy.deepcopy(proj)
+    for st in pipe.steps:
+        eager = st.fn(eager) or eager
+    p1, n1 = _steps_run(pipe, proj)
+    assert n1 == len(pipe.steps)
+    assert _no_uids(p1) == _no_uids(eager)
+
+    # An already-normalized project skips every step and comes back as-is.
+    skipped = pipe.stats["skipped"]
+    p2, n2 = _steps_run(pipe, p1)
+    assert p2 is p1 and n2 == 0 and pipe.stats["skipped"] == skipped + 1
+
+    # A ui-only edit (in place) re-runs only the steps that read ui.
+    del p2["ui"]["selected_layer"]
+    p3, n3 = _steps_run(pipe, p2)
+    assert n3 == sum(1 for st in pipe.steps if "ui" in st.reads)
+    assert p3["ui"]["selected_layer"] == 0
+
+    # An in-place layers edit re-runs the layer steps, which restore the uid.
+    del p3["layers"][1]["uid"]
+    p4, n4 = _steps_run(pipe, p3)
+    assert n4 == sum(1 for st in pipe.steps if "layers" in st.reads)
+    assert p4["layers"][1]["uid"] == p4["layers"][1]["__uid"]
+
+    # Changing the normalizer version invalidates the remembered fingerprints.
+    pipe.stamp = (pipe.stamp[0], pipe.stamp[1] + 1)
+    _p5, n5 = _steps_run(pipe, p4)
+    assert n5 == len(pipe.steps)
+
+
+def test_pipeline_matches_eager_zones_masks_groups():
+    from app.project_normalize import (
+        NormalizePipeline, ZONES_MASKS_GROUPS_STEPS, normalize_project_zones_masks_groups,
+        project_fingerprints,
+    )
+
+    proj = {
+        "layout": {"count": 40},
+        "zones": {"left": {"indices": [3, 1, 1, 99]}},
+        "groups": {"g": {"indices": ["2", 5]}},
+        "layers": [{"behavior": "solid", "target_kind": "bogus", "target_ref": 0}],
+        "target_mask": "zone:left",
+    }
+    want, _ = normalize_project_zones_masks_groups(copy.deepcopy(proj))
+    pipe = NormalizePipeline(ZONES_MASKS_GROUPS_STEPS)
+    got = pipe.run(copy.deepcopy(proj))
+    assert got == want
+    assert pipe.fingerprints == project_fingerprints(got)
+    assert pipe.run(copy.deepcopy(got), fingerprints=project_fingerprints(got)) == want
+    assert pipe.stats["skipped"] == 1
+
+
+def main():
+    test_normalized_indices_match_reference()
+    test_memo_hits_return_fresh_lists_and_no_spurious_changes()
+    test_pipeline_reruns_only_steps_reading_changed_sections()
+    test_pipeline_matches_eager_zones_masks_groups()
+    print("OK: project normalize cache selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Selftest for Rules V6 table mode (arduino_exporter._emit_rules_v6_table_blocks + budget.plan_rules_mode)."""
+
+from __future__ import annotations
+
+_SIGNALS = ["audio.energy", "audio.mono3", "audio.L1", "audio.R6", "vars.number.a", "vars.toggle.t", "audio.mono5", "bogus"]
+_PARAMS = ["opacity", "brightness", "op_gain", "op_gamma", "postfx_trail", "postfx_bleed", "postfx_bleed_radius"]
+
+
+def _project(n: int) -> dict:
+    """n rules cycling through every trigger, condition mode, action, param and conflict policy."""
+    rules = []
+    for i in range(n):
+        when = {"signal": _SIGNALS[i % 8], "op": [">", "<", ">=", "<="][i % 4], "value": 0.1 * (i % 7), "hyst": 0.05 * (i % 3)}
+        conds = [{"signal": _SIGNALS[(i + 3) % 8], "op": ["<", ">", "==", ">="][i % 4], "value": 0.3}] if i % 3 == 0 else []
+        k = i % 5
+        if k == 0:
+            act = {"kind": "set_var", "var": "a", "var_kind": "number",
+                   "expr": {"src": "signal", "signal": _SIGNALS[i % 5], "scale": 2.0, "bias": 0.25}}
+        elif k == 1:
+            act = {"kind": "add_var", "var": "b", "var_kind": "number",
+                   "expr": {"src": "const", "const": 0.125, "scale": 1.5, "as_bool": i % 2 == 0}}
+        elif k == 2:
+            act = {"kind": "flip_toggle", "var": "t", "var_kind": "toggle"}
+        else:
+            param = _PARAMS[i % 7]
+            act = {"kind": "set_layer_param", "layer": 0 if param.startswith("op_") else i % 3, "param": param,
+                   "conflict": ["last", "first", "max", "min"][i % 4],
+                   "expr": {"src": "signal", "signal": _SIGNALS[(i + 1) % 4], "bias": 0.1 * (i % 4)}}
+        rules.append({"id": f"r{i}", "name": f"rule {i:03d}", "enabled": i % 11 != 10, "trigger": ["tick", "rising", "threshold", "threshold"][i % 4],
+                      "when": when, "conditions": conds, "cond_mode": "any" if i % 2 else "all", "action": act})
+    ops = [{"kind": "gain", "params": {"gain": 1.0}}, {"kind": "gamma", "params": {"gamma": 2.2}}]
+    return {"layout": {"kind": "strip", "num_leds": 8},
+            "layers": [{"behavior": "solid", "params": {}, "operators": ops}, {"behavior": "chase", "params": {}},
+                       {"behavior": "fade", "params": {}}],
+            "variables": {"number": {"a": 0.0, "b": 0.5}, "toggle": {"t": False}}, "rules_v6": rules}
+
+
+def test_table_matches_unrolled_on_host():
+    from export.host_harness import find_cxx, run_host_harness
+
+    if not find_cxx():
+        print("SKIP: no C++ compiler; rules table interpreter not exercised")
+        return
+    out = {}
+    for mode in ("unrolled", "table"):
+        # The real layer-stack export, not a hand-written harness around the rules blocks.
+        res = run_host_harness(dict(_project(40), export={"rules_mode": mode}), frames=40, fps=30.0, compare=False)
+        assert res.ok, res.log
+        out[mode] = [f.pixels for f in res.frames]
+    assert len(out["table"]) == 40 and out["table"] == out["unrolled"]
+    assert len({str(px) for px in out["table"]}) > 20  # rules actually change the output frame to frame
+
+
+def test_hundred_rules_sketch_builds_for_mega():
+    import tempfile
+    from pathlib import Path
+
+    from export.host_harness import export_host_sketch, find_cxx, run_host_harness
+    from export.targets.registry import load_target
+
+    mega = dict(load_target("arduino_mega_fastled_msgeq7").meta)
+    with tempfile.TemporaryDirectory() as td:
+        text = export_host_sketch(_project(120), Path(td) / "rules.ino", target_meta=mega).read_text(encoding="utf-8")
+    assert "rules_tab_run();" in text and "static inline float clampf(" in text
+    if not find_cxx():
+        print("SKIP: no C++ compiler; 120-rule sketch not built")
+        return
+    res = run_host_harness(_project(120), frames=10, fps=30.0, compare=False, target_meta=mega)
+    assert res.ok, res.log
+
+
+def test_audio_peak_is_rejected():
+    from export.arduino_exporter import ExportValidationError, make_layerstack_sketch
+
+    proj = _project(1)
+    proj["rules_v6"][0].update(trigger="threshold", when={"signal": "audio_peak", "op": ">", "value": 0.5})
+    for mode in ("unrolled", "table"):
+        try:
+            make_layerstack_sketch(project=proj, rules_mode=mode)
+        except ExportValidationError as e:
+            assert "E_RULE_SIGNAL_NOT_EXPORTABLE" in str(e)
+        else:
+            raise AssertionError("audio_peak has no firmware source and must not export")
+
+
+def test_table_blocks_and_sketch():
+    from export.arduino_exporter import ExportValidationError, _emit_rules_v6_table_blocks, make_layerstack_sketch
+
+    proj = _project(12)
+    decls, runtime, apply = _emit_rules_v6_table_blocks(project=proj, storage="progmem")
+    assert "static const uint16_t RULES_N = 12;" in decls and "static const uint16_t RULES_TAB_N = 11;" in decls
+    assert "#define MODULO_LUT_PROGMEM 1" in decls and "RULES_TAB[11] MODULO_LUT_ATTR" in decls
+    # One condition on every third rule; signals deduplicated, unknown keys read as id 0.
+    assert decls.count("}, // r") == 11 and "RULE_CONDS[4]" in decls
+    assert runtime.count("    case ") >= 7 and "(float)(g_energy)" in runtime and "bogus" not in runtime
+    assert "rules_tab_run();" in apply and "// Rule r0" not in apply
+    assert _emit_rules_v6_table_blocks(project={}) == ("// Rules V6 disabled\n", "", "// Rules V6 disabled\n")
+
+    table = make_layerstack_sketch(project=proj, rules_mode="table")
+    unrolled = make_layerstack_sketch(project=proj, rules_mode="unrolled")
+    assert "{rules_decls}" not in table and "{rules_apply}" not in table and "{RULES_RUNTIME}" not in table
+    assert table.index("RULES_TAB_N") < table.index("static void rules_tab_run()") < table.index("void loop()")
+    assert "// Rule r0" in unrolled and "rules_tab_run" not in unrolled
+    assert make_layerstack_sketch(project=proj) == unrolled
+
+    bad = _project(12)
+    bad["layers"][0]["operators"] = [{"kind": "gamma", "params": {"gamma": 2.2}}]
+    try:
+        _emit_rules_v6_table_blocks(project=bad)
+    except ExportValidationError as e:
+        assert "E_RULE_OP_GAIN_NO_OPERATOR" in str(e)
+    else:
+        raise AssertionError("table mode must validate like unrolled mode")
+
+
+def test_plan_rules_mode():
+    from export.budget import RULES_UNROLLED_MAX, plan_rules_mode
+    from export.targets.registry import load_target
+
+    uno = dict(load_target("arduino_uno_fastled_msgeq7").meta)
+    mega = dict(load_target("arduino_mega_fastled_msgeq7").meta)
+    assert plan_rules_mode(_project(12), None) == "unrolled"
+    assert plan_rules_mode(_project(12), mega) == "unrolled"
+    assert plan_rules_mode(_project(24), uno) == "table"  # unrolled rules would take > 1/4 of Uno flash headroom
+    assert plan_rules_mode(_project(RULES_UNROLLED_MAX + 8), None) == "table"
+    forced = dict(_project(24), export={"rules_mode": "unrolled"})
+    assert plan_rules_mode(forced, uno) == "unrolled"
+    assert plan_rules_mode(dict(_project(2), export={"rules_mode": "table"}), None) == "table"
+
+
+def test_hundred_rules_fit_mega():
+    from export.budget import estimate_firmware_cost, target_flash_limit
+    from export.targets.registry import load_target
+
+    mega = dict(load_target("arduino_mega_fastled_msgeq7").meta)
+    proj = _project(120)
+    est = estimate_firmware_cost(proj, mega)
+    assert est.rules_mode == "table"
+    assert est.flash_bytes <= target_flash_limit(mega) and est.ram_bytes <= mega["ram_limit_bytes"], est.describe()
+    unrolled = estimate_firmware_cost(dict(proj, export={"rules_mode": "unrolled"}), mega)
+    assert unrolled.rules_mode == "unrolled"
+    assert est.flash_breakdown["rules"] * 2 < unrolled.flash_breakdown["rules"]
+    assert est.ram_breakdown["rules"] < unrolled.ram_breakdown["rules"]
+    assert any("table" in n for n in est.notes)
+
+
+def main():
+    test_table_matches_unrolled_on_host()
+    test_hundred_rules_sketch_builds_for_mega()
+    test_audio_peak_is_rejected()
+    test_table_blocks_and_sketch()
+    test_plan_rules_mode()
+    test_hundred_rules_fit_mega()
+    print("OK: rules table selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Selftest for behaviors.assets._sprite_atlas (row blitter + compiled tilemap scenes)."""
+
+from __future__ import annotations
+
+import random
+
+
+def _ref_blit(buf, mw, mh, rows, x0, y0):
+    # Per-pixel reference: the behaviors' original set_xy/_blit semantics.
+    for y, row in enumerate(rows):
+        for x, c in enumerate(row):
+            xx, yy = x0 + x, y0 + y
+            if c is None or xx < 0 or yy < 0 or xx >= mw or yy >= mh:
+                continue
+            i = yy * mw + xx
+            if i < len(buf):
+                buf[i] = c
+
+
+def test_blit_matches_per_pixel_reference():
+    from behaviors.assets._sprite_atlas import Sprite, blit, blit_tiled
+
+    rng = random.Random(7)
+    for _ in range(200):
+        w, h = rng.randint(1, 11), rng.randint(1, 9)
+        rows = [[rng.choice([None, (1, 2, 3), (9, 9, 9)]) for _ in range(w)] for _ in range(h)]
+        spr = Sprite(w, h, rows)
+        mw, mh = rng.randint(1, 16), rng.randint(1, 12)
+        n = mw * mh - rng.randint(0, mw * 2)  # partially covered grids clip on len(buf)
+        n = max(1, n)
+        x0, y0 = rng.randint(-12, 18), rng.randint(-10, 14)
+
+        got, ref = [(0, 0, 0)] * n, [(0, 0, 0)] * n
+        blit(got, mw, mh, spr, x0, y0)
+        _ref_blit(ref, mw, mh, rows, x0, y0)
+        assert got == ref, (w, h, mw, mh, x0, y0)
+
+        off = rng.randint(-40, 40)
+        got, ref = [(0, 0, 0)] * n, [(0, 0, 0)] * n
+        blit_tiled(got, mw, mh, spr, y0, off)
+        wide = [[r[(x + off) % w] for x in range(mw)] for r in rows]
+        _ref_blit(ref, mw, mh, wide, 0, y0)
+        assert got == ref, ("tiled", w, h, mw, mh, y0, off)
+
+
+def test_tilemap_scene_compiled_once_per_params_change():
+    from behaviors.assets import _sprite_atlas as sprite_atlas
+    from behaviors.effects.tilemap_sprite import _preview_emit
+
+    sprite_atlas.clear_cache()
+    params = {"_mw": 24, "_mh": 16, "tilemap_map": ["..BBQ.", "GG..B"], "sprite_frames": [[255] * 8]}
+    st = {}
+    frames = [_preview_emit(num_leds=24 * 16, params=params, t=i * 0.25, state=st) for i in range(10)]
+    assert sprite_atlas.stats["misses"] == 1 and sprite_atlas.stats["hits"] == 9
+    assert len({tuple(f) for f in frames}) > 1  # scrolls
+
+    params["tilemap_map"] = ["Q"]
+    _preview_emit(num_leds=24 * 16, params=params, t=0.0, state=st)
+    assert sprite_atlas.stats["misses"] == 2
+
+
+def main():
+    test_blit_matches_per_pixel_reference()
+    test_tilemap_scene_compiled_once_per_params_change()
+    print("OK: sprite atlas selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Selftest for app.startup_profile (startup spans, import timing, JSON report)."""
+
+from __future__ import annotations
+
+import builtins
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def test_import_hook_spans_and_report():
+    from app.startup_profile import StartupTracer, export_report, load_report, report_text
+
+    with tempfile.TemporaryDirectory() as td:
+        pkg = Path(td) / "sp_probe_pkg"
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("from . import slow\n", encoding="utf-8")
+        (pkg / "slow.py").write_text("import time\ntime.sleep(0.02)\nimport sp_probe_leaf\n", encoding="utf-8")
+        (Path(td) / "sp_probe_leaf.py").write_text("import time\ntime.sleep(0.01)\n", encoding="utf-8")
+        sys.path.insert(0, td)
+        orig = builtins.__import__
+        tr = StartupTracer()
+        try:
+            tr.start()
+            with tr.span("outer"):
+                with tr.span("inner"):
+                    import sp_probe_pkg  # noqa: F401
+            tr.mark("first_frame")
+            rep = tr.finish(write=False)
+        finally:
+            sys.path.remove(td)
+            for m in ("sp_probe_pkg", "sp_probe_pkg.slow", "sp_probe_leaf"):
+                sys.modules.pop(m, None)
+        assert builtins.__import__ is orig  # hook removed on finish
+
+        by_name = {r["name"]: r for r in rep["imports_top"]}
+        top, slow, leaf = by_name["sp_probe_pkg"], by_name["sp_probe_pkg.slow"], by_name["sp_probe_leaf"]
+        assert (top["depth"], slow["depth"], leaf["depth"]) == (0, 1, 2)
+        assert top["cum_ms"] >= slow["cum_ms"] >= leaf["cum_ms"] >= 9.0
+        assert slow["self_ms"] >= 18.0 and top["self_ms"] < slow["self_ms"]
+        phases = {p["name"]: p for p in rep["phases"]}
+        assert phases["inner"]["depth"] == 1 and phases["outer"]["dur_ms"] >= phases["inner"]["dur_ms"] >= 30.0
+        assert rep["finished"] and rep["total_ms"] >= phases["outer"]["dur_ms"]
+
+        # Spans after finish are ignored; the JSON export round-trips.
+        assert tr.begin("late") is None
+        p = export_report(rep, Path(td) / "profile.json")
+        assert load_report(p) == json.loads(json.dumps(rep))
+        assert "sp_probe_pkg.slow" in report_text(rep)
+
+
+def test_diff_reports_flags_regressions():
+    from app.startup_profile import StartupTracer, diff_reports
+
+    tr = StartupTracer()
+    assert tr.begin("ignored") is None  # not started
+    tr.start(import_hook=False)
+    with tr.span("core_bridge"):
+        time.sleep(0.001)
+    old = tr.finish(write=False)
+    new = json.loads(json.dumps(old))
+    new["total_ms"] += 40.0
+    new["phases"][0]["dur_ms"] += 30.0
+    lines = diff_reports(old, new, threshold_ms=5.0)
+    assert any(ln.startswith("total:") for ln in lines)
+    assert any(ln.startswith("phase core_bridge:") and "+30.0" in ln for ln in lines)
+    assert diff_reports(old, old) == []
+
+
+def main():
+    test_import_hook_spans_and_report()
+    test_diff_reports_flags_regressions()
+    print("OK: startup profile selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Selftest for the GFX font binary cache and behaviors.assets._text_raster."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HEADER = REPO_ROOT / "third_party" / "mariobros_clock" / "Super_Mario_Bros__24pt7b.h"
+STRUCT = "Super_Mario_Bros__24pt7b"
+
+
+def _ref_draw(buf, mw, mh, font, text, x, y_baseline, color):
+    # Per-pixel Adafruit_GFX walk (the pre-cache draw_text_to_buffer).
+    cx = int(x)
+    for ch in text:
+        g = font.glyphs.get(ord(ch))
+        if g is None:
+            cx += font.yAdvance // 2
+            continue
+        bit = 0
+        for yy in range(max(0, g.height)):
+            for xx in range(max(0, g.width)):
+                on = font.bitmaps[g.bitmapOffset + bit // 8] & (0x80 >> (bit % 8))
+                bit += 1
+                px, py = cx + g.xOffset + xx, int(y_baseline) + g.yOffset + yy
+                if on and 0 <= px < mw and 0 <= py < mh:
+                    buf[py * mw + px] = color
+        cx += g.xAdvance
+
+
+def test_font_binary_cache_roundtrip_and_staleness():
+    from behaviors.assets.adafruit_gfx_font import load_gfx_font_from_header
+
+    parsed = load_gfx_font_from_header(HEADER, STRUCT, use_cache=False)
+    with tempfile.TemporaryDirectory() as td:
+        old = os.environ.get("MODULO_FONT_CACHE")
+        os.environ["MODULO_FONT_CACHE"] = str(Path(td) / "fc")
+        try:
+            hdr = Path(td) / HEADER.name
+            shutil.copyfile(HEADER, hdr)
+            assert load_gfx_font_from_header(hdr, STRUCT) == parsed  # parse + write cache
+            files = list((Path(td) / "fc").glob("*.mlgfx"))
+            assert len(files) == 1
+            assert load_gfx_font_from_header(hdr, STRUCT) == parsed  # served from cache
+
+            # A corrupt cache file is ignored and rewritten.
+            files[0].write_bytes(b"junk")
+            assert load_gfx_font_from_header(hdr, STRUCT) == parsed
+            assert files[0].read_bytes().startswith(b"MLGFXF1")
+
+            # A same-named header elsewhere gets its own cache entry.
+            other = Path(td) / "copy"
+            other.mkdir()
+            shutil.copyfile(HEADER, other / HEADER.name)
+            assert load_gfx_font_from_header(other / HEADER.name, STRUCT) == parsed
+            assert len(list((Path(td) / "fc").glob("*.mlgfx"))) == 2
+
+            # Editing the header invalidates the cache (size/mtime fingerprint).
+            hdr.write_text(hdr.read_text(encoding="utf-8").replace("0x20, 0x7E", "0x20, 0x30", 1), encoding="utf-8")
+            edited = load_gfx_font_from_header(hdr, STRUCT)
+            assert edited.last == 0x30 and edited.last != parsed.last
+        finally:
+            if old is None:
+                os.environ.pop("MODULO_FONT_CACHE", None)
+            else:
+                os.environ["MODULO_FONT_CACHE"] = old
+
+
+def test_text_layout_matches_reference_and_is_cached():
+    from behaviors.assets import _text_raster as text_raster
+    from behaviors.assets.adafruit_gfx_font import draw_text_to_buffer, load_gfx_font_from_header
+
+    font = load_gfx_font_from_header(HEADER, STRUCT, use_cache=False)
+    text_raster.clear_caches()
+    for text, x, y in (("0123456789", -5, 30), ("12:34 ~", 3, 20), ("88", 50, 70), ("", 0, 0)):
+        for mw, mh in ((64, 64), (30, 25)):
+            got = [(0, 0, 0)] * (mw * mh)
+            ref = list(got)
+            draw_text_to_buffer(buf=got, mw=mw, mh=mh, font=font, text=text, x=x, y_baseline=y, color=(1, 2, 3))
+            _ref_draw(ref, mw, mh, font, text, x, y, (1, 2, 3))
+            assert got == ref, (text, mw, mh)
+    misses = text_raster.TEXT_CACHE.misses
+    buf = [(0, 0, 0)] * 64 * 64
+    draw_text_to_buffer(buf=buf, mw=64, mh=64, font=font, text="88", x=0, y_baseline=30, color=(1, 2, 3))
+    assert text_raster.TEXT_CACHE.misses == misses
+
+    # Scaled row-bits font (clock_hhmm_digits) lays out glyph + spacing per scale.
+    rb = text_raster.RowBitsFont("t", {"1": [0b010, 0b110, 0b010], " ": [0, 0, 0]}, width=3)
+    spr, dx, dy = text_raster.text_sprite(rb, "1x1", scale=2, color=(9, 9, 9))
+    assert (dx, dy) == (0, 0) and (spr.w, spr.h) == (3 * 2 * 3 + 2 * 2, 6)
+    assert [x for x, c in enumerate(spr.rows[0]) if c] == [2, 3, 18, 19]
+
+
+def main():
+    test_font_binary_cache_roundtrip_and_staleness()
+    test_text_layout_matches_reference_and_is_cached()
+    print("OK: text raster selftest passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Selftest for app.validation_engine (per-section check caching, change events)."""
+
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+
+
+def _project():
+    return {
+        "layout": {"count": 40},
+        "zones": {"a": {"indices": list(range(10))}, "bad": {"indices": [1, 99]}},
+        "groups": {"g": {"indices": [1, 2, 3]}},
+        "masks": {
+            "m": {"indices": [0, 1]},
+            "both": {"op": "union", "a": "m", "b": {"start": 5, "end": 8}},
+            "group:g": {"indices": [1]},
+        },
+        "ui": {"target_mask": "missing"},
+        "target_mask": "legacy",
+        "layers": [
+            {"behavior": "solid", "target_kind": "zone", "target_ref": 5},
+            {"behavior": "solid", "operators": [{"params": 3}, "x"]},
+            {"behavior": "solid", "target_kind": "weird"},
+        ],
+    }
+
+
+def _mutations():
+    return [
+        lambda p: p["zones"]["bad"]["indices"].pop(),
+        lambda p: p["groups"].update(h={"indices": "nope"}),
+        lambda p: p["masks"].pop("group:g"),
+        lambda p: p["ui"].update(target_mask="both"),
+        lambda p: p.pop("target_mask"),
+        lambda p: p["layers"][1].update(operators=[]),
+        lambda p: p["layout"].update(count=4),
+        lambda p: p.update(zones=["not", "a", "dict"]),
+        lambda p: p.update(masks=None),
+        lambda p: p.pop("layers"),
+    ]
+
+
+def test_snapshot_matches_validate_project():
+    from app.project_validation import validate_project
+    from app.validation_engine import ValidationEngine
+
+    eng = ValidationEngine()
+    p = _project()
+    assert eng.update(p) == validate_project(p)
+    for fn in _mutations():
+        fn(p)  # in place: the engine must see content changes, not identity
+        assert eng.update(p) == validate_project(copy.deepcopy(p))
+
+    root = Path(__file__).resolve().parents[1]
+    demos = sorted((root / "demos").glob("*.json"))[:12]
+    for path in demos:
+        try:
+            d = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        assert eng.update(d) == validate_project(d), path.name
+
+
+def test_only_affected_checks_rerun():
+    from app.validation_engine import ValidationEngine
+
+    eng = ValidationEngine()
+    p = _project()
+    eng.update(p)
+    n_checks = len(eng.checks)
+    assert eng.stats["checks_run"] == n_checks
+
+    eng.update(copy.deepcopy(p))  # same content, new objects: nothing re-runs
+    assert eng.stats["checks_run"] == n_checks
+
+    p["ui"]["target_mask"] = "m"  # only the ui.target_mask check reads 'ui'
+    eng.update(p)
+    assert eng.stats["checks_run"] == n_checks + 1
+
+    p["groups"]["g"]["indices"] = [4]  # groups, masks (shadowing), layers (group count)
+    eng.update(p)
+    assert eng.stats["checks_run"] == n_checks + 4
+
+    # cached() memoizes heavier passes on the sections they read.
+    calls = []
+    def _diag(proj):
+        calls.append(1)
+        return {"n": len(proj.get("layers") or [])}
+    for _ in range(3):
+        eng.cached("diag", ("layers",), p, _diag)
+    p["ui"]["x"] = 1
+    eng.cached("diag", ("layers",), p, _diag)
+    assert len(calls) == 1
+    p["layers"].append({"behavior": "solid"})
+    assert eng.cached("diag", ("layers",), p, _diag) == {"n": 4} and len(calls) == 2
+
+    d = eng.diagnose(p)
+    from app.project_diagnostics import diagnose_project
+    assert d == diagnose_project(copy.deepcopy(p))
+    assert eng.diagnose(p) is d
+
+
+def test_events_fire_only_on_change():
+    from app.validation_engine import ValidationEngine
+
+    eng = ValidationEngine()
+    seen = []
+    unsubscribe = eng.subscribe(seen.append)
+    p = _project()
+    eng.update(p)
+    eng.update(p)
+    assert len(seen) == 1 and not seen[0]["ok"]
+
+    p["layers"][0]["params"] = {"speed": 2}  # valid edit, same issues: no event
+    eng.update(p)
+    assert len(seen) == 1
+
+    eng.update(p, notify=False)
+    p["zones"]["bad"]["indices"] = [1]
+    eng.update(p, notify=False)
+    assert len(seen) == 1
+    eng.publish()
+    eng.publish()
+    assert len(seen) == 2
+
+    eng.set_failed(["era"])
+    eng.update(p)  # recovering from a hard failure is a change too
+    assert len(seen) == 4 and seen[-1] == eng.snapshot
+
+    unsubscribe()
+    p["zones"]["bad"]["indices"] = [1, 500]
+    eng.update(p)
+    assert len(seen) == 4
+
+
+def main():
+    test_snapshot_matches_validate_project()
+    test_only_affected_checks_rerun()
+    test_events_fire_only_on_change()
+    print("OK: validation engine selftest passed")
+
+
+if __name__ == "__main__":
+    main()
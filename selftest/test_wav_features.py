@@ -0,0 +1,114 @@
+"""Selftest for audio.wav_features (offline WAV analysis + cached feature track)."""
+
+from __future__ import annotations
+
+import math
+import struct
+import tempfile
+import wave
+from pathlib import Path
+
+
+def _write_test_wav(path: Path, *, sr: int = 8000, seconds: float = 4.0, bpm: float = 120.0) -> None:
+    """Stereo: 1 kHz tone on the left only + 60 Hz kick bursts on both channels at `bpm`."""
+    n = int(sr * seconds)
+    beat = 60.0 / bpm
+    frames = bytearray()
+    for i in range(n):
+        t = i / sr
+        tb = t % beat
+        kick = math.exp(-tb * 30.0) * math.sin(2 * math.pi * 60.0 * t)
+        tone = 0.25 * math.sin(2 * math.pi * 1000.0 * t)
+        l = max(-1.0, min(1.0, 0.6 * kick + tone))
+        r = max(-1.0, min(1.0, 0.6 * kick))
+        frames += struct.pack("<hh", int(l * 32767), int(r * 32767))
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(bytes(frames))
+
+
+def test_wav_features_bands_onsets_bpm_and_cache():
+    import audio.wav_features as wf
+    from runtime.audio_service import AudioService
+
+    with tempfile.TemporaryDirectory() as td:
+        wav = Path(td) / "kick120.wav"
+        cache = Path(td) / "cache"
+        _write_test_wav(wav)
+
+        track = wf.feature_track_for_wav(wav, cache_dir=cache)
+        assert track.columns == wf.COLUMNS
+        assert abs(track.duration - 4.0) < 0.05
+        assert len(list(cache.glob("*.mlaf"))) == 1
+
+        # Left carries the 1 kHz tone (band 3), right does not.
+        l3 = sum(track.column("l3")) / track.n_frames
+        r3 = sum(track.column("r3")) / track.n_frames
+        assert l3 > r3 + 0.2, (l3, r3)
+
+        # 8 kicks in 4 s at 120 BPM.
+        kicks = sum(1 for v in track.column("kick") if v > 0.5)
+        assert 6 <= kicks <= 9, kicks
+        assert abs(track.bpm - 120.0) < 6.0, track.bpm
+
+        # Round-trip through the binary format.
+        again = wf.FeatureTrack.from_bytes(track.to_bytes())
+        assert again.data == track.data and again.n_frames == track.n_frames
+
+        # Second load comes from the cache: analysis must not run again.
+        orig = wf.analyze_wav
+        try:
+            def _boom(*a, **k):
+                raise AssertionError("analyze_wav re-ran despite cache")
+            wf.analyze_wav = _boom
+            cached = wf.feature_track_for_wav(wav, cache_dir=cache)
+        finally:
+            wf.analyze_wav = orig
+        assert cached.data == track.data
+
+        # Backend: pulses are held across coarse render steps (30 fps over 100 fps features).
+        be = wf.WavFeatureBackend(cached)
+        svc = AudioService(be)
+        assert svc.mode == "wav"
+        seen = 0
+        for i in range(int(4.0 * 30)):
+            svc.step(i / 30.0)
+            st = svc.state
+            assert len(st["mono"]) == 7 and 0.0 <= st["energy"] <= 1.0
+            if st["kick"] > 0.5:
+                seen += 1
+        assert seen == kicks, (seen, kicks)
+
+
+def test_numpy_decode_and_blocked_stft_match_python():
+    import audio.wav_features as wf
+
+    if wf._np is None:
+        print("SKIP: numpy not installed; blocked STFT not exercised")
+        return
+    with tempfile.TemporaryDirectory() as td:
+        wav = Path(td) / "kick120.wav"
+        _write_test_wav(wav, seconds=1.0)
+        np_track = wf.analyze_wav(wav)
+        block, np_mod = wf._STFT_BLOCK_FRAMES, wf._np
+        try:
+            wf._STFT_BLOCK_FRAMES = 7  # many blocks, ragged tail
+            blocked = wf.analyze_wav(wav)
+            wf._np = None
+            py_track = wf.analyze_wav(wav)
+        finally:
+            wf._STFT_BLOCK_FRAMES, wf._np = block, np_mod
+    assert blocked.data == np_track.data
+    assert py_track.data == np_track.data and abs(py_track.bpm - np_track.bpm) < 1e-6
+
+
+def main():
+    test_wav_features_bands_onsets_bpm_and_cache()
+    test_numpy_decode_and_blocked_stft_match_python()
+    print("OK: wav_features selftest passed")
+
+
+if __name__ == "__main__":
+    main()
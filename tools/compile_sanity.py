@@ -12,7 +12,13 @@ FQBN mapping:
 - Override via env: MODULO_FQBN_MAP=/path/to/map.json
 - Or CLI: --fqbn-map /path/to/map.json
 
-Writes reports to: parity_reports/compile_sanity_<timestamp>/
+Writes reports to: parity_reports/compile_sanity_<timestamp>/ (summary.json is rewritten
+after every cell, so a long compile run leaves a usable partial report).
+
+Cells run on a process pool and are memoized in out/build_cache/compile_sanity.json,
+keyed on (project hash, target pack hash, exporter source hash, output mode, FQBN,
+available toolchains). A cached cell keeps the `emitted` path of the run that built it.
+Use --no-cache to rebuild everything and --workers 1 to run in-process.
 """
 from __future__ import annotations
 
@@ -30,6 +36,7 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from export.build_cache import ResultCache, cell_key, run_jobs, target_pack_hash
 from export.emit import emit_project
 from export.targets.registry import load_target
 
@@ -160,11 +167,78 @@ def _hint_install_core_for_fqbn(fqbn: str, installed_cores: List[Dict[str, Any]]
         f"If that fails, add the vendor's Boards Manager URL, then re-run the install."
     )
 
-def main() -> int:
+def _sanity_cell(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Emit (and, when a toolchain is present, compile) one target x behavior cell."""
+    target_id = job["target"]
+    beh = job["behavior"]
+    mode = job["output_mode"]
+    proj = _minimal_project(beh)
+    stem = f"{target_id}__{beh}__{mode}"
+    out_path = Path(job["out_dir"]) / stem
+
+    try:
+        written, _rep = emit_project(project=proj, out_path=out_path, target_id=target_id, output_mode=mode)
+        written_p = Path(written)
+    except Exception as e:
+        return {
+            "target": target_id,
+            "behavior": beh,
+            "output_mode": mode,
+            "status": "ERR",
+            "detail": f"Emit failed: {e}",
+        }
+
+    try:
+        emitted = str(written_p.relative_to(REPO_ROOT)) if written_p.exists() else str(written_p)
+    except ValueError:
+        emitted = str(written_p)
+    rec: Dict[str, Any] = {
+        "target": target_id,
+        "behavior": beh,
+        "output_mode": mode,
+        "emitted": emitted,
+        "status": "OK",
+        "compile": "N/A",
+        "compile_hint": "",
+    }
+
+    if mode.startswith("platformio"):
+        if job["have_pio"] and written_p.exists() and written_p.is_dir():
+            rc, out = _run(["pio", "run"], cwd=written_p)
+            rec["compile"] = "OK" if rc == 0 else "ERR"
+            if rc != 0:
+                rec["status"] = "WARN"
+                rec["detail"] = out[-2000:]
+        else:
+            rec["compile"] = "SKIP"
+    else:
+        # Arduino sketch compilation
+        if job["have_arduino"] and written_p.exists() and written_p.suffix.lower() == ".ino":
+            fqbn = job["fqbn"]
+            if not fqbn:
+                rec["compile"] = "SKIP"
+                rec["compile_hint"] = f"No FQBN mapping for target_id '{target_id}'. Add it to tools/fqbn_map.json or use --preset."
+            else:
+                rc, out = _arduino_compile(written_p, fqbn=fqbn)
+                rec["compile"] = "OK" if rc == 0 else "ERR"
+                if rc != 0:
+                    rec["status"] = "WARN"
+                    rec["detail"] = out[-2000:]
+                    hint = _hint_install_core_for_fqbn(fqbn, job["installed_cores"])
+                    if hint:
+                        rec["compile_hint"] = hint
+        else:
+            rec["compile"] = "SKIP"
+    return rec
+
+
+def main(argv=None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--fqbn-map", default="", help="Path to fqbn_map.json (overrides MODULO_FQBN_MAP)")
     ap.add_argument("--preset", default="", help="Name of a preset in tools/fqbn_presets.json to merge into mappings")
-    args = ap.parse_args()
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count - 1; 1 = in-process)")
+    ap.add_argument("--no-cache", action="store_true", help="Re-export/compile every cell and do not update the result cache")
+    args = ap.parse_args(argv)
 
     ts = _dt.datetime.utcnow().strftime("%Y%m%d_%H%M%SZ")
     out_dir = REPO_ROOT / "parity_reports" / f"compile_sanity_{ts}"
@@ -192,6 +266,7 @@ def main() -> int:
 
     installed_cores: List[Dict[str, Any]] = _arduino_core_list() if have_arduino else []
 
+    jobs: List[Tuple[str, Dict[str, Any]]] = []
     summary: Dict[str, Any] = {
         "timestamp": ts,
         "have_arduino_cli": have_arduino,
@@ -216,65 +291,43 @@ def main() -> int:
             })
             continue
 
+        thash = target_pack_hash(target_id)
         for beh in _pick_behaviors():
             proj = _minimal_project(beh)
-            stem = f"{target_id}__{beh}__{mode}"
-            out_path = out_dir / stem
-
-            try:
-                written, _rep = emit_project(project=proj, out_path=out_path, target_id=target_id, output_mode=mode)
-                written_p = Path(written)
-            except Exception as e:
-                summary["runs"].append({
-                    "target": target_id,
-                    "behavior": beh,
-                    "output_mode": mode,
-                    "status": "ERR",
-                    "detail": f"Emit failed: {e}",
-                })
-                continue
-
-            rec: Dict[str, Any] = {
+            fqbn = fqbn_map.get(target_id, "") if mode == "arduino" else ""
+            key = cell_key("compile_sanity", proj, thash, mode=mode, fqbn=fqbn,
+                           have_pio=have_pio, have_arduino=have_arduino, cores=installed_cores)
+            jobs.append((key, {
                 "target": target_id,
                 "behavior": beh,
                 "output_mode": mode,
-                "emitted": str(written_p.relative_to(REPO_ROOT)) if written_p.exists() else str(written_p),
-                "status": "OK",
-                "compile": "N/A",
-                "compile_hint": "",
+                "out_dir": str(out_dir),
+                "fqbn": fqbn,
+                "have_pio": have_pio,
+                "have_arduino": have_arduino,
+                "installed_cores": installed_cores,
+            }))
+
+    cache = ResultCache("compile_sanity", enabled=not args.no_cache)
+    # Failed compiles are not cached: they are often an environment problem (missing core).
+    results = run_jobs(_sanity_cell, jobs, cache=cache, workers=args.workers,
+                       should_cache=lambda rec: rec.get("compile") != "ERR")
+    for (_key, job), res in zip(jobs, results):
+        if res.ok:
+            rec = dict(res.value)
+            if res.cached:
+                rec["cached"] = True
+        else:
+            rec = {
+                "target": job["target"],
+                "behavior": job["behavior"],
+                "output_mode": job["output_mode"],
+                "status": "ERR",
+                "detail": f"Cell crashed: {res.error}",
             }
-
-            if mode.startswith("platformio"):
-                if have_pio and written_p.exists() and written_p.is_dir():
-                    rc, out = _run(["pio", "run"], cwd=written_p)
-                    rec["compile"] = "OK" if rc == 0 else "ERR"
-                    if rc != 0:
-                        rec["status"] = "WARN"
-                        rec["detail"] = out[-2000:]
-                else:
-                    rec["compile"] = "SKIP"
-            else:
-                # Arduino sketch compilation
-                if have_arduino and written_p.exists() and written_p.suffix.lower() == ".ino":
-                    fqbn = fqbn_map.get(target_id, "")
-                    if not fqbn and args.preset:
-                        fqbn = fqbn_map.get(target_id, "")
-                    if not fqbn:
-                        rec["compile"] = "SKIP"
-                        rec["compile_hint"] = f"No FQBN mapping for target_id '{target_id}'. Add it to tools/fqbn_map.json or use --preset."
-                    else:
-                        rc, out = _arduino_compile(written_p, fqbn=fqbn)
-                        rec["compile"] = "OK" if rc == 0 else "ERR"
-                        if rc != 0:
-                            rec["status"] = "WARN"
-                            rec["detail"] = out[-2000:]
-                            hint = _hint_install_core_for_fqbn(fqbn, installed_cores)
-                            if hint:
-                                rec["compile_hint"] = hint
-                else:
-                    rec["compile"] = "SKIP"
-
-            summary["runs"].append(rec)
+        summary["runs"].append(rec)
+        (out_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    cache.flush(prune=True)
 
     (out_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
     print(f"Wrote: {out_dir}/summary.json")
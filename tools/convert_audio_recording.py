@@ -0,0 +1,49 @@
+"""Convert JSONL audio recordings to the binary, seekable .mlar format.
+
+Usage:
+  python3 tools/convert_audio_recording.py path/to/recording.jsonl [more.jsonl ...]
+  python3 tools/convert_audio_recording.py in.jsonl --out out.mlar
+
+Binary recordings are memory-mapped on load and seek by bisect, so headless runs
+and soak tests can scrub or fast-forward through long recordings instantly.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from preview.audio_recorder import BinaryRecording, convert_jsonl_to_binary
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("inputs", nargs="+", help="JSONL recordings to convert")
+    ap.add_argument("--out", default=None, help="Output path (single input only)")
+    args = ap.parse_args(argv)
+
+    if args.out and len(args.inputs) != 1:
+        print("--out requires exactly one input")
+        return 2
+    rc = 0
+    for src in args.inputs:
+        p = Path(src)
+        if not p.exists():
+            print(f"[convert] missing: {p}")
+            rc = 1
+            continue
+        dst = convert_jsonl_to_binary(p, Path(args.out) if args.out else None)
+        rec = BinaryRecording.open(dst)
+        try:
+            print(f"[convert] {p} -> {dst} frames={rec.n_frames} cols={len(rec.columns) - 1} duration={rec.duration:.2f}s")
+        finally:
+            rec.close()
+    return rc
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Collect frame timing telemetry (MT1 records) from a board exported with export.telemetry.
+
+Examples:
+  python tools/firmware_telemetry.py --port /dev/ttyUSB0 --seconds 20
+  python tools/firmware_telemetry.py --replay capture.log --project demos/foo.json
+
+Writes <out-dir>/firmware_telemetry.json (summary + records) and
+<out-dir>/firmware_telemetry.csv (one row per record). Exit codes: 0 ok,
+1 no records received, 2 port could not be opened.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime as _dt
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from export.telemetry import STAGES, telemetry_layer_names
+from preview.firmware_telemetry import FirmwareTelemetryCollector
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Collect MT1 frame timing records from exported firmware.")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--port", help="Serial port of the board")
+    src.add_argument("--replay", type=Path, help="Parse a captured serial log instead")
+    ap.add_argument("--baud", type=int, default=115200, help="export.debug_serial_baud of the sketch")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--project", type=Path, default=None, help="Project JSON (labels layers in the report)")
+    ap.add_argument("--out-dir", type=Path, default=None)
+    args = ap.parse_args(argv)
+
+    col = FirmwareTelemetryCollector()
+    if args.replay:
+        col.replay(args.replay.read_text(encoding="utf-8", errors="ignore").splitlines())
+    else:
+        if not col.connect(args.port, args.baud):
+            print(f"[telemetry] {col.status.last_error}")
+            return 2
+        try:
+            time.sleep(max(0.0, args.seconds))
+        finally:
+            col.disconnect()
+
+    names = []
+    if args.project:
+        names = telemetry_layer_names(json.loads(args.project.read_text(encoding="utf-8")))
+    print(col.report_text(names))
+
+    recs = col.snapshot()
+    out_dir = args.out_dir or (REPO_ROOT / "out" / f"firmware_telemetry_{_dt.datetime.now():%Y%m%d_%H%M%S}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report = {"summary": col.summary(), "records": [r.to_dict() for r in recs], "other_lines": list(col.other_lines)}
+    (out_dir / "firmware_telemetry.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    n_layers = max((len(r.layers_us) for r in recs), default=0)
+    with (out_dir / "firmware_telemetry.csv").open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["seq", "frames", "window_ms", "frame_avg_us", "frame_max_us", *STAGES,
+                    *[f"layer{i}_us" for i in range(n_layers)]])
+        for r in recs:
+            w.writerow([r.seq, r.frames, r.window_ms, r.frame_avg_us, r.frame_max_us,
+                        *[r.stages_us[k] for k in STAGES], *r.layers_us])
+    print(f"[telemetry] report: {out_dir}")
+    return 0 if recs else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,11 +10,15 @@ Why:
 Usage:
   python3 tools/golden_exports.py           # compare against baseline
   python3 tools/golden_exports.py --update  # regenerate baseline (intentional changes)
+  python3 tools/golden_exports.py --no-cache --workers 1
 
 Notes:
 - This uses the Arduino exporter (export/arduino_exporter.py) which writes a single
   .ino sketch per project.
 - Baseline lives at golden_exports/golden_exports.json
+- Fixtures export in parallel; results are memoized in out/build_cache/golden_exports.json
+  keyed on (normalized project hash, exporter source hash), so unchanged fixtures are
+  not re-exported (see export/build_cache.py).
 """
 
 from __future__ import annotations
@@ -35,6 +39,7 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 from export.arduino_exporter import export_project_validated
+from export.build_cache import ResultCache, cell_key, hash_json, run_jobs
 
 BASELINE_PATH = REPO_ROOT / "golden_exports" / "golden_exports.json"
 DEMOS_DIR = REPO_ROOT / "demos"
@@ -116,11 +121,31 @@ def _export_one(project_path: Path, out_dir: Path) -> Path:
     return Path(written)
 
 
-def main() -> int:
+def _golden_cell(fx: str) -> Dict[str, Any]:
+    """Export one fixture into a scratch dir and return its hash record (pool worker)."""
+    tmp_root = Path(tempfile.mkdtemp(prefix="modulo_golden_"))
+    try:
+        out_dir = tmp_root / fx.replace(".json", "")
+        ino_path = _export_one(DEMOS_DIR / fx, out_dir)
+        ino_lines = _read_text_lines(ino_path)
+        return {
+            "ino_relpath": str(ino_path.relative_to(out_dir)),
+            "ino_sha256": _sha256_file(ino_path),
+            "ino_bytes": ino_path.stat().st_size,
+            "ino_excerpt": _excerpt(ino_lines),
+        }
+    finally:
+        shutil.rmtree(tmp_root, ignore_errors=True)
+
+
+def main(argv=None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--update", action="store_true", help="Regenerate baseline hashes")
     ap.add_argument("--fixtures", nargs="*", default=None, help="Override fixture list")
-    args = ap.parse_args()
+    ap.add_argument("--out-dir", default=None, help="Directory for mismatch diff hints (default: parity_reports/ or $MODULO_ARTIFACT_DIR)")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count - 1; 1 = in-process)")
+    ap.add_argument("--no-cache", action="store_true", help="Re-export every fixture and do not update the result cache")
+    args = ap.parse_args(argv)
 
     fixtures = args.fixtures if args.fixtures else FIXTURES
 
@@ -134,79 +159,77 @@ def main() -> int:
             print(f"- {m}")
         return 2
 
-    tmp_root = Path(tempfile.mkdtemp(prefix="modulo_golden_"))
-    try:
-        results: Dict[str, Dict[str, Any]] = {}
-        for fx in fixtures:
-            proj_path = DEMOS_DIR / fx
-            out_dir = tmp_root / fx.replace(".json", "")
-            ino_path = _export_one(proj_path, out_dir)
-            ino_lines = _read_text_lines(ino_path)
-            results[fx] = {
-                "ino_relpath": str(ino_path.relative_to(out_dir)),
-                "ino_sha256": _sha256_file(ino_path),
-                "ino_bytes": ino_path.stat().st_size,
-                "ino_excerpt": _excerpt(ino_lines),
-            }
-            print(f"OK export: {fx} -> {ino_path.name} ({results[fx]['ino_bytes']} bytes)")
-
-        if args.update or not BASELINE_PATH.exists():
-            BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
-            BASELINE_PATH.write_text(json.dumps({"fixtures": results}, indent=2, sort_keys=True) + "\n", encoding="utf-8")
-            print(f"Wrote baseline: {BASELINE_PATH}")
-            return 0
-
-        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
-        base_fx = (baseline.get("fixtures") or {})
-
-        mismatches = []
-        for fx, cur in results.items():
-            prev = base_fx.get(fx)
-            if not prev:
-                mismatches.append((fx, "missing_in_baseline", cur["ino_sha256"], ""))
-                continue
-            if str(prev.get("ino_sha256")) != str(cur.get("ino_sha256")):
-                mismatches.append((fx, "sha256", cur["ino_sha256"], prev.get("ino_sha256")))
-
-        if mismatches:
-            print("\nGOLDEN EXPORT MISMATCHES:")
-            base_dir = Path(os.environ.get("MODULO_ARTIFACT_DIR")) if os.environ.get("MODULO_ARTIFACT_DIR") else None
-            if args.out_dir:
-                mismatch_dir = Path(args.out_dir) / "golden_mismatch"
-            elif base_dir:
-                mismatch_dir = base_dir / "parity_reports" / "golden_mismatch"
-            else:
-                mismatch_dir = REPO_ROOT / "parity_reports" / "golden_mismatch"
-            mismatch_dir.mkdir(parents=True, exist_ok=True)
-            for fx, kind, cur_hash, prev_hash in mismatches:
-                print(f"- {fx}: {kind}\n    current: {cur_hash}\n    baseline: {prev_hash}")
-
-                # Write a small diff hint (excerpt-based) so you can spot what changed quickly.
-                cur_excerpt = (results.get(fx) or {}).get("ino_excerpt") or {}
-                prev_excerpt = (base_fx.get(fx) or {}).get("ino_excerpt") or {}
-
-                cur_blob = (str(cur_excerpt.get("head") or "") + "\n...\n" + str(cur_excerpt.get("tail") or ""))
-                prev_blob = (str(prev_excerpt.get("head") or "") + "\n...\n" + str(prev_excerpt.get("tail") or ""))
-
-                diff_txt = "".join(difflib.unified_diff(
-                    prev_blob.splitlines(keepends=True),
-                    cur_blob.splitlines(keepends=True),
-                    fromfile="baseline_excerpt",
-                    tofile="current_excerpt",
-                ))
-
-                diff_path = mismatch_dir / (fx.replace(".json", "") + ".diff.txt")
-                diff_path.write_text(diff_txt, encoding="utf-8")
-                print(f"    diff_hint: {diff_path}")
-
-            print("\nIf changes are intentional, run: python3 tools/golden_exports.py --update")
-            return 1
-
-        print(f"\nGolden exports OK ({len(results)} fixtures).")
+    cache = ResultCache("golden_exports", enabled=not args.no_cache)
+    exporter_id = hash_json("export.arduino_exporter")
+    jobs = []
+    for fx in fixtures:
+        project = _normalize_project_for_export(_load_json(DEMOS_DIR / fx))
+        jobs.append((cell_key("golden_exports", project, exporter_id), fx))
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for (_key, fx), res in zip(jobs, run_jobs(_golden_cell, jobs, cache=cache, workers=args.workers)):
+        if not res.ok:
+            print(f"ERROR export: {fx}: {res.error}")
+            return 2
+        results[fx] = res.value
+        src = " (cached)" if res.cached else ""
+        print(f"OK export: {fx} -> {Path(results[fx]['ino_relpath']).name} ({results[fx]['ino_bytes']} bytes){src}")
+    cache.flush(prune=not args.fixtures)
+
+    if args.update or not BASELINE_PATH.exists():
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps({"fixtures": results}, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Wrote baseline: {BASELINE_PATH}")
         return 0
 
-    finally:
-        shutil.rmtree(tmp_root, ignore_errors=True)
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    base_fx = (baseline.get("fixtures") or {})
+
+    mismatches = []
+    for fx, cur in results.items():
+        prev = base_fx.get(fx)
+        if not prev:
+            mismatches.append((fx, "missing_in_baseline", cur["ino_sha256"], ""))
+            continue
+        if str(prev.get("ino_sha256")) != str(cur.get("ino_sha256")):
+            mismatches.append((fx, "sha256", cur["ino_sha256"], prev.get("ino_sha256")))
+
+    if mismatches:
+        print("\nGOLDEN EXPORT MISMATCHES:")
+        base_dir = Path(os.environ.get("MODULO_ARTIFACT_DIR")) if os.environ.get("MODULO_ARTIFACT_DIR") else None
+        if args.out_dir:
+            mismatch_dir = Path(args.out_dir) / "golden_mismatch"
+        elif base_dir:
+            mismatch_dir = base_dir / "parity_reports" / "golden_mismatch"
+        else:
+            mismatch_dir = REPO_ROOT / "parity_reports" / "golden_mismatch"
+        mismatch_dir.mkdir(parents=True, exist_ok=True)
+        for fx, kind, cur_hash, prev_hash in mismatches:
+            print(f"- {fx}: {kind}\n    current: {cur_hash}\n    baseline: {prev_hash}")
+
+            # Write a small diff hint (excerpt-based) so you can spot what changed quickly.
+            cur_excerpt = (results.get(fx) or {}).get("ino_excerpt") or {}
+            prev_excerpt = (base_fx.get(fx) or {}).get("ino_excerpt") or {}
+
+            cur_blob = (str(cur_excerpt.get("head") or "") + "\n...\n" + str(cur_excerpt.get("tail") or ""))
+            prev_blob = (str(prev_excerpt.get("head") or "") + "\n...\n" + str(prev_excerpt.get("tail") or ""))
+
+            diff_txt = "".join(difflib.unified_diff(
+                prev_blob.splitlines(keepends=True),
+                cur_blob.splitlines(keepends=True),
+                fromfile="baseline_excerpt",
+                tofile="current_excerpt",
+            ))
+
+            diff_path = mismatch_dir / (fx.replace(".json", "") + ".diff.txt")
+            diff_path.write_text(diff_txt, encoding="utf-8")
+            print(f"    diff_hint: {diff_path}")
+
+        print("\nIf changes are intentional, run: python3 tools/golden_exports.py --update")
+        return 1
+
+    print(f"\nGolden exports OK ({len(results)} fixtures).")
+    return 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Host harness: run an exported sketch natively and gate frame time + preview parity.
+
+Exports a project (or takes an existing .ino), compiles it with the local C++
+compiler against the Arduino/FastLED shim in export/host_harness.py, runs N
+frames with a scripted clock and AudioSim-driven MSGEQ7 readings, and diffs the
+captured FastLED.show() frames against PreviewEngine.render_frame().
+
+Examples:
+  python tools/host_harness.py --project demos/foo.json --frames 240
+  python tools/host_harness.py --behavior solid --max-frame-us 500 --max-delta 2
+  python tools/host_harness.py --project p.json --sketch out/p.ino --keep-dir /tmp/hh
+  python tools/host_harness.py --calibrate-kernels
+
+--calibrate-kernels times every layer-stack kernel instead and suggests
+LAYERSTACK_KERNEL_COSTS cycles_per_pixel relative to solid (kernel 0), written to
+<out-dir>/kernel_costs.json.
+
+Writes <out-dir>/host_harness.json (summary + per-frame parity) and
+<out-dir>/host_frames.csv (frame, t_ms, shows, cpu_us, stack_bytes, heap_bytes).
+Exit codes: 0 ok, 1 gate failed (frame time / parity), 2 export/compile/run failed.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime as _dt
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from export.host_harness import calibrate_kernel_costs, run_host_harness
+from export.targets.registry import load_target
+
+
+def _minimal_project(behavior_key: str, *, num_leds: int = 60) -> Dict[str, Any]:
+    return {
+        "version": 1,
+        "layout": {"kind": "strip", "num_leds": num_leds},
+        "layers": [{"name": behavior_key, "enabled": True, "behavior": behavior_key, "effect": behavior_key,
+                    "params": {}}],
+    }
+
+
+def _calibrate(args) -> int:
+    try:
+        rows = calibrate_kernel_costs(frames=max(args.frames, 2), opt=args.opt)
+    except RuntimeError as e:
+        print(f"[host_harness] calibration failed: {e}")
+        return 2
+    out_dir = args.out_dir or (REPO_ROOT / "parity_reports" / f"kernel_costs_{_dt.datetime.now():%Y%m%d_%H%M%S}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "kernel_costs.json").write_text(json.dumps({str(k): v for k, v in rows.items()}, indent=2),
+                                               encoding="utf-8")
+    for kid, row in rows.items():
+        if "error" in row:
+            print(f"[host_harness] kernel {kid:2d} {row.get('behavior', '?')}: {row['error']}")
+        else:
+            print(f"[host_harness] kernel {kid:2d} {row['behavior']}: declared {row.get('declared_cycles_per_pixel')} "
+                  f"-> suggested {row['cycles_per_pixel']} cycles/pixel")
+    print(f"[host_harness] report: {out_dir}")
+    return 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Run an exported sketch on the host and gate timing/parity.")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--project", type=Path, help="Project JSON to export and compare")
+    src.add_argument("--behavior", help="Single-layer strip project using this behavior key")
+    src.add_argument("--calibrate-kernels", action="store_true",
+                     help="Time every layer-stack kernel and suggest LAYERSTACK_KERNEL_COSTS cycles")
+    ap.add_argument("--sketch", type=Path, default=None, help="Run this .ino instead of exporting the project")
+    ap.add_argument("--target", default=None, help="Target pack id (LUT planning / math mode)")
+    ap.add_argument("--math-mode", default=None, choices=("float", "fixed"))
+    ap.add_argument("--frames", type=int, default=120)
+    ap.add_argument("--fps", type=float, default=60.0)
+    ap.add_argument("--tolerance", type=int, default=0, help="Per-channel delta still counted as a match")
+    ap.add_argument("--max-frame-us", type=float, default=None, help="Fail when p95 loop() CPU time exceeds this")
+    ap.add_argument("--max-delta", type=int, default=None, help="Fail when any channel differs by more than this")
+    ap.add_argument("--no-preview", action="store_true", help="Skip the PreviewEngine diff")
+    ap.add_argument("--opt", default="-O2", help="Host optimization flag")
+    ap.add_argument("--keep-dir", type=Path, default=None, help="Keep generated sources/binary here")
+    ap.add_argument("--out-dir", type=Path, default=None)
+    args = ap.parse_args(argv)
+    if args.calibrate_kernels:
+        return _calibrate(args)
+
+    if args.project:
+        project = json.loads(args.project.read_text(encoding="utf-8"))
+    else:
+        project = _minimal_project(args.behavior)
+    meta = None
+    if args.target:
+        meta = dict(load_target(args.target).meta)
+    sketch = args.sketch.read_text(encoding="utf-8") if args.sketch else None
+
+    res = run_host_harness(project, sketch_text=sketch, frames=args.frames, fps=args.fps,
+                           compare=not args.no_preview, tolerance=args.tolerance, target_meta=meta,
+                           math_mode=args.math_mode, work_dir=args.keep_dir, opt=args.opt)
+    summary = res.summary()
+    gates = []
+    if res.ok and args.max_frame_us is not None and summary.get("cpu_us_p95", 0.0) > args.max_frame_us:
+        gates.append(f"p95 frame time {summary['cpu_us_p95']:.1f}us > {args.max_frame_us:.1f}us")
+    if res.ok and res.parity is not None:
+        limit = args.max_delta if args.max_delta is not None else args.tolerance
+        if "error" in res.parity:
+            gates.append(f"preview render failed: {res.parity['error']}")
+        elif res.parity.get("max_delta", 0) > limit:
+            gates.append(f"parity max delta {res.parity['max_delta']} > {limit} "
+                         f"({res.parity.get('mismatched_frames', 0)} frame(s) differ)")
+    summary["gate_failures"] = gates
+
+    out_dir = args.out_dir or (REPO_ROOT / "parity_reports" / f"host_harness_{_dt.datetime.now():%Y%m%d_%H%M%S}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report = {"summary": summary, "parity": res.parity, "serial_tail": res.serial_tail}
+    (out_dir / "host_harness.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    with (out_dir / "host_frames.csv").open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["frame", "t_ms", "shows", "cpu_us", "stack_bytes", "heap_bytes"])
+        for fr in res.frames:
+            w.writerow([fr.index, fr.t_ms, fr.shows, f"{fr.cpu_us:.3f}", fr.stack_bytes, fr.heap_bytes])
+
+    if not res.ok:
+        print(f"[host_harness] {res.stage} failed:\n{res.log[:4000]}")
+        print(f"[host_harness] report: {out_dir}")
+        return 2
+    print(f"[host_harness] {summary['frames']} frames: cpu p95={summary.get('cpu_us_p95', 0.0):.1f}us "
+          f"max={summary.get('cpu_us_max', 0.0):.1f}us stack={summary.get('peak_stack_bytes', 0)}B "
+          f"heap={summary.get('peak_heap_bytes', 0)}B")
+    if res.parity is not None and "error" not in res.parity:
+        print(f"[host_harness] parity: max_delta={res.parity['max_delta']} "
+              f"mismatched_frames={res.parity['mismatched_frames']}/{res.parity['frames_compared']}")
+    for g in gates:
+        print(f"[host_harness] GATE FAILED: {g}")
+    print(f"[host_harness] report: {out_dir}")
+    return 1 if gates else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
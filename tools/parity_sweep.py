@@ -3,16 +3,22 @@
 Parity sweep: iterate all shipped effects vs all builtin targets and report export gating.
 
 Outputs:
-- parity_reports/parity_sweep_<timestamp>.csv
+- parity_reports/parity_sweep_<timestamp>.csv   (rows are appended as cells finish)
 - parity_reports/parity_sweep_<timestamp>.md
 
 This is intentionally non-invasive: it does NOT modify projects or targets.
+
+Cells are fanned out over a process pool and memoized in out/build_cache/parity_sweep.json
+(see export/build_cache.py), keyed on (project hash, target pack hash, exporter source
+hash): re-runs only recompute the cells whose inputs changed. Use --no-cache to force
+a full sweep and --workers 1 to run in-process.
 """
 from __future__ import annotations
 
 import csv
 import argparse
 import datetime as _dt
+import json
 import os
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
@@ -26,11 +32,11 @@ if str(REPO_ROOT) not in sys.path:
 from export.targets.registry import list_targets, load_target
 from export.gating import gate_project_for_target
 from export.export_eligibility import get_eligibility, ExportStatus
+from export.build_cache import ResultCache, cell_key, run_jobs, target_pack_hash
 
 CATALOG_PATH = REPO_ROOT / "behaviors" / "capabilities_catalog.json"
 
 def _load_effect_keys() -> List[str]:
-    import json
     data = json.loads(CATALOG_PATH.read_text(encoding="utf-8"))
     effects = data.get("effects") or {}
     if isinstance(effects, dict):
@@ -62,7 +68,55 @@ def _minimal_project_for_behavior(behavior_key: str) -> Dict[str, Any]:
         ],
     }
 
-def main() -> int:
+def _is_capability_missing_error(msg: str) -> bool:
+    m = (msg or "").lower()
+    # "Skip" means: export is blocked only because the selected *target* lacks
+    # a declared runtime capability (so it's not a regression in the app/effect).
+    if "does not support" in m or "doesn't support" in m or "not support" in m:
+        return True
+    if "supports_postfx_runtime" in m or "supports_operators_runtime" in m:
+        return True
+    if m.startswith("postfx") or m.startswith("operators"):
+        return True
+    return False
+
+def _sweep_cell(job: Tuple[str, Dict[str, Any], str]) -> Dict[str, Any]:
+    """Gate one behavior against one target. Runs in pool workers; must stay module-level."""
+    tid, tmeta, beh = job
+    elig = get_eligibility(beh)
+    if elig.status != ExportStatus.EXPORTABLE:
+        return {
+            "target": tid,
+            "behavior": beh,
+            "result": elig.status,
+            "errors": elig.reason or "",
+            "warnings": "",
+            "total": "blocked",
+        }
+
+    proj = _minimal_project_for_behavior(beh)
+    gate = gate_project_for_target(proj, tmeta)
+    if gate.ok and not gate.errors and not gate.warnings:
+        res = "ok"
+    elif gate.ok and gate.warnings and not gate.errors:
+        res = "warn"
+    else:
+        # Phase 6: distinguish real regressions (ERR) from "capability missing" SKIPs.
+        errs = gate.errors or []
+        if errs and all(_is_capability_missing_error(e) for e in errs):
+            res = "skip"
+        else:
+            res = "err"
+    return {
+        "target": tid,
+        "behavior": beh,
+        "result": res,
+        "errors": " | ".join(gate.errors or []),
+        "warnings": " | ".join(gate.warnings or []),
+        "total": res,
+    }
+
+def main(argv=None) -> int:
     if not CATALOG_PATH.exists():
         print(f"ERROR: missing catalog at {CATALOG_PATH}")
         return 2
@@ -70,7 +124,9 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Modulo export parity sweep")
     parser.add_argument("--out-dir", default=None, help="Directory to write reports (default: parity_reports/ or $MODULO_ARTIFACT_DIR)")
     parser.add_argument("--json-summary", action="store_true", help="Also write a small JSON summary next to the reports")
-    args = parser.parse_args()
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count - 1; 1 = in-process)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the result cache")
+    args = parser.parse_args(argv)
 
     effect_keys = _load_effect_keys()
     # NOTE: registry.list_targets() returns target *records* (dicts), not ids.
@@ -92,19 +148,11 @@ def main() -> int:
 
     rows: List[Dict[str, Any]] = []
     totals = {"ok": 0, "warn": 0, "err": 0, "skip": 0, "blocked": 0}
+    fieldnames = ["target","behavior","result","errors","warnings"]
 
-    def _is_capability_missing_error(msg: str) -> bool:
-        m = (msg or "").lower()
-        # "Skip" means: export is blocked only because the selected *target* lacks
-        # a declared runtime capability (so it's not a regression in the app/effect).
-        if "does not support" in m or "doesn't support" in m or "not support" in m:
-            return True
-        if "supports_postfx_runtime" in m or "supports_operators_runtime" in m:
-            return True
-        if m.startswith("postfx") or m.startswith("operators"):
-            return True
-        return False
-
+    cache = ResultCache("parity_sweep", enabled=not args.no_cache)
+    jobs: List[Tuple[str, Tuple[str, Dict[str, Any], str]]] = []
+    load_errors: List[Dict[str, Any]] = []
     for tid in target_ids:
         if not tid:
             # Defensive: skip any malformed records.
@@ -112,59 +160,43 @@ def main() -> int:
         try:
             tmeta = load_target(tid).meta  # normalized meta dict
         except Exception as e:
-            rows.append({
+            load_errors.append({
                 "target": tid,
                 "behavior": "*",
                 "result": "ERR",
                 "errors": f"Failed to load target pack: {e}",
                 "warnings": "",
             })
-            totals["err"] += 1
             continue
+        thash = target_pack_hash(tmeta)
         for beh in effect_keys:
-            elig = get_eligibility(beh)
-            if elig.status != ExportStatus.EXPORTABLE:
-                rows.append({
-                    "target": tid,
-                    "behavior": beh,
-                    "result": elig.status,
-                    "errors": elig.reason or "",
-                    "warnings": "",
-                })
-                totals["blocked"] += 1
-                continue
-
-            proj = _minimal_project_for_behavior(beh)
-            gate = gate_project_for_target(proj, tmeta)
-            if gate.ok and not gate.errors and not gate.warnings:
-                res = "ok"
-                totals["ok"] += 1
-            elif gate.ok and gate.warnings and not gate.errors:
-                res = "warn"
-                totals["warn"] += 1
-            else:
-                # Phase 6: distinguish real regressions (ERR) from "capability missing" SKIPs.
-                errs = gate.errors or []
-                if errs and all(_is_capability_missing_error(e) for e in errs):
-                    res = "skip"
-                    totals["skip"] += 1
-                else:
-                    res = "err"
-                    totals["err"] += 1
-
-            rows.append({
-                "target": tid,
-                "behavior": beh,
-                "result": res,
-                "errors": " | ".join(gate.errors or []),
-                "warnings": " | ".join(gate.warnings or []),
-            })
+            key = cell_key("parity_sweep", _minimal_project_for_behavior(beh), thash, behavior=beh)
+            jobs.append((key, (tid, tmeta, beh)))
 
-    # Write CSV
+    # Write CSV incrementally (job order, so reports stay diffable between runs).
     with csv_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=["target","behavior","result","errors","warnings"])
+        w = csv.DictWriter(f, fieldnames=fieldnames)
         w.writeheader()
-        w.writerows(rows)
+        for row in load_errors:
+            totals["err"] += 1
+            rows.append(row)
+            w.writerow(row)
+        results = run_jobs(_sweep_cell, jobs, cache=cache, workers=args.workers,
+                           chunksize=max(1, len(effect_keys) // 2))
+        for (_key, (tid, _tmeta, beh)), res in zip(jobs, results):
+            if res.ok:
+                cell = dict(res.value)
+                totals[cell.pop("total")] += 1
+            else:
+                cell = {"target": tid, "behavior": beh, "result": "err",
+                        "errors": f"Sweep cell crashed: {res.error}", "warnings": ""}
+                totals["err"] += 1
+            rows.append(cell)
+            w.writerow(cell)
+            f.flush()
+
+    cache.flush(prune=True)
+    print(f"Parity sweep: {len(rows)} cells, {cache.hits} cached")
 
     # Write markdown summary
     def _count(pred):
@@ -186,7 +218,11 @@ def main() -> int:
     md.append("")
     md.append("## Quick links")
     md.append("")
-    md.append(f"- CSV: `{csv_path.relative_to(REPO_ROOT)}`")
+    try:
+        csv_label = csv_path.resolve().relative_to(REPO_ROOT)
+    except ValueError:
+        csv_label = csv_path
+    md.append(f"- CSV: `{csv_label}`")
     md.append("")
     md.append("## Top non-OK (first 50)")
     md.append("")
@@ -206,9 +242,10 @@ def main() -> int:
             "totals": totals,
             "csv": str(csv_path),
             "md": str(md_path),
+            "cached_cells": cache.hits,
         }, indent=2), encoding="utf-8")
 
-        print(f"Wrote:\n- {csv_path}\n- {md_path}")
+    print(f"Wrote:\n- {csv_path}\n- {md_path}")
 
     # Exit non-zero only for real regressions.
     return 1 if totals["err"] > 0 else 0